@@ -6,6 +6,7 @@ from django.utils.safestring import mark_safe
 from django.utils import timezone
 from django.contrib import messages
 from django.db import transaction
+from .auth import forget_cached_users
 from .models import User, OrganizerApplication, AthleteApplication, CoachApplication
 from django.contrib.contenttypes.models import ContentType
 from common.models import DeletionRequest
@@ -208,7 +209,9 @@ class UserAdmin(BaseUserAdmin):
     
     def suspend_users(self, request, queryset):
         """Suspend selected users"""
-        count = queryset.filter(is_active=True).update(is_active=False)
+        user_ids = list(queryset.filter(is_active=True).values_list('pk', flat=True))
+        count = queryset.filter(pk__in=user_ids).update(is_active=False)
+        transaction.on_commit(lambda: forget_cached_users(user_ids))
         self.message_user(
             request,
             f'Suspended {count} user(s).',
@@ -218,7 +221,9 @@ class UserAdmin(BaseUserAdmin):
     
     def activate_users(self, request, queryset):
         """Activate selected users"""
-        count = queryset.filter(is_active=False).update(is_active=True)
+        user_ids = list(queryset.filter(is_active=False).values_list('pk', flat=True))
+        count = queryset.filter(pk__in=user_ids).update(is_active=True)
+        transaction.on_commit(lambda: forget_cached_users(user_ids))
         self.message_user(
             request,
             f'Activated {count} user(s).',
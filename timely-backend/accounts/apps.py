@@ -9,6 +9,9 @@ class AccountsConfig(AppConfig):
     
     def ready(self):
         """Post-migrate signal to verify accounts.User table exists"""
+        from .auth import connect_auth_cache_signals
+        connect_auth_cache_signals()
+
         try:
             # Only run in production or when explicitly called
             if not self.apps.is_installed('django.contrib.admin'):
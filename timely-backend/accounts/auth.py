@@ -1,15 +1,27 @@
 """Cookie-based JWT helpers and authentication.
 
-Small, typed utilities to issue and read JWT from HttpOnly cookies.
+Small, typed utilities to issue and read JWT from HttpOnly cookies, and to
+resolve the token's user through a short-lived cache instead of a database
+read per request.
 """
 from __future__ import annotations
 
-from typing import Optional, Tuple
+from typing import Iterable, Optional, Tuple
 
 from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import AuthenticationFailed
 from rest_framework.response import Response
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings
+
+from .tokens import TOKEN_VERSION_CLAIM
 
 
 # Cookie configuration from settings
@@ -57,6 +69,95 @@ def clear_jwt_cookies(response: Response) -> None:
     response.delete_cookie(REFRESH_COOKIE_NAME, path=COOKIE_PATH)
 
 
+# ---------------------------------------------------------------------------
+# Cached token users
+#
+# Users are cached under (user id, token version) for AUTH_USER_CACHE_TIMEOUT
+# seconds, next to the user's current token version. Both keys are read in
+# one round trip, so an authenticated request costs a cache hit instead of a
+# row lookup. Saving or deleting a user drops its version key on commit, so
+# role changes and deactivation are picked up on the next request;
+# revoke_user_tokens() bumps the version so every token issued before it
+# stops resolving.
+# ---------------------------------------------------------------------------
+
+
+def _version_key(user_id) -> str:
+    return f"auth:ver:{user_id}"
+
+
+def _user_key(user_id, token_version) -> str:
+    return f"auth:user:{user_id}:{token_version}"
+
+
+def _cache_timeout() -> int:
+    return getattr(settings, "AUTH_USER_CACHE_TIMEOUT", 60)
+
+
+def _revoked() -> AuthenticationFailed:
+    return AuthenticationFailed(_("Token has been revoked"), code="token_revoked")
+
+
+def resolve_token_user(user_id, token_version: int):
+    """
+    Return the user a token belongs to, or None if it no longer exists.
+
+    Raises AuthenticationFailed when the token's version is not the user's
+    current one (logged out or otherwise revoked).
+    """
+    version_key = _version_key(user_id)
+    user_key = _user_key(user_id, token_version)
+    found = cache.get_many([version_key, user_key])
+
+    current = found.get(version_key)
+    if current is not None:
+        if current != token_version:
+            raise _revoked()
+        if user_key in found:
+            return found[user_key]
+
+    User = get_user_model()
+    try:
+        user = User.objects.get(**{api_settings.USER_ID_FIELD: user_id})
+    except User.DoesNotExist:
+        return None
+    if user.token_version != token_version:
+        raise _revoked()
+
+    timeout = _cache_timeout()
+    # add() so a racing read cannot roll back a version set by a revocation
+    cache.add(version_key, user.token_version, timeout)
+    cache.set(user_key, user, timeout)
+    return user
+
+
+def forget_cached_users(user_ids: Iterable) -> None:
+    """Drop cached users, e.g. after a queryset .update() that skips signals."""
+    # Without a version key the next request reloads the row and re-caches it
+    cache.delete_many([_version_key(user_id) for user_id in user_ids])
+
+
+def revoke_user_tokens(user) -> int:
+    """Invalidate every access and refresh token issued to the user so far."""
+    User = get_user_model()
+    User.objects.filter(pk=user.pk).update(token_version=F("token_version") + 1)
+    user.refresh_from_db(fields=["token_version"])
+    version = user.token_version
+    transaction.on_commit(lambda: cache.set(_version_key(user.pk), version, _cache_timeout()))
+    return version
+
+
+def _forget_on_change(sender, instance, **kwargs) -> None:
+    user_id = instance.pk
+    transaction.on_commit(lambda: forget_cached_users([user_id]))
+
+
+def connect_auth_cache_signals() -> None:
+    User = get_user_model()
+    post_save.connect(_forget_on_change, sender=User, dispatch_uid="auth-cache:user:save")
+    post_delete.connect(_forget_on_change, sender=User, dispatch_uid="auth-cache:user:delete")
+
+
 class CookieJWTAuthentication(JWTAuthentication):
     """Read JWT from HttpOnly cookies if Authorization header is missing."""
 
@@ -85,4 +186,24 @@ class CookieJWTAuthentication(JWTAuthentication):
         except TokenError as exc:
             raise InvalidToken(exc.args[0])
 
-        return self.get_user(validated), validated
\ No newline at end of file
+        return self.get_user(validated), validated
+
+    def get_user(self, validated_token):
+        """
+        Resolve the token's user through the auth cache.
+
+        Same checks as SimpleJWT's get_user, plus the token version check.
+        """
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        user = resolve_token_user(user_id, validated_token.get(TOKEN_VERSION_CLAIM, 0))
+        if user is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        return user
@@ -58,6 +58,8 @@ class User(AbstractBaseUser, PermissionsMixin):
     is_staff = models.BooleanField(default=False)
     is_superuser = models.BooleanField(default=False)
     email_verified = models.BooleanField(default=False)
+    # Carried in issued JWTs; bumping it revokes every outstanding token
+    token_version = models.PositiveIntegerField(default=0)
     
     # Role field - users never set this at registration
     role = models.CharField(
@@ -5,9 +5,19 @@ Comprehensive RBAC permissions for DRF implementing the specific requirements:
 - Coach: R/W own team/roster; R on fixtures/results for their team's events
 - Athlete: R/W own profile; R on own fixtures/results; R on own tickets
 - Spectator: R on public; R/W on their purchases only
+
+Each role's rules are kept once, in an RBACPolicy, as (lookup, allowed values)
+pairs. List views compile them into a single filter (scope_queryset) and the
+permission classes check objects against them in Python, using memberships
+loaded at most once per request (get_memberships), so neither pays per-row
+permission queries.
 """
+from functools import cached_property
+
 from rest_framework import permissions
 from django.contrib.auth import get_user_model
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Q
 from events.models import Event
 from teams.models import Team, TeamMember
 from fixtures.models import Fixture
@@ -25,12 +35,227 @@ from venues.models import Venue
 User = get_user_model()
 
 
+PUBLIC_VISIBILITY = frozenset(['PUBLIC'])
+
+
+class RBACMemberships:
+    """
+    The user's organized events/venues and coached/joined teams.
+    
+    Each set is loaded lazily with one query the first time a policy needs it
+    and then reused for the rest of the request.
+    """
+    
+    def __init__(self, user):
+        self.user = user
+    
+    @cached_property
+    def organized_event_ids(self):
+        return frozenset(Event.objects.filter(created_by=self.user).values_list('id', flat=True))
+    
+    @cached_property
+    def organized_venue_ids(self):
+        return frozenset(Venue.objects.filter(created_by=self.user).values_list('id', flat=True))
+    
+    @cached_property
+    def coached_teams(self):
+        """Coached team id -> event id"""
+        return dict(Team.objects.filter(coach=self.user).values_list('id', 'event_id'))
+    
+    @property
+    def coached_team_ids(self):
+        return frozenset(self.coached_teams)
+    
+    @property
+    def coached_event_ids(self):
+        return frozenset(event_id for event_id in self.coached_teams.values() if event_id is not None)
+    
+    @cached_property
+    def member_team_ids(self):
+        return frozenset(TeamMember.objects.filter(athlete=self.user).values_list('team_id', flat=True))
+
+
+def get_memberships(request):
+    """Memberships for request.user, cached on the underlying HttpRequest"""
+    user = request.user
+    http_request = getattr(request, '_request', request)
+    memberships = getattr(http_request, '_rbac_memberships', None)
+    if memberships is None or memberships.user != user:
+        memberships = http_request._rbac_memberships = RBACMemberships(user)
+    return memberships
+
+
+def _has_field(model, name):
+    try:
+        model._meta.get_field(name)
+    except FieldDoesNotExist:
+        return False
+    return True
+
+
+def _resolve(obj, path):
+    """Follow a Django lookup path (e.g. 'fixture__home_id') on an instance"""
+    for attr in path.split('__'):
+        if obj is None:
+            return None
+        obj = getattr(obj, attr)
+    return obj
+
+
+class RBACPolicy:
+    """
+    A role's access rules as (lookup path, allowed values) pairs.
+    
+    An object is accessible when any rule matches; filter_q() ORs the rules
+    into one Q for list views and allows() evaluates them on an instance,
+    so list and detail access always agree.
+    """
+    
+    def __init__(self, user, memberships):
+        self.user = user
+        self.memberships = memberships
+        self.own = frozenset([user.pk])
+    
+    def rules(self, model, safe):
+        return []
+    
+    def filter_q(self, model, safe=True):
+        q = Q(pk__in=[])
+        for path, values in self.rules(model, safe):
+            q |= Q(**{f'{path}__in': values})
+        return q
+    
+    def allows(self, obj, safe=True):
+        return any(_resolve(obj, path) in values for path, values in self.rules(type(obj), safe))
+
+
+class OrganizerPolicy(RBACPolicy):
+    """Their events and venues, and everything belonging to them"""
+    
+    def rules(self, model, safe):
+        if issubclass(model, Event):
+            return [('id', self.memberships.organized_event_ids)]
+        if issubclass(model, Venue):
+            return [('id', self.memberships.organized_venue_ids)]
+        # Models such as Result reach their event through a fixture
+        rules = []
+        if _has_field(model, 'event'):
+            rules.append(('event_id', self.memberships.organized_event_ids))
+        if _has_field(model, 'fixture'):
+            rules.append(('fixture__event_id', self.memberships.organized_event_ids))
+        if rules:
+            return rules
+        if _has_field(model, 'venue'):
+            return [('venue_id', self.memberships.organized_venue_ids)]
+        return []
+
+
+class CoachPolicy(RBACPolicy):
+    """R/W on coached teams and rosters; R on fixtures/results of their teams' events"""
+    
+    def rules(self, model, safe):
+        if issubclass(model, Team):
+            return [('id', self.memberships.coached_team_ids)]
+        if issubclass(model, TeamMember):
+            return [('team_id', self.memberships.coached_team_ids)]
+        if issubclass(model, Fixture):
+            return [('event_id', self.memberships.coached_event_ids)] if safe else []
+        if issubclass(model, Result):
+            return [('fixture__event_id', self.memberships.coached_event_ids)] if safe else []
+        if _has_field(model, 'team'):
+            return [('team_id', self.memberships.coached_team_ids)]
+        return []
+
+
+class AthletePolicy(RBACPolicy):
+    """R/W on own profile; R on own fixtures/results, tickets and memberships"""
+    
+    def rules(self, model, safe):
+        if issubclass(model, User):
+            return [('pk', self.own)]
+        if issubclass(model, Fixture):
+            teams = self.memberships.member_team_ids
+            return [('home_id', teams), ('away_id', teams)] if safe else []
+        if issubclass(model, Result):
+            teams = self.memberships.member_team_ids
+            return [('fixture__home_id', teams), ('fixture__away_id', teams)] if safe else []
+        if issubclass(model, Ticket):
+            return [('order__user_id', self.own)] if safe else []
+        if issubclass(model, TicketOrder):
+            return [('user_id', self.own)] if safe else []
+        if issubclass(model, TeamMember):
+            return [('athlete_id', self.own)] if safe else []
+        if _has_field(model, 'user'):
+            return [('user_id', self.own)]
+        if _has_field(model, 'athlete'):
+            return [('athlete_id', self.own)]
+        return []
+
+
+class SpectatorPolicy(RBACPolicy):
+    """R on public data; R/W on their own purchases and profile"""
+    
+    def rules(self, model, safe):
+        if issubclass(model, Event):
+            return [('visibility', PUBLIC_VISIBILITY)] if safe else []
+        if issubclass(model, Ticket):
+            return [('order__user_id', self.own)]
+        if issubclass(model, TicketOrder):
+            return [('user_id', self.own)]
+        if issubclass(model, User):
+            return [('pk', self.own)]
+        if safe:
+            if _has_field(model, 'visibility'):
+                return [('visibility', PUBLIC_VISIBILITY)]
+            if _has_field(model, 'is_public'):
+                return [('is_public', frozenset([True]))]
+            if _has_field(model, 'event'):
+                return [('event__visibility', PUBLIC_VISIBILITY)]
+        return []
+
+
+ROLE_POLICIES = {
+    User.Roles.ORGANIZER: OrganizerPolicy,
+    User.Roles.COACH: CoachPolicy,
+    User.Roles.ATHLETE: AthletePolicy,
+    User.Roles.SPECTATOR: SpectatorPolicy,
+}
+
+
+def scope_queryset(request, queryset, public=None, safe=True):
+    """
+    Restrict a queryset to what request.user's role may access, in one filter.
+    
+    Admins (staff, superusers and the ADMIN role) see everything. public is an
+    optional Q for rows every user may see (e.g. published fixtures), which is
+    all anonymous users get. Read rules apply unless safe=False; writes are
+    still checked per object by the permission classes.
+    """
+    user = request.user
+    if user and user.is_authenticated and (
+        user.is_staff or user.is_superuser or getattr(user, 'role', '') == User.Roles.ADMIN
+    ):
+        return queryset
+    
+    q = Q(pk__in=[])
+    policy_class = ROLE_POLICIES.get(getattr(user, 'role', None)) if user and user.is_authenticated else None
+    if policy_class:
+        policy = policy_class(user, get_memberships(request))
+        q = policy.filter_q(queryset.model, safe)
+    if public is not None:
+        q |= public
+    return queryset.filter(q)
+
+
 class BaseRBACPermission(permissions.BasePermission):
     """
     Base RBAC permission class with common functionality.
     All role-specific permissions inherit from this.
     """
     
+    # RBACPolicy used for object checks and filter_queryset
+    policy_class = None
+    
     def is_admin_or_staff(self, user):
         """Check if user is admin or staff (bypasses all restrictions)"""
         return user and user.is_authenticated and (user.is_staff or user.is_superuser)
@@ -46,6 +271,25 @@ class BaseRBACPermission(permissions.BasePermission):
     def has_role(self, user, role_type):
         """Check if user has role via legacy field or RBAC"""
         return self.has_legacy_role(user, role_type) or self.has_rbac_role(user, role_type)
+    
+    def get_policy(self, request):
+        """This permission's role policy for request.user, sharing the request's memberships"""
+        return self.policy_class(request.user, get_memberships(request))
+    
+    def filter_queryset(self, request, queryset):
+        """Restrict a list queryset with this permission's role policy (admins see everything)"""
+        if self.is_admin_or_staff(request.user):
+            return queryset
+        safe = request.method in permissions.SAFE_METHODS
+        return queryset.filter(self.get_policy(request).filter_q(queryset.model, safe))
+    
+    def has_object_permission(self, request, view, obj):
+        # Admin/staff can do anything
+        if self.is_admin_or_staff(request.user):
+            return True
+        if self.policy_class is None or not request.user or not request.user.is_authenticated:
+            return False
+        return self.get_policy(request).allows(obj, request.method in permissions.SAFE_METHODS)
 
 
 class OrganizerPermissions(BaseRBACPermission):
@@ -54,6 +298,8 @@ class OrganizerPermissions(BaseRBACPermission):
     Admin/staff bypass.
     """
     
+    policy_class = OrganizerPolicy
+    
     def has_permission(self, request, view):
         # Admin/staff can do anything
         if self.is_admin_or_staff(request.user):
@@ -65,33 +311,6 @@ class OrganizerPermissions(BaseRBACPermission):
         
         # Must be organizer
         return self.has_role(request.user, User.Roles.ORGANIZER)
-    
-    def has_object_permission(self, request, view, obj):
-        # Admin/staff can do anything
-        if self.is_admin_or_staff(request.user):
-            return True
-        
-        # For Event objects
-        if isinstance(obj, Event):
-            return obj.created_by == request.user
-        
-        # For Venue objects
-        if isinstance(obj, Venue):
-            return obj.created_by == request.user
-        
-        # For objects that belong to an event
-        if hasattr(obj, 'event') and obj.event:
-            return obj.event.created_by == request.user
-        
-        # For objects that belong to a venue
-        if hasattr(obj, 'venue') and obj.venue:
-            return obj.venue.created_by == request.user
-        
-        # For Announcement objects
-        if hasattr(obj, 'created_by') and hasattr(obj, 'event'):
-            return obj.created_by == request.user
-        
-        return False
 
 
 class CoachPermissions(BaseRBACPermission):
@@ -100,6 +319,8 @@ class CoachPermissions(BaseRBACPermission):
     Admin/staff bypass.
     """
     
+    policy_class = CoachPolicy
+    
     def has_permission(self, request, view):
         # Admin/staff can do anything
         if self.is_admin_or_staff(request.user):
@@ -111,45 +332,6 @@ class CoachPermissions(BaseRBACPermission):
         
         # Must be coach
         return self.has_role(request.user, User.Roles.COACH)
-    
-    def has_object_permission(self, request, view, obj):
-        # Admin/staff can do anything
-        if self.is_admin_or_staff(request.user):
-            return True
-        
-        # For Team objects - coach can R/W their own teams
-        if isinstance(obj, Team):
-            return obj.coach == request.user
-        
-        # For TeamMember objects - coach can R/W members of their teams
-        if isinstance(obj, TeamMember):
-            return obj.team.coach == request.user
-        
-        # For Fixture objects - coach can R fixtures/results for their team's events
-        if isinstance(obj, Fixture):
-            if request.method in permissions.SAFE_METHODS:
-                # Check if user coaches any team in this fixture's event
-                return Team.objects.filter(
-                    event=obj.event,
-                    coach=request.user
-                ).exists()
-            return False  # Coaches cannot write fixtures
-        
-        # For Result objects - coach can R results for their team's events
-        if isinstance(obj, Result):
-            if request.method in permissions.SAFE_METHODS:
-                # Check if user coaches any team in this result's fixture's event
-                return Team.objects.filter(
-                    event=obj.fixture.event,
-                    coach=request.user
-                ).exists()
-            return False  # Coaches cannot write results
-        
-        # For objects that reference a team
-        if hasattr(obj, 'team') and isinstance(obj.team, Team):
-            return obj.team.coach == request.user
-        
-        return False
 
 
 class AthletePermissions(BaseRBACPermission):
@@ -158,6 +340,8 @@ class AthletePermissions(BaseRBACPermission):
     Admin/staff bypass.
     """
     
+    policy_class = AthletePolicy
+    
     def has_permission(self, request, view):
         # Admin/staff can do anything
         if self.is_admin_or_staff(request.user):
@@ -169,77 +353,6 @@ class AthletePermissions(BaseRBACPermission):
         
         # Must be athlete
         return self.has_role(request.user, User.Roles.ATHLETE)
-    
-    def has_object_permission(self, request, view, obj):
-        # Admin/staff can do anything
-        if self.is_admin_or_staff(request.user):
-            return True
-        
-        # For User objects - athletes can R/W their own profile
-        if isinstance(obj, User):
-            return obj == request.user
-        
-        # For Fixture objects - athletes can R fixtures where they're on a team
-        if isinstance(obj, Fixture):
-            if request.method in permissions.SAFE_METHODS:
-                # Check if user is a member of any team in this fixture
-                team_ids = []
-                if obj.home:
-                    team_ids.append(obj.home.id)
-                if obj.away:
-                    team_ids.append(obj.away.id)
-                
-                if team_ids:
-                    return TeamMember.objects.filter(
-                        team_id__in=team_ids,
-                        athlete=request.user
-                    ).exists()
-            return False  # Athletes cannot write fixtures
-        
-        # For Result objects - athletes can R results where they're on a team
-        if isinstance(obj, Result):
-            if request.method in permissions.SAFE_METHODS:
-                # Check if user is a member of any team in this result's fixture
-                team_ids = []
-                if obj.fixture.home:
-                    team_ids.append(obj.fixture.home.id)
-                if obj.fixture.away:
-                    team_ids.append(obj.fixture.away.id)
-                
-                if team_ids:
-                    return TeamMember.objects.filter(
-                        team_id__in=team_ids,
-                        athlete=request.user
-                    ).exists()
-            return False  # Athletes cannot write results
-        
-        # For Ticket objects - athletes can R their own tickets
-        if isinstance(obj, Ticket):
-            if request.method in permissions.SAFE_METHODS:
-                return obj.order.user == request.user
-            return False  # Athletes cannot modify tickets
-        
-        # For TicketOrder objects - athletes can R their own orders
-        if isinstance(obj, TicketOrder):
-            if request.method in permissions.SAFE_METHODS:
-                return obj.user == request.user
-            return False  # Athletes cannot modify orders
-        
-        # For TeamMember objects - athletes can R their own memberships
-        if isinstance(obj, TeamMember):
-            if request.method in permissions.SAFE_METHODS:
-                return obj.athlete == request.user
-            return False  # Athletes cannot modify team memberships
-        
-        # For objects with user field
-        if hasattr(obj, 'user'):
-            return obj.user == request.user
-        
-        # For objects with athlete field
-        if hasattr(obj, 'athlete'):
-            return obj.athlete == request.user
-        
-        return False
 
 
 class SpectatorPermissions(BaseRBACPermission):
@@ -248,6 +361,8 @@ class SpectatorPermissions(BaseRBACPermission):
     Admin/staff bypass.
     """
     
+    policy_class = SpectatorPolicy
+    
     def has_permission(self, request, view):
         # Admin/staff can do anything
         if self.is_admin_or_staff(request.user):
@@ -259,43 +374,6 @@ class SpectatorPermissions(BaseRBACPermission):
         
         # Must be spectator
         return self.has_role(request.user, User.Roles.SPECTATOR)
-    
-    def has_object_permission(self, request, view, obj):
-        # Admin/staff can do anything
-        if self.is_admin_or_staff(request.user):
-            return True
-        
-        # For Event objects - spectators can R public events
-        if isinstance(obj, Event):
-            if request.method in permissions.SAFE_METHODS:
-                return obj.visibility == 'PUBLIC'
-            return False  # Spectators cannot write events
-        
-        # For Ticket objects - spectators can R/W their own tickets
-        if isinstance(obj, Ticket):
-            return obj.order.user == request.user
-        
-        # For TicketOrder objects - spectators can R/W their own orders
-        if isinstance(obj, TicketOrder):
-            return obj.user == request.user
-        
-        # For User objects - spectators can R/W their own profile
-        if isinstance(obj, User):
-            return obj == request.user
-        
-        # For public data, allow read access
-        if request.method in permissions.SAFE_METHODS:
-            # Check if object is public (has visibility field)
-            if hasattr(obj, 'visibility'):
-                return obj.visibility == 'PUBLIC'
-            # Check if object is public (has is_public field)
-            if hasattr(obj, 'is_public'):
-                return obj.is_public
-            # For events, check if they're public
-            if hasattr(obj, 'event'):
-                return obj.event.visibility == 'PUBLIC'
-        
-        return False
 
 
 class MultiRolePermissions(BaseRBACPermission):
@@ -9,7 +9,11 @@ from django.contrib.auth.password_validation import validate_password
 from django.utils import timezone
 from django.core.validators import validate_email
 from django.core.exceptions import ValidationError
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from .auth import resolve_token_user
 from .models import User, OrganizerApplication, AthleteApplication, CoachApplication
+from .tokens import TOKEN_VERSION_CLAIM, UserRefreshToken
 from common.models import AuditLog
 
 
@@ -188,6 +192,24 @@ class PasswordResetConfirmSerializer(serializers.Serializer):
         return attrs
 
 
+# ------------ JWT ------------
+
+class UserTokenObtainPairSerializer(TokenObtainPairSerializer):
+    token_class = UserRefreshToken
+
+
+class UserTokenRefreshSerializer(TokenRefreshSerializer):
+    """Refuses refresh tokens revoked by a token version bump (e.g. logout)"""
+    token_class = UserRefreshToken
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs["refresh"])
+        user_id = refresh.payload.get(api_settings.USER_ID_CLAIM)
+        if user_id is not None:
+            resolve_token_user(user_id, refresh.payload.get(TOKEN_VERSION_CLAIM, 0))
+        return super().validate(attrs)
+
+
 # ------------ Email verification ------------
 # Disabled for minimal boot profile - no token models
 
@@ -0,0 +1,103 @@
+# accounts/tests/test_auth_cache.py
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIClient
+
+from accounts.auth import CookieJWTAuthentication, forget_cached_users, revoke_user_tokens
+from accounts.tokens import TOKEN_VERSION_CLAIM, UserRefreshToken
+
+User = get_user_model()
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class CachedTokenUserTest(TestCase):
+    """Test cached, revocation-aware JWT user resolution"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email='jwt@test.com', password='x', role=User.Roles.SPECTATOR)
+        self.auth = CookieJWTAuthentication()
+
+    def _access(self, user=None):
+        return UserRefreshToken.for_user(user or self.user).access_token
+
+    def test_tokens_carry_token_version(self):
+        refresh = UserRefreshToken.for_user(self.user)
+        self.assertEqual(refresh[TOKEN_VERSION_CLAIM], 0)
+        self.assertEqual(refresh.access_token[TOKEN_VERSION_CLAIM], 0)
+
+    def test_repeat_requests_hit_cache(self):
+        token = self._access()
+        with self.assertNumQueries(1):
+            self.auth.get_user(token)
+        with self.assertNumQueries(0):
+            user = self.auth.get_user(token)
+        self.assertEqual(user.pk, self.user.pk)
+
+    def test_role_change_is_seen_on_next_request(self):
+        token = self._access()
+        self.auth.get_user(token)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.role = User.Roles.ORGANIZER
+            self.user.save(update_fields=['role'])
+
+        self.assertEqual(self.auth.get_user(token).role, User.Roles.ORGANIZER)
+
+    def test_deactivated_user_is_rejected(self):
+        token = self._access()
+        self.auth.get_user(token)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save(update_fields=['is_active'])
+
+        with self.assertRaises(AuthenticationFailed):
+            self.auth.get_user(token)
+
+    def test_bulk_update_needs_explicit_forget(self):
+        token = self._access()
+        self.auth.get_user(token)
+
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        forget_cached_users([self.user.pk])
+
+        with self.assertRaises(AuthenticationFailed):
+            self.auth.get_user(token)
+
+    def test_revocation_rejects_cached_and_fresh_lookups(self):
+        old_token = self._access()
+        self.auth.get_user(old_token)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            revoke_user_tokens(self.user)
+
+        with self.assertNumQueries(0), self.assertRaises(AuthenticationFailed):
+            self.auth.get_user(old_token)
+
+        cache.clear()
+        with self.assertRaises(AuthenticationFailed):
+            self.auth.get_user(old_token)
+
+        # Tokens issued after the bump resolve normally
+        self.assertEqual(self.auth.get_user(self._access()).pk, self.user.pk)
+
+    def test_tokens_without_version_claim_match_version_zero(self):
+        token = self._access()
+        del token[TOKEN_VERSION_CLAIM]
+        self.assertEqual(self.auth.get_user(token).pk, self.user.pk)
+
+    def test_logout_revokes_access_and_refresh_tokens(self):
+        refresh = UserRefreshToken.for_user(self.user)
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = client.post('/api/auth/logout/')
+        self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(client.get('/api/me/').status_code, 401)
+        response = APIClient().post('/api/auth/refresh/', {'refresh': str(refresh)}, format='json')
+        self.assertEqual(response.status_code, 401)
@@ -0,0 +1,142 @@
+# accounts/tests/test_rbac_policies.py
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.db.models import Q
+from django.test import RequestFactory, TestCase
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from accounts.rbac_permissions import (
+    AthletePermissions, CoachPermissions, OrganizerPermissions, SpectatorPermissions,
+    get_memberships, scope_queryset,
+)
+from events.models import Event
+from fixtures.models import Fixture
+from results.models import Result
+from results.views import ResultViewSet
+from teams.models import Team, TeamMember
+from tickets.models import TicketOrder
+
+User = get_user_model()
+
+
+class RBACPolicyTest(TestCase):
+    """Test set-based role policies and cached memberships"""
+
+    def setUp(self):
+        # Keep the realtime broadcaster's coalescing timers out of these tests
+        patcher = patch('events.signals.broadcaster')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.organizer = User.objects.create_user(email='org@test.com', password='x', role=User.Roles.ORGANIZER)
+        self.other_organizer = User.objects.create_user(email='org2@test.com', password='x', role=User.Roles.ORGANIZER)
+        self.coach = User.objects.create_user(email='coach@test.com', password='x', role=User.Roles.COACH)
+        self.athlete = User.objects.create_user(email='athlete@test.com', password='x', role=User.Roles.ATHLETE)
+        self.spectator = User.objects.create_user(email='fan@test.com', password='x', role=User.Roles.SPECTATOR)
+        self.admin = User.objects.create_user(email='admin@test.com', password='x', role=User.Roles.ADMIN)
+
+        self.event = self._event(self.organizer, 'PUBLIC')
+        self.private_event = self._event(self.other_organizer, 'PRIVATE')
+
+        coached = Team.objects.create(name='Coached', manager=self.organizer, coach=self.coach, event=self.event)
+        rival = Team.objects.create(name='Rival', manager=self.organizer, event=self.event)
+        third = Team.objects.create(name='Third', manager=self.organizer, event=self.event)
+        away = Team.objects.create(name='Away', manager=self.other_organizer, event=self.private_event)
+        away2 = Team.objects.create(name='Away 2', manager=self.other_organizer, event=self.private_event)
+        TeamMember.objects.create(team=coached, athlete=self.athlete, jersey_no=7)
+
+        self.own_fixture = self._fixture(self.event, coached, rival)
+        self.event_fixture = self._fixture(self.event, rival, third)
+        self.private_fixture = self._fixture(self.private_event, away, away2)
+        self.result = Result.objects.create(fixture=self.own_fixture, score_home=2, score_away=1)
+
+    def _event(self, owner, visibility):
+        start = timezone.now() + timedelta(days=3)
+        return Event.objects.create(
+            name=f'{visibility} event', sport='Football', start_datetime=start,
+            end_datetime=start + timedelta(hours=6), created_by=owner, visibility=visibility
+        )
+
+    def _fixture(self, event, home, away):
+        return Fixture.objects.create(event=event, home=home, away=away, start_at=event.start_datetime)
+
+    def _request(self, user, method='get'):
+        request = getattr(RequestFactory(), method)('/')
+        request.user = user
+        return request
+
+    def _visible(self, user, public=None):
+        return set(scope_queryset(self._request(user), Fixture.objects.all(), public=public))
+
+    def test_roles_scope_fixtures(self):
+        self.assertEqual(self._visible(self.organizer), {self.own_fixture, self.event_fixture})
+        self.assertEqual(self._visible(self.coach), {self.own_fixture, self.event_fixture})
+        self.assertEqual(self._visible(self.athlete), {self.own_fixture})
+        self.assertEqual(self._visible(self.spectator), {self.own_fixture, self.event_fixture})
+        self.assertEqual(len(self._visible(self.admin)), 3)
+
+    def test_public_rows_are_added(self):
+        public = Q(pk=self.private_fixture.pk)
+        self.assertEqual(self._visible(self.athlete, public), {self.own_fixture, self.private_fixture})
+
+        request = self._request(AnonymousUser())
+        self.assertEqual(list(scope_queryset(request, Fixture.objects.all(), public=public)), [self.private_fixture])
+
+    def test_list_is_one_filter_and_object_checks_are_free(self):
+        request = self._request(self.coach)
+        permission = CoachPermissions()
+
+        # One query for the coached teams, one for the fixtures
+        with self.assertNumQueries(2):
+            fixtures = list(scope_queryset(request, Fixture.objects.all()))
+        with self.assertNumQueries(0):
+            self.assertTrue(all(permission.has_object_permission(request, None, fixture) for fixture in fixtures))
+        self.assertIs(get_memberships(request), get_memberships(request))
+
+    def test_object_checks_match_list_filters(self):
+        cases = [
+            (OrganizerPermissions(), self.organizer),
+            (CoachPermissions(), self.coach),
+            (AthletePermissions(), self.athlete),
+            (SpectatorPermissions(), self.spectator),
+        ]
+        fixtures = list(Fixture.objects.select_related('event'))
+        for permission, user in cases:
+            request = self._request(user)
+            visible = set(permission.filter_queryset(request, Fixture.objects.all()))
+            allowed = {fixture for fixture in fixtures if permission.has_object_permission(request, None, fixture)}
+            self.assertEqual(allowed, visible, user.role)
+
+    def test_write_rules(self):
+        post = self._request(self.coach, 'post')
+        self.assertFalse(CoachPermissions().has_object_permission(post, None, self.own_fixture))
+        self.assertTrue(CoachPermissions().has_object_permission(post, None, self.own_fixture.home))
+
+        post = self._request(self.athlete, 'post')
+        self.assertFalse(AthletePermissions().has_object_permission(post, None, self.result))
+        self.assertTrue(AthletePermissions().has_object_permission(self._request(self.athlete), None, self.result))
+
+    def test_ticket_ownership(self):
+        own = TicketOrder.objects.create(user=self.spectator, event_id=self.event.id, total_cents=1000)
+        other = TicketOrder.objects.create(user=self.athlete, event_id=self.event.id, total_cents=1000)
+        request = self._request(self.spectator, 'patch')
+
+        self.assertEqual(list(SpectatorPermissions().filter_queryset(request, TicketOrder.objects.all())), [own])
+        self.assertFalse(SpectatorPermissions().has_object_permission(request, None, other))
+
+    def test_organizer_lists_own_unfinalized_results(self):
+        other = Result.objects.create(fixture=self.private_fixture, score_home=0, score_away=1)
+        request = APIRequestFactory().get('/api/results/')
+        force_authenticate(request, user=self.organizer)
+
+        response = ResultViewSet.as_view({'get': 'list'})(request)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row['id'] for row in response.data['results']], [self.result.id])
+
+        request = self._request(self.organizer, 'patch')
+        self.assertTrue(OrganizerPermissions().has_object_permission(request, None, self.result))
+        self.assertFalse(OrganizerPermissions().has_object_permission(request, None, other))
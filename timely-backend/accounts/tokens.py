@@ -4,9 +4,13 @@ from django.core import signing
 import secrets
 from datetime import timedelta
 from django.utils import timezone
+from rest_framework_simplejwt.tokens import RefreshToken
 
 SIGNER = signing.TimestampSigner(salt="email-verify")
 
+# JWT claim holding User.token_version at issue time
+TOKEN_VERSION_CLAIM = "ver"
+
 def make_email_token(user_id: int) -> str:
     return SIGNER.sign(str(user_id))
 
@@ -17,4 +21,18 @@ def read_email_token(token: str, max_age=60*60*24) -> int:
 
 def new_token(length: int = 32) -> str:
     # 64 hex chars by default (length*2)
-    return secrets.token_hex(length)
\ No newline at end of file
+    return secrets.token_hex(length)
+
+
+class UserRefreshToken(RefreshToken):
+    """Refresh token stamped with the user's token version.
+
+    Access tokens minted from it copy the claim, so bumping
+    ``User.token_version`` revokes the whole family.
+    """
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token[TOKEN_VERSION_CLAIM] = user.token_version
+        return token
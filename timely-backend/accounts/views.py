@@ -11,7 +11,6 @@ from django.db import models, transaction
 
 from .models import User, OrganizerApplication, AthleteApplication, CoachApplication
 from common.models import AuditLog
-from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from .serializers import (
     UserRegistrationSerializer, UserLoginSerializer, UserProfileSerializer,
@@ -27,7 +26,8 @@ from .serializers import (
     CoachApplicationCreateSerializer
 )
 from .permissions import IsUserManager, IsSelfOrAdmin
-from .auth import set_jwt_cookies, clear_jwt_cookies, CookieJWTAuthentication
+from .auth import set_jwt_cookies, clear_jwt_cookies, revoke_user_tokens, CookieJWTAuthentication
+from .tokens import UserRefreshToken
 
 
 class UserRegistrationViewSet(viewsets.ViewSet):
@@ -50,7 +50,7 @@ class UserRegistrationViewSet(viewsets.ViewSet):
             )
             
             # Generate JWT tokens
-            refresh = RefreshToken.for_user(user)
+            refresh = UserRefreshToken.for_user(user)
             access_token = str(refresh.access_token)
             refresh_token = str(refresh)
             
@@ -83,7 +83,7 @@ class UserLoginViewSet(viewsets.ViewSet):
             user = authenticate(request, email=email, password=password)
             if user and user.is_active:
                 # Generate JWT tokens
-                refresh = RefreshToken.for_user(user)
+                refresh = UserRefreshToken.for_user(user)
                 access_token = str(refresh.access_token)
                 refresh_token = str(refresh)
                 
@@ -130,7 +130,8 @@ class UserLogoutViewSet(viewsets.ViewSet):
             details={'email': request.user.email}
         )
         
-        # Clear cookies
+        # Revoke outstanding tokens, then clear cookies
+        revoke_user_tokens(request.user)
         response = Response({'message': 'Logout successful'})
         clear_jwt_cookies(response)
         return response
@@ -0,0 +1,221 @@
+# api/metrics.py - Buffered API metrics
+"""
+In-process API metrics aggregation.
+
+Requests are recorded into a bounded in-memory buffer keyed by
+(endpoint, method, status bucket). Each key keeps a count, total/max latency
+and a fixed-bin latency histogram, so p50/p95/p99 can be estimated without
+storing individual samples. The buffer is swapped out and written as
+APIMetricsRollup rows with one bulk insert every API_METRICS_FLUSH_INTERVAL
+seconds, on the background "metrics" queue, so recording costs no DB work.
+"""
+import re
+import threading
+import time
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from django.conf import settings
+from django.utils import timezone
+
+from common.background import get_queue
+
+# Upper bounds (ms) of the latency histogram bins; one overflow bin follows
+LATENCY_BUCKETS_MS: Tuple[int, ...] = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+DEFAULT_FLUSH_INTERVAL = 60  # seconds
+DEFAULT_MAX_KEYS = 2000
+OVERFLOW_ENDPOINT = '<other>'
+
+_ID_SEGMENT = re.compile(
+    r'/(?:\d+|[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12})(?=/|$)'
+)
+
+
+def normalize_endpoint(path: str) -> str:
+    """Collapse numeric and UUID path segments so endpoints stay low-cardinality"""
+    return _ID_SEGMENT.sub('/:id', path)[:255]
+
+
+def status_bucket(status_code: int) -> str:
+    return f"{status_code // 100}xx"
+
+
+def percentile_from_histogram(histogram: Sequence[int], quantile: float, max_ms: int = 0) -> int:
+    """Estimate a latency percentile as the upper bound of the bin that contains it"""
+    total = sum(histogram)
+    if not total:
+        return 0
+    threshold = quantile * total
+    running = 0
+    for index, count in enumerate(histogram):
+        running += count
+        if running >= threshold:
+            if index < len(LATENCY_BUCKETS_MS):
+                return min(LATENCY_BUCKETS_MS[index], max_ms) if max_ms else LATENCY_BUCKETS_MS[index]
+            return max_ms
+    return max_ms
+
+
+@dataclass
+class LatencyStats:
+    """Aggregated latency for one (endpoint, method, status bucket) key"""
+
+    count: int = 0
+    total_ms: int = 0
+    max_ms: int = 0
+    histogram: List[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS_MS) + 1))
+
+    def record(self, response_time_ms: int):
+        self.count += 1
+        self.total_ms += response_time_ms
+        if response_time_ms > self.max_ms:
+            self.max_ms = response_time_ms
+        self.histogram[bisect_left(LATENCY_BUCKETS_MS, response_time_ms)] += 1
+
+    def merge(self, other: 'LatencyStats'):
+        self.count += other.count
+        self.total_ms += other.total_ms
+        self.max_ms = max(self.max_ms, other.max_ms)
+        self.histogram = [a + b for a, b in zip(self.histogram, other.histogram)]
+
+    def percentile(self, quantile: float) -> int:
+        return percentile_from_histogram(self.histogram, quantile, self.max_ms)
+
+    @property
+    def avg_ms(self) -> float:
+        return self.total_ms / self.count if self.count else 0.0
+
+
+class MetricsBuffer:
+    """Thread-safe, bounded aggregation buffer with periodic background flush"""
+
+    def __init__(self, flush_interval: Optional[float] = None, max_keys: Optional[int] = None):
+        self._flush_interval = flush_interval
+        self._max_keys = max_keys
+        self._lock = threading.Lock()
+        self._stats: Dict[Tuple[str, str, str], LatencyStats] = {}
+        self._window_start = timezone.now()
+        self._last_flush = time.monotonic()
+
+    @property
+    def flush_interval(self) -> float:
+        if self._flush_interval is not None:
+            return self._flush_interval
+        return getattr(settings, 'API_METRICS_FLUSH_INTERVAL', DEFAULT_FLUSH_INTERVAL)
+
+    @property
+    def max_keys(self) -> int:
+        if self._max_keys is not None:
+            return self._max_keys
+        return getattr(settings, 'API_METRICS_MAX_KEYS', DEFAULT_MAX_KEYS)
+
+    def record(self, path: str, method: str, status_code: int, response_time_ms: int):
+        """Record one request; O(1) and never touches the database"""
+        key = (normalize_endpoint(path), method, status_bucket(status_code))
+        flush_due = False
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                if len(self._stats) >= self.max_keys:
+                    # Bounded memory: unknown endpoints beyond the cap share one key
+                    key = (OVERFLOW_ENDPOINT, method, key[2])
+                    stats = self._stats.get(key)
+                if stats is None:
+                    stats = self._stats[key] = LatencyStats()
+            stats.record(response_time_ms)
+            flush_due = time.monotonic() - self._last_flush >= self.flush_interval
+
+        if flush_due:
+            self.flush(background=True)
+
+    def drain(self):
+        """Swap out the current window and return (window_start, window_end, stats)"""
+        with self._lock:
+            stats, self._stats = self._stats, {}
+            window_start, self._window_start = self._window_start, timezone.now()
+            self._last_flush = time.monotonic()
+        return window_start, self._window_start, stats
+
+    def flush(self, background: bool = False):
+        """Write the current window as rollup rows"""
+        window_start, window_end, stats = self.drain()
+        if not stats:
+            return
+        if background:
+            get_queue('metrics').submit(write_rollups, window_start, window_end, stats)
+        else:
+            write_rollups(window_start, window_end, stats)
+
+    def snapshot(self) -> Dict[Tuple[str, str, str], LatencyStats]:
+        """Copy of the unflushed window"""
+        with self._lock:
+            return {key: LatencyStats(s.count, s.total_ms, s.max_ms, list(s.histogram)) for key, s in self._stats.items()}
+
+
+def write_rollups(window_start, window_end, stats: Dict[Tuple[str, str, str], LatencyStats]):
+    """Persist one drained window with a single bulk insert"""
+    from .models import APIMetricsRollup
+
+    APIMetricsRollup.objects.bulk_create([
+        APIMetricsRollup(
+            window_start=window_start,
+            window_end=window_end,
+            endpoint=endpoint,
+            method=method,
+            status_bucket=bucket,
+            count=s.count,
+            total_ms=s.total_ms,
+            max_ms=s.max_ms,
+            p50_ms=s.percentile(0.50),
+            p95_ms=s.percentile(0.95),
+            p99_ms=s.percentile(0.99),
+            histogram=s.histogram,
+        )
+        for (endpoint, method, bucket), s in stats.items()
+    ])
+
+
+def top_slow_endpoints(since=None, limit: int = 10, order_by: str = 'p95_ms', include_buffer: bool = True) -> List[dict]:
+    """
+    Slowest endpoints since a point in time, merged across rollup windows,
+    processes and status buckets.
+    """
+    from .models import APIMetricsRollup
+
+    since = since or timezone.now() - timedelta(hours=1)
+    merged: Dict[Tuple[str, str], LatencyStats] = {}
+
+    rows = APIMetricsRollup.objects.filter(window_end__gte=since).values_list(
+        'endpoint', 'method', 'count', 'total_ms', 'max_ms', 'histogram'
+    )
+    for endpoint, method, count, total_ms, max_ms, histogram in rows.iterator():
+        merged.setdefault((endpoint, method), LatencyStats()).merge(
+            LatencyStats(count, total_ms, max_ms, list(histogram))
+        )
+
+    if include_buffer:
+        for (endpoint, method, _bucket), stats in metrics_buffer.snapshot().items():
+            merged.setdefault((endpoint, method), LatencyStats()).merge(stats)
+
+    results = [
+        {
+            'endpoint': endpoint,
+            'method': method,
+            'count': stats.count,
+            'avg_ms': round(stats.avg_ms, 1),
+            'p50_ms': stats.percentile(0.50),
+            'p95_ms': stats.percentile(0.95),
+            'p99_ms': stats.percentile(0.99),
+            'max_ms': stats.max_ms,
+        }
+        for (endpoint, method), stats in merged.items()
+    ]
+    results.sort(key=lambda row: row.get(order_by, 0), reverse=True)
+    return results[:limit]
+
+
+# Process-wide buffer used by AuditLoggingMiddleware
+metrics_buffer = MetricsBuffer()
@@ -1,9 +1,12 @@
 # api/middleware.py - API Middleware
 import time
 import json
+from django.conf import settings
 from django.utils.deprecation import MiddlewareMixin
 from django.contrib.auth import get_user_model
-from .models import AuditLog, APIMetrics
+from common.ratelimit import client_ip, get_limiter, too_many_requests
+from .models import AuditLog
+from .metrics import metrics_buffer
 
 User = get_user_model()
 
@@ -201,33 +204,41 @@ class AuditLoggingMiddleware(MiddlewareMixin):
     
     def _log_api_metrics(self, request, response, response_time):
         """Log API usage metrics"""
-        from django.conf import settings
         # Skip metrics in DEBUG mode unless explicitly enabled
         if not getattr(settings, 'API_METRICS_ENABLED', not settings.DEBUG):
             return
             
         try:
-            APIMetrics.objects.create(
-                endpoint=request.path,
-                method=request.method,
-                user=request.user if request.user.is_authenticated else None,
-                response_time_ms=response_time,
-                status_code=response.status_code,
-            )
+            # Aggregated in memory and flushed in bulk; no per-request insert
+            metrics_buffer.record(request.path, request.method, response.status_code, response_time)
         except Exception as e:
             # Don't let metrics logging break the request
             print(f"Metrics logging error: {e}")
 
 
 class RateLimitingMiddleware(MiddlewareMixin):
-    """Rate limiting middleware"""
+    """Apply RATE_LIMIT_POLICIES to matching routes, keyed by client IP"""
     
     def process_request(self, request):
         """Check rate limits"""
-        # Skip rate limiting for certain paths
-        if request.path.startswith('/admin/') or request.path.startswith('/static/'):
+        if not getattr(settings, 'RATE_LIMIT_ENABLED', True):
+            return None
+        
+        limiter = get_limiter()
+        policies = limiter.match(request.path, request.method)
+        if not policies:
             return None
         
-        # Implement rate limiting logic here
-        # This is a placeholder - implement based on your requirements
+        decision = limiter.check(policies, client_ip(request))
+        if not decision.allowed:
+            return too_many_requests(decision)
+        request._rate_limit = decision
         return None
+    
+    def process_response(self, request, response):
+        """Expose the remaining allowance on limited routes"""
+        decision = getattr(request, '_rate_limit', None)
+        if decision is not None:
+            response['X-RateLimit-Limit'] = str(decision.limit)
+            response['X-RateLimit-Remaining'] = str(decision.remaining)
+        return response
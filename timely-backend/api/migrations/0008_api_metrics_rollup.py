@@ -0,0 +1,35 @@
+# Generated by Django 5.2.6 on 2026-10-16 20:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0007_delete_announcement'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='APIMetricsRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('window_start', models.DateTimeField()),
+                ('window_end', models.DateTimeField()),
+                ('endpoint', models.CharField(max_length=255)),
+                ('method', models.CharField(max_length=10)),
+                ('status_bucket', models.CharField(max_length=3)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('total_ms', models.PositiveBigIntegerField(default=0)),
+                ('max_ms', models.PositiveIntegerField(default=0)),
+                ('p50_ms', models.PositiveIntegerField(default=0)),
+                ('p95_ms', models.PositiveIntegerField(default=0)),
+                ('p99_ms', models.PositiveIntegerField(default=0)),
+                ('histogram', models.JSONField(default=list)),
+            ],
+            options={
+                'ordering': ['-window_end'],
+                'indexes': [models.Index(fields=['window_end'], name='api_apimetr_window__34aa8e_idx'), models.Index(fields=['endpoint', 'window_end'], name='api_apimetr_endpoin_76f3cf_idx')],
+            },
+        ),
+    ]
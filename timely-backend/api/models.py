@@ -161,4 +161,30 @@ class RateLimit(models.Model):
     
     def __str__(self):
         identifier = self.user.email if self.user else self.ip_address
-        return f"{identifier} - {self.endpoint} ({self.request_count} requests)"
\ No newline at end of file
+        return f"{identifier} - {self.endpoint} ({self.request_count} requests)"
+
+class APIMetricsRollup(models.Model):
+    """Aggregated API latency for one endpoint over one flush window"""
+    
+    window_start = models.DateTimeField()
+    window_end = models.DateTimeField()
+    endpoint = models.CharField(max_length=255)
+    method = models.CharField(max_length=10)
+    status_bucket = models.CharField(max_length=3)
+    count = models.PositiveIntegerField(default=0)
+    total_ms = models.PositiveBigIntegerField(default=0)
+    max_ms = models.PositiveIntegerField(default=0)
+    p50_ms = models.PositiveIntegerField(default=0)
+    p95_ms = models.PositiveIntegerField(default=0)
+    p99_ms = models.PositiveIntegerField(default=0)
+    histogram = models.JSONField(default=list)
+    
+    class Meta:
+        ordering = ['-window_end']
+        indexes = [
+            models.Index(fields=['window_end']),
+            models.Index(fields=['endpoint', 'window_end']),
+        ]
+    
+    def __str__(self):
+        return f"{self.method} {self.endpoint} {self.status_bucket} x{self.count} (p95 {self.p95_ms}ms)"
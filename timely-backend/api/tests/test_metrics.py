@@ -0,0 +1,156 @@
+# api/tests/test_metrics.py
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.http import HttpResponse
+from django.test import TestCase, RequestFactory, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from api.metrics import (
+    MetricsBuffer, LatencyStats, normalize_endpoint, percentile_from_histogram,
+    top_slow_endpoints, OVERFLOW_ENDPOINT,
+)
+from api.middleware import AuditLoggingMiddleware
+from api.models import APIMetricsRollup, APIMetrics
+
+User = get_user_model()
+
+
+class MetricsBufferTest(TestCase):
+    """Test in-memory aggregation and bulk flushing"""
+
+    def test_normalize_endpoint_collapses_ids(self):
+        self.assertEqual(normalize_endpoint('/api/events/42/fixtures/'), '/api/events/:id/fixtures/')
+        self.assertEqual(
+            normalize_endpoint('/api/tickets/3f2b1c9e-8d7a-4b6c-9e5f-1a2b3c4d5e6f'),
+            '/api/tickets/:id'
+        )
+        self.assertEqual(normalize_endpoint('/api/v1/events/'), '/api/v1/events/')
+
+    def test_histogram_percentiles(self):
+        stats = LatencyStats()
+        for ms in [3] * 90 + [40] * 9 + [900]:
+            stats.record(ms)
+
+        self.assertEqual(stats.count, 100)
+        self.assertEqual(stats.max_ms, 900)
+        self.assertEqual(stats.percentile(0.50), 5)
+        self.assertEqual(stats.percentile(0.95), 50)
+        self.assertEqual(stats.percentile(0.99), 50)
+        self.assertEqual(stats.percentile(1.0), 900)
+        self.assertEqual(percentile_from_histogram([0] * 12, 0.95), 0)
+
+    def test_record_aggregates_without_queries(self):
+        buffer = MetricsBuffer(flush_interval=3600)
+        with self.assertNumQueries(0):
+            for event_id in range(50):
+                buffer.record(f'/api/events/{event_id}/', 'GET', 200, 12)
+            buffer.record('/api/events/1/', 'GET', 404, 3)
+
+        snapshot = buffer.snapshot()
+        self.assertEqual(len(snapshot), 2)
+        self.assertEqual(snapshot[('/api/events/:id/', 'GET', '2xx')].count, 50)
+        self.assertEqual(snapshot[('/api/events/:id/', 'GET', '4xx')].count, 1)
+
+    def test_key_cap_routes_to_overflow(self):
+        buffer = MetricsBuffer(flush_interval=3600, max_keys=2)
+        for name in ('a', 'b', 'c', 'd'):
+            buffer.record(f'/api/{name}/', 'GET', 200, 10)
+
+        snapshot = buffer.snapshot()
+        self.assertEqual(len(snapshot), 3)
+        self.assertEqual(snapshot[(OVERFLOW_ENDPOINT, 'GET', '2xx')].count, 2)
+
+    def test_flush_writes_one_bulk_insert(self):
+        buffer = MetricsBuffer(flush_interval=3600)
+        for ms in (10, 20, 300):
+            buffer.record('/api/events/', 'GET', 200, ms)
+        buffer.record('/api/results/', 'POST', 500, 1200)
+
+        with self.assertNumQueries(1):
+            buffer.flush()
+
+        self.assertEqual(APIMetricsRollup.objects.count(), 2)
+        rollup = APIMetricsRollup.objects.get(endpoint='/api/events/')
+        self.assertEqual(rollup.count, 3)
+        self.assertEqual(rollup.total_ms, 330)
+        self.assertEqual(rollup.max_ms, 300)
+        self.assertEqual(rollup.status_bucket, '2xx')
+        self.assertEqual(rollup.p95_ms, 300)
+        self.assertEqual(buffer.snapshot(), {})
+
+    @override_settings(BACKGROUND_TASKS_EAGER=True)
+    def test_interval_triggers_flush(self):
+        buffer = MetricsBuffer(flush_interval=0)
+        buffer.record('/api/events/', 'GET', 200, 15)
+        self.assertEqual(APIMetricsRollup.objects.count(), 1)
+
+    def test_top_slow_endpoints_merges_windows(self):
+        buffer = MetricsBuffer(flush_interval=3600)
+        for _ in range(2):
+            for ms in (8, 9, 2000):
+                buffer.record('/api/reports/', 'GET', 200, ms)
+            buffer.record('/api/events/', 'GET', 200, 4)
+            buffer.flush()
+
+        slow = top_slow_endpoints(limit=5, include_buffer=False)
+        self.assertEqual([row['endpoint'] for row in slow], ['/api/reports/', '/api/events/'])
+        self.assertEqual(slow[0]['count'], 6)
+        self.assertEqual(slow[0]['p95_ms'], 2000)
+
+        since = timezone.now() + timedelta(minutes=1)
+        self.assertEqual(top_slow_endpoints(since=since, include_buffer=False), [])
+
+
+@override_settings(API_METRICS_ENABLED=True)
+class SlowEndpointsViewTest(TestCase):
+    """Test middleware recording and the admin read endpoint"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = User.objects.create_user(email='admin@example.com', password='pass12345', is_staff=True)
+        self.user = User.objects.create_user(email='user@example.com', password='pass12345')
+
+    def test_middleware_records_into_buffer(self):
+        request = RequestFactory().get('/api/events/7/')
+        request.user = AnonymousUser()
+        middleware = AuditLoggingMiddleware(lambda req: HttpResponse(status=200))
+
+        with patch('api.middleware.metrics_buffer') as buffer, self.assertNumQueries(0):
+            middleware(request)
+
+        buffer.record.assert_called_once()
+        self.assertEqual(buffer.record.call_args[0][:3], ('/api/events/7/', 'GET', 200))
+        self.assertEqual(APIMetrics.objects.count(), 0)
+
+    def test_admin_only(self):
+        url = reverse('metrics-slow-endpoints')
+        self.client.force_authenticate(self.user)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_403_FORBIDDEN)
+
+        self.client.force_authenticate(self.admin)
+        response = self.client.get(url, {'hours': 2, 'limit': 5})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('results', response.data)
+
+    def test_rejects_unknown_order(self):
+        self.client.force_authenticate(self.admin)
+        response = self.client.get(reverse('metrics-slow-endpoints'), {'order_by': 'endpoint'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_rejects_bad_numbers_and_clamps_limit(self):
+        self.client.force_authenticate(self.admin)
+        url = reverse('metrics-slow-endpoints')
+        for params in ({'limit': 'ten'}, {'limit': '2.5'}, {'hours': 'nan'}, {'hours': 'inf'}, {'hours': '-1'}):
+            self.assertEqual(self.client.get(url, params).status_code, status.HTTP_400_BAD_REQUEST, params)
+
+        with patch('api.metrics.top_slow_endpoints', return_value=[]) as top:
+            self.client.get(url, {'limit': -3})
+            self.assertEqual(top.call_args[1]['limit'], 1)
+            self.client.get(url, {'limit': 500})
+            self.assertEqual(top.call_args[1]['limit'], 100)
@@ -0,0 +1,113 @@
+# api/tests/test_public_cache.py
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from common.cache import bump_cache_version, get_cache_versions, versioned_key
+from events.models import Event
+from fixtures.models import Fixture
+from results.models import Result, LeaderboardEntry
+from results.services.standings import StandingsEngine
+from teams.models import Team
+from venues.models import Venue
+
+User = get_user_model()
+
+
+class VersionedKeyTest(TestCase):
+    """Test versioned cache keys"""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_bump_changes_only_its_scope(self):
+        key = versioned_key(('fixtures',), 1, '/path')
+        other = versioned_key(('fixtures',), 2, '/path')
+        self.assertEqual(versioned_key(('fixtures',), 1, '/path'), key)
+
+        bump_cache_version('fixtures', 1)
+        self.assertNotEqual(versioned_key(('fixtures',), 1, '/path'), key)
+        self.assertEqual(versioned_key(('fixtures',), 2, '/path'), other)
+
+    def test_evicted_version_is_not_reissued(self):
+        before = get_cache_versions(['news'])['news']
+        cache.clear()
+        bump_cache_version('news')
+        self.assertGreater(get_cache_versions(['news'])['news'], before)
+
+
+class PublicCacheAPITest(APITestCase):
+    """Test caching and invalidation of public event pages"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email='organizer@test.com', password='testpass123')
+        start = timezone.now() + timedelta(days=3)
+        self.event = Event.objects.create(
+            name='Cup',
+            sport='Football',
+            start_datetime=start,
+            end_datetime=start + timedelta(days=10),
+            created_by=self.user,
+            visibility='PUBLIC',
+        )
+        venue = Venue.objects.create(name='Main Ground', address='1 Park Rd', created_by=self.user)
+        self.home = Team.objects.create(name='Home', manager=self.user, event=self.event)
+        self.away = Team.objects.create(name='Away', manager=self.user, event=self.event)
+        self.fixture = Fixture.objects.create(
+            event=self.event, home=self.home, away=self.away, venue=venue, start_at=start,
+        )
+
+    def _get(self, name):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.get(reverse(name, args=[self.event.id]))
+
+    def test_fixtures_cached_until_fixture_saved(self):
+        first = self._get('public-event-fixtures')
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first['X-Cache'], 'MISS')
+
+        with self.assertNumQueries(0):
+            second = self._get('public-event-fixtures')
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(second.data, first.data)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.fixture.round = 2
+            self.fixture.save()
+
+        third = self._get('public-event-fixtures')
+        self.assertEqual(third['X-Cache'], 'MISS')
+        self.assertEqual(third.data[0]['round'], 2)
+
+    def test_leaderboard_invalidated_by_standings_rebuild(self):
+        self.assertEqual(self._get('public-event-leaderboard').data, {'leaderboard': []})
+        self.assertEqual(self._get('public-event-leaderboard')['X-Cache'], 'HIT')
+
+        with patch('events.signals.broadcaster'), self.captureOnCommitCallbacks(execute=True):
+            Result.objects.create(fixture=self.fixture, score_home=2, score_away=1, status='FINALIZED')
+            StandingsEngine(self.event.id).rebuild()
+
+        response = self._get('public-event-leaderboard')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual([row['team__name'] for row in response.data['leaderboard']], ['Home', 'Away'])
+        self.assertEqual(response.data['leaderboard'][0]['points'], 3)
+
+    def test_other_namespaces_keep_their_cache(self):
+        self._get('public-event-fixtures')
+        with self.captureOnCommitCallbacks(execute=True):
+            LeaderboardEntry.objects.create(event=self.event, team=self.home)
+        # A leaderboard write leaves the fixtures page cached
+        self.assertEqual(self._get('public-event-fixtures')['X-Cache'], 'HIT')
+
+    def test_not_found_not_cached(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Event.objects.filter(id=self.event.id).update(visibility='PRIVATE')
+        self.assertEqual(self._get('public-event-fixtures').status_code, 404)
+        self.assertEqual(self._get('public-event-fixtures').status_code, 404)
@@ -0,0 +1,168 @@
+# api/tests/test_rate_limiting.py
+import json
+from unittest.mock import MagicMock, patch
+
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from api.middleware import RateLimitingMiddleware
+from common.ratelimit import LocalStore, RatePolicy, RateLimiter, RedisStore, parse_rate, reset_limiter
+from common.security import rate_limit
+
+POLICIES = {
+    'login': {'rate': '3/min', 'methods': ['POST'], 'paths': ['/api/auth/login/']},
+    'checkout': {'rate': '2/min', 'paths': ['/api/tickets/*']},
+}
+
+
+class GCRATest(SimpleTestCase):
+    """Test GCRA semantics and idle-key eviction of the local store"""
+
+    def setUp(self):
+        self.clock = 1000.0
+        patcher = patch('common.ratelimit.time.monotonic', side_effect=lambda: self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.store = LocalStore()
+        self.limiter = RateLimiter(self.store)
+        self.policy = RatePolicy('test', limit=3, period=60)
+
+    def test_parse_rate(self):
+        self.assertEqual(parse_rate('10/min'), (10, 60.0))
+        self.assertEqual(parse_rate('5/s'), (5, 1.0))
+        self.assertEqual(parse_rate('100/hour'), (100, 3600.0))
+
+    def test_burst_then_refill_one_interval_at_a_time(self):
+        decisions = [self.limiter.hit(self.policy, 'ip') for _ in range(4)]
+        self.assertEqual([d.allowed for d in decisions], [True, True, True, False])
+        self.assertEqual([d.remaining for d in decisions[:3]], [2, 1, 0])
+        self.assertAlmostEqual(decisions[3].retry_after, 20.0)
+
+        # One emission interval (period / limit) frees exactly one request
+        self.clock += 20
+        self.assertTrue(self.limiter.hit(self.policy, 'ip').allowed)
+        self.assertFalse(self.limiter.hit(self.policy, 'ip').allowed)
+
+    def test_refused_hits_do_not_extend_the_wait(self):
+        for _ in range(3):
+            self.limiter.hit(self.policy, 'ip')
+        for _ in range(10):
+            self.limiter.hit(self.policy, 'ip')
+        self.clock += 20
+        self.assertTrue(self.limiter.hit(self.policy, 'ip').allowed)
+
+    def test_keys_are_independent(self):
+        for _ in range(3):
+            self.limiter.hit(self.policy, 'a')
+        self.assertFalse(self.limiter.hit(self.policy, 'a').allowed)
+        self.assertTrue(self.limiter.hit(self.policy, 'b').allowed)
+
+    def test_idle_keys_are_evicted(self):
+        for i in range(100):
+            self.limiter.hit(self.policy, f'ip-{i}')
+        self.assertEqual(len(self.store), 100)
+
+        # Once their buckets refill, each allowed hit drops an idle key
+        self.clock += 61
+        busy = RatePolicy('busy', limit=1000, period=60)
+        for i in range(100):
+            self.limiter.hit(busy, 'ip')
+            self.clock += 0.001
+        self.assertEqual(len(self.store), 1)
+
+    def test_store_is_bounded(self):
+        store = LocalStore(max_keys=10)
+        limiter = RateLimiter(store)
+        for i in range(50):
+            limiter.hit(self.policy, f'ip-{i}')
+        self.assertEqual(len(store), 10)
+
+    def test_redis_errors_fall_back_to_local_store(self):
+        backend = MagicMock()
+        backend._cache.get_client.side_effect = ConnectionError('down')
+        store = RedisStore(backend, fallback=self.store)
+        limiter = RateLimiter(store)
+
+        with self.assertLogs('common.ratelimit', level='ERROR'):
+            decisions = [limiter.hit(self.policy, 'ip') for _ in range(4)]
+        self.assertEqual([d.allowed for d in decisions], [True, True, True, False])
+        # Redis is not retried on every request while it is down
+        self.assertEqual(backend._cache.get_client.call_count, 1)
+
+
+@override_settings(RATE_LIMIT_ENABLED=True, RATE_LIMIT_POLICIES=POLICIES)
+class RateLimitingMiddlewareTest(SimpleTestCase):
+    """Test per-route policies applied by the middleware"""
+
+    def setUp(self):
+        reset_limiter()
+        self.factory = RequestFactory()
+        self.middleware = RateLimitingMiddleware(lambda request: HttpResponse('ok'))
+
+    def _post(self, path, ip='10.0.0.1', **extra):
+        return self.middleware(self.factory.post(path, REMOTE_ADDR=ip, **extra))
+
+    def test_login_limited_per_ip(self):
+        statuses = [self._post('/api/auth/login/').status_code for _ in range(4)]
+        self.assertEqual(statuses, [200, 200, 200, 429])
+        self.assertEqual(self._post('/api/auth/login/', ip='10.0.0.2').status_code, 200)
+
+    def test_forwarded_for_is_ignored_without_trusted_proxies(self):
+        statuses = [
+            self._post('/api/auth/login/', HTTP_X_FORWARDED_FOR=f'192.0.2.{i}').status_code
+            for i in range(4)
+        ]
+        self.assertEqual(statuses, [200, 200, 200, 429])
+
+    @override_settings(RATE_LIMIT_TRUSTED_PROXIES=1)
+    def test_client_is_taken_from_behind_trusted_proxies(self):
+        # The proxy appends the real client after whatever the client sent
+        statuses = [
+            self._post('/api/auth/login/', HTTP_X_FORWARDED_FOR=f'192.0.2.{i}, 203.0.113.7').status_code
+            for i in range(4)
+        ]
+        self.assertEqual(statuses, [200, 200, 200, 429])
+        response = self._post('/api/auth/login/', HTTP_X_FORWARDED_FOR='203.0.113.8')
+        self.assertEqual(response.status_code, 200)
+
+    def test_rejection_carries_retry_after(self):
+        for _ in range(3):
+            response = self._post('/api/auth/login/')
+        self.assertEqual(response['X-RateLimit-Remaining'], '0')
+
+        response = self._post('/api/auth/login/')
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '20')
+        self.assertEqual(json.loads(response.content)['retry_after'], 20)
+
+    def test_methods_and_unmatched_routes_pass(self):
+        for _ in range(5):
+            self.assertEqual(self.middleware(self.factory.get('/api/auth/login/')).status_code, 200)
+            response = self._post('/api/events/')
+            self.assertEqual(response.status_code, 200)
+            self.assertFalse(response.has_header('X-RateLimit-Limit'))
+
+    def test_prefix_policy(self):
+        statuses = [self._post(path).status_code for path in ('/api/tickets/checkout/', '/api/tickets/free/', '/api/tickets/checkout/')]
+        self.assertEqual(statuses, [200, 200, 429])
+
+    @override_settings(RATE_LIMIT_ENABLED=False)
+    def test_disabled(self):
+        statuses = [self._post('/api/auth/login/').status_code for _ in range(5)]
+        self.assertEqual(statuses, [200] * 5)
+
+
+@override_settings(RATE_LIMIT_POLICIES={})
+class RateLimitDecoratorTest(SimpleTestCase):
+    """Test the per-view decorator on the shared limiter"""
+
+    def test_function_view(self):
+        reset_limiter()
+
+        @rate_limit(max_attempts=2, window_minutes=1)
+        def view(request):
+            return HttpResponse('ok')
+
+        request = RequestFactory().post('/login/', REMOTE_ADDR='10.0.0.9')
+        statuses = [view(request).status_code for _ in range(3)]
+        self.assertEqual(statuses, [200, 200, 429])
@@ -36,6 +36,7 @@ urlpatterns = [
     path('auth/login/', views.LoginView.as_view(), name='auth-login'),
     path('auth/refresh/', views.TokenRefreshView.as_view(), name='auth-refresh'),
     path('auth/register/', views.RegisterView.as_view(), name='auth-register'),
+    path('auth/logout/', views.AuthViewSet.as_view({'post': 'logout'}), name='auth-logout'),
     path('me/', views.MeView.as_view(), name='me'),
 
     # Include app-specific endpoints FIRST (before router to avoid conflicts)
@@ -45,6 +46,11 @@ urlpatterns = [
     # Stripe webhook (must be at root /api/stripe/webhook/)
     path('stripe/webhook/', __import__('tickets.views_webhook', fromlist=['stripe_webhook']).stripe_webhook, name='stripe-webhook'),
     
+    # API latency metrics (admin)
+    path('metrics/slow-endpoints/', views.SlowEndpointsView.as_view(), name='metrics-slow-endpoints'),
+    path('metrics/webhook-inbox/', views.WebhookInboxView.as_view(), name='metrics-webhook-inbox'),
+    path('metrics/delivery/', views.DeliveryStatsView.as_view(), name='metrics-delivery'),
+    
     # Test endpoint to verify URL loading
     path('test/', views.HealthView.as_view(), name='test-endpoint'),
     
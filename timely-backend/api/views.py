@@ -2,19 +2,22 @@
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated, AllowAny
+from rest_framework.permissions import IsAuthenticated, AllowAny, IsAdminUser
 from rest_framework.views import APIView
 from rest_framework_simplejwt.views import TokenRefreshView
-from rest_framework_simplejwt.authentication import JWTAuthentication
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
 from django.shortcuts import get_object_or_404
 from django.db.models import Q
 from django.utils import timezone
+from django.utils.http import parse_etags
 from django.core.exceptions import ValidationError
 from datetime import timedelta
 
 from common.pagination import TimelyPageNumberPagination
+from common.cache import cache_public_response
+from search.filters import IndexedSearchFilter
+from search.services import search_queryset
 from .permissions import (
     IsAdmin, IsOrganizer, IsCoach, IsAthlete, IsSpectator,
     IsEventOrganizer, IsEventParticipant
@@ -37,9 +40,12 @@ from sports.models import Sport
 from teams.models import Team, TeamMember
 from registrations.models import Registration
 from fixtures.models import Fixture
-from results.models import Result, LeaderboardEntry
+from results.models import EventResultsSnapshot, Result, LeaderboardEntry
+from results.services.snapshot import rebuild_results_snapshot
 # from notifications.models import Notification  # Disabled for minimal boot profile
 from accounts.models import User, AthleteApplication, CoachApplication, OrganizerApplication
+from accounts.auth import CookieJWTAuthentication, resolve_token_user, revoke_user_tokens
+from accounts.rbac_permissions import scope_queryset
 from accounts.serializers import (
     AthleteApplicationCreateSerializer, CoachApplicationCreateSerializer, OrganizerApplicationCreateSerializer,
     AthleteApplicationSerializer, CoachApplicationSerializer, OrganizerApplicationSerializer
@@ -69,14 +75,14 @@ class AuthViewSet(viewsets.ViewSet):
     def register(self, request):
         """User registration"""
         from accounts.serializers import UserRegistrationSerializer
-        from rest_framework_simplejwt.tokens import RefreshToken
+        from accounts.tokens import UserRefreshToken
         
         serializer = UserRegistrationSerializer(data=request.data)
         if serializer.is_valid():
             user = serializer.save()
             
             # Generate JWT tokens
-            refresh = RefreshToken.for_user(user)
+            refresh = UserRefreshToken.for_user(user)
             access_token = str(refresh.access_token)
             refresh_token = str(refresh)
             
@@ -98,7 +104,7 @@ class AuthViewSet(viewsets.ViewSet):
     def login(self, request):
         """User login"""
         from django.contrib.auth import authenticate
-        from rest_framework_simplejwt.tokens import RefreshToken
+        from accounts.tokens import UserRefreshToken
         
         email = request.data.get('email')
         password = request.data.get('password')
@@ -112,7 +118,7 @@ class AuthViewSet(viewsets.ViewSet):
         user = authenticate(request, email=email, password=password)
         if user and user.is_active:
             # Generate JWT tokens
-            refresh = RefreshToken.for_user(user)
+            refresh = UserRefreshToken.for_user(user)
             access_token = str(refresh.access_token)
             refresh_token = str(refresh)
             
@@ -136,7 +142,7 @@ class AuthViewSet(viewsets.ViewSet):
     @action(detail=False, methods=['post'])
     def refresh(self, request):
         """Token refresh"""
-        from rest_framework_simplejwt.tokens import RefreshToken
+        from accounts.tokens import TOKEN_VERSION_CLAIM, UserRefreshToken
         
         refresh_token = request.data.get('refresh')
         if not refresh_token:
@@ -146,7 +152,9 @@ class AuthViewSet(viewsets.ViewSet):
             )
         
         try:
-            refresh = RefreshToken(refresh_token)
+            refresh = UserRefreshToken(refresh_token)
+            # Raises once the token has been revoked
+            resolve_token_user(refresh['user_id'], refresh.get(TOKEN_VERSION_CLAIM, 0))
             access_token = str(refresh.access_token)
             return Response({'access': access_token})
         except Exception:
@@ -158,7 +166,8 @@ class AuthViewSet(viewsets.ViewSet):
     @action(detail=False, methods=['post'], permission_classes=[IsAuthenticated])
     def logout(self, request):
         """User logout"""
-        # For JWT, logout is handled client-side by removing the token
+        # Bumps the token version, so the user's access and refresh tokens stop working
+        revoke_user_tokens(request.user)
         return Response({'message': 'Logged out successfully'})
     
     @action(detail=False, methods=['post'], permission_classes=[IsAuthenticated])
@@ -250,9 +259,10 @@ class VenueViewSet(viewsets.ModelViewSet):
     queryset = Venue.objects.all()
     serializer_class = VenueSerializer
     permission_classes = [IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, OrderingFilter, IndexedSearchFilter]
     filterset_class = VenueFilter
     search_fields = ['name', 'address']
+    search_kind = 'venue'
     ordering_fields = ['name', 'capacity', 'created_at']
     ordering = ['name']
     
@@ -325,9 +335,10 @@ class EventViewSet(viewsets.ModelViewSet):
     queryset = Event.objects.select_related('venue', 'created_by').all()
     serializer_class = EventSerializer
     permission_classes = [IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, OrderingFilter, IndexedSearchFilter]
     filterset_class = EventFilter
     search_fields = ['name', 'description', 'sport']
+    search_kind = 'event'
     ordering_fields = ['start_datetime', 'created_at', 'name']
     ordering = ['-start_datetime']
     
@@ -738,41 +749,12 @@ class EventFixturesView(APIView):
     def get(self, request, event_id):
         event = get_object_or_404(Event, id=event_id)
         
-        # Apply role-based filtering
-        fixtures = Fixture.objects.filter(event=event).select_related('home', 'away', 'venue')
-        
-        # Filter based on user role
-        if not request.user.is_authenticated:
-            # Public users can only see published fixtures
-            fixtures = fixtures.filter(status=Fixture.Status.SCHEDULED)  # Assuming SCHEDULED means published
-        elif request.user.is_staff or request.user.role == 'ADMIN':
-            # Admin sees all fixtures
-            pass
-        elif request.user.role == 'ORGANIZER':
-            # Organizer sees fixtures for their events + published fixtures
-            if event.created_by != request.user:
-                fixtures = fixtures.filter(status=Fixture.Status.SCHEDULED)
-        elif request.user.role == 'COACH':
-            # Coach sees fixtures for teams they coach + published fixtures
-            from teams.models import Team
-            team_ids = Team.objects.filter(coach=request.user, event=event).values_list('id', flat=True)
-            fixtures = fixtures.filter(
-                Q(home_id__in=team_ids) |
-                Q(away_id__in=team_ids) |
-                Q(status=Fixture.Status.SCHEDULED)
-            ).distinct()
-        elif request.user.role == 'ATHLETE':
-            # Athlete sees fixtures for teams they're in + published fixtures
-            from teams.models import TeamMember
-            team_ids = TeamMember.objects.filter(athlete=request.user, team__event=event).values_list('team_id', flat=True)
-            fixtures = fixtures.filter(
-                Q(home_id__in=team_ids) |
-                Q(away_id__in=team_ids) |
-                Q(status=Fixture.Status.SCHEDULED)
-            ).distinct()
-        else:
-            # Spectator sees only published fixtures
-            fixtures = fixtures.filter(status=Fixture.Status.SCHEDULED)
+        # Apply role-based filtering: fixtures the user's role gives access to, plus published ones
+        fixtures = scope_queryset(
+            request,
+            Fixture.objects.filter(event=event).select_related('home', 'away', 'venue'),
+            public=Q(status=Fixture.Status.SCHEDULED),  # Assuming SCHEDULED means published
+        )
         
         # Order by start time
         fixtures = fixtures.order_by('start_at', 'round')
@@ -1165,12 +1147,7 @@ class PublicEventListView(APIView):
         if venue:
             events = events.filter(venue__name__icontains=venue)
         
-        search = request.query_params.get('search')
-        if search:
-            events = events.filter(
-                Q(name__icontains=search) | 
-                Q(description__icontains=search)
-            )
+        events = search_queryset(events, 'event', request.query_params.get('search'))
         
         serializer = EventSerializer(events, many=True)
         return Response(serializer.data)
@@ -1194,6 +1171,7 @@ class PublicEventFixturesView(APIView):
     """Public event fixtures"""
     permission_classes = [AllowAny]
     
+    @cache_public_response('fixtures', scope_kwarg='event_id')
     def get(self, request, event_id):
         event = get_object_or_404(Event, id=event_id, visibility='PUBLIC')
         fixtures = Fixture.objects.filter(event=event).select_related('home', 'away', 'venue')
@@ -1202,33 +1180,47 @@ class PublicEventFixturesView(APIView):
 
 
 class PublicEventResultsView(APIView):
-    """Public event results"""
+    """
+    Public event results and leaderboard
+
+    Served from the event's materialized snapshot (one query) with a strong
+    ETag; a matching If-None-Match gets 304 Not Modified.
+    """
     permission_classes = [AllowAny]
     
     def get(self, request, event_id):
-        event = get_object_or_404(Event, id=event_id, visibility='PUBLIC')
-        fixtures = Fixture.objects.filter(
-            event=event,
-            result__isnull=False
-        ).select_related('result', 'home', 'away')
+        event = get_object_or_404(
+            Event.objects.select_related('results_snapshot'), id=event_id, visibility='PUBLIC'
+        )
+        try:
+            snapshot = event.results_snapshot
+        except EventResultsSnapshot.DoesNotExist:
+            snapshot = rebuild_results_snapshot(event.id)
         
-        results = [fixture.result for fixture in fixtures]
-        serializer = ResultSerializer(results, many=True)
-        return Response(serializer.data)
+        etag = f'"{snapshot.etag}"'
+        headers = {'ETag': etag, 'Cache-Control': 'public, no-cache'}
+        if_none_match = request.headers.get('If-None-Match')
+        if if_none_match and (etag in parse_etags(if_none_match) or if_none_match.strip() == '*'):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        
+        return Response(snapshot.payload, headers=headers)
 
 
 class PublicEventLeaderboardView(APIView):
     """Public event leaderboard"""
     permission_classes = [AllowAny]
     
+    @cache_public_response('leaderboard', scope_kwarg='event_id')
     def get(self, request, event_id):
         event = get_object_or_404(Event, id=event_id, visibility='PUBLIC')
         leaderboard = LeaderboardEntry.objects.filter(
             event=event
-        ).select_related('team').order_by('-pts', '-gd', '-gf')
+        ).order_by('position', '-points', '-goal_difference', '-goals_for').values(
+            'team_id', 'team__name', 'position', 'points', 'matches_played', 'wins', 'draws',
+            'losses', 'goals_for', 'goals_against', 'goal_difference'
+        )
         
-        serializer = ResultSerializer(leaderboard, many=True)
-        return Response({'leaderboard': serializer.data})
+        return Response({'leaderboard': list(leaderboard)})
 
 
 class PublicStatsView(APIView):
@@ -1309,8 +1301,8 @@ class LoginView(APIView):
             )
         
         # Generate JWT tokens
-        from rest_framework_simplejwt.tokens import RefreshToken
-        refresh = RefreshToken.for_user(user)
+        from accounts.tokens import UserRefreshToken
+        refresh = UserRefreshToken.for_user(user)
         access_token = str(refresh.access_token)
         refresh_token = str(refresh)
         
@@ -1334,8 +1326,8 @@ class RegisterView(APIView):
             user = serializer.save()
             
             # Generate JWT tokens for immediate login
-            from rest_framework_simplejwt.tokens import RefreshToken
-            refresh = RefreshToken.for_user(user)
+            from accounts.tokens import UserRefreshToken
+            refresh = UserRefreshToken.for_user(user)
             access_token = str(refresh.access_token)
             refresh_token = str(refresh)
             
@@ -1351,7 +1343,7 @@ class RegisterView(APIView):
 class MeView(APIView):
     """Get current user profile - JWT required"""
     permission_classes = [IsAuthenticated]
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [CookieJWTAuthentication]
     
     def get(self, request):
         """Get current user profile"""
@@ -1597,4 +1589,55 @@ class UserApplicationsView(APIView):
         except OrganizerApplication.DoesNotExist:
             pass
         
-        return Response(applications)
\ No newline at end of file
+        return Response(applications)
+
+class SlowEndpointsView(APIView):
+    """Slowest API endpoints by latency percentile (admin only)"""
+    permission_classes = [IsAdminUser]
+    
+    ORDER_FIELDS = ('p50_ms', 'p95_ms', 'p99_ms', 'max_ms', 'avg_ms', 'count')
+    
+    def get(self, request):
+        from .metrics import top_slow_endpoints
+        
+        try:
+            hours = float(request.query_params.get('hours', 1))
+            limit = max(1, min(int(request.query_params.get('limit', 10)), 100))
+            if hours <= 0:
+                raise ValueError(hours)
+            # Rejects nan and spans too large for a timedelta
+            since = timezone.now() - timedelta(hours=hours)
+        except (ValueError, OverflowError):
+            return Response(
+                {'detail': 'hours must be a positive number and limit an integer'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        order_by = request.query_params.get('order_by', 'p95_ms')
+        if order_by not in self.ORDER_FIELDS:
+            return Response({'detail': f'order_by must be one of {", ".join(self.ORDER_FIELDS)}'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        return Response({
+            'since': since,
+            'results': top_slow_endpoints(since=since, limit=limit, order_by=order_by),
+        })
+
+
+class WebhookInboxView(APIView):
+    """Stripe webhook inbox backlog and lag (admin only)"""
+    permission_classes = [IsAdminUser]
+    
+    def get(self, request):
+        from payments.inbox import inbox_stats
+        
+        return Response(inbox_stats())
+
+
+class DeliveryStatsView(APIView):
+    """Outbound email/SMS queue depth, breaker state and throughput (admin only)"""
+    permission_classes = [IsAdminUser]
+    
+    def get(self, request):
+        from payments.delivery import delivery_stats
+        
+        return Response(delivery_stats())
@@ -0,0 +1,101 @@
+"""
+In-process background work queues for Timely.
+
+Work that must not hold up a request (fan-out, email/SMS delivery, exports)
+is handed to a named, bounded thread pool. Set BACKGROUND_TASKS_EAGER = True
+to run submitted work inline (used by tests and management commands).
+"""
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_WORKERS = 4
+
+
+class BackgroundQueue:
+    """A named thread pool that closes its DB connection after each task"""
+
+    def __init__(self, name: str, max_workers: int = DEFAULT_MAX_WORKERS):
+        self.name = name
+        self.max_workers = max_workers
+        self._executor = None
+        self._lock = threading.Lock()
+        self._stats = {'submitted': 0, 'completed': 0, 'failed': 0}
+
+    @property
+    def eager(self) -> bool:
+        return getattr(settings, 'BACKGROUND_TASKS_EAGER', False)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix=f"timely-{self.name}",
+                )
+            return self._executor
+
+    def submit(self, func: Callable, *args, **kwargs) -> Future:
+        """Run func in the pool (or inline when eager) and return its future"""
+        with self._lock:
+            self._stats['submitted'] += 1
+
+        if self.eager:
+            future = Future()
+            try:
+                future.set_result(self._run(func, args, kwargs, close_connection=False))
+            except Exception as exc:
+                future.set_exception(exc)
+            return future
+
+        return self._get_executor().submit(self._run, func, args, kwargs)
+
+    def _run(self, func, args, kwargs, close_connection=True):
+        if close_connection:
+            close_old_connections()
+        try:
+            result = func(*args, **kwargs)
+        except Exception:
+            logger.exception("Background task %s failed in queue %s", getattr(func, '__name__', func), self.name)
+            with self._lock:
+                self._stats['failed'] += 1
+            raise
+        finally:
+            if close_connection:
+                # Worker threads own their connection; release it between tasks
+                connection.close()
+        with self._lock:
+            self._stats['completed'] += 1
+        return result
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            stats = dict(self._stats)
+        stats['in_flight'] = stats['submitted'] - stats['completed'] - stats['failed']
+        return stats
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+
+_queues: Dict[str, BackgroundQueue] = {}
+_queues_lock = threading.Lock()
+
+
+def get_queue(name: str) -> BackgroundQueue:
+    """Return the shared queue for name, sized from BACKGROUND_QUEUE_WORKERS"""
+    with _queues_lock:
+        queue = _queues.get(name)
+        if queue is None:
+            workers = getattr(settings, 'BACKGROUND_QUEUE_WORKERS', {}).get(name, DEFAULT_MAX_WORKERS)
+            queue = _queues[name] = BackgroundQueue(name, max_workers=workers)
+        return queue
@@ -1,10 +1,17 @@
 """
 Cache utilities for Timely API
 """
+import hashlib
+import time
 from functools import wraps
+
+from django.conf import settings
 from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
 from django.utils.decorators import method_decorator
 from django.views.decorators.cache import cache_page
+from rest_framework.response import Response
 
 
 def cache_page_seconds(seconds):
@@ -26,3 +33,114 @@ def cache_page_seconds_method(seconds):
     Usage: @method_decorator(cache_page_seconds_method(60), name='dispatch')
     """
     return method_decorator(cache_page(seconds))
+
+
+# ---------------------------------------------------------------------------
+# Versioned keys
+#
+# Public data is cached under keys that embed a version per (namespace,
+# scope), e.g. ('fixtures', event_id). Writes bump the version instead of
+# deleting keys, which works on any shared backend (no key scans) and lets
+# superseded entries simply expire.
+# ---------------------------------------------------------------------------
+
+GLOBAL_SCOPE = 'global'
+
+
+def _version_key(namespace, scope):
+    return f'cachever:{namespace}:{scope}'
+
+
+def _fresh_version():
+    # Time-based so a version lost to eviction is never reissued
+    return time.time_ns() // 1000
+
+
+def get_cache_versions(namespaces, scope=GLOBAL_SCOPE):
+    """Current versions for several namespaces in one round trip"""
+    keys = {namespace: _version_key(namespace, scope) for namespace in namespaces}
+    found = cache.get_many(list(keys.values()))
+    versions = {}
+    for namespace, key in keys.items():
+        version = found.get(key)
+        if version is None:
+            cache.add(key, _fresh_version(), timeout=None)
+            version = cache.get(key)
+        versions[namespace] = version
+    return versions
+
+
+def bump_cache_version(namespace, scope=GLOBAL_SCOPE):
+    """Invalidate everything cached for (namespace, scope)"""
+    key = _version_key(namespace, scope)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        version = _fresh_version()
+        cache.set(key, version, timeout=None)
+        return version
+
+
+def bump_cache_versions(namespaces, scope=GLOBAL_SCOPE):
+    for namespace in namespaces:
+        bump_cache_version(namespace, scope)
+
+
+def versioned_key(namespaces, scope=GLOBAL_SCOPE, *parts):
+    """Cache key that changes whenever any of the namespaces is bumped for scope"""
+    versions = get_cache_versions(namespaces, scope)
+    stamp = '.'.join(f'{namespace}{versions[namespace]}' for namespace in namespaces)
+    suffix = hashlib.md5(':'.join(str(part) for part in parts).encode()).hexdigest()
+    return f'public:{scope}:{stamp}:{suffix}'
+
+
+def cache_public_response(*namespaces, scope_kwarg=None, timeout=None):
+    """
+    Cache successful GET responses of a view method under a versioned key.
+
+    The key covers the full path (query string included). scope_kwarg names
+    the URL kwarg (e.g. 'event_id') the namespaces are versioned by;
+    without it the global scope is used.
+    Usage: @cache_public_response('fixtures', scope_kwarg='event_id')
+    """
+    def decorator(view_method):
+        @wraps(view_method)
+        def wrapper(self, request, *args, **kwargs):
+            if request.method != 'GET':
+                return view_method(self, request, *args, **kwargs)
+
+            scope = kwargs.get(scope_kwarg, GLOBAL_SCOPE) if scope_kwarg else GLOBAL_SCOPE
+            key = versioned_key(namespaces, scope, request.get_full_path())
+            cached = cache.get(key)
+            if cached is not None:
+                data, status_code = cached
+                response = Response(data, status=status_code)
+                response['X-Cache'] = 'HIT'
+                return response
+
+            response = view_method(self, request, *args, **kwargs)
+            if response.status_code == 200:
+                cache.set(key, (response.data, response.status_code),
+                          timeout if timeout is not None else settings.PUBLIC_CACHE_TIMEOUT)
+                response['X-Cache'] = 'MISS'
+            return response
+        return wrapper
+    return decorator
+
+
+def invalidate_on_change(model, namespaces, scope=None):
+    """
+    Bump the namespaces' versions after a model instance is saved or deleted.
+
+    scope maps an instance to the scope it belongs to (e.g. its event id);
+    without it the global scope is bumped. Bumps run on commit, so a read
+    racing the write cannot re-cache the old data under the new version.
+    """
+    def handler(sender, instance, **kwargs):
+        target = scope(instance) if scope else GLOBAL_SCOPE
+        if target is not None:
+            transaction.on_commit(lambda: bump_cache_versions(namespaces, target))
+
+    uid = f'cache-invalidate:{model._meta.label}:{",".join(namespaces)}'
+    post_save.connect(handler, sender=model, weak=False, dispatch_uid=f'{uid}:save')
+    post_delete.connect(handler, sender=model, weak=False, dispatch_uid=f'{uid}:delete')
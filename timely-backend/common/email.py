@@ -1,9 +1,7 @@
 # common/email.py
-from django.core.mail import EmailMultiAlternatives
 from django.template.loader import render_to_string
 from django.conf import settings
 from django.utils.html import strip_tags
-from django.core.mail import get_connection
 from celery import shared_task
 import logging
 
@@ -27,29 +25,24 @@ class EmailTemplate:
         return render_to_string(f'emails/{self.template_name}.txt', self.context)
     
     def send(self, to_emails, from_email=None):
-        """Send the email"""
+        """Queue the email for delivery (payments.delivery)"""
+        from payments.delivery import queue_email as queue_delivery
+        
         if isinstance(to_emails, str):
             to_emails = [to_emails]
         
-        from_email = from_email or settings.DEFAULT_FROM_EMAIL
-        
-        html_content = self.render_html()
-        text_content = self.render_text()
-        
-        msg = EmailMultiAlternatives(
-            subject=self.subject,
-            body=text_content,
-            from_email=from_email,
-            to=to_emails
-        )
-        msg.attach_alternative(html_content, "text/html")
-        
         try:
-            msg.send()
-            logger.info(f"Email sent successfully to {to_emails}")
+            queue_delivery(
+                to_emails,
+                subject=self.subject,
+                body=self.render_text(),
+                html=self.render_html(),
+                from_email=from_email,
+            )
+            logger.info(f"Email queued for {to_emails}")
             return True
         except Exception as e:
-            logger.error(f"Failed to send email to {to_emails}: {e}")
+            logger.error(f"Failed to queue email to {to_emails}: {e}")
             return False
 
 
@@ -222,30 +215,25 @@ def send_email_verification_email(user_id, verification_url):
 
 # Utility functions
 def send_bulk_emails(emails, template_class, context_data):
-    """Send bulk emails efficiently"""
-    connection = get_connection()
-    messages = []
+    """Queue bulk emails; the delivery engine sends them in batches over one connection"""
+    from payments.delivery import EMAIL, queue_messages
     
+    messages = []
     for email_data in emails:
         template = template_class(**context_data, **email_data)
-        html_content = template.render_html()
-        text_content = template.render_text()
-        
-        msg = EmailMultiAlternatives(
-            subject=template.subject,
-            body=text_content,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            to=[email_data['email']]
-        )
-        msg.attach_alternative(html_content, "text/html")
-        messages.append(msg)
+        messages.append({
+            'to': email_data['email'],
+            'subject': template.subject,
+            'body': template.render_text(),
+            'html': template.render_html(),
+        })
     
     try:
-        connection.send_messages(messages)
-        logger.info(f"Bulk email sent to {len(messages)} recipients")
+        queued = queue_messages(EMAIL, messages)
+        logger.info(f"Bulk email queued for {queued} recipients")
         return True
     except Exception as e:
-        logger.error(f"Failed to send bulk emails: {e}")
+        logger.error(f"Failed to queue bulk emails: {e}")
         return False
 
 
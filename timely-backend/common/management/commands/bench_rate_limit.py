@@ -0,0 +1,81 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+
+from api.middleware import RateLimitingMiddleware
+from common.ratelimit import LocalStore, RatePolicy, RateLimiter, get_limiter, reset_limiter
+
+
+class Command(BaseCommand):
+    help = 'Benchmark rate limiting overhead per request: legacy timestamp lists vs the GCRA limiter'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200000, help='Hits per measurement')
+        parser.add_argument('--keys', type=int, default=1000, help='Distinct client keys')
+
+    def handle(self, *args, **options):
+        count = options['requests']
+        keys = [f'10.0.{i // 256}.{i % 256}' for i in range(options['keys'])]
+        policy = RatePolicy('bench', limit=100, period=60)
+
+        self._measure('legacy timestamp lists', count, self._legacy(keys, policy, count))
+
+        limiter = RateLimiter(LocalStore(), [policy])
+        self._measure('gcra local store', count, self._hits(limiter, keys, policy, count))
+
+        policies = {
+            'allowed': {'rate': '1000000000/min', 'methods': ['POST'], 'paths': ['/api/auth/login/']},
+            'refused': {'rate': '1/day', 'methods': ['POST'], 'paths': ['/api/tickets/checkout/']},
+        }
+        with override_settings(RATE_LIMIT_ENABLED=True, RATE_LIMIT_POLICIES=policies):
+            reset_limiter()
+            response = HttpResponse()
+            view = lambda request: response  # noqa: E731
+            middleware = RateLimitingMiddleware(view)
+            factory = RequestFactory()
+            allowed = [factory.post('/api/auth/login/', REMOTE_ADDR=key) for key in keys]
+            refused = [factory.post('/api/tickets/checkout/', REMOTE_ADDR=key) for key in keys]
+            unlimited = [factory.post('/api/events/', REMOTE_ADDR=key) for key in keys]
+            self._measure('no middleware (baseline)', count, self._requests(view, unlimited, count))
+            self._measure('middleware, unmatched route', count, self._requests(middleware, unlimited, count))
+            self._measure('middleware, allowed hit', count, self._requests(middleware, allowed, count))
+            self._measure('middleware, refused (429)', count, self._requests(middleware, refused, count))
+            self.stdout.write(f'store: {type(get_limiter().store).__name__}')
+        reset_limiter()
+
+    @staticmethod
+    def _legacy(keys, policy, count):
+        """The previous decorator: rebuild the key's timestamp list on every call"""
+        def run():
+            storage = {}
+            for i in range(count):
+                key = keys[i % len(keys)]
+                now = time.time()
+                storage[key] = [t for t in storage.get(key, []) if now - t < policy.period]
+                if len(storage[key]) < policy.limit:
+                    storage[key].append(now)
+        return run
+
+    @staticmethod
+    def _hits(limiter, keys, policy, count):
+        def run():
+            for i in range(count):
+                limiter.hit(policy, keys[i % len(keys)])
+        return run
+
+    @staticmethod
+    def _requests(middleware, requests, count):
+        def run():
+            for i in range(count):
+                request = requests[i % len(requests)]
+                request.__dict__.pop('_rate_limit', None)
+                middleware(request)
+        return run
+
+    def _measure(self, label, count, run):
+        started = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - started
+        self.stdout.write(f'{label:30s} {elapsed / count * 1e6:8.2f} us/request {count / elapsed:12.0f} requests/s')
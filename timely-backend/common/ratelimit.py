@@ -0,0 +1,286 @@
+"""
+Rate limiting for Timely (GCRA).
+
+Each key holds a single number, its theoretical arrival time (TAT): the
+moment its bucket would be full again. A hit pushes the TAT forward by one
+emission interval (period / limit) and is refused if that would put it more
+than one period ahead of now. State per key is O(1) and a key whose TAT is
+in the past is indistinguishable from a new one, so idle keys are simply
+dropped (TTL on Redis, eager eviction in memory).
+
+State lives in the shared cache when it is Redis (one atomic script per
+hit, so every worker enforces the same limit) and in process memory
+otherwise, or while Redis is unreachable.
+
+Policies come from RATE_LIMIT_POLICIES and are applied to matching routes by
+api.middleware.RateLimitingMiddleware; common.security.rate_limit uses the
+same limiter for individual views. Both key on client_ip(), which only
+believes X-Forwarded-For as far as RATE_LIMIT_TRUSTED_PROXIES allows.
+"""
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.redis import RedisCache
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.http import JsonResponse
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_LOCAL_KEYS = 50000
+KEY_PREFIX = 'rl'
+
+_PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_rate(rate: str) -> Tuple[int, float]:
+    """Parse a DRF-style rate ('10/min', '5/s', '100/hour') into (limit, period seconds)"""
+    num, period = rate.split('/')
+    return int(num), float(_PERIODS[period.strip()[0]])
+
+
+@dataclass(frozen=True)
+class RatePolicy:
+    """A limit of `limit` requests per `period` seconds, optionally bound to routes"""
+    name: str
+    limit: int
+    period: float
+    methods: FrozenSet[str] = frozenset()
+    paths: Tuple[str, ...] = ()
+
+    @property
+    def interval(self) -> float:
+        return self.period / self.limit
+
+    @classmethod
+    def from_setting(cls, name: str, spec: Dict) -> 'RatePolicy':
+        limit, period = parse_rate(spec['rate'])
+        return cls(
+            name=name,
+            limit=limit,
+            period=period,
+            methods=frozenset(method.upper() for method in spec.get('methods', ())),
+            paths=tuple(spec.get('paths', ())),
+        )
+
+
+class Decision(NamedTuple):
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: float  # seconds until the next hit would be allowed
+
+
+# ---------------------------------------------------------------------------
+# Stores
+# ---------------------------------------------------------------------------
+
+class LocalStore:
+    """Process-local TATs, bounded by max_keys and evicted once idle"""
+
+    def __init__(self, max_keys: int = DEFAULT_MAX_LOCAL_KEYS):
+        self.max_keys = max_keys
+        self._tats: 'OrderedDict[str, float]' = OrderedDict()  # least recently hit first
+        self._lock = threading.Lock()
+
+    def hit(self, key: str, interval: float, period: float) -> Tuple[bool, float]:
+        """Apply one hit; returns (allowed, slack) with slack in seconds"""
+        now = time.monotonic()
+        with self._lock:
+            tats = self._tats
+            tat = tats.get(key, now)
+            new_tat = (tat if tat > now else now) + interval
+            ahead = new_tat - now
+            if ahead > period:
+                return False, ahead - period
+
+            tats[key] = new_tat
+            tats.move_to_end(key)
+            # The least recently hit key is the likeliest to be idle; drop it
+            # once its bucket has refilled, and always when over capacity
+            oldest_key, oldest_tat = next(iter(tats.items()))
+            if oldest_tat <= now or len(tats) > self.max_keys:
+                del tats[oldest_key]
+            return True, period - ahead
+
+    def __len__(self) -> int:
+        return len(self._tats)
+
+    def clear(self):
+        with self._lock:
+            self._tats.clear()
+
+
+# KEYS[1] = bucket key; ARGV = interval, period (microseconds).
+# Uses the server clock so every worker agrees on "now".
+_GCRA_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000000 + tonumber(t[2])
+local interval = tonumber(ARGV[1])
+local period = tonumber(ARGV[2])
+local tat = tonumber(redis.call('GET', KEYS[1])) or now
+if tat < now then tat = now end
+local new_tat = tat + interval
+local ahead = new_tat - now
+if ahead > period then
+    return {0, ahead - period}
+end
+redis.call('SET', KEYS[1], string.format('%d', new_tat), 'PX', math.ceil(ahead / 1000))
+return {1, period - ahead}
+"""
+
+_RETRY_REDIS_AFTER = 30  # seconds on the local fallback after a Redis error
+
+
+class RedisStore:
+    """TATs in the shared Redis cache, falling back to a LocalStore on errors"""
+
+    def __init__(self, redis_cache, fallback: Optional[LocalStore] = None):
+        self.cache = redis_cache
+        self.fallback = fallback or LocalStore()
+        self._script = None
+        self._down_until = 0.0
+
+    def _get_script(self):
+        if self._script is None:
+            client = self.cache._cache.get_client(write=True)
+            self._script = client.register_script(_GCRA_SCRIPT)
+        return self._script
+
+    def hit(self, key: str, interval: float, period: float) -> Tuple[bool, float]:
+        if time.monotonic() >= self._down_until:
+            try:
+                allowed, slack = self._get_script()(
+                    keys=[self.cache.make_key(key)],
+                    args=[int(interval * 1_000_000), int(period * 1_000_000)],
+                )
+                return bool(allowed), slack / 1_000_000
+            except Exception:
+                logger.exception("Rate limit store unavailable; using in-process limits")
+                self._script = None
+                self._down_until = time.monotonic() + _RETRY_REDIS_AFTER
+        return self.fallback.hit(key, interval, period)
+
+    def clear(self):
+        self.fallback.clear()
+
+
+# ---------------------------------------------------------------------------
+# Limiter
+# ---------------------------------------------------------------------------
+
+class RateLimiter:
+    """Applies policies to identities (IP, user id, ...) against a store"""
+
+    def __init__(self, store, policies: Iterable[RatePolicy] = ()):
+        self.store = store
+        self.policies = {policy.name: policy for policy in policies}
+        # Route table: exact paths first, then 'prefix*' paths
+        self._exact: Dict[str, List[RatePolicy]] = {}
+        prefixes = []
+        for policy in self.policies.values():
+            for path in policy.paths:
+                if path.endswith('*'):
+                    prefixes.append((path[:-1], policy))
+                else:
+                    self._exact.setdefault(path, []).append(policy)
+        self._prefixes = tuple(prefixes)
+        self._prefix_strings = tuple(prefix for prefix, _ in prefixes)
+
+    def match(self, path: str, method: str) -> List[RatePolicy]:
+        """Policies that apply to a request; the common no-match case is one dict lookup"""
+        matched = self._exact.get(path, ())
+        if self._prefix_strings and path.startswith(self._prefix_strings):
+            matched = list(matched) + [policy for prefix, policy in self._prefixes if path.startswith(prefix)]
+        return [policy for policy in matched if not policy.methods or method in policy.methods]
+
+    def hit(self, policy: RatePolicy, identity: str) -> Decision:
+        allowed, slack = self.store.hit(f'{KEY_PREFIX}:{policy.name}:{identity}', policy.interval, policy.period)
+        if allowed:
+            # Epsilon guards float error turning e.g. 2.0 into 1.999...
+            return Decision(True, policy.limit, int(slack / policy.interval + 1e-9), 0.0)
+        return Decision(False, policy.limit, 0, slack)
+
+    def check(self, policies: Iterable[RatePolicy], identity: str) -> Optional[Decision]:
+        """Hit every policy; returns the first refusal, else the tightest allowance"""
+        tightest = None
+        for policy in policies:
+            decision = self.hit(policy, identity)
+            if not decision.allowed:
+                return decision
+            if tightest is None or decision.remaining < tightest.remaining:
+                tightest = decision
+        return tightest
+
+
+def too_many_requests(decision: Decision, message: str = 'Too many requests. Please try again later.') -> JsonResponse:
+    retry_after = max(1, math.ceil(decision.retry_after))
+    response = JsonResponse({'error': message, 'retry_after': retry_after}, status=429)
+    response['Retry-After'] = str(retry_after)
+    response['X-RateLimit-Limit'] = str(decision.limit)
+    response['X-RateLimit-Remaining'] = '0'
+    return response
+
+
+def client_ip(request) -> str:
+    """
+    The address to rate limit a request by.
+
+    REMOTE_ADDR, unless RATE_LIMIT_TRUSTED_PROXIES says how many proxies of
+    ours sit in front of the app. Each appends the address it received the
+    request from to X-Forwarded-For, so the client is the entry that many
+    places from the end; anything before it was sent by the client and can
+    be forged.
+    """
+    remote_addr = request.META.get('REMOTE_ADDR', '')
+    trusted = getattr(settings, 'RATE_LIMIT_TRUSTED_PROXIES', 0)
+    if trusted <= 0:
+        return remote_addr
+    forwarded = [ip.strip() for ip in request.META.get('HTTP_X_FORWARDED_FOR', '').split(',') if ip.strip()]
+    if len(forwarded) < trusted:
+        # Did not come through every proxy
+        return remote_addr
+    return forwarded[-trusted]
+
+
+_limiter: Optional[RateLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def get_limiter() -> RateLimiter:
+    """The process-wide limiter built from RATE_LIMIT_POLICIES and the default cache"""
+    global _limiter
+    limiter = _limiter
+    if limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                local = LocalStore(getattr(settings, 'RATE_LIMIT_MAX_LOCAL_KEYS', DEFAULT_MAX_LOCAL_KEYS))
+                backend = caches['default']
+                store = RedisStore(backend, fallback=local) if isinstance(backend, RedisCache) else local
+                policies = [
+                    RatePolicy.from_setting(name, spec)
+                    for name, spec in getattr(settings, 'RATE_LIMIT_POLICIES', {}).items()
+                ]
+                _limiter = RateLimiter(store, policies)
+            limiter = _limiter
+    return limiter
+
+
+def reset_limiter():
+    """Drop the process-wide limiter and its local state; rebuilt on next use"""
+    global _limiter
+    with _limiter_lock:
+        _limiter = None
+
+
+@receiver(setting_changed)
+def _reset_on_setting_change(setting, **kwargs):
+    if setting.startswith('RATE_LIMIT') or setting == 'CACHES':
+        reset_limiter()
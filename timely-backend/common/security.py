@@ -11,10 +11,9 @@ from django.views.decorators.csrf import csrf_exempt
 from django.conf import settings
 import json
 
-logger = logging.getLogger(__name__)
+from .ratelimit import RatePolicy, client_ip, get_limiter, too_many_requests
 
-# In-memory rate limiting storage (simple dict for dev; use Redis in production)
-_rate_limit_storage = {}
+logger = logging.getLogger(__name__)
 
 def get_client_ip(request):
     """Extract client IP address from request."""
@@ -35,54 +34,39 @@ def rate_limit(max_attempts=5, window_minutes=5, key_func=None):
         key_func: Function to generate rate limit key (defaults to IP + email)
     """
     def decorator(view_func):
+        policy = RatePolicy(
+            name=f"view:{view_func.__module__}.{view_func.__qualname__}",
+            limit=max_attempts,
+            period=window_minutes * 60,
+        )
+        
         @wraps(view_func)
         def wrapper(self_or_request, request=None, *args, **kwargs):
             # Handle both function-based and class-based views
             if request is None:
                 # Function-based view: self_or_request is the request
                 request = self_or_request
+                view_args = (request,)
             else:
                 # Class-based view: self_or_request is self, request is the request
-                pass
+                view_args = (self_or_request, request)
             
             # Generate rate limit key
             if key_func:
                 key = key_func(request)
             else:
-                ip = get_client_ip(request)
+                ip = client_ip(request)
                 email = request.data.get('email', '') if hasattr(request, 'data') else ''
-                key = f"rate_limit:{ip}:{email}"
-            
-            # Check current attempts
-            current_time = time.time()
-            window_seconds = window_minutes * 60
+                key = f"{ip}:{email}"
             
-            # Clean old entries
-            _rate_limit_storage[key] = [
-                attempt_time for attempt_time in _rate_limit_storage.get(key, [])
-                if current_time - attempt_time < window_seconds
-            ]
-            
-            # Check if limit exceeded
-            if len(_rate_limit_storage.get(key, [])) >= max_attempts:
+            # Shared GCRA limiter: one state value per key, evicted once idle
+            decision = get_limiter().hit(policy, key)
+            if not decision.allowed:
                 logger.warning(f"Rate limit exceeded for key: {key}")
-                return JsonResponse({
-                    'error': 'Too many attempts. Please try again later.',
-                    'retry_after': window_seconds
-                }, status=429)
-            
-            # Record this attempt
-            if key not in _rate_limit_storage:
-                _rate_limit_storage[key] = []
-            _rate_limit_storage[key].append(current_time)
+                return too_many_requests(decision, 'Too many attempts. Please try again later.')
             
             # Call the original view
-            if request is None:
-                # Function-based view
-                return view_func(self_or_request, *args, **kwargs)
-            else:
-                # Class-based view
-                return view_func(self_or_request, request, *args, **kwargs)
+            return view_func(*view_args, *args, **kwargs)
         return wrapper
     return decorator
 
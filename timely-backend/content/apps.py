@@ -8,4 +8,9 @@ class ContentConfig(AppConfig):
     
     def ready(self):
         """Import signals when app is ready."""
-        import content.signals
\ No newline at end of file
+        import content.signals
+        from common.cache import invalidate_on_change
+        from .models import News, Banner, Announcement
+
+        for model in (News, Banner, Announcement):
+            invalidate_on_change(model, ('news',))
\ No newline at end of file
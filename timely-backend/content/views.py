@@ -1,10 +1,14 @@
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.filters import OrderingFilter
+from django_filters.rest_framework import DjangoFilterBackend
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from django.db import models
 from accounts.rbac_permissions import OrganizerOrAdminPermission
+from common.cache import cache_public_response
+from search.filters import IndexedSearchFilter
 from .models import Page, News, Banner, Announcement
 from .serializers import PageSerializer, NewsSerializer, NewsPublicSerializer, BannerSerializer, AnnouncementSerializer
 
@@ -118,6 +122,8 @@ class PublicNewsViewSet(viewsets.ReadOnlyModelViewSet):
     serializer_class = NewsPublicSerializer
     permission_classes = [permissions.AllowAny]
     lookup_field = 'slug'
+    filter_backends = [DjangoFilterBackend, OrderingFilter, IndexedSearchFilter]
+    search_kind = 'news'
 
     def get_queryset(self):
         """Filter by published status and publish_at."""
@@ -127,6 +133,14 @@ class PublicNewsViewSet(viewsets.ReadOnlyModelViewSet):
         ).filter(
             models.Q(publish_at__isnull=True) | models.Q(publish_at__lte=now)
         ).order_by('-published_at', '-created_at')
+
+    @cache_public_response('news')
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @cache_public_response('news')
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
     
     def get_object(self):
         """Override to support both ID and slug lookup."""
@@ -8,4 +8,9 @@ class EventsConfig(AppConfig):
     
     def ready(self):
         """Import signals when app is ready"""
-        import events.signals
\ No newline at end of file
+        import events.signals
+        from common.cache import invalidate_on_change
+        from .models import Event
+
+        # Visibility or detail changes affect every public page of the event
+        invalidate_on_change(Event, ('fixtures', 'results', 'leaderboard'), scope=lambda event: event.pk)
\ No newline at end of file
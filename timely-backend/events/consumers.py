@@ -8,11 +8,12 @@ from .models import Event
 from results.models import Result, LeaderboardEntry
 from fixtures.models import Fixture
 from teams.models import Team
+from realtime.frames import FrameForwardingMixin
 
 User = get_user_model()
 
 
-class EventConsumer(AsyncWebsocketConsumer):
+class EventConsumer(FrameForwardingMixin, AsyncWebsocketConsumer):
     """WebSocket consumer for event-specific real-time updates"""
     
     async def connect(self):
@@ -135,52 +136,31 @@ class EventConsumer(AsyncWebsocketConsumer):
     # Event update handlers
     async def event_update(self, event):
         """Handle event updates"""
-        await self.send(text_data=json.dumps({
-            'type': 'event_update',
-            'data': event['data']
-        }))
+        await self.send_frame(event, 'event_update')
     
     async def results_update(self, event):
         """Handle results updates"""
-        await self.send(text_data=json.dumps({
-            'type': 'results_update',
-            'data': event['data']
-        }))
+        await self.send_frame(event, 'results_update')
     
     async def schedule_update(self, event):
         """Handle schedule updates"""
-        await self.send(text_data=json.dumps({
-            'type': 'schedule_update',
-            'data': event['data']
-        }))
+        await self.send_frame(event, 'schedule_update')
     
     async def announcement_update(self, event):
         """Handle announcement updates"""
-        await self.send(text_data=json.dumps({
-            'type': 'announcement_update',
-            'data': event['data']
-        }))
+        await self.send_frame(event, 'announcement_update')
     
     async def leaderboard_update(self, event):
         """Handle leaderboard updates"""
-        await self.send(text_data=json.dumps({
-            'type': 'leaderboard_update',
-            'data': event['data']
-        }))
+        await self.send_frame(event, 'leaderboard_update')
     
     async def result_update(self, event):
         """Handle individual result updates"""
-        await self.send(text_data=json.dumps({
-            'type': 'result_update',
-            'data': event['data']
-        }))
+        await self.send_frame(event, 'result_update')
     
     async def fixture_update(self, event):
         """Handle individual fixture updates"""
-        await self.send(text_data=json.dumps({
-            'type': 'fixture_update',
-            'data': event['data']
-        }))
+        await self.send_frame(event, 'fixture_update')
     
     @database_sync_to_async
     def get_event(self, event_id):
@@ -234,7 +214,7 @@ class EventConsumer(AsyncWebsocketConsumer):
         return False
 
 
-class NotificationConsumer(AsyncWebsocketConsumer):
+class NotificationConsumer(FrameForwardingMixin, AsyncWebsocketConsumer):
     """WebSocket consumer for general notifications"""
     
     async def connect(self):
@@ -304,14 +284,8 @@ class NotificationConsumer(AsyncWebsocketConsumer):
     # Notification handlers
     async def notification(self, event):
         """Handle notification messages"""
-        await self.send(text_data=json.dumps({
-            'type': 'notification',
-            'data': event['data']
-        }))
+        await self.send_frame(event, 'notification')
     
     async def system_message(self, event):
         """Handle system messages"""
-        await self.send(text_data=json.dumps({
-            'type': 'system_message',
-            'data': event['data']
-        }))
\ No newline at end of file
+        await self.send_frame(event, 'system_message')
\ No newline at end of file
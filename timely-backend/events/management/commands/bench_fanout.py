@@ -0,0 +1,90 @@
+import asyncio
+import json
+import time
+
+from django.core.management.base import BaseCommand
+
+from realtime.consumers import SpectatorConsumer
+from realtime.frames import group_message
+
+
+class LegacySpectatorConsumer(SpectatorConsumer):
+    """Handler as it was before frames were pre-encoded: json.dumps per socket"""
+
+    async def results_update(self, event):
+        await self.send(text_data=json.dumps({
+            'type': 'results_update',
+            'data': event['data']
+        }))
+
+
+def leaderboard_payload(teams):
+    """A results_update payload shaped like RealtimeBroadcaster's"""
+    return {
+        'type': 'results_update',
+        'event_id': 1,
+        'version': 42,
+        'merged': 3,
+        'timestamp': '2030-03-04T19:30:00+11:00',
+        'result': {
+            'id': 7, 'fixture_id': 12, 'home_team': 'Team 1', 'away_team': 'Team 2',
+            'home_score': 2, 'away_score': 1, 'winner': 'Team 1', 'status': 'FINALIZED',
+        },
+        'leaderboard': [
+            {
+                'id': i, 'team_name': f'Team {i}', 'pts': 60 - 2 * i, 'w': 20 - i, 'd': i % 4, 'l': i,
+                'gf': 50 - i, 'ga': 20 + i, 'gd': 30 - 2 * i, 'matches_played': 22, 'position': i,
+            }
+            for i in range(1, teams + 1)
+        ],
+    }
+
+
+class Command(BaseCommand):
+    help = 'Benchmark per-message WebSocket fan-out cost against group size, per-socket encoding vs pre-encoded frames'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=str, default='10,100,1000,10000', help='Comma-separated group sizes')
+        parser.add_argument('--teams', type=int, default=24, help='Leaderboard rows in the payload')
+        parser.add_argument('--messages', type=int, default=5, help='Messages fanned out per measurement')
+
+    def handle(self, *args, **options):
+        data = leaderboard_payload(options['teams'])
+        frame_bytes = len(group_message('results_update', data)['frame'])
+        self.stdout.write(f'payload: {options["teams"]} leaderboard rows, {frame_bytes} byte frame')
+        self.stdout.write(
+            f'{"sockets":>8} {"legacy ms/msg":>14} {"frames ms/msg":>14} '
+            f'{"legacy us/socket":>17} {"frames us/socket":>17} {"speedup":>8}'
+        )
+
+        for size in [int(size) for size in options['sizes'].split(',') if size.strip()]:
+            legacy = asyncio.run(self._fan_out(LegacySpectatorConsumer, size, data, options['messages'], prebuilt=False))
+            frames = asyncio.run(self._fan_out(SpectatorConsumer, size, data, options['messages'], prebuilt=True))
+            self.stdout.write(
+                f'{size:>8} {legacy * 1000:>14.2f} {frames * 1000:>14.2f} '
+                f'{legacy / size * 1e6:>17.2f} {frames / size * 1e6:>17.2f} {legacy / frames:>7.1f}x'
+            )
+
+    async def _fan_out(self, consumer_class, size, data, messages, prebuilt):
+        """Seconds per message to run the handler on every socket of a group"""
+        sent = []
+
+        async def sink(text_data=None, bytes_data=None, close=False):
+            sent.append(text_data)
+
+        consumers = []
+        for _ in range(size):
+            consumer = consumer_class()
+            consumer.send = sink
+            consumers.append(consumer)
+
+        started = time.perf_counter()
+        for _ in range(messages):
+            # The broadcaster encodes the frame once per message, inside the timed loop
+            message = group_message('results_update', data) if prebuilt else {'type': 'results_update', 'data': data}
+            for consumer in consumers:
+                await consumer.results_update(message)
+        elapsed = time.perf_counter() - started
+
+        assert len(sent) == size * messages
+        return elapsed / messages
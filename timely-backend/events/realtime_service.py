@@ -13,6 +13,7 @@ from results.services import compute_event_leaderboard, recompute_event_standing
 from results.models import LeaderboardEntry
 from fixtures.models import Fixture
 from teams.models import Team
+from realtime.frames import group_message
 
 
 class RealtimeBroadcastService:
@@ -238,13 +239,7 @@ class RealtimeBroadcastService:
     def _broadcast_to_group(self, group_name, message_type, data):
         """Broadcast message to a channel group"""
         if self.channel_layer:
-            async_to_sync(self.channel_layer.group_send)(
-                group_name,
-                {
-                    'type': message_type,
-                    'data': data
-                }
-            )
+            async_to_sync(self.channel_layer.group_send)(group_name, group_message(message_type, data))
     
     def _get_team_name(self, team_id):
         """Get team name by ID"""
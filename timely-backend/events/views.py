@@ -14,6 +14,7 @@ from accounts.permissions import (
     IsSpectatorReadOnly, IsAdmin, IsOwnerOrReadOnly
 )
 from accounts.audit_mixin import AuditLogMixin
+from search.filters import IndexedSearchFilter
 
 # Create a simple permission class for event ownership
 class IsEventOwnerOrAdmin(permissions.BasePermission):
@@ -49,9 +50,10 @@ class EventViewSet(AuditLogMixin, viewsets.ModelViewSet):
     """Event ViewSet with RBAC and lifecycle management"""
     
     queryset = Event.objects.select_related('created_by').prefetch_related('divisions').all()
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, IndexedSearchFilter]
     filterset_fields = ['sport', 'status']
     search_fields = ['name', 'description', 'location']
+    search_kind = 'event'
     ordering_fields = ['start_datetime', 'created_at', 'name']
     ordering = ['start_datetime', 'created_at']
     # Use default pagination from settings
@@ -121,15 +123,7 @@ class EventViewSet(AuditLogMixin, viewsets.ModelViewSet):
         if date_to:
             queryset = queryset.filter(end_datetime__lte=date_to)
         
-        # Search query
-        q = self.request.query_params.get('q')
-        if q:
-            queryset = queryset.filter(
-                Q(name__icontains=q) |
-                Q(description__icontains=q) |
-                Q(location__icontains=q)
-            )
-        
+        # ?q= / ?search= are applied by IndexedSearchFilter
         return queryset
     
     def perform_create(self, serializer):
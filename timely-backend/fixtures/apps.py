@@ -10,4 +10,8 @@ class FixturesConfig(AppConfig):
     def ready(self):
         """Import signals when app is ready"""
         # import fixtures.signals  # Temporarily commented out for migration
-        pass
\ No newline at end of file
+        from common.cache import invalidate_on_change
+        from .models import Fixture
+
+        # Public fixture and result pages both list an event's fixtures
+        invalidate_on_change(Fixture, ('fixtures', 'results'), scope=lambda fixture: fixture.event_id)
\ No newline at end of file
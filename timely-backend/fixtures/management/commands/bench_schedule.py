@@ -0,0 +1,106 @@
+import math
+import random
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, reset_queries, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from venues.models import Venue, VenueSlot
+from fixtures.services.conflicts import Booking, ConflictEngine
+from fixtures.services.scheduling import ScheduleConstraints, round_robin_pairings, schedule_matches
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the schedule optimizer on synthetic round-robin leagues against the serial layout'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--teams', type=str, default='20,60,120', help='Comma-separated league sizes')
+        parser.add_argument('--venues', type=int, default=12, help='Venues available to every league')
+        parser.add_argument('--blocked', type=float, default=0.05, help='Fraction of venue-days blocked for maintenance')
+        parser.add_argument('--min-rest-hours', type=float, default=12, help='Minimum team rest between matches')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed for blocked venue-days')
+
+    def handle(self, *args, **options):
+        random.seed(options['seed'])
+        constraints = ScheduleConstraints(min_rest=timedelta(hours=options['min_rest_hours']), horizon=timedelta(days=365))
+        starts_at = (timezone.localtime() + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+
+        # Everything runs inside a transaction that is rolled back at the end
+        with transaction.atomic():
+            venue_ids = self._venues(options['venues'], starts_at, options['blocked'])
+            for team_count in [int(size) for size in options['teams'].split(',') if size.strip()]:
+                self._run(team_count, venue_ids, starts_at, constraints)
+            transaction.set_rollback(True)
+
+    def _venues(self, count, starts_at, blocked_fraction):
+        owner = User.objects.create_user(
+            email=f'bench-{time.time_ns()}@timely.local',
+            password='bench-password',
+        )
+        stamp = time.time_ns()
+        venues = Venue.objects.bulk_create([
+            Venue(name=f'Bench ground {stamp}-{i}', address=f'{i} Bench Rd', created_by=owner)
+            for i in range(count)
+        ])
+        blocked = [
+            VenueSlot(
+                venue=venue,
+                starts_at=starts_at + timedelta(days=day),
+                ends_at=starts_at + timedelta(days=day + 1),
+                status=VenueSlot.Status.BLOCKED,
+                reason='Maintenance',
+            )
+            for venue in venues for day in range(365) if random.random() < blocked_fraction
+        ]
+        VenueSlot.objects.bulk_create(blocked)
+        self.stdout.write(f'{count} venues, {len(blocked)} blocked venue-days')
+        return [venue.id for venue in venues]
+
+    def _run(self, team_count, venue_ids, starts_at, constraints):
+        teams = list(range(1, team_count + 1))
+        rounds = round_robin_pairings(teams)
+        match_count = sum(len(pairings) for pairings in rounds)
+
+        reset_queries()
+        with CaptureQueriesContext(connection) as ctx:
+            started = time.perf_counter()
+            result = schedule_matches(rounds, venue_ids, starts_at, constraints)
+            elapsed = time.perf_counter() - started
+
+        # Capacity bound: venue slots per day, and how often one team may play per day
+        window = constraints.day_end.hour * 60 + constraints.day_end.minute - (
+            constraints.day_start.hour * 60 + constraints.day_start.minute)
+        per_venue_day = (window - constraints.duration.total_seconds() // 60) // (constraints.slot_length.total_seconds() // 60) + 1
+        per_team_day = (window - constraints.duration.total_seconds() // 60) // (constraints.team_spacing.total_seconds() // 60) + 1
+        lower_bound = max(
+            math.ceil(match_count / (per_venue_day * len(venue_ids))),
+            math.ceil((team_count - 1) / per_team_day),
+        )
+
+        # The previous generator laid matches out one after another
+        serial_days = match_count * (constraints.duration + constraints.turnover) / timedelta(days=1)
+        clashes = self._clashes(result)
+
+        self.stdout.write(
+            f'{team_count:4d} teams {match_count:6d} matches: {elapsed * 1000:9.2f} ms '
+            f'{len(ctx.captured_queries):3d} queries | {result.days_used:4d} match days '
+            f'(bound {lower_bound}), span {result.makespan.days} d vs serial {serial_days:.0f} d | '
+            f'unscheduled {len(result.unscheduled)} | clashes {clashes}'
+        )
+
+    @staticmethod
+    def _clashes(result):
+        """Cross-check the timetable with the conflict engine"""
+        bookings = [
+            Booking(id=None, start_at=m.starts_at, home_id=m.team_home_id, away_id=m.team_away_id,
+                    venue_id=m.venue_id, round=m.round_no, index=i)
+            for i, m in enumerate(result.matches)
+        ]
+        engine = ConflictEngine(bookings)
+        return sum(len(engine.conflicts_for(booking)) for booking in bookings)
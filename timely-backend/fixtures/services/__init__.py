@@ -1,7 +1,7 @@
 # fixtures/services/__init__.py
 from .generator import (
     generate_round_robin, generate_knockout, 
-    get_available_teams_for_event, validate_participants
+    get_available_teams_for_event, validate_participants, parse_slot_hints
 )
 from .conflicts import (
     check_fixture_conflicts, check_venue_availability,
@@ -10,7 +10,7 @@ from .conflicts import (
 
 __all__ = [
     'generate_round_robin', 'generate_knockout',
-    'get_available_teams_for_event', 'validate_participants',
+    'get_available_teams_for_event', 'validate_participants', 'parse_slot_hints',
     'check_fixture_conflicts', 'check_venue_availability',
     'suggest_alternative_times', 'validate_fixture_schedule', 'find_conflicts'
 ]
\ No newline at end of file
@@ -1,84 +1,265 @@
 # fixtures/services/conflicts.py
+"""
+Fixture conflict detection.
+
+Conflicts are answered by a ConflictEngine: the fixtures (and blocked venue
+slots) that could clash with a candidate schedule are loaded in one pass and
+indexed into per-venue and per-team interval trees, so checking a whole
+schedule costs a constant number of queries instead of several per fixture.
+"""
 from __future__ import annotations
 
+from dataclasses import dataclass
 from datetime import timedelta, datetime
-from typing import List, Dict
-from django.utils import timezone
+from typing import List, Dict, Iterable, Optional
+
 from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 
 from ..models import Fixture
+from .intervals import IntervalTree
+
+# Fixtures don't store an end time; assume a 2-hour duration
+FIXTURE_DURATION = timedelta(hours=2)
+
+ACTIVE_STATUSES = [Fixture.Status.SCHEDULED, Fixture.Status.LIVE]
+
+
+@dataclass(frozen=True)
+class Booking:
+    """A fixture (saved or candidate) occupying a venue and two teams"""
+
+    id: Optional[int]
+    start_at: datetime
+    home_id: Optional[int] = None
+    away_id: Optional[int] = None
+    venue_id: Optional[int] = None
+    home_name: Optional[str] = None
+    away_name: Optional[str] = None
+    venue_name: Optional[str] = None
+    round: Optional[int] = None
+    index: Optional[int] = None  # position in a candidate schedule
+
+    @property
+    def end_at(self) -> datetime:
+        return self.start_at + FIXTURE_DURATION
+
+    @property
+    def name(self) -> str:
+        return f"R{self.round}: {self.home_name or 'TBD'} vs {self.away_name or 'TBD'}"
+
+    @classmethod
+    def from_fixture(cls, fixture: Fixture, index: Optional[int] = None) -> 'Booking':
+        def cached_name(field_name):
+            # Only use related names already loaded; never trigger a query here
+            descriptor = getattr(Fixture, field_name)
+            if descriptor.is_cached(fixture):
+                related = getattr(fixture, field_name)
+                return related.name if related else None
+            return None
+
+        return cls(
+            id=fixture.pk,
+            start_at=fixture.start_at,
+            home_id=fixture.home_id,
+            away_id=fixture.away_id,
+            venue_id=fixture.venue_id,
+            home_name=cached_name('home'),
+            away_name=cached_name('away'),
+            venue_name=cached_name('venue'),
+            round=fixture.round,
+            index=index,
+        )
+
+
+@dataclass(frozen=True)
+class BlockedSlot:
+    id: int
+    venue_id: int
+    venue_name: str
+    starts_at: datetime
+    ends_at: datetime
+    reason: Optional[str] = None
+
+
+BOOKING_FIELDS = (
+    'id', 'start_at', 'home_id', 'away_id', 'venue_id',
+    'home__name', 'away__name', 'venue__name', 'round',
+)
+
+
+def _bookings(queryset) -> List[Booking]:
+    return [Booking(*row) for row in queryset.order_by().values_list(*BOOKING_FIELDS)]
+
+
+class ConflictEngine:
+    """Answers venue and team conflicts from per-venue and per-team interval trees"""
+
+    def __init__(self, bookings: Iterable[Booking], blocked_slots: Iterable[BlockedSlot] = ()):
+        by_venue: Dict[int, list] = {}
+        by_team: Dict[int, list] = {}
+        self.names: Dict[str, Dict[int, str]] = {'team': {}, 'venue': {}}
+
+        for booking in bookings:
+            if not booking.start_at:
+                continue
+            interval = (booking.start_at, booking.end_at, booking)
+            if booking.venue_id:
+                by_venue.setdefault(booking.venue_id, []).append(interval)
+            for team_id in {booking.home_id, booking.away_id} - {None}:
+                by_team.setdefault(team_id, []).append(interval)
+            self._remember_names(booking)
+
+        slots_by_venue: Dict[int, list] = {}
+        for slot in blocked_slots:
+            slots_by_venue.setdefault(slot.venue_id, []).append((slot.starts_at, slot.ends_at, slot))
+            self.names['venue'].setdefault(slot.venue_id, slot.venue_name)
+
+        self.venue_trees = {venue_id: IntervalTree(items) for venue_id, items in by_venue.items()}
+        self.team_trees = {team_id: IntervalTree(items) for team_id, items in by_team.items()}
+        self.slot_trees = {venue_id: IntervalTree(items) for venue_id, items in slots_by_venue.items()}
+
+    def _remember_names(self, booking: Booking):
+        for team_id, team_name in ((booking.home_id, booking.home_name), (booking.away_id, booking.away_name)):
+            if team_id and team_name:
+                self.names['team'].setdefault(team_id, team_name)
+        if booking.venue_id and booking.venue_name:
+            self.names['venue'].setdefault(booking.venue_id, booking.venue_name)
+
+    @classmethod
+    def load(cls, candidates: List[Booking], include_candidates: bool = False,
+             padding: timedelta = FIXTURE_DURATION) -> 'ConflictEngine':
+        """
+        Load every active fixture and blocked slot that could clash with the
+        candidates (same venue or team, within the schedule's time span
+        widened by padding). With include_candidates, unsaved candidates also
+        clash with each other.
+        """
+        timed = [candidate for candidate in candidates if candidate.start_at]
+        bookings: List[Booking] = []
+        slots: List[BlockedSlot] = []
+
+        if timed:
+            window_start = min(candidate.start_at for candidate in timed) - padding
+            window_end = max(candidate.start_at for candidate in timed) + padding
+            venue_ids = {c.venue_id for c in timed if c.venue_id}
+            team_ids = {team_id for c in timed for team_id in (c.home_id, c.away_id) if team_id}
+
+            if venue_ids or team_ids:
+                bookings = _bookings(Fixture.objects.filter(
+                    Q(venue_id__in=venue_ids) | Q(home_id__in=team_ids) | Q(away_id__in=team_ids),
+                    start_at__gt=window_start,
+                    start_at__lt=window_end,
+                    status__in=ACTIVE_STATUSES,
+                ))
+
+            if venue_ids:
+                from venues.models import VenueSlot
+                slots = [
+                    BlockedSlot(*row)
+                    for row in VenueSlot.objects.filter(
+                        venue_id__in=venue_ids,
+                        status=VenueSlot.Status.BLOCKED,
+                        starts_at__lt=window_end,
+                        ends_at__gt=window_start,
+                    ).order_by().values_list('id', 'venue_id', 'venue__name', 'starts_at', 'ends_at', 'reason')
+                ]
+
+        if include_candidates:
+            bookings.extend(candidate for candidate in timed if candidate.id is None)
+        return cls(bookings, slots)
+
+    def _clashes(self, tree: Optional[IntervalTree], candidate: Booking) -> List[Booking]:
+        if tree is None:
+            return []
+        clashes = [
+            booking for _, _, booking in tree.overlapping(candidate.start_at, candidate.end_at)
+            if not _same_booking(booking, candidate)
+        ]
+        return sorted(clashes, key=lambda booking: (booking.start_at, booking.round or 0, booking.id or 0))
+
+    def conflicts_for(self, candidate: Booking) -> List[Dict]:
+        """Conflicts for one fixture, in the shape the fixture views return"""
+        conflicts: List[Dict] = []
+        if not candidate.start_at:
+            return conflicts
+
+        if candidate.venue_id:
+            venue_name = candidate.venue_name or self.names['venue'].get(candidate.venue_id, f'#{candidate.venue_id}')
+            for clash in self._clashes(self.venue_trees.get(candidate.venue_id), candidate):
+                conflicts.append(_conflict(
+                    'venue_conflict', clash, f'Venue {venue_name} is already booked at {clash.start_at}'
+                ))
+            slot_tree = self.slot_trees.get(candidate.venue_id)
+            if slot_tree is not None:
+                for _, _, slot in slot_tree.overlapping(candidate.start_at, candidate.end_at):
+                    conflicts.append(_slot_conflict(slot, venue_name))
+
+        for team_id, team_name in ((candidate.home_id, candidate.home_name), (candidate.away_id, candidate.away_name)):
+            if not team_id:
+                continue
+            team_name = team_name or self.names['team'].get(team_id, f'#{team_id}')
+            for clash in self._clashes(self.team_trees.get(team_id), candidate):
+                conflicts.append(_conflict(
+                    'team_conflict', clash, f'Team {team_name} is already playing at {clash.start_at}'
+                ))
+
+        return conflicts
+
+    def is_venue_free(self, venue_id: int, start_at: datetime, end_at: datetime, exclude_fixture_id: Optional[int] = None) -> bool:
+        tree = self.venue_trees.get(venue_id)
+        if tree is not None and any(
+            booking.id != exclude_fixture_id for _, _, booking in tree.overlapping(start_at, end_at)
+        ):
+            return False
+        slot_tree = self.slot_trees.get(venue_id)
+        return slot_tree is None or not slot_tree.overlaps(start_at, end_at)
+
+
+def _same_booking(a: Booking, b: Booking) -> bool:
+    if a.id is not None or b.id is not None:
+        return a.id == b.id
+    return a.index == b.index
+
+
+def _conflict(conflict_type: str, clash: Booking, message: str) -> Dict:
+    conflicting = {
+        'id': clash.id,
+        'home_team': clash.home_name or 'TBD',
+        'away_team': clash.away_name or 'TBD',
+        'start_at': clash.start_at.isoformat()
+    }
+    if clash.id is None:
+        # Another fixture in the same candidate schedule
+        conflicting['fixture_index'] = clash.index
+    return {
+        'type': conflict_type,
+        'fixture_id': clash.id,
+        'message': message,
+        'conflicting_fixture': conflicting
+    }
+
+
+def _slot_conflict(slot: BlockedSlot, venue_name: str) -> Dict:
+    reason = f' ({slot.reason})' if slot.reason else ''
+    return {
+        'type': 'venue_unavailable',
+        'fixture_id': None,
+        'message': f'Venue {venue_name} is blocked from {slot.starts_at} to {slot.ends_at}{reason}',
+        'conflicting_slot': {
+            'id': slot.id,
+            'starts_at': slot.starts_at.isoformat(),
+            'ends_at': slot.ends_at.isoformat(),
+            'reason': slot.reason
+        }
+    }
 
 
 def check_fixture_conflicts(fixture: Fixture) -> List[Dict]:
     """Check for conflicts with a fixture"""
-    conflicts = []
-    
-    # Check venue conflicts
-    if fixture.venue and fixture.start_at:
-        venue_conflicts = Fixture.objects.filter(
-            venue=fixture.venue,
-            start_at__lt=fixture.start_at + timedelta(hours=2),  # Assume 2-hour duration
-            start_at__gt=fixture.start_at - timedelta(hours=2),
-            status__in=[Fixture.Status.SCHEDULED, Fixture.Status.LIVE]
-        ).exclude(id=fixture.id)
-        
-        for conflict in venue_conflicts:
-            conflicts.append({
-                'type': 'venue_conflict',
-                'fixture_id': conflict.id,
-                'message': f'Venue {fixture.venue.name} is already booked at {conflict.start_at}',
-                'conflicting_fixture': {
-                    'id': conflict.id,
-                    'home_team': conflict.home.name if conflict.home else 'TBD',
-                    'away_team': conflict.away.name if conflict.away else 'TBD',
-                    'start_at': conflict.start_at.isoformat()
-                }
-            })
-    
-    # Check team conflicts
-    if fixture.home and fixture.start_at:
-        home_conflicts = Fixture.objects.filter(
-            Q(home=fixture.home) | Q(away=fixture.home),
-            start_at__lt=fixture.start_at + timedelta(hours=2),
-            start_at__gt=fixture.start_at - timedelta(hours=2),
-            status__in=[Fixture.Status.SCHEDULED, Fixture.Status.LIVE]
-        ).exclude(id=fixture.id)
-        
-        for conflict in home_conflicts:
-            conflicts.append({
-                'type': 'team_conflict',
-                'fixture_id': conflict.id,
-                'message': f'Team {fixture.home.name} is already playing at {conflict.start_at}',
-                'conflicting_fixture': {
-                    'id': conflict.id,
-                    'home_team': conflict.home.name if conflict.home else 'TBD',
-                    'away_team': conflict.away.name if conflict.away else 'TBD',
-                    'start_at': conflict.start_at.isoformat()
-                }
-            })
-    
-    if fixture.away and fixture.start_at:
-        away_conflicts = Fixture.objects.filter(
-            Q(home=fixture.away) | Q(away=fixture.away),
-            start_at__lt=fixture.start_at + timedelta(hours=2),
-            start_at__gt=fixture.start_at - timedelta(hours=2),
-            status__in=[Fixture.Status.SCHEDULED, Fixture.Status.LIVE]
-        ).exclude(id=fixture.id)
-        
-        for conflict in away_conflicts:
-            conflicts.append({
-                'type': 'team_conflict',
-                'fixture_id': conflict.id,
-                'message': f'Team {fixture.away.name} is already playing at {conflict.start_at}',
-                'conflicting_fixture': {
-                    'id': conflict.id,
-                    'home_team': conflict.home.name if conflict.home else 'TBD',
-                    'away_team': conflict.away.name if conflict.away else 'TBD',
-                    'start_at': conflict.start_at.isoformat()
-                }
-            })
-    
-    return conflicts
+    candidate = Booking.from_fixture(fixture)
+    return ConflictEngine.load([candidate]).conflicts_for(candidate)
 
 
 def check_venue_availability(venue_id: int, start_at: datetime, duration_hours: int = 2, exclude_fixture_id: int = None) -> bool:
@@ -87,74 +268,103 @@ def check_venue_availability(venue_id: int, start_at: datetime, duration_hours:
         venue_id=venue_id,
         start_at__lt=start_at + timedelta(hours=duration_hours),
         start_at__gt=start_at - timedelta(hours=duration_hours),
-        status__in=[Fixture.Status.SCHEDULED, Fixture.Status.LIVE]
+        status__in=ACTIVE_STATUSES
     )
-    
+
     if exclude_fixture_id:
         conflicts = conflicts.exclude(id=exclude_fixture_id)
-    
+
     return not conflicts.exists()
 
 
 def suggest_alternative_times(venue_id: int, preferred_time: datetime, duration_hours: int = 2) -> List[datetime]:
     """Suggest alternative times for a venue"""
-    suggestions = []
-    
-    # Try different times on the same day
-    for hour_offset in [1, 2, 3, -1, -2, -3]:
-        new_time = preferred_time + timedelta(hours=hour_offset)
-        if check_venue_availability(venue_id, new_time, duration_hours):
-            suggestions.append(new_time)
-    
-    # Try next few days
-    for day_offset in [1, 2, 3]:
-        new_time = preferred_time + timedelta(days=day_offset)
-        if check_venue_availability(venue_id, new_time, duration_hours):
-            suggestions.append(new_time)
-    
+    duration = timedelta(hours=duration_hours)
+    options = [preferred_time + timedelta(hours=offset) for offset in [1, 2, 3, -1, -2, -3]]
+    options += [preferred_time + timedelta(days=offset) for offset in [1, 2, 3]]
+
+    # Load the venue's bookings for the whole search span once
+    engine = ConflictEngine.load(
+        [Booking(id=None, start_at=option, venue_id=venue_id) for option in options],
+        padding=max(duration, FIXTURE_DURATION),
+    )
+    suggestions = [
+        option for option in options
+        if engine.is_venue_free(venue_id, option - duration + FIXTURE_DURATION, option + duration)
+    ]
     return suggestions[:5]  # Return top 5 suggestions
 
 
 def validate_fixture_schedule(fixtures_data: List[Dict], event_id: int) -> Dict:
-    """Validate a list of fixtures for conflicts"""
-    conflicts = []
-    
-    for i, fixture_data in enumerate(fixtures_data):
-        # Create temporary fixture for validation
-        temp_fixture = Fixture(
-            event_id=event_id,
+    """Validate a list of fixtures for conflicts (with existing fixtures and each other)"""
+    candidates = [
+        Booking(
+            id=None,
+            start_at=_as_datetime(fixture_data.get('start_at')),
             home_id=fixture_data.get('home_team_id'),
             away_id=fixture_data.get('away_team_id'),
             venue_id=fixture_data.get('venue_id'),
-            start_at=fixture_data.get('start_at')
+            round=fixture_data.get('round'),
+            index=i,
         )
-        
-        fixture_conflicts = check_fixture_conflicts(temp_fixture)
+        for i, fixture_data in enumerate(fixtures_data)
+    ]
+    engine = ConflictEngine.load(candidates, include_candidates=True)
+    _load_candidate_names(engine, candidates)
+
+    conflicts = []
+    for i, (fixture_data, candidate) in enumerate(zip(fixtures_data, candidates)):
+        fixture_conflicts = engine.conflicts_for(candidate)
         if fixture_conflicts:
             conflicts.append({
                 'fixture_index': i,
                 'fixture_data': fixture_data,
                 'conflicts': fixture_conflicts
             })
-    
+
     return {
         'valid': len(conflicts) == 0,
         'conflicts': conflicts
     }
 
 
+def _as_datetime(value) -> Optional[datetime]:
+    """Schedules posted as JSON carry ISO 8601 strings"""
+    if isinstance(value, str):
+        parsed = parse_datetime(value)
+        if parsed is not None and timezone.is_naive(parsed):
+            parsed = timezone.make_aware(parsed)
+        return parsed
+    return value
+
+
+def _load_candidate_names(engine: ConflictEngine, candidates: List[Booking]):
+    """Resolve team/venue names the loaded fixtures didn't already provide"""
+    from teams.models import Team
+    from venues.models import Venue
+
+    team_ids = {t for c in candidates for t in (c.home_id, c.away_id) if t} - set(engine.names['team'])
+    venue_ids = {c.venue_id for c in candidates if c.venue_id} - set(engine.names['venue'])
+    if team_ids:
+        engine.names['team'].update(Team.objects.filter(id__in=team_ids).values_list('id', 'name'))
+    if venue_ids:
+        engine.names['venue'].update(Venue.objects.filter(id__in=venue_ids).values_list('id', 'name'))
+
+
 def find_conflicts(event_id: int) -> List[Dict]:
     """Find all conflicts in an event"""
-    fixtures = Fixture.objects.filter(event_id=event_id)
+    candidates = _bookings(Fixture.objects.filter(event_id=event_id))
+    candidates.sort(key=lambda booking: (booking.start_at, booking.round))
+    engine = ConflictEngine.load(candidates)
     all_conflicts = []
-    
-    for fixture in fixtures:
-        conflicts = check_fixture_conflicts(fixture)
+
+    for candidate in candidates:
+        conflicts = engine.conflicts_for(candidate)
         if conflicts:
             all_conflicts.append({
-                'fixture_id': fixture.id,
-                'fixture_name': str(fixture),
+                'fixture_id': candidate.id,
+                'fixture_name': candidate.name,
                 'conflicts': conflicts
             })
-    
-    return all_conflicts
\ No newline at end of file
+
+    return all_conflicts
@@ -1,174 +1,158 @@
 # fixtures/services/generator.py
 from __future__ import annotations
 
-import random
-from datetime import datetime, timedelta
-from typing import List, Dict, Tuple, Optional
+from dataclasses import replace
+from datetime import datetime, time, timedelta
+from typing import Any, List, Dict, Tuple, Optional
 from django.utils import timezone
-from django.db import transaction
+from django.utils.dateparse import parse_datetime, parse_time
 from django.core.exceptions import ValidationError
 
-from ..models import Fixture
 from venues.models import Venue
 from teams.models import Team
 from registrations.models import Registration
+from .scheduling import (
+    ScheduleConstraints, ScheduleResult, knockout_pairings, round_robin_pairings, schedule_matches,
+)
 
 
-def generate_round_robin(teams: List[int], event_id: int, start_date: datetime = None, venues: List[int] = None) -> List[Dict]:
+def _venue_ids(venues: Optional[List[int]]) -> List[int]:
+    if venues:
+        venue_ids = list(Venue.objects.filter(id__in=venues).values_list('id', flat=True))
+    else:
+        venue_ids = list(Venue.objects.order_by('id').values_list('id', flat=True)[:3])  # Default to first 3 venues
+
+    if not venue_ids:
+        raise ValidationError("No venues available")
+    return venue_ids
+
+
+def _fixture_data(result: ScheduleResult, event_id: int, phase: str) -> List[Dict]:
+    if result.unscheduled:
+        raise ValidationError(
+            f"Could not fit {len(result.unscheduled)} of "
+            f"{len(result.unscheduled) + len(result.matches)} matches into the available venue slots"
+        )
+    return [
+        {
+            'event_id': event_id,
+            'round': match.round_no,
+            'phase': phase,
+            'home_team_id': match.team_home_id,
+            'away_team_id': match.team_away_id,
+            'venue_id': match.venue_id,
+            'start_at': match.starts_at.isoformat(),
+            'status': 'SCHEDULED'
+        }
+        for match in result.matches
+    ]
+
+
+def generate_round_robin(teams: List[int], event_id: int, start_date: datetime = None, venues: List[int] = None,
+                         constraints: ScheduleConstraints = None) -> List[Dict]:
     """
     Generate round-robin fixtures for teams
-    
+
     Args:
         teams: List of team IDs
         event_id: Event ID
         start_date: Start date for fixtures (defaults to now + 1 day)
         venues: List of venue IDs to use
-    
+        constraints: Match length, team rest, daily window and blackouts
+
     Returns:
         List of fixture dictionaries
     """
     if len(teams) < 2:
         raise ValidationError("Need at least 2 teams for round-robin")
-    
-    # Handle odd number of teams
-    if len(teams) % 2 == 1:
-        teams = teams + [None]  # Add bye
-    
+
     # Default start date
     if not start_date:
         start_date = timezone.now() + timedelta(days=1)
-    
-    # Get venues
-    if venues:
-        venue_objects = Venue.objects.filter(id__in=venues)
-    else:
-        venue_objects = Venue.objects.all()[:3]  # Default to first 3 venues
-    
-    if not venue_objects.exists():
-        raise ValidationError("No venues available")
-    
-    venue_list = list(venue_objects)
-    
-    fixtures = []
-    num_teams = len(teams)
-    rounds = num_teams - 1
-    
-    for round_num in range(rounds):
-        # Generate matches for this round
-        for i in range(num_teams // 2):
-            home_idx = i
-            away_idx = num_teams - 1 - i
-            
-            # Skip if either team is bye
-            if teams[home_idx] is None or teams[away_idx] is None:
-                continue
-            
-            # Calculate match time
-            match_date = start_date + timedelta(days=round_num)
-            match_time = match_date.replace(hour=10 + (i * 2), minute=0, second=0, microsecond=0)
-            
-            # Assign venue
-            venue = venue_list[i % len(venue_list)]
-            
-            fixture_data = {
-                'event_id': event_id,
-                'round': round_num + 1,
-                'phase': 'RR',
-                'home_team_id': teams[home_idx],
-                'away_team_id': teams[away_idx],
-                'venue_id': venue.id,
-                'start_at': match_time.isoformat(),
-                'status': 'SCHEDULED'
-            }
-            
-            fixtures.append(fixture_data)
-        
-        # Rotate teams (except first team)
-        teams = [teams[0]] + teams[1:] + [teams[1]]
-    
-    return fixtures
 
+    result = schedule_matches(round_robin_pairings(teams), _venue_ids(venues), start_date, constraints)
+    return _fixture_data(result, event_id, 'RR')
 
-def generate_knockout(teams: List[int], event_id: int, start_date: datetime = None, venues: List[int] = None) -> List[Dict]:
+
+def generate_knockout(teams: List[int], event_id: int, start_date: datetime = None, venues: List[int] = None,
+                      constraints: ScheduleConstraints = None) -> List[Dict]:
     """
     Generate knockout fixtures for teams
-    
+
     Args:
         teams: List of team IDs
         event_id: Event ID
         start_date: Start date for fixtures (defaults to now + 1 day)
         venues: List of venue IDs to use
-    
+        constraints: Match length, team rest, daily window and blackouts
+
     Returns:
         List of fixture dictionaries
     """
     if len(teams) < 2:
         raise ValidationError("Need at least 2 teams for knockout")
-    
+
     # Default start date
     if not start_date:
         start_date = timezone.now() + timedelta(days=1)
-    
-    # Get venues
-    if venues:
-        venue_objects = Venue.objects.filter(id__in=venues)
-    else:
-        venue_objects = Venue.objects.all()[:3]  # Default to first 3 venues
-    
-    if not venue_objects.exists():
-        raise ValidationError("No venues available")
-    
-    venue_list = list(venue_objects)
-    
-    fixtures = []
-    num_teams = len(teams)
-    rounds = (num_teams - 1).bit_length()
-    
-    # Add byes to make it a power of 2
-    while len(teams) < 2 ** rounds:
-        teams.append(None)
-    
-    match_number = 1
-    current_teams = teams.copy()
-    
-    for round_num in range(1, rounds + 1):
-        matches_in_round = len(current_teams) // 2
-        next_round_teams = []
-        
-        for match_idx in range(matches_in_round):
-            home_idx = match_idx * 2
-            away_idx = home_idx + 1
-            
-            # Calculate match time
-            match_date = start_date + timedelta(days=(round_num - 1) * 2)
-            match_time = match_date.replace(hour=10 + (match_idx * 3), minute=0, second=0, microsecond=0)
-            
-            # Assign venue
-            venue = venue_list[match_idx % len(venue_list)]
-            
-            fixture_data = {
-                'event_id': event_id,
-                'round': round_num,
-                'phase': 'KO',
-                'home_team_id': current_teams[home_idx],
-                'away_team_id': current_teams[away_idx],
-                'venue_id': venue.id,
-                'start_at': match_time.isoformat(),
-                'status': 'SCHEDULED',
-                'match_number': match_number
-            }
-            
-            fixtures.append(fixture_data)
-            match_number += 1
-            
-            # Add winner to next round (placeholder for now)
-            next_round_teams.append(None)
-        
-        current_teams = next_round_teams
-    
+
+    # Winners must be known before the next round is played
+    constraints = replace(constraints or ScheduleConstraints(), round_barrier=True)
+    result = schedule_matches(knockout_pairings(teams), _venue_ids(venues), start_date, constraints)
+
+    fixtures = _fixture_data(result, event_id, 'KO')
+    for match_number, fixture_data in enumerate(sorted(fixtures, key=lambda f: (f['round'], f['start_at'])), start=1):
+        fixture_data['match_number'] = match_number
     return fixtures
 
 
+def _hint_datetime(value: Any, name: str) -> datetime:
+    parsed = value if isinstance(value, datetime) else parse_datetime(str(value))
+    if parsed is None:
+        raise ValidationError(f"Invalid datetime for {name}: {value}")
+    return timezone.make_aware(parsed) if timezone.is_naive(parsed) else parsed
+
+
+def _hint_time(value: Any, name: str) -> time:
+    parsed = value if isinstance(value, time) else parse_time(str(value))
+    if parsed is None:
+        raise ValidationError(f"Invalid time for {name}: {value}")
+    return parsed
+
+
+def parse_slot_hints(slot_hints: Optional[Dict]) -> Tuple[Optional[datetime], Optional[List[int]], ScheduleConstraints]:
+    """
+    Read generation options from a request's slot_hints:
+    start_date, venues, duration_minutes, turnover_minutes, min_rest_minutes,
+    day_start / day_end ("HH:MM") and blackouts ([{"start": ..., "end": ...}]).
+    """
+    slot_hints = slot_hints or {}
+    constraints = ScheduleConstraints()
+    try:
+        for hint, attr in (('duration_minutes', 'duration'), ('turnover_minutes', 'turnover'),
+                           ('min_rest_minutes', 'min_rest')):
+            if slot_hints.get(hint) is not None:
+                setattr(constraints, attr, timedelta(minutes=int(slot_hints[hint])))
+    except (TypeError, ValueError):
+        raise ValidationError("Durations in slot_hints must be whole minutes")
+    if constraints.duration <= timedelta(0):
+        raise ValidationError("duration_minutes must be positive")
+
+    for hint in ('day_start', 'day_end'):
+        if slot_hints.get(hint):
+            setattr(constraints, hint, _hint_time(slot_hints[hint], hint))
+
+    for blackout in slot_hints.get('blackouts') or []:
+        start = _hint_datetime(blackout.get('start'), 'blackout start')
+        end = _hint_datetime(blackout.get('end'), 'blackout end')
+        if end <= start:
+            raise ValidationError("Blackout end must be after its start")
+        constraints.blackouts.append((start, end))
+
+    start_date = _hint_datetime(slot_hints['start_date'], 'start_date') if slot_hints.get('start_date') else None
+    return start_date, slot_hints.get('venues') or None, constraints
+
+
 def get_available_teams_for_event(event_id: int) -> List[Dict]:
     """Get available teams for an event"""
     teams = Team.objects.filter(
@@ -190,4 +174,4 @@ def validate_participants(participants: List[int], event_id: int) -> Dict:
         'valid': len(invalid_ids) == 0,
         'invalid_ids': invalid_ids,
         'available_teams': available_teams
-    }
\ No newline at end of file
+    }
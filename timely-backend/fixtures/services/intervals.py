@@ -0,0 +1,63 @@
+# fixtures/services/intervals.py
+"""
+Static interval tree for schedule conflict checks.
+
+Intervals are half-open [start, end) and sorted once by start; an implicit
+balanced tree over the sorted array keeps, per node, the latest end in its
+subtree so overlap queries skip whole subtrees. Building is O(n log n) and
+each query is O(log n + k) for k overlaps.
+"""
+from __future__ import annotations
+
+from typing import Any, Generic, Iterable, List, Tuple, TypeVar
+
+T = TypeVar('T')
+
+
+class IntervalTree(Generic[T]):
+    """Immutable set of (start, end, item) intervals supporting overlap queries"""
+
+    def __init__(self, intervals: Iterable[Tuple[Any, Any, T]] = ()):
+        self._intervals = sorted(intervals, key=lambda interval: (interval[0], interval[1]))
+        self._max_end: List[Any] = [None] * len(self._intervals)
+        if self._intervals:
+            self._build(0, len(self._intervals))
+
+    def __len__(self):
+        return len(self._intervals)
+
+    def _build(self, lo: int, hi: int):
+        mid = (lo + hi) // 2
+        latest = self._intervals[mid][1]
+        if lo < mid:
+            latest = max(latest, self._build(lo, mid))
+        if mid + 1 < hi:
+            latest = max(latest, self._build(mid + 1, hi))
+        self._max_end[mid] = latest
+        return latest
+
+    def overlapping(self, start, end) -> List[Tuple[Any, Any, T]]:
+        """All intervals overlapping [start, end), in start order"""
+        found: List[Tuple[Any, Any, T]] = []
+        if self._intervals:
+            self._query(0, len(self._intervals), start, end, found)
+        return found
+
+    def _query(self, lo: int, hi: int, start, end, found: list):
+        mid = (lo + hi) // 2
+        if self._max_end[mid] <= start:
+            # Nothing in this subtree ends after the query starts
+            return
+        if lo < mid:
+            self._query(lo, mid, start, end, found)
+        interval = self._intervals[mid]
+        if interval[0] >= end:
+            # This interval and everything to its right start too late
+            return
+        if interval[1] > start:
+            found.append(interval)
+        if mid + 1 < hi:
+            self._query(mid + 1, hi, start, end, found)
+
+    def overlaps(self, start, end) -> bool:
+        return bool(self.overlapping(start, end))
@@ -1,27 +1,37 @@
 # fixtures/services/scheduling.py
 """
-Scheduling services for generating Round-Robin and Knockout tournaments.
-Simple greedy placement algorithm for match scheduling.
+Scheduling engine for Round-Robin and Knockout tournaments.
+
+Matches are packed into parallel venue slots. Each venue's playable windows
+come from its AVAILABLE VenueSlots (or a default daily window when it has
+none), minus BLOCKED slots, blackout windows and fixtures already booked
+there. Matches are then placed round by round, each in the earliest free
+slot where both teams have had their minimum rest, so a round fills every
+free venue at once instead of being laid out one match after another.
 """
 
 from __future__ import annotations
-from typing import List, Optional, Dict, Any
-from datetime import datetime, timedelta
-from itertools import combinations, permutations
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 import math
 
 from django.utils import timezone
 from django.db import transaction
 
-from ..models import Match
-from events.models import Event, Division
+from ..models import Fixture
+from .conflicts import ACTIVE_STATUSES, FIXTURE_DURATION
+from .intervals import IntervalTree
 from teams.models import Team
 
+Pairing = Tuple[Optional[int], Optional[int]]
+
 
 class MatchPrototype:
     """Prototype for a match to be created"""
-    def __init__(self, round_no: int, sequence_no: int, team_home_id: Optional[int], 
-                 team_away_id: Optional[int], starts_at: Optional[datetime] = None, 
+    def __init__(self, round_no: int, sequence_no: int, team_home_id: Optional[int],
+                 team_away_id: Optional[int], starts_at: Optional[datetime] = None,
                  venue_id: Optional[int] = None, duration_minutes: int = 60):
         self.round_no = round_no
         self.sequence_no = sequence_no
@@ -31,12 +41,299 @@ class MatchPrototype:
         self.venue_id = venue_id
         self.duration_minutes = duration_minutes
 
+    @property
+    def ends_at(self) -> Optional[datetime]:
+        if self.starts_at is None:
+            return None
+        return self.starts_at + timedelta(minutes=self.duration_minutes)
+
+    def __repr__(self):
+        return (f'<MatchPrototype R{self.round_no}#{self.sequence_no} '
+                f'{self.team_home_id} v {self.team_away_id} @ {self.venue_id} {self.starts_at}>')
+
+
+@dataclass
+class ScheduleConstraints:
+    """
+    Constraints for packing matches into venue slots.
+
+    Consecutive matches at one venue are at least duration + turnover apart,
+    and a team's next match starts no sooner than min_rest after its last one
+    ends. Both spacings are floored at FIXTURE_DURATION so generated schedules
+    pass the fixture conflict checks.
+    """
+    duration: timedelta = timedelta(minutes=90)
+    turnover: timedelta = timedelta(minutes=30)
+    min_rest: timedelta = timedelta(hours=12)
+    day_start: time = time(9, 0)
+    day_end: time = time(21, 0)
+    blackouts: List[Tuple[datetime, datetime]] = field(default_factory=list)
+    horizon: timedelta = timedelta(days=180)
+    round_barrier: bool = False  # a round starts only after the previous one has finished
+
+    @property
+    def slot_length(self) -> timedelta:
+        return max(self.duration + self.turnover, FIXTURE_DURATION)
+
+    @property
+    def team_spacing(self) -> timedelta:
+        return max(self.duration + self.min_rest, FIXTURE_DURATION)
+
+
+@dataclass
+class ScheduleResult:
+    """Outcome of a scheduling run"""
+    matches: List[MatchPrototype]
+    unscheduled: List[MatchPrototype]
+    slots_available: int = 0
+
+    @property
+    def first_start(self) -> Optional[datetime]:
+        return min((m.starts_at for m in self.matches), default=None)
+
+    @property
+    def last_end(self) -> Optional[datetime]:
+        return max((m.ends_at for m in self.matches), default=None)
+
+    @property
+    def makespan(self) -> timedelta:
+        if not self.matches:
+            return timedelta(0)
+        return self.last_end - self.first_start
+
+    @property
+    def days_used(self) -> int:
+        return len({timezone.localtime(m.starts_at).date() for m in self.matches})
+
+
+def round_robin_pairings(teams: Sequence[int], legs: int = 1) -> List[List[Pairing]]:
+    """
+    Pair teams with the circle method: n - 1 rounds (n rounded up to even)
+    in which every team plays at most once. Home and away alternate, and
+    every further leg mirrors the one before it.
+    """
+    slots: List[Optional[int]] = list(teams)
+    if len(slots) < 2:
+        return []
+    if len(slots) % 2:
+        slots.append(None)  # bye
+
+    n = len(slots)
+    first_leg: List[List[Pairing]] = []
+    for round_idx in range(n - 1):
+        pairings = []
+        for i in range(n // 2):
+            home, away = slots[i], slots[n - 1 - i]
+            if home is None or away is None:
+                continue
+            if (round_idx + i) % 2:
+                home, away = away, home
+            pairings.append((home, away))
+        first_leg.append(pairings)
+        # Keep the first team fixed and rotate the rest one place
+        slots = [slots[0], slots[-1]] + slots[1:-1]
+
+    rounds = []
+    for leg in range(legs):
+        for pairings in first_leg:
+            rounds.append(pairings if leg % 2 == 0 else [(away, home) for home, away in pairings])
+    return rounds
 
-def generate_rr(teams: List[int], rounds: int = 1, starts_at: datetime = None, 
+
+def knockout_pairings(teams: Sequence[int]) -> List[List[Pairing]]:
+    """
+    Bracket rounds for a knockout. Teams given a bye skip the first round;
+    later rounds are placeholders (None vs None) until winners are known.
+    """
+    if len(teams) < 2:
+        return []
+    bracket_size = 2 ** math.ceil(math.log2(len(teams)))
+    byes = bracket_size - len(teams)
+    first = list(teams[byes:])
+    rounds = [[(first[i], first[i + 1]) for i in range(0, len(first), 2)]]
+
+    remaining = bracket_size // 2
+    while remaining > 1:
+        rounds.append([(None, None)] * (remaining // 2))
+        remaining //= 2
+    return rounds
+
+
+def _local_days(start: datetime, end: datetime) -> Iterable[date]:
+    day = timezone.localtime(start).date()
+    last = timezone.localtime(end).date()
+    while day <= last:
+        yield day
+        day += timedelta(days=1)
+
+
+def _daily_windows(start: datetime, end: datetime, constraints: ScheduleConstraints) -> List[Tuple[datetime, datetime]]:
+    windows = []
+    tz = timezone.get_current_timezone()
+    for day in _local_days(start, end):
+        opens = timezone.make_aware(datetime.combine(day, constraints.day_start), tz)
+        closes = timezone.make_aware(datetime.combine(day, constraints.day_end), tz)
+        if closes <= opens:
+            closes += timedelta(days=1)  # overnight window
+        windows.append((opens, closes))
+    return windows
+
+
+def build_venue_slots(venue_ids: Sequence[Optional[int]], starts_at: datetime,
+                      constraints: ScheduleConstraints) -> Dict[Optional[int], List[datetime]]:
+    """
+    Candidate match start times per venue between starts_at and the horizon.
+
+    Costs two queries however many venues and days are involved: one for
+    the venues' VenueSlots, one for fixtures already booked there.
+    """
+    from venues.models import VenueSlot
+
+    ends_at = starts_at + constraints.horizon
+    real_ids = [venue_id for venue_id in venue_ids if venue_id is not None]
+
+    open_windows: Dict[int, list] = {}
+    unavailable: Dict[Optional[int], list] = {venue_id: [] for venue_id in venue_ids}
+    if real_ids:
+        venue_slots = VenueSlot.objects.filter(
+            venue_id__in=real_ids, starts_at__lt=ends_at, ends_at__gt=starts_at,
+        ).order_by().values_list('venue_id', 'starts_at', 'ends_at', 'status')
+        for venue_id, slot_start, slot_end, slot_status in venue_slots:
+            if slot_status == VenueSlot.Status.AVAILABLE:
+                open_windows.setdefault(venue_id, []).append((slot_start, slot_end))
+            else:
+                unavailable[venue_id].append((slot_start, slot_end, None))
+
+        booked = Fixture.objects.filter(
+            venue_id__in=real_ids,
+            start_at__gt=starts_at - FIXTURE_DURATION,
+            start_at__lt=ends_at,
+            status__in=ACTIVE_STATUSES,
+        ).order_by().values_list('venue_id', 'start_at')
+        for venue_id, fixture_start in booked:
+            unavailable[venue_id].append((fixture_start, fixture_start + FIXTURE_DURATION, None))
+
+    blackouts = [(start, end, None) for start, end in constraints.blackouts]
+    default_windows = _daily_windows(starts_at, ends_at, constraints)
+    step = constraints.slot_length
+
+    slots: Dict[Optional[int], List[datetime]] = {}
+    for venue_id in venue_ids:
+        # A match holds the venue for its slot, so test the whole slot (turnover included)
+        closed = IntervalTree(unavailable[venue_id] + blackouts)
+        starts = []
+        for window_start, window_end in sorted(open_windows.get(venue_id, default_windows)):
+            slot_start = max(window_start, starts_at)
+            while slot_start + constraints.duration <= min(window_end, ends_at):
+                blocking = closed.overlapping(slot_start, slot_start + step)
+                if blocking:
+                    # Resume once everything in the way has ended
+                    slot_start = max(end for _, end, _ in blocking)
+                else:
+                    starts.append(slot_start)
+                    slot_start += step
+        slots[venue_id] = starts
+    return slots
+
+
+class SlotGrid:
+    """
+    Free venue slots grouped by start time. take() returns the earliest slot
+    at or after a given time; exhausted start times are skipped through a
+    path-compressed "next free" index so each lookup is near O(log n).
+    """
+
+    def __init__(self, slots: Dict[Optional[int], List[datetime]]):
+        by_time: Dict[datetime, list] = {}
+        for venue_id, starts in slots.items():
+            for start in starts:
+                by_time.setdefault(start, []).append(venue_id)
+        self.times = sorted(by_time)
+        # Popped from the end, so the lowest venue id is used first
+        self.free = [sorted(by_time[t], key=lambda v: -1 if v is None else v, reverse=True) for t in self.times]
+        self._next = list(range(len(self.times) + 1))
+        self.size = sum(len(venues) for venues in self.free)
+
+    def _find(self, i: int) -> int:
+        root = i
+        while self._next[root] != root:
+            root = self._next[root]
+        while self._next[i] != root:
+            self._next[i], i = root, self._next[i]
+        return root
+
+    def take(self, earliest: datetime) -> Optional[Tuple[datetime, Optional[int]]]:
+        i = self._find(bisect_left(self.times, earliest))
+        if i == len(self.times):
+            return None
+        venue_id = self.free[i].pop()
+        if not self.free[i]:
+            self._next[i] = i + 1
+        return self.times[i], venue_id
+
+
+def pack_matches(rounds: List[List[Pairing]], slots: Dict[Optional[int], List[datetime]],
+                 constraints: ScheduleConstraints, starts_at: Optional[datetime] = None) -> ScheduleResult:
+    """
+    Place every pairing in the earliest free slot where both teams are rested.
+
+    Rounds are placed in order, so later rounds back-fill venue slots left
+    over by earlier ones whenever their teams are free. No database access.
+    """
+    grid = SlotGrid(slots)
+    earliest_start = starts_at or (grid.times[0] if grid.times else timezone.now())
+    duration_minutes = int(constraints.duration.total_seconds() // 60)
+    ready: Dict[int, datetime] = {}
+    scheduled: List[MatchPrototype] = []
+    unscheduled: List[MatchPrototype] = []
+    round_ready = earliest_start
+
+    for round_no, pairings in enumerate(rounds, start=1):
+        round_end = round_ready
+        for sequence_no, (home_id, away_id) in enumerate(pairings, start=1):
+            match = MatchPrototype(round_no, sequence_no, home_id, away_id, duration_minutes=duration_minutes)
+            earliest = max(
+                round_ready if constraints.round_barrier else earliest_start,
+                ready.get(home_id, earliest_start),
+                ready.get(away_id, earliest_start),
+            )
+            slot = grid.take(earliest)
+            if slot is None:
+                unscheduled.append(match)
+                continue
+
+            match.starts_at, match.venue_id = slot
+            scheduled.append(match)
+            for team_id in (home_id, away_id):
+                if team_id is not None:
+                    ready[team_id] = match.starts_at + constraints.team_spacing
+            round_end = max(round_end, match.starts_at + constraints.team_spacing)
+        round_ready = round_end
+
+    scheduled.sort(key=lambda m: (m.starts_at, m.round_no, m.sequence_no))
+    return ScheduleResult(matches=scheduled, unscheduled=unscheduled, slots_available=grid.size)
+
+
+def schedule_matches(rounds: List[List[Pairing]], venue_ids: Optional[Sequence[int]] = None,
+                     starts_at: Optional[datetime] = None,
+                     constraints: Optional[ScheduleConstraints] = None) -> ScheduleResult:
+    """
+    Lay out pairings across venues, honouring VenueSlot availability,
+    blocked slots, existing fixtures, blackouts and team rest.
+
+    Without venues every match goes to a single unnamed pitch.
+    """
+    constraints = constraints or ScheduleConstraints()
+    starts_at = starts_at or timezone.now()
+    slots = build_venue_slots(list(venue_ids) if venue_ids else [None], starts_at, constraints)
+    return pack_matches(rounds, slots, constraints, starts_at)
+
+
+def generate_rr(teams: List[int], rounds: int = 1, starts_at: datetime = None,
                 duration: int = 60, gap: int = 30, venue_ids: List[int] = None) -> List[MatchPrototype]:
     """
     Generate Round-Robin tournament matches.
-    
+
     Args:
         teams: List of team IDs
         rounds: Number of rounds (default 1 for single round-robin)
@@ -44,195 +341,91 @@ def generate_rr(teams: List[int], rounds: int = 1, starts_at: datetime = None,
         duration: Match duration in minutes
         gap: Gap between matches in minutes
         venue_ids: List of venue IDs to distribute matches across
-        
+
     Returns:
         List of MatchPrototype objects
     """
-    if len(teams) < 2:
-        return []
-    
-    matches = []
-    current_time = starts_at or timezone.now()
-    venue_index = 0
-    
-    # Generate all possible pairings
-    team_pairs = list(combinations(teams, 2))
-    
-    # For multiple rounds, repeat the pairings
-    for round_num in range(1, rounds + 1):
-        sequence = 1
-        
-        for home_team, away_team in team_pairs:
-            # Alternate home/away for fairness
-            if round_num % 2 == 0:
-                home_team, away_team = away_team, home_team
-            
-            # Assign venue if available
-            venue_id = None
-            if venue_ids:
-                venue_id = venue_ids[venue_index % len(venue_ids)]
-                venue_index += 1
-            
-            match = MatchPrototype(
-                round_no=round_num,
-                sequence_no=sequence,
-                team_home_id=home_team,
-                team_away_id=away_team,
-                starts_at=current_time,
-                venue_id=venue_id,
-                duration_minutes=duration
-            )
-            matches.append(match)
-            
-            # Advance time for next match
-            current_time += timedelta(minutes=duration + gap)
-            sequence += 1
-    
-    return matches
+    constraints = ScheduleConstraints(duration=timedelta(minutes=duration), turnover=timedelta(minutes=gap))
+    result = schedule_matches(round_robin_pairings(teams, legs=rounds), venue_ids, starts_at, constraints)
+    return result.matches
 
 
-def generate_ko(teams: List[int], starts_at: datetime = None, duration: int = 60, 
+def generate_ko(teams: List[int], starts_at: datetime = None, duration: int = 60,
                 gap: int = 30, venue_ids: List[int] = None) -> List[MatchPrototype]:
     """
     Generate Knockout tournament matches.
-    
+
     Args:
         teams: List of team IDs
         starts_at: Start time for first match
         duration: Match duration in minutes
         gap: Gap between matches in minutes
         venue_ids: List of venue IDs to distribute matches across
-        
+
     Returns:
         List of MatchPrototype objects
     """
-    if len(teams) < 2:
-        return []
-    
-    matches = []
-    current_time = starts_at or timezone.now()
-    venue_index = 0
-    
-    # Calculate bracket size (nearest power of 2)
-    bracket_size = 2 ** math.ceil(math.log2(len(teams)))
-    num_byes = bracket_size - len(teams)
-    
-    # Create initial bracket with byes
-    bracket_teams = teams.copy()
-    for i in range(num_byes):
-        bracket_teams.append(None)  # None represents a bye
-    
-    # Generate matches round by round
-    current_round_teams = bracket_teams.copy()
-    round_num = 1
-    
-    while len(current_round_teams) > 1:
-        next_round_teams = []
-        sequence = 1
-        
-        # Pair teams for this round
-        for i in range(0, len(current_round_teams), 2):
-            home_team = current_round_teams[i]
-            away_team = current_round_teams[i + 1] if i + 1 < len(current_round_teams) else None
-            
-            # Skip matches where one team is None (bye)
-            if home_team is None and away_team is None:
-                continue
-            elif home_team is None:
-                # Bye for away team
-                next_round_teams.append(away_team)
-                continue
-            elif away_team is None:
-                # Bye for home team
-                next_round_teams.append(home_team)
-                continue
-            
-            # Assign venue if available
-            venue_id = None
-            if venue_ids:
-                venue_id = venue_ids[venue_index % len(venue_ids)]
-                venue_index += 1
-            
-            match = MatchPrototype(
-                round_no=round_num,
-                sequence_no=sequence,
-                team_home_id=home_team,
-                team_away_id=away_team,
-                starts_at=current_time,
-                venue_id=venue_id,
-                duration_minutes=duration
-            )
-            matches.append(match)
-            
-            # Advance time for next match
-            current_time += timedelta(minutes=duration + gap)
-            sequence += 1
-            
-            # Winner advances (placeholder for now)
-            next_round_teams.append(home_team)
-        
-        current_round_teams = next_round_teams
-        round_num += 1
-    
-    return matches
-
-
-def create_matches_from_prototypes(event_id: int, division_id: Optional[int], 
-                                 prototypes: List[MatchPrototype]) -> List[Match]:
-    """
-    Create Match objects from prototypes.
-    
+    constraints = ScheduleConstraints(
+        duration=timedelta(minutes=duration), turnover=timedelta(minutes=gap), round_barrier=True,
+    )
+    result = schedule_matches(knockout_pairings(teams), venue_ids, starts_at, constraints)
+    return result.matches
+
+
+def create_matches_from_prototypes(event_id: int, division_id: Optional[int],
+                                 prototypes: List[MatchPrototype]) -> List[Fixture]:
+    """
+    Create Fixture objects from prototypes.
+
     Args:
         event_id: Event ID
-        division_id: Division ID (optional)
+        division_id: Division ID (unused; fixtures are not split by division)
         prototypes: List of MatchPrototype objects
-        
+
     Returns:
-        List of created Match objects
+        List of created Fixture objects
     """
-    matches = []
-    
     with transaction.atomic():
-        for proto in prototypes:
-            fixture = Fixture.objects.create(
+        return Fixture.objects.bulk_create([
+            Fixture(
                 event_id=event_id,
-                round_no=proto.round_no,
-                starts_at=proto.starts_at,
-                ends_at=proto.starts_at + timedelta(minutes=proto.duration_minutes),
+                round=proto.round_no,
+                home_id=proto.team_home_id,
+                away_id=proto.team_away_id,
+                start_at=proto.starts_at,
                 venue_id=proto.venue_id,
-                status=Fixture.Status.DRAFT
+                status=Fixture.Status.SCHEDULED
             )
-            matches.append(fixture)
-    
-    return matches
+            for proto in prototypes
+        ])
 
 
 def get_available_teams_for_event(event_id: int, division_id: Optional[int] = None) -> List[int]:
     """
     Get available team IDs for an event/division.
-    
+
     Args:
         event_id: Event ID
         division_id: Division ID (optional)
-        
+
     Returns:
         List of team IDs
     """
     try:
         from registrations.models import Registration
-        
+
         # Get teams from confirmed registrations
         registrations = Registration.objects.filter(
             event_id=event_id,
             status='CONFIRMED',
             registration_type='TEAM'
         )
-        
+
         if division_id:
             registrations = registrations.filter(division_id=division_id)
-        
+
         return [reg.team_id for reg in registrations if reg.team_id]
-    
+
     except ImportError:
         # Fallback: get all teams if registrations not available
         return list(Team.objects.values_list('id', flat=True))
@@ -0,0 +1,167 @@
+# fixtures/tests/test_conflicts.py
+import random
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from events.models import Event
+from teams.models import Team
+from venues.models import Venue, VenueSlot
+from fixtures.models import Fixture
+from fixtures.services.conflicts import (
+    check_fixture_conflicts, find_conflicts, suggest_alternative_times,
+    validate_fixture_schedule, check_venue_availability,
+)
+from fixtures.services.intervals import IntervalTree
+
+User = get_user_model()
+
+
+class IntervalTreeTest(SimpleTestCase):
+    """Test the interval tree against a brute-force scan"""
+
+    def test_matches_brute_force(self):
+        rng = random.Random(7)
+        intervals = []
+        for i in range(400):
+            start = rng.randint(0, 10000)
+            intervals.append((start, start + rng.randint(1, 300), i))
+        tree = IntervalTree(intervals)
+
+        for _ in range(200):
+            start = rng.randint(-100, 10100)
+            end = start + rng.randint(1, 500)
+            expected = sorted(i for s, e, i in intervals if s < end and e > start)
+            self.assertEqual(sorted(item for _, _, item in tree.overlapping(start, end)), expected)
+
+    def test_half_open_boundaries(self):
+        tree = IntervalTree([(10, 20, 'a')])
+        self.assertFalse(tree.overlaps(20, 30))
+        self.assertFalse(tree.overlaps(0, 10))
+        self.assertTrue(tree.overlaps(19, 30))
+        self.assertFalse(IntervalTree().overlaps(0, 100))
+
+
+class ConflictEngineTest(TestCase):
+    """Test fixture conflict detection"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(email='organizer@test.com', password='testpass123')
+        self.start = timezone.now().replace(microsecond=0) + timedelta(days=7)
+        self.event = Event.objects.create(
+            name='Cup',
+            sport='Football',
+            start_datetime=self.start,
+            end_datetime=self.start + timedelta(days=30),
+            created_by=self.user,
+        )
+        self.venue = Venue.objects.create(name='Main Ground', address='1 Park Rd', created_by=self.user)
+        self.other_venue = Venue.objects.create(name='Side Ground', address='2 Park Rd', created_by=self.user)
+        self.teams = Team.objects.bulk_create([
+            Team(name=f'Team {i}', manager=self.user, event=self.event) for i in range(6)
+        ])
+        # bulk_create skips Fixture.clean(), so clashing fixtures can be set up directly
+        self.base, self.venue_clash, self.team_clash, self.clear = Fixture.objects.bulk_create([
+            Fixture(event=self.event, home=self.teams[0], away=self.teams[1], venue=self.venue, start_at=self.start),
+            Fixture(event=self.event, home=self.teams[2], away=self.teams[3], venue=self.venue,
+                    start_at=self.start + timedelta(hours=1)),
+            Fixture(event=self.event, home=self.teams[4], away=self.teams[0], venue=self.other_venue,
+                    start_at=self.start + timedelta(minutes=30)),
+            Fixture(event=self.event, home=self.teams[4], away=self.teams[5], venue=self.venue,
+                    start_at=self.start + timedelta(hours=3)),
+        ])
+
+    def test_check_fixture_conflicts_shape(self):
+        fixture = Fixture.objects.get(id=self.base.id)
+        with self.assertNumQueries(2):
+            conflicts = check_fixture_conflicts(fixture)
+
+        self.assertEqual([c['type'] for c in conflicts], ['venue_conflict', 'team_conflict'])
+        venue_conflict, team_conflict = conflicts
+        self.assertEqual(venue_conflict['fixture_id'], self.venue_clash.id)
+        self.assertEqual(venue_conflict['message'], f'Venue Main Ground is already booked at {self.venue_clash.start_at}')
+        self.assertEqual(venue_conflict['conflicting_fixture'], {
+            'id': self.venue_clash.id,
+            'home_team': 'Team 2',
+            'away_team': 'Team 3',
+            'start_at': self.venue_clash.start_at.isoformat(),
+        })
+        self.assertEqual(team_conflict['fixture_id'], self.team_clash.id)
+        self.assertEqual(team_conflict['message'], f'Team Team 0 is already playing at {self.team_clash.start_at}')
+
+    def test_no_conflicts_outside_window(self):
+        self.assertEqual(check_fixture_conflicts(Fixture.objects.get(id=self.clear.id)), [])
+
+    def test_finished_fixtures_do_not_clash(self):
+        Fixture.objects.filter(id=self.venue_clash.id).update(status=Fixture.Status.FINAL)
+        conflicts = check_fixture_conflicts(Fixture.objects.get(id=self.base.id))
+        self.assertEqual([c['fixture_id'] for c in conflicts], [self.team_clash.id])
+
+    def test_blocked_venue_slot(self):
+        VenueSlot.objects.create(
+            venue=self.venue,
+            starts_at=self.start + timedelta(hours=4),
+            ends_at=self.start + timedelta(hours=6),
+            status=VenueSlot.Status.BLOCKED,
+            reason='Pitch maintenance',
+        )
+        conflicts = check_fixture_conflicts(Fixture.objects.get(id=self.clear.id))
+        self.assertEqual(len(conflicts), 1)
+        self.assertEqual(conflicts[0]['type'], 'venue_unavailable')
+        self.assertIn('Pitch maintenance', conflicts[0]['message'])
+
+    def test_find_conflicts_constant_queries(self):
+        with self.assertNumQueries(3):
+            conflicts = find_conflicts(self.event.id)
+
+        by_fixture = {entry['fixture_id']: entry for entry in conflicts}
+        self.assertEqual(set(by_fixture), {self.base.id, self.venue_clash.id, self.team_clash.id})
+        self.assertEqual(by_fixture[self.base.id]['fixture_name'], 'R1: Team 0 vs Team 1')
+
+    def test_validate_schedule_checks_candidates_against_each_other(self):
+        later = self.start + timedelta(days=2)
+        schedule = [
+            {'round': 2, 'home_team_id': self.teams[0].id, 'away_team_id': self.teams[2].id,
+             'venue_id': self.venue.id, 'start_at': later.isoformat()},
+            {'round': 2, 'home_team_id': self.teams[1].id, 'away_team_id': self.teams[3].id,
+             'venue_id': self.venue.id, 'start_at': (later + timedelta(hours=1)).isoformat()},
+            {'round': 2, 'home_team_id': self.teams[4].id, 'away_team_id': self.teams[5].id,
+             'venue_id': self.other_venue.id, 'start_at': later.isoformat()},
+        ]
+        result = validate_fixture_schedule(schedule, self.event.id)
+
+        self.assertFalse(result['valid'])
+        self.assertEqual([entry['fixture_index'] for entry in result['conflicts']], [0, 1])
+        clash = result['conflicts'][0]['conflicts'][0]
+        self.assertEqual(clash['type'], 'venue_conflict')
+        self.assertIsNone(clash['fixture_id'])
+        self.assertEqual(clash['conflicting_fixture']['fixture_index'], 1)
+        self.assertEqual(clash['message'], f'Venue Main Ground is already booked at {later + timedelta(hours=1)}')
+
+    def test_validate_large_schedule_constant_queries(self):
+        schedule = [
+            {'round': i, 'home_team_id': self.teams[i % 6].id, 'away_team_id': self.teams[(i + 1) % 6].id,
+             'venue_id': self.venue.id, 'start_at': self.start + timedelta(days=1, hours=3 * i)}
+            for i in range(300)
+        ]
+        # Fixtures, blocked slots, then one name lookup each for teams and venues
+        with self.assertNumQueries(4):
+            result = validate_fixture_schedule(schedule, self.event.id)
+        self.assertTrue(result['valid'])
+
+    def test_suggest_alternative_times_single_load(self):
+        with self.assertNumQueries(2):
+            suggestions = suggest_alternative_times(self.venue.id, self.start)
+
+        # +1h..+3h still overlap fixtures at the venue; -3h and the next days are free
+        self.assertEqual(suggestions, [
+            self.start - timedelta(hours=2),
+            self.start - timedelta(hours=3),
+            self.start + timedelta(days=1),
+            self.start + timedelta(days=2),
+            self.start + timedelta(days=3),
+        ])
+        for suggestion in suggestions:
+            self.assertTrue(check_venue_availability(self.venue.id, suggestion))
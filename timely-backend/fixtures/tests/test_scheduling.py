@@ -0,0 +1,199 @@
+# fixtures/tests/test_scheduling.py
+from collections import Counter
+from datetime import datetime, time, timedelta
+from itertools import combinations
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from events.models import Event
+from teams.models import Team
+from venues.models import Venue, VenueSlot
+from fixtures.models import Fixture
+from fixtures.services.conflicts import validate_fixture_schedule
+from fixtures.services.generator import generate_knockout, generate_round_robin, parse_slot_hints
+from fixtures.services.scheduling import (
+    ScheduleConstraints, knockout_pairings, pack_matches, round_robin_pairings, schedule_matches,
+)
+
+User = get_user_model()
+
+
+class PairingTest(SimpleTestCase):
+    """Test round pairings"""
+
+    def test_round_robin_pairs_every_team_once(self):
+        for team_count in (2, 5, 8, 11):
+            teams = list(range(1, team_count + 1))
+            rounds = round_robin_pairings(teams)
+            pairs = [frozenset(pair) for pairings in rounds for pair in pairings]
+
+            self.assertEqual(len(pairs), len(set(pairs)))
+            self.assertEqual(set(pairs), {frozenset(pair) for pair in combinations(teams, 2)})
+            for pairings in rounds:
+                playing = [team for pair in pairings for team in pair]
+                self.assertEqual(len(playing), len(set(playing)))
+
+    def test_second_leg_mirrors_first(self):
+        rounds = round_robin_pairings([1, 2, 3, 4], legs=2)
+        self.assertEqual(len(rounds), 6)
+        for first, second in zip(rounds[:3], rounds[3:]):
+            self.assertEqual(second, [(away, home) for home, away in first])
+
+    def test_knockout_byes(self):
+        rounds = knockout_pairings([1, 2, 3, 4, 5, 6])
+        self.assertEqual(rounds[0], [(3, 4), (5, 6)])
+        self.assertEqual([len(pairings) for pairings in rounds], [2, 2, 1])
+
+
+class PackMatchesTest(SimpleTestCase):
+    """Test packing pairings into venue slots without the database"""
+
+    def setUp(self):
+        self.start = timezone.make_aware(datetime(2030, 3, 4, 9, 0))
+        self.constraints = ScheduleConstraints(duration=timedelta(minutes=90), turnover=timedelta(minutes=30),
+                                               min_rest=timedelta(hours=12))
+
+    def _slots(self, venues, days):
+        return {
+            venue: [self.start + timedelta(days=day, hours=2 * i) for day in range(days) for i in range(6)]
+            for venue in venues
+        }
+
+    def test_rounds_use_parallel_venues(self):
+        rounds = round_robin_pairings(list(range(1, 9)))
+        result = pack_matches(rounds, self._slots([1, 2, 3, 4], days=10), self.constraints, self.start)
+
+        self.assertEqual(result.unscheduled, [])
+        # 4 matches per round on 4 venues: one start time per round, one round per day (12h rest)
+        self.assertEqual(len({match.starts_at for match in result.matches}), 7)
+        self.assertEqual(result.days_used, 7)
+
+    def test_team_rest_enforced(self):
+        rounds = round_robin_pairings(list(range(1, 7)))
+        result = pack_matches(rounds, self._slots([1, 2, 3, 4, 5, 6], days=10), self.constraints, self.start)
+
+        starts_by_team = {}
+        for match in result.matches:
+            for team in (match.team_home_id, match.team_away_id):
+                starts_by_team.setdefault(team, []).append(match.starts_at)
+        for starts in starts_by_team.values():
+            starts.sort()
+            for earlier, later in zip(starts, starts[1:]):
+                self.assertGreaterEqual(later - earlier, self.constraints.team_spacing)
+
+    def test_reports_matches_that_do_not_fit(self):
+        rounds = round_robin_pairings(list(range(1, 9)))
+        result = pack_matches(rounds, self._slots([1], days=2), self.constraints, self.start)
+        self.assertLessEqual(len(result.matches), result.slots_available)
+        self.assertTrue(result.unscheduled)
+        self.assertEqual(len(result.matches) + len(result.unscheduled), 28)
+
+    def test_knockout_rounds_wait_for_previous_round(self):
+        self.constraints.round_barrier = True
+        result = pack_matches(knockout_pairings(list(range(1, 9))), self._slots([1, 2], days=5), self.constraints, self.start)
+
+        last_by_round = {}
+        for match in result.matches:
+            last_by_round[match.round_no] = max(last_by_round.get(match.round_no, match.starts_at), match.starts_at)
+        for match in result.matches:
+            if match.round_no > 1:
+                self.assertGreaterEqual(match.starts_at, last_by_round[match.round_no - 1] + self.constraints.team_spacing)
+
+
+class ScheduleMatchesTest(TestCase):
+    """Test scheduling against venue availability"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(email='organizer@test.com', password='testpass123')
+        self.start = timezone.make_aware(datetime(2030, 3, 4, 0, 0))
+        self.event = Event.objects.create(
+            name='League',
+            sport='Football',
+            start_datetime=self.start,
+            end_datetime=self.start + timedelta(days=60),
+            created_by=self.user,
+        )
+        self.venues = Venue.objects.bulk_create([
+            Venue(name=f'Ground {i}', address=f'{i} Park Rd', created_by=self.user) for i in range(3)
+        ])
+        self.venue_ids = [venue.id for venue in self.venues]
+        self.teams = [
+            team.id for team in Team.objects.bulk_create([
+                Team(name=f'Team {i}', manager=self.user, event=self.event) for i in range(10)
+            ])
+        ]
+
+    def test_respects_blocked_slots_windows_and_blackouts(self):
+        first, second, third = self.venue_ids
+        VenueSlot.objects.create(venue_id=first, starts_at=self.start, ends_at=self.start + timedelta(days=3),
+                                 status=VenueSlot.Status.BLOCKED, reason='Resurfacing')
+        VenueSlot.objects.create(venue_id=second, starts_at=self.start + timedelta(hours=18),
+                                 ends_at=self.start + timedelta(hours=22), status=VenueSlot.Status.AVAILABLE)
+        blackout = (self.start + timedelta(days=1), self.start + timedelta(days=2))
+        constraints = ScheduleConstraints(blackouts=[blackout], horizon=timedelta(days=20))
+
+        with self.assertNumQueries(2):
+            result = schedule_matches(round_robin_pairings(self.teams), self.venue_ids, self.start, constraints)
+
+        self.assertEqual(result.unscheduled, [])
+        for match in result.matches:
+            self.assertFalse(match.venue_id == first and match.starts_at < self.start + timedelta(days=3))
+            if match.venue_id == second:
+                # Only its own evening window is open
+                self.assertEqual(match.starts_at, self.start + timedelta(hours=18))
+            self.assertFalse(blackout[0] - constraints.slot_length < match.starts_at < blackout[1])
+            if match.venue_id == third:
+                self.assertGreaterEqual(timezone.localtime(match.starts_at).time(), time(9, 0))
+
+    def test_avoids_existing_fixtures(self):
+        booked = self.start + timedelta(hours=9)
+        Fixture.objects.create(event=self.event, home_id=self.teams[0], away_id=self.teams[1],
+                               venue_id=self.venue_ids[0], start_at=booked)
+
+        result = schedule_matches(round_robin_pairings(self.teams[2:]), self.venue_ids[:1], self.start)
+        self.assertNotIn(booked, [match.starts_at for match in result.matches])
+        self.assertEqual(result.matches[0].starts_at, booked + timedelta(hours=2))
+
+    def test_generated_round_robin_is_conflict_free(self):
+        fixtures = generate_round_robin(self.teams, self.event.id, self.start, self.venue_ids)
+
+        self.assertEqual(len(fixtures), 45)
+        self.assertEqual(Counter(f['round'] for f in fixtures), Counter({r: 5 for r in range(1, 10)}))
+        self.assertTrue(validate_fixture_schedule(fixtures, self.event.id)['valid'])
+        # No more matches piled onto hours past midnight
+        for fixture in fixtures:
+            local = timezone.localtime(datetime.fromisoformat(fixture['start_at']))
+            self.assertTrue(time(9, 0) <= local.time() <= time(19, 30))
+
+    def test_generated_knockout_numbers_matches(self):
+        fixtures = generate_knockout(self.teams[:8], self.event.id, self.start, self.venue_ids)
+        self.assertEqual([f['match_number'] for f in fixtures], list(range(1, 8)))
+        self.assertEqual(Counter(f['round'] for f in fixtures), Counter({1: 4, 2: 2, 3: 1}))
+
+    def test_generation_fails_when_horizon_too_short(self):
+        constraints = ScheduleConstraints(horizon=timedelta(days=2))
+        with self.assertRaises(ValidationError):
+            generate_round_robin(self.teams, self.event.id, self.start, self.venue_ids[:1], constraints)
+
+    def test_parse_slot_hints(self):
+        start_date, venues, constraints = parse_slot_hints({
+            'start_date': '2030-03-04T08:00:00Z',
+            'venues': self.venue_ids[:2],
+            'duration_minutes': 60,
+            'min_rest_minutes': 1440,
+            'day_start': '08:00',
+            'day_end': '22:00',
+            'blackouts': [{'start': '2030-03-05T00:00:00Z', 'end': '2030-03-06T00:00:00Z'}],
+        })
+        self.assertEqual(start_date.hour, 8)
+        self.assertEqual(venues, self.venue_ids[:2])
+        self.assertEqual(constraints.duration, timedelta(hours=1))
+        self.assertEqual(constraints.min_rest, timedelta(days=1))
+        self.assertEqual(constraints.day_start, time(8, 0))
+        self.assertEqual(len(constraints.blackouts), 1)
+
+        with self.assertRaises(ValidationError):
+            parse_slot_hints({'blackouts': [{'start': '2030-03-06T00:00:00Z', 'end': '2030-03-05T00:00:00Z'}]})
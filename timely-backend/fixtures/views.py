@@ -22,7 +22,7 @@ from accounts.audit_mixin import AuditLogMixin
 from realtime.services import broadcast_schedule_update, broadcast_result_update, broadcast_leaderboard_update
 from .services.generator import (
     generate_round_robin, generate_knockout, get_available_teams_for_event,
-    validate_participants
+    validate_participants, parse_slot_hints
 )
 from .services.conflicts import (
     find_conflicts, check_fixture_conflicts, validate_fixture_schedule,
@@ -141,10 +141,11 @@ class FixtureViewSet(viewsets.ModelViewSet):
         
         try:
             # Generate fixtures based on mode
+            start_date, venues, constraints = parse_slot_hints(slot_hints)
             if mode == 'rr':
-                fixtures = generate_round_robin(participants, slot_hints)
+                fixtures = generate_round_robin(participants, event_id, start_date, venues, constraints)
             elif mode == 'ko':
-                fixtures = generate_knockout(participants, slot_hints)
+                fixtures = generate_knockout(participants, event_id, start_date, venues, constraints)
             else:
                 return Response(
                     {'error': 'Invalid mode'}, 
@@ -159,6 +160,11 @@ class FixtureViewSet(viewsets.ModelViewSet):
                 'count': len(fixtures)
             })
             
+        except ValidationError as e:
+            return Response(
+                {'error': ' '.join(e.messages)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         except Exception as e:
             return Response(
                 {'error': str(e)}, 
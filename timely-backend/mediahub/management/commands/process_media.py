@@ -0,0 +1,23 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from mediahub.services.renditions import process_pending_media
+
+
+class Command(BaseCommand):
+    help = 'Build renditions for uploads still pending processing (once, or every --interval seconds)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=int, default=0, help='Keep sweeping every N seconds')
+        parser.add_argument('--limit', type=int, default=100, help='Items processed per sweep')
+        parser.add_argument('--retry-failed', action='store_true', help='Also retry items that failed')
+
+    def handle(self, *args, **options):
+        while True:
+            processed = process_pending_media(limit=options['limit'], retry_failed=options['retry_failed'])
+            if processed or not options['interval']:
+                self.stdout.write(f'Processed {processed} media items')
+            if not options['interval']:
+                return
+            time.sleep(options['interval'])
@@ -26,6 +26,12 @@ class MediaItem(models.Model):
         REJECTED = 'rejected', 'Rejected'
         HIDDEN = 'hidden', 'Hidden'
     
+    class Processing(models.TextChoices):
+        PENDING = 'pending', 'Pending'
+        PROCESSING = 'processing', 'Processing'
+        READY = 'ready', 'Ready'
+        FAILED = 'failed', 'Failed'
+    
     # Core fields
     uploader = models.ForeignKey(
         User,
@@ -76,6 +82,20 @@ class MediaItem(models.Model):
         help_text="Thumbnail for images (auto-generated)"
     )
     
+    # Background processing (services.renditions)
+    processing_status = models.CharField(
+        max_length=10,
+        choices=Processing.choices,
+        default=Processing.PENDING,
+        help_text="Progress of rendition generation and metadata stripping"
+    )
+    renditions = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Rendition name -> {width, height, <format>: url}"
+    )
+    processing_error = models.TextField(blank=True, default='')
+    
     # Content
     title = models.CharField(
         max_length=200,
@@ -134,8 +154,12 @@ class MediaItem(models.Model):
     
     @property
     def is_public(self):
-        """Check if media is public (approved and not hidden)"""
-        return self.status == self.Status.APPROVED and not self.is_hidden
+        """Check if media is public (approved, processed and not hidden)"""
+        return (
+            self.status == self.Status.APPROVED and
+            self.processing_status == self.Processing.READY and
+            not self.is_hidden
+        )
     
     @property
     def is_hidden(self):
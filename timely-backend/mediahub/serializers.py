@@ -9,6 +9,19 @@ from .models import MediaItem
 User = get_user_model()
 
 
+def absolute_renditions(obj, request):
+    """Rendition metadata with absolute URLs for each format"""
+    if not request:
+        return obj.renditions
+    return {
+        name: {
+            key: request.build_absolute_uri(value) if isinstance(value, str) else value
+            for key, value in rendition.items()
+        }
+        for name, rendition in (obj.renditions or {}).items()
+    }
+
+
 class MediaItemSerializer(serializers.ModelSerializer):
     """Serializer for MediaItem CRUD operations"""
     
@@ -17,6 +30,7 @@ class MediaItemSerializer(serializers.ModelSerializer):
     fixture_name = serializers.CharField(source='fixture.name', read_only=True)
     file_url = serializers.SerializerMethodField()
     thumbnail_url = serializers.SerializerMethodField()
+    renditions = serializers.SerializerMethodField()
     share_url = serializers.SerializerMethodField()
     can_edit = serializers.SerializerMethodField()
     can_moderate = serializers.SerializerMethodField()
@@ -27,11 +41,11 @@ class MediaItemSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'uploader', 'uploader_name', 'event', 'event_name',
             'fixture', 'fixture_name', 'kind', 'file', 'file_url',
-            'thumbnail', 'thumbnail_url', 'title', 'description',
-            'status', 'featured', 'created_at', 'updated_at',
+            'thumbnail', 'thumbnail_url', 'renditions', 'processing_status',
+            'title', 'description', 'status', 'featured', 'created_at', 'updated_at',
             'share_url', 'can_edit', 'can_moderate', 'can_delete'
         ]
-        read_only_fields = ['id', 'uploader', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'uploader', 'processing_status', 'created_at', 'updated_at']
     
     def get_file_url(self, obj):
         """Get full URL for media file"""
@@ -51,6 +65,10 @@ class MediaItemSerializer(serializers.ModelSerializer):
             return obj.thumbnail.url
         return None
     
+    def get_renditions(self, obj):
+        """Get rendition sizes and URLs"""
+        return absolute_renditions(obj, self.context.get('request'))
+    
     def get_share_url(self, obj):
         """Get share URL"""
         request = self.context.get('request')
@@ -103,9 +121,10 @@ class MediaItemCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = MediaItem
         fields = [
-            'id', 'event', 'fixture', 'file', 'title', 'description', 'status', 'kind'
+            'id', 'event', 'fixture', 'file', 'title', 'description', 'status', 'kind',
+            'processing_status'
         ]
-        read_only_fields = ['id', 'status', 'kind']
+        read_only_fields = ['id', 'status', 'kind', 'processing_status']
     
     def validate_file(self, value):
         """Validate uploaded file"""
@@ -136,19 +155,6 @@ class MediaItemCreateSerializer(serializers.ModelSerializer):
         
         return data
     
-    def create(self, validated_data):
-        """Create media item with EXIF stripping for images"""
-        from .services.storage import strip_exif_metadata
-        
-        file = validated_data.get('file')
-        
-        # Strip EXIF metadata from images for privacy
-        if file and file.content_type and file.content_type.startswith('image/'):
-            validated_data['file'] = strip_exif_metadata(file)
-        
-        return super().create(validated_data)
-
-
 class MediaItemUpdateSerializer(serializers.ModelSerializer):
     """Serializer for updating media items (no file changes)"""
     
@@ -193,6 +199,7 @@ class MediaItemPublicSerializer(serializers.ModelSerializer):
     fixture_name = serializers.CharField(source='fixture.name', read_only=True)
     file_url = serializers.SerializerMethodField()
     thumbnail_url = serializers.SerializerMethodField()
+    renditions = serializers.SerializerMethodField()
     share_url = serializers.SerializerMethodField()
     
     class Meta:
@@ -200,7 +207,7 @@ class MediaItemPublicSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'uploader_name', 'event', 'event_name',
             'fixture', 'fixture_name', 'kind', 'file_url',
-            'thumbnail_url', 'title', 'description',
+            'thumbnail_url', 'renditions', 'title', 'description',
             'featured', 'created_at', 'share_url'
         ]
     
@@ -222,6 +229,10 @@ class MediaItemPublicSerializer(serializers.ModelSerializer):
             return obj.thumbnail.url
         return None
     
+    def get_renditions(self, obj):
+        """Get rendition sizes and URLs"""
+        return absolute_renditions(obj, self.context.get('request'))
+    
     def get_share_url(self, obj):
         """Get share URL"""
         request = self.context.get('request')
@@ -230,6 +241,20 @@ class MediaItemPublicSerializer(serializers.ModelSerializer):
         return obj.get_share_url()
 
 
+class MediaProcessingSerializer(serializers.ModelSerializer):
+    """Serializer for rendition processing status"""
+    
+    renditions = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = MediaItem
+        fields = ['id', 'processing_status', 'processing_error', 'renditions']
+    
+    def get_renditions(self, obj):
+        """Get rendition sizes and URLs"""
+        return absolute_renditions(obj, self.context.get('request'))
+
+
 class MediaModerationSerializer(serializers.Serializer):
     """Serializer for moderation actions"""
     
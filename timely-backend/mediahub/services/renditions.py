@@ -0,0 +1,225 @@
+"""
+Background media processing: responsive renditions and metadata stripping.
+
+Uploads are saved as-is and handed to the "media" background queue, so the
+upload request never decodes an image. Each photo is decoded once (JPEGs at
+a reduced scale via Image.draft(), just large enough for the biggest
+rendition), resized down through MEDIA_RENDITIONS and written as WebP/JPEG
+without EXIF. In the same pass the original loses its EXIF/XMP/IPTC data:
+losslessly for JPEGs, by re-encoding for other formats.
+"""
+import logging
+import math
+import os
+from io import BytesIO
+from typing import Dict, Tuple
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import transaction
+
+from common.background import get_queue
+from ..models import MediaItem
+from ..signals import send_realtime_update, user_group
+from .storage import ORIENTATION_TAG, strip_exif_metadata, strip_jpeg_metadata
+
+try:
+    from PIL import Image, ImageOps
+    PILLOW_AVAILABLE = True
+except ImportError:
+    PILLOW_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Rendition configuration
+RENDITIONS = getattr(settings, 'MEDIA_RENDITIONS', {
+    'thumb': {'size': (320, 320), 'crop': True},
+    'medium': {'size': (1024, 1024)},
+    'large': {'size': (2048, 2048)},
+})
+RENDITION_FORMATS = getattr(settings, 'MEDIA_RENDITION_FORMATS', ('webp', 'jpeg'))
+RENDITION_QUALITY = getattr(settings, 'MEDIA_RENDITION_QUALITY', 82)
+
+SAVE_OPTIONS = {
+    'jpeg': {'format': 'JPEG', 'optimize': True, 'progressive': True},
+    'webp': {'format': 'WEBP', 'method': 4},
+}
+# Orientations that swap width and height
+TRANSPOSED_ORIENTATIONS = {5, 6, 7, 8}
+
+
+def enqueue_processing(media_item) -> None:
+    """Queue processing for a new upload once its transaction commits"""
+    media_id = media_item.pk
+    transaction.on_commit(lambda: get_queue('media').submit(process_media, media_id))
+
+
+def process_media(media_id: int) -> bool:
+    """
+    Build renditions for a media item and strip the original's metadata.
+
+    Args:
+        media_id: MediaItem primary key
+
+    Returns:
+        True if the item was processed, False if another worker owns it or it failed
+    """
+    # Claim the item so a sweep and the upload's own task can't both process it
+    claimed = MediaItem.objects.filter(
+        pk=media_id,
+        processing_status__in=[MediaItem.Processing.PENDING, MediaItem.Processing.FAILED]
+    ).update(processing_status=MediaItem.Processing.PROCESSING)
+    if not claimed:
+        return False
+
+    media_item = MediaItem.objects.get(pk=media_id)
+    try:
+        fields = build_media_renditions(media_item)
+    except Exception as e:
+        logger.exception(f"Failed to process media {media_id}")
+        fields = {'processing_status': MediaItem.Processing.FAILED, 'processing_error': str(e)[:500]}
+    else:
+        fields.update(processing_status=MediaItem.Processing.READY, processing_error='')
+
+    MediaItem.objects.filter(pk=media_id).update(**fields)
+    send_realtime_update(
+        user_group(media_item.uploader_id),
+        'media.processed',
+        {
+            'id': media_id,
+            'processing_status': fields['processing_status'],
+            'renditions': fields.get('renditions', {}),
+        }
+    )
+    return fields['processing_status'] == MediaItem.Processing.READY
+
+
+def process_pending_media(limit: int = 100, retry_failed: bool = False) -> int:
+    """
+    Process items whose queued task never ran (e.g. the worker restarted).
+
+    Returns:
+        Number of items processed
+    """
+    statuses = [MediaItem.Processing.PENDING]
+    if retry_failed:
+        statuses.append(MediaItem.Processing.FAILED)
+    media_ids = MediaItem.objects.filter(processing_status__in=statuses).order_by('created_at').values_list(
+        'pk', flat=True
+    )[:limit]
+    return sum(process_media(media_id) for media_id in list(media_ids))
+
+
+def build_media_renditions(media_item) -> Dict:
+    """
+    Write renditions for a photo and scrub its original.
+
+    Returns:
+        MediaItem field values to record (renditions, thumbnail, file)
+    """
+    if media_item.kind != MediaItem.Kind.PHOTO or not media_item.file or not PILLOW_AVAILABLE:
+        return {'renditions': {}}
+
+    storage = media_item.file.storage
+    with media_item.file.open('rb') as f:
+        data = f.read()
+
+    image = Image.open(BytesIO(data))
+    fields = {}
+
+    # Scrub the original before anything else reads the decoded image
+    if image.format == 'JPEG':
+        scrubbed = strip_jpeg_metadata(data, image.getexif().get(ORIENTATION_TAG, 1))
+        if scrubbed != data:
+            fields['file'] = _replace_file(storage, media_item.file.name, scrubbed)
+    elif 'exif' in image.info or 'xmp' in image.info:
+        scrubbed = strip_exif_metadata(ContentFile(data, name=os.path.basename(media_item.file.name)))
+        fields['file'] = _replace_file(storage, media_item.file.name, scrubbed.read())
+
+    renditions = {}
+    for name, (rendition, size) in render_renditions(image).items():
+        entry = {'width': size[0], 'height': size[1]}
+        for fmt, content in rendition.items():
+            path = f"media/renditions/{media_item.pk}/{name}.{'jpg' if fmt == 'jpeg' else fmt}"
+            if storage.exists(path):
+                storage.delete(path)
+            saved = storage.save(path, ContentFile(content))
+            entry[fmt] = storage.url(saved)
+            if name == 'thumb' and fmt == 'jpeg':
+                fields['thumbnail'] = saved
+        renditions[name] = entry
+
+    fields['renditions'] = renditions
+    return fields
+
+
+def render_renditions(image) -> Dict[str, Tuple[Dict[str, bytes], Tuple[int, int]]]:
+    """
+    Resize an opened (not yet loaded) image into every configured rendition.
+
+    Args:
+        image: PIL image straight from Image.open()
+
+    Returns:
+        Rendition name -> ({format: encoded bytes}, (width, height))
+    """
+    specs = sorted(RENDITIONS.items(), key=lambda item: item[1]['size'][0] * item[1]['size'][1], reverse=True)
+    orientation = image.getexif().get(ORIENTATION_TAG, 1)
+
+    if image.format == 'JPEG':
+        # Let the decoder downscale by 1/2, 1/4 or 1/8 while still covering every rendition
+        scale = max(_scale_needed(image.size, spec, orientation) for _, spec in specs)
+        if scale < 1:
+            image.draft('RGB', (math.ceil(image.width * scale), math.ceil(image.height * scale)))
+
+    # Apply the orientation to the pixels; renditions are saved without EXIF
+    image = ImageOps.exif_transpose(image)
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if 'A' in image.getbands() or image.mode == 'P' else 'RGB')
+
+    results = {}
+    source = image
+    for name, spec in specs:
+        box = tuple(spec['size'])
+        # Resize from the previous rendition when it still covers this box
+        if source.width < box[0] or source.height < box[1]:
+            source = image
+        if spec.get('crop'):
+            resized = ImageOps.fit(source, box, Image.Resampling.LANCZOS)
+        else:
+            resized = source.copy()
+            resized.thumbnail(box, Image.Resampling.LANCZOS)
+        results[name] = (_encode(resized), resized.size)
+        source = resized
+    return results
+
+
+def _scale_needed(size: Tuple[int, int], spec: Dict, orientation: int) -> float:
+    """Smallest scale of the stored image that still fills or fits the rendition box"""
+    box_width, box_height = spec['size']
+    if orientation in TRANSPOSED_ORIENTATIONS:
+        box_width, box_height = box_height, box_width
+    ratios = (box_width / size[0], box_height / size[1])
+    return min(1.0, max(ratios) if spec.get('crop') else min(ratios))
+
+
+def _encode(image) -> Dict[str, bytes]:
+    """Encode a rendition in every configured format (no metadata is written)"""
+    encoded = {}
+    for fmt in RENDITION_FORMATS:
+        output = image
+        if fmt == 'jpeg' and image.mode == 'RGBA':
+            # JPEG has no alpha: flatten onto white
+            output = Image.new('RGB', image.size, (255, 255, 255))
+            output.paste(image, mask=image.split()[-1])
+        buffer = BytesIO()
+        output.save(buffer, quality=RENDITION_QUALITY, **SAVE_OPTIONS[fmt])
+        encoded[fmt] = buffer.getvalue()
+    return encoded
+
+
+def _replace_file(storage, name: str, content: bytes) -> str:
+    """Save content alongside name, delete the old file and return the new name"""
+    saved = storage.save(name, ContentFile(content))
+    storage.delete(name)
+    return saved
@@ -163,6 +163,66 @@ def strip_exif_metadata(image_file: UploadedFile) -> ContentFile:
         return image_file
 
 
+# JPEG segments dropped by strip_jpeg_metadata: APP1 (EXIF, XMP), APP13 (IPTC), COM
+STRIPPED_JPEG_MARKERS = {0xE1, 0xED, 0xFE}
+ORIENTATION_TAG = 0x0112
+
+
+def strip_jpeg_metadata(data: bytes, orientation: int = 1) -> bytes:
+    """
+    Strip EXIF, XMP and IPTC metadata from JPEG bytes without re-encoding.
+    
+    Segments are copied through untouched apart from the metadata ones, so
+    there is no quality loss and no decode. The orientation tag is kept in a
+    minimal EXIF block so portrait phone photos still display upright.
+    
+    Args:
+        data: JPEG file contents
+        orientation: EXIF orientation of the original (1 = upright)
+        
+    Returns:
+        JPEG bytes without metadata (identical to data if it had none)
+        
+    Raises:
+        ValueError: If data is not a well-formed JPEG
+    """
+    if data[:2] != b'\xff\xd8':
+        raise ValueError("Not a JPEG file")
+    
+    segments = []
+    pos = 2
+    while pos < len(data):
+        if data[pos] != 0xFF:
+            raise ValueError("Corrupt JPEG marker")
+        marker = data[pos + 1]
+        if marker == 0xFF:
+            # Fill byte before a marker
+            pos += 1
+            continue
+        if marker == 0xDA:
+            # Start of scan: the rest is image data
+            segments.append(data[pos:])
+            break
+        if 0xD0 <= marker <= 0xD7 or marker == 0x01:
+            segments.append(data[pos:pos + 2])
+            pos += 2
+            continue
+        end = pos + 2 + int.from_bytes(data[pos + 2:pos + 4], 'big')
+        if marker not in STRIPPED_JPEG_MARKERS:
+            segments.append(data[pos:end])
+        pos = end
+    
+    if orientation != 1 and PIL_AVAILABLE:
+        exif = Image.Exif()
+        exif[ORIENTATION_TAG] = orientation
+        payload = exif.tobytes()
+        # EXIF goes after the JFIF header when there is one
+        index = 1 if segments and segments[0][1] == 0xE0 else 0
+        segments.insert(index, b'\xff\xe1' + (len(payload) + 2).to_bytes(2, 'big') + payload)
+    
+    return b'\xff\xd8' + b''.join(segments)
+
+
 def get_safe_filename(filename: str) -> str:
     """
     Generate a safe filename by removing dangerous characters.
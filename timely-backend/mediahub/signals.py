@@ -1,12 +1,19 @@
 """
 Media Hub signals for realtime updates via Django Channels.
 Broadcasts media events to appropriate WebSocket groups.
+
+Channels group names may only hold letters, digits, '-', '_' and '.'.
+Uploaders get their events on user_<id>, the group the ws/user/ consumer joins.
 """
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from .models import MediaItem
 
 
+def user_group(user_id) -> str:
+    return f"user_{user_id}"
+
+
 def send_realtime_update(group_name: str, event_type: str, data: dict):
     """
     Send realtime update via Django Channels.
@@ -55,7 +62,7 @@ def media_item_saved(sender, instance, created, **kwargs):
     if created:
         # New media uploaded
         send_realtime_update(
-            f"media:user:{instance.uploader_id}",
+            user_group(instance.uploader_id),
             'media.uploaded',
             data
         )
@@ -63,14 +70,14 @@ def media_item_saved(sender, instance, created, **kwargs):
         # Notify event/fixture groups
         if instance.event_id:
             send_realtime_update(
-                f"media:event:{instance.event_id}",
+                f"media_event_{instance.event_id}",
                 'media.uploaded',
                 data
             )
         
         if instance.fixture_id:
             send_realtime_update(
-                f"media:fixture:{instance.fixture_id}",
+                f"media_fixture_{instance.fixture_id}",
                 'media.uploaded',
                 data
             )
@@ -79,7 +86,7 @@ def media_item_saved(sender, instance, created, **kwargs):
         if instance.status == MediaItem.Status.APPROVED:
             # Media approved - notify public and relevant groups
             send_realtime_update(
-                "media:public",
+                "media_public",
                 'media.approved',
                 data
             )
@@ -93,14 +100,14 @@ def media_item_saved(sender, instance, created, **kwargs):
             
             if instance.event_id:
                 send_realtime_update(
-                    f"media:event:{instance.event_id}",
+                    f"media_event_{instance.event_id}",
                     'media.approved',
                     data
                 )
             
             if instance.fixture_id:
                 send_realtime_update(
-                    f"media:fixture:{instance.fixture_id}",
+                    f"media_fixture_{instance.fixture_id}",
                     'media.approved',
                     data
                 )
@@ -108,7 +115,7 @@ def media_item_saved(sender, instance, created, **kwargs):
         elif instance.status == MediaItem.Status.REJECTED:
             # Media rejected - notify uploader
             send_realtime_update(
-                f"media:user:{instance.uploader_id}",
+                user_group(instance.uploader_id),
                 'media.rejected',
                 data
             )
@@ -116,7 +123,7 @@ def media_item_saved(sender, instance, created, **kwargs):
         elif instance.status == MediaItem.Status.HIDDEN:
             # Media hidden - notify public group
             send_realtime_update(
-                "media:public",
+                "media_public",
                 'media.hidden',
                 data
             )
@@ -124,7 +131,7 @@ def media_item_saved(sender, instance, created, **kwargs):
         # Featured status change
         if instance.featured:
             send_realtime_update(
-                "media:public",
+                "media_public",
                 'media.featured',
                 data
             )
@@ -145,21 +152,21 @@ def media_item_deleted(sender, instance, **kwargs):
     
     # Notify all relevant groups about deletion
     send_realtime_update(
-        f"media:user:{instance.uploader_id}",
+        user_group(instance.uploader_id),
         'media.deleted',
         data
     )
     
     if instance.event_id:
         send_realtime_update(
-            f"media:event:{instance.event_id}",
+            f"media_event_{instance.event_id}",
             'media.deleted',
             data
         )
     
     if instance.fixture_id:
         send_realtime_update(
-            f"media:fixture:{instance.fixture_id}",
+            f"media_fixture_{instance.fixture_id}",
             'media.deleted',
             data
         )
@@ -167,7 +174,7 @@ def media_item_deleted(sender, instance, **kwargs):
     # If it was public, notify public group
     if instance.is_public:
         send_realtime_update(
-            "media:public",
+            "media_public",
             'media.deleted',
             data
         )
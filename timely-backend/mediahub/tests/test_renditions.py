@@ -0,0 +1,223 @@
+"""
+Media Hub tests for background rendition processing.
+"""
+import shutil
+import tempfile
+from datetime import timedelta
+from io import BytesIO
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from PIL import Image
+from rest_framework.test import APIClient
+
+from events.models import Event
+from mediahub.models import MediaItem
+from mediahub.services.renditions import enqueue_processing, process_media, render_renditions
+from mediahub.services.storage import ORIENTATION_TAG, strip_jpeg_metadata
+from mediahub.signals import user_group
+
+User = get_user_model()
+
+GPS_TAG = 0x8825
+
+
+def jpeg_bytes(size=(4000, 3000), orientation=1):
+    """Phone-style JPEG with GPS data and an orientation tag"""
+    exif = Image.Exif()
+    exif[ORIENTATION_TAG] = orientation
+    exif[0x010F] = 'Phone Maker'
+    exif.get_ifd(GPS_TAG)[2] = (33.0, 52.0, 10.0)
+    buffer = BytesIO()
+    Image.new('RGB', size, (200, 30, 30)).save(buffer, format='JPEG', exif=exif.tobytes())
+    return buffer.getvalue()
+
+
+class JpegMetadataTest(TestCase):
+    """Test lossless JPEG metadata stripping"""
+
+    def test_strip_keeps_pixels_and_orientation_only(self):
+        data = jpeg_bytes(size=(64, 48), orientation=6)
+
+        scrubbed = strip_jpeg_metadata(data, orientation=6)
+
+        image = Image.open(BytesIO(scrubbed))
+        self.assertEqual(dict(image.getexif()), {ORIENTATION_TAG: 6})
+        # Image data is copied, not re-encoded
+        self.assertTrue(data.endswith(scrubbed[scrubbed.index(b'\xff\xda'):]))
+
+    def test_strip_without_metadata_is_a_no_op(self):
+        buffer = BytesIO()
+        Image.new('RGB', (16, 16)).save(buffer, format='JPEG')
+        self.assertEqual(strip_jpeg_metadata(buffer.getvalue()), buffer.getvalue())
+
+    def test_rejects_non_jpeg(self):
+        with self.assertRaises(ValueError):
+            strip_jpeg_metadata(b'\x89PNG\r\n\x1a\n')
+
+
+class RenderRenditionsTest(TestCase):
+    """Test rendition sizing"""
+
+    def test_renditions_are_oriented_and_sized(self):
+        image = Image.open(BytesIO(jpeg_bytes(orientation=6)))
+
+        renditions = render_renditions(image)
+
+        # Stored landscape, displayed portrait
+        self.assertEqual(renditions['large'][1], (1536, 2048))
+        self.assertEqual(renditions['medium'][1], (768, 1024))
+        self.assertEqual(renditions['thumb'][1], (320, 320))
+        webp = Image.open(BytesIO(renditions['medium'][0]['webp']))
+        self.assertEqual((webp.format, webp.size), ('WEBP', (768, 1024)))
+        self.assertFalse(Image.open(BytesIO(renditions['large'][0]['jpeg'])).getexif())
+
+    def test_jpeg_decoded_at_reduced_scale(self):
+        image = Image.open(BytesIO(jpeg_bytes(size=(8000, 6000))))
+
+        render_renditions(image)
+
+        # draft() let the decoder skip straight to 1/2 scale, still covering 2048x1536
+        self.assertEqual(image.size, (4000, 3000))
+
+    def test_small_images_are_not_upscaled(self):
+        image = Image.open(BytesIO(jpeg_bytes(size=(800, 600))))
+
+        renditions = render_renditions(image)
+
+        self.assertEqual(renditions['large'][1], (800, 600))
+        self.assertEqual(renditions['medium'][1], (800, 600))
+
+
+@override_settings(BACKGROUND_TASKS_EAGER=True)
+class ProcessMediaTest(TestCase):
+    """Test the background processing pipeline"""
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+
+        self.user = User.objects.create_user(email='fan@example.com', password='testpass123')
+        start = timezone.now() + timedelta(days=7)
+        self.event = Event.objects.create(
+            name='Test Event', sport='Football', start_datetime=start,
+            end_datetime=start + timedelta(hours=8), created_by=self.user
+        )
+
+    def _upload(self, name='photo.jpg', content=None, kind=MediaItem.Kind.PHOTO):
+        return MediaItem.objects.create(
+            uploader=self.user, event=self.event, kind=kind,
+            file=SimpleUploadedFile(name, content or jpeg_bytes(orientation=6), content_type='image/jpeg')
+        )
+
+    def test_upload_processed_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            media_item = self._upload()
+            enqueue_processing(media_item)
+            self.assertEqual(media_item.processing_status, MediaItem.Processing.PENDING)
+
+        media_item.refresh_from_db()
+        self.assertEqual(media_item.processing_status, MediaItem.Processing.READY)
+        self.assertEqual(set(media_item.renditions), {'thumb', 'medium', 'large'})
+        self.assertEqual(media_item.renditions['thumb']['width'], 320)
+        self.assertTrue(media_item.renditions['medium']['webp'].endswith(f'/renditions/{media_item.pk}/medium.webp'))
+        self.assertEqual(media_item.thumbnail.name, f'media/renditions/{media_item.pk}/thumb.jpg')
+
+        # The original keeps its orientation but loses GPS and camera data
+        with media_item.file.open('rb') as f:
+            exif = Image.open(f).getexif()
+        self.assertEqual(dict(exif), {ORIENTATION_TAG: 6})
+
+    def test_processing_is_claimed_once(self):
+        media_item = self._upload()
+
+        self.assertTrue(process_media(media_item.pk))
+        self.assertFalse(process_media(media_item.pk))
+
+    def test_unreadable_image_fails_and_can_be_retried(self):
+        media_item = self._upload(content=b'\xff\xd8\xff\xe0not really a jpeg')
+
+        with self.assertLogs('mediahub.services.renditions', 'ERROR'):
+            self.assertFalse(process_media(media_item.pk))
+        media_item.refresh_from_db()
+        self.assertEqual(media_item.processing_status, MediaItem.Processing.FAILED)
+        self.assertTrue(media_item.processing_error)
+
+        with self.assertLogs('mediahub.services.renditions', 'ERROR'):
+            call_command('process_media', '--retry-failed', stdout=open('/dev/null', 'w'))
+
+    def test_videos_are_ready_without_renditions(self):
+        media_item = self._upload(name='clip.mp4', content=b'\x00\x00\x00\x18ftypmp41', kind=MediaItem.Kind.VIDEO)
+
+        call_command('process_media', stdout=open('/dev/null', 'w'))
+
+        media_item.refresh_from_db()
+        self.assertEqual(media_item.processing_status, MediaItem.Processing.READY)
+        self.assertEqual(media_item.renditions, {})
+
+    @override_settings(CHANNEL_LAYERS={'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}})
+    def test_uploader_is_told_when_processing_ends(self):
+        media_item = self._upload()
+        layer = get_channel_layer()
+        channel = async_to_sync(layer.new_channel)()
+        async_to_sync(layer.group_add)(user_group(self.user.pk), channel)
+
+        process_media(media_item.pk)
+
+        message = async_to_sync(layer.receive)(channel)
+        self.assertEqual(message['type'], 'media_update')
+        self.assertEqual(message['event_type'], 'media.processed')
+        self.assertEqual(message['data']['processing_status'], MediaItem.Processing.READY)
+
+    def test_processing_status_endpoint(self):
+        media_item = self._upload()
+        process_media(media_item.pk)
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        response = client.get(f'/api/media/{media_item.pk}/processing/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['processing_status'], MediaItem.Processing.READY)
+
+    def test_only_processed_media_can_be_approved(self):
+        admin = User.objects.create_user(email='admin@example.com', password='testpass123', is_staff=True)
+        client = APIClient()
+        client.force_authenticate(admin)
+        media_item = self._upload()
+
+        response = client.post(f'/api/media/{media_item.pk}/approve/')
+        self.assertEqual(response.status_code, 400)
+
+        broken = self._upload(content=b'\xff\xd8\xff\xe0not really a jpeg')
+        with self.assertLogs('mediahub.services.renditions', 'ERROR'):
+            process_media(broken.pk)
+        response = client.post(f'/api/media/{broken.pk}/approve/')
+        self.assertEqual(response.status_code, 400)
+        broken.refresh_from_db()
+        self.assertEqual(broken.status, MediaItem.Status.PENDING)
+
+        process_media(media_item.pk)
+        response = client.post(f'/api/media/{media_item.pk}/approve/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['status'], MediaItem.Status.APPROVED)
+
+    def test_public_gallery_lists_processed_media_only(self):
+        ready = self._upload()
+        process_media(ready.pk)
+        unprocessed = self._upload()
+        MediaItem.objects.filter(pk__in=[ready.pk, unprocessed.pk]).update(status=MediaItem.Status.APPROVED)
+        client = APIClient()
+
+        response = client.get('/api/media/public/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([item['id'] for item in response.data['results']], [ready.pk])
+        self.assertEqual(client.get(f'/api/media/public/{unprocessed.pk}/').status_code, 404)
+        self.assertEqual(client.get(f'/api/media/share/{unprocessed.pk}/').status_code, 404)
@@ -13,14 +13,15 @@ from django.shortcuts import get_object_or_404
 from .models import MediaItem
 from .serializers import (
     MediaItemSerializer, MediaItemCreateSerializer, MediaItemUpdateSerializer,
-    MediaItemPublicSerializer, MediaModerationSerializer, MediaShareSerializer
+    MediaItemPublicSerializer, MediaModerationSerializer, MediaShareSerializer,
+    MediaProcessingSerializer
 )
 from .permissions import (
     CanUploadMedia, CanViewMedia, CanModerateMedia, CanEditMedia, CanDeleteMedia,
     PublicMediaReadOnly
 )
 from .services.storage import validate_media_file
-from .services.thumbnails import generate_thumbnail_for_media
+from .services.renditions import enqueue_processing
 
 
 class MediaItemViewSet(viewsets.ModelViewSet):
@@ -64,21 +65,22 @@ class MediaItemViewSet(viewsets.ModelViewSet):
         """Filter queryset based on user permissions"""
         queryset = super().get_queryset()
         
+        # Metadata is only stripped once processing is READY
+        public = Q(status=MediaItem.Status.APPROVED, processing_status=MediaItem.Processing.READY)
+        
         # If user is not authenticated, only show approved media
         if not self.request.user.is_authenticated:
-            return queryset.filter(status=MediaItem.Status.APPROVED)
+            return queryset.filter(public)
         
         # If user is authenticated but not staff/organizer, show their own + approved
         if not (self.request.user.is_staff or self.request.user.role == 'ORGANIZER'):
-            return queryset.filter(
-                Q(uploader=self.request.user) | Q(status=MediaItem.Status.APPROVED)
-            )
+            return queryset.filter(Q(uploader=self.request.user) | public)
         
         # Staff and organizers can see all media
         return queryset
     
     def perform_create(self, serializer):
-        """Create media item with file validation and thumbnail generation"""
+        """Create media item with file validation; renditions are built in the background"""
         # Validate file
         file_obj = serializer.validated_data.get('file')
         if file_obj:
@@ -94,9 +96,8 @@ class MediaItemViewSet(viewsets.ModelViewSet):
         # Save the media item
         media_item = serializer.save(uploader=self.request.user)
         
-        # Generate thumbnail for images
-        if media_item.kind == 'photo':
-            generate_thumbnail_for_media(media_item)
+        # Renditions, thumbnail and EXIF stripping run on the media queue
+        enqueue_processing(media_item)
     
     def perform_update(self, serializer):
         """Update media item with permission checks"""
@@ -132,6 +133,13 @@ class MediaItemViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
         
+        # Until processing succeeds the original may still carry GPS and camera metadata
+        if media_item.processing_status != MediaItem.Processing.READY:
+            return Response(
+                {'error': 'Media cannot be approved until processing has finished'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
         media_item.status = MediaItem.Status.APPROVED
         media_item.save()
         
@@ -199,6 +207,21 @@ class MediaItemViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
+    @action(detail=True, methods=['get'])
+    def processing(self, request, pk=None):
+        """Rendition processing status (uploader and moderators only)"""
+        media_item = self.get_object()
+        
+        if media_item.uploader != request.user and not media_item.can_moderate(request.user):
+            return Response(
+                {'error': 'Insufficient permissions to view processing status'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        serializer = MediaProcessingSerializer(media_item, context={'request': request})
+        return Response(serializer.data)
+
+
 class PublicMediaViewSet(viewsets.ReadOnlyModelViewSet):
     """
     Public viewset for approved media gallery.
@@ -215,7 +238,8 @@ class PublicMediaViewSet(viewsets.ReadOnlyModelViewSet):
     def get_queryset(self):
         """Return only approved media for public gallery"""
         return MediaItem.objects.filter(
-            status=MediaItem.Status.APPROVED
+            status=MediaItem.Status.APPROVED,
+            processing_status=MediaItem.Processing.READY
         ).select_related('uploader', 'event', 'fixture')
 
 
@@ -230,7 +254,8 @@ class MediaShareViewSet(viewsets.ReadOnlyModelViewSet):
     def get_queryset(self):
         """Return only approved media for sharing"""
         return MediaItem.objects.filter(
-            status=MediaItem.Status.APPROVED
+            status=MediaItem.Status.APPROVED,
+            processing_status=MediaItem.Processing.READY
         ).select_related('uploader', 'event', 'fixture')
     
     def retrieve(self, request, pk=None):
@@ -8,6 +8,7 @@ from .models import (
     Notification, DeliveryAttempt, MessageThread, MessageParticipant, 
     Message, NotificationUnread, NotificationTemplate, Broadcast
 )
+from .services.unread import reconcile_unread_counts
 
 
 @admin.register(Notification)
@@ -74,14 +75,11 @@ class NotificationUnreadAdmin(admin.ModelAdmin):
     
     def recalculate_counts(self, request, queryset):
         """Recalculate unread counts for selected users"""
-        updated = 0
-        for unread in queryset:
-            NotificationUnread.update_count_for_user(unread.user)
-            updated += 1
+        repaired = reconcile_unread_counts(user_ids=queryset.values_list('user_id', flat=True))
         
         self.message_user(
             request,
-            f"Recalculated unread counts for {updated} user(s)."
+            f"Recalculated unread counts for {queryset.count()} user(s); {repaired} corrected."
         )
     recalculate_counts.short_description = "Recalculate selected counts"
 
@@ -0,0 +1,28 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from notifications.services.unread import reconcile_unread_counts
+
+
+class Command(BaseCommand):
+    help = 'Repair unread notification counters that drifted from the notifications (once, or every --interval seconds)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help='Keep reconciling every --interval seconds')
+        parser.add_argument(
+            '--interval', type=int, default=None,
+            help='Seconds between runs with --loop (default: NOTIFICATION_UNREAD_RECONCILE_INTERVAL)'
+        )
+        parser.add_argument('--batch-size', type=int, default=1000, help='Users recounted per query')
+
+    def handle(self, *args, **options):
+        interval = options['interval'] or settings.NOTIFICATION_UNREAD_RECONCILE_INTERVAL
+        while True:
+            repaired = reconcile_unread_counts(batch_size=options['batch_size'])
+            if repaired or not options['loop']:
+                self.stdout.write(f'Repaired {repaired} unread counters')
+            if not options['loop']:
+                return
+            time.sleep(interval)
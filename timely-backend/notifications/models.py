@@ -1,5 +1,9 @@
-from django.db import models
+from collections import Counter, defaultdict
+
 from django.conf import settings
+from django.core.cache import cache
+from django.db import models, transaction
+from django.db.models.functions import Greatest
 from django.utils import timezone
 import uuid
 
@@ -53,8 +57,13 @@ class Notification(models.Model):
     
     def mark_read(self):
         if not self.read_at:
-            self.read_at = timezone.now()
-            self.save(update_fields=['read_at'])
+            read_at = timezone.now()
+            with transaction.atomic():
+                # Only the request that flips read_at takes the notification off the counter
+                if Notification.objects.filter(pk=self.pk, read_at__isnull=True).update(read_at=read_at):
+                    NotificationUnread.adjust_counts({self.user_id: -1})
+            self.read_at = read_at
+            self._loaded_unread = False
 
 
 class DeliveryAttempt(models.Model):
@@ -188,6 +197,27 @@ class NotificationUnread(models.Model):
     def __str__(self):
         return f"{self.user.email}: {self.count} unread"
     
+    @staticmethod
+    def cache_key(user_id):
+        return f"notifications:unread:{user_id}"
+
+    @classmethod
+    def forget_cached(cls, user_ids):
+        """Drop cached counts once the surrounding transaction commits"""
+        keys = [cls.cache_key(user_id) for user_id in set(user_ids)]
+        if keys:
+            transaction.on_commit(lambda: cache.delete_many(keys))
+
+    @classmethod
+    def get_count(cls, user_id):
+        """Unread count for the badge: cache first, then the counter row (never Notification)"""
+        key = cls.cache_key(user_id)
+        count = cache.get(key)
+        if count is None:
+            count = cls.objects.filter(user_id=user_id).values_list('count', flat=True).first() or 0
+            cache.set(key, count, getattr(settings, 'NOTIFICATION_UNREAD_CACHE_TTL', 300))
+        return count
+
     @classmethod
     def get_or_create_for_user(cls, user):
         """Get or create unread count for user"""
@@ -202,28 +232,49 @@ class NotificationUnread(models.Model):
             read_at__isnull=True
         ).count()
         
-        unread, _ = cls.objects.get_or_create(user=user)
-        unread.count = count
-        unread.save(update_fields=['count', 'last_updated'])
+        unread, _ = cls.objects.update_or_create(user=user, defaults={'count': count})
+        cls.forget_cached([user.pk])
         return unread
     
     @classmethod
-    def increment_for_user(cls, user):
+    def adjust_counts(cls, deltas):
+        """Apply {user_id: delta} to the counters with atomic F() updates.
+
+        Users sharing a delta are updated in one statement, so a fan-out batch
+        costs an insert for missing rows plus one UPDATE. Decrements never go
+        below zero; drift either way is repaired by the reconciler.
+        """
+        by_delta = defaultdict(list)
+        for user_id, delta in deltas.items():
+            if delta:
+                by_delta[delta].append(user_id)
+        if not by_delta:
+            return
+
+        now = timezone.now()
+        increments = [user_id for delta, user_ids in by_delta.items() if delta > 0 for user_id in user_ids]
+        if increments:
+            # Zero rows first, so concurrent first notifications can't race each other's insert
+            cls.objects.bulk_create([cls(user_id=user_id) for user_id in increments], ignore_conflicts=True)
+        for delta, user_ids in by_delta.items():
+            count = models.F('count') + delta if delta > 0 else Greatest(models.F('count') + delta, 0)
+            cls.objects.filter(user_id__in=user_ids).update(count=count, last_updated=now)
+        cls.forget_cached(deltas)
+
+    @classmethod
+    def increment_for_user(cls, user, by=1):
         """Increment unread count for user"""
-        unread, created = cls.get_or_create_for_user(user)
-        if not created:  # Don't increment if just created (count is already accurate)
-            unread.count += 1
-            unread.save(update_fields=['count', 'last_updated'])
-        return unread
+        cls.adjust_counts({user.pk: by})
     
     @classmethod
-    def decrement_for_user(cls, user):
+    def bulk_increment(cls, user_ids, by=1):
+        """Increment unread counts for many users at once (fan-out batches)"""
+        cls.adjust_counts({user_id: n * by for user_id, n in Counter(user_ids).items()})
+    
+    @classmethod
+    def decrement_for_user(cls, user, by=1):
         """Decrement unread count for user"""
-        unread, created = cls.get_or_create_for_user(user)
-        if not created and unread.count > 0:
-            unread.count -= 1
-            unread.save(update_fields=['count', 'last_updated'])
-        return unread
+        cls.adjust_counts({user.pk: -by})
 
 
 class NotificationTemplate(models.Model):
@@ -72,30 +72,72 @@ def send_sms(to: str, text: str, notification: Optional[Notification] = None) ->
     return True
 
 
-def send_notification_email(notification: Notification) -> bool:
+def render_notification_email(notification: Notification) -> dict:
     """
-    Send email for a notification using the templating system.
+    Render a notification's email with the templating system.
     
     Args:
-        notification: Notification instance to send
+        notification: Notification instance to render
     
     Returns:
-        bool: Success status
+        dict: Message payload with to, subject and body
     """
     from .templating import get_email_template
     
     template = get_email_template(notification.topic, notification.kind)
-    subject = template['subject'].format(title=notification.title)
-    body = template['body'].format(
-        title=notification.title,
-        body=notification.body,
-        link_url=notification.link_url or ''
-    )
+    return {
+        'to': notification.user.email,
+        'subject': template['subject'].format(title=notification.title),
+        'body': template['body'].format(
+            title=notification.title,
+            body=notification.body,
+            link_url=notification.link_url or '',
+            link_line=f"Learn more: {notification.link_url}" if notification.link_url else ''
+        ),
+    }
+
+
+def render_notification_sms(notification: Notification) -> Optional[dict]:
+    """
+    Render a notification's SMS with the templating system.
+    
+    Args:
+        notification: Notification instance to render
+    
+    Returns:
+        dict: Message payload with to and body, or None if the user has no phone number
+    """
+    from .templating import get_sms_template
+    
+    phone_number = getattr(notification.user, 'phone_number', '')
+    if not phone_number:
+        return None
+    template = get_sms_template(notification.topic, notification.kind)
+    return {
+        'to': phone_number,
+        'body': template['body'].format(
+            title=notification.title,
+            body=notification.body,
+            link_url=notification.link_url or ''
+        ),
+    }
+
+
+def send_notification_email(notification: Notification) -> bool:
+    """
+    Send email for a notification using the templating system.
+    
+    Args:
+        notification: Notification instance to send
     
+    Returns:
+        bool: Success status
+    """
+    message = render_notification_email(notification)
     return send_email(
-        to=notification.user.email,
-        subject=subject,
-        text=body,
+        to=message['to'],
+        subject=message['subject'],
+        text=message['body'],
         notification=notification
     )
 
@@ -110,17 +152,11 @@ def send_notification_sms(notification: Notification) -> bool:
     Returns:
         bool: Success status
     """
-    from .templating import get_sms_template
-    
-    template = get_sms_template(notification.topic, notification.kind)
-    body = template['body'].format(
-        title=notification.title,
-        body=notification.body,
-        link_url=notification.link_url or ''
-    )
-    
+    message = render_notification_sms(notification)
+    if message is None:
+        return False
     return send_sms(
-        to=getattr(notification.user, 'phone_number', ''),
-        text=body,
+        to=message['to'],
+        text=message['body'],
         notification=notification
     )
@@ -0,0 +1,209 @@
+"""
+Batched announcement fan-out.
+
+An announcement is recorded as a Broadcast and the delivery runs on the
+"notifications" background queue: notifications are bulk-created in chunks,
+realtime messages are published once per chunk (or once to the event group
+for event-wide announcements), and each chunk's email/SMS is rendered and queued for the delivery engine
+(payments.delivery).
+Broadcast.sent_count/failed_count track progress as chunks complete.
+"""
+import logging
+from typing import Iterable, List
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from common.background import get_queue
+from ..models import Notification, NotificationUnread, Broadcast
+from .email_sms import render_notification_email, render_notification_sms
+
+logger = logging.getLogger(__name__)
+
+User = get_user_model()
+
+DEFAULT_CHUNK_SIZE = 500
+
+
+def _chunk_size() -> int:
+    return getattr(settings, 'NOTIFICATION_FANOUT_CHUNK_SIZE', DEFAULT_CHUNK_SIZE)
+
+
+def _chunks(items: List, size: int) -> Iterable[List]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def start_announcement_fanout(sender, data: dict, scope: str, scope_id, user_ids: List[int]) -> Broadcast:
+    """
+    Record the announcement as a Broadcast and queue its delivery.
+    Returns immediately; delivery starts once the request transaction commits.
+    """
+    broadcast = Broadcast.objects.create(
+        title=data['title'],
+        message=data['body'],
+        target_type='event' if scope == 'event' else 'custom',
+        target_criteria={
+            'scope': scope,
+            'scope_id': str(scope_id),
+            'kind': data['kind'],
+            'topic': data['topic'],
+            'link_url': data.get('link_url'),
+        },
+        status='sending',
+        total_recipients=len(user_ids),
+        created_by=sender,
+    )
+    transaction.on_commit(
+        lambda: get_queue('notifications').submit(run_announcement_fanout, broadcast.id, user_ids)
+    )
+    return broadcast
+
+
+def run_announcement_fanout(broadcast_id: int, user_ids: List[int]):
+    """Deliver a broadcast to user_ids chunk by chunk, recording progress"""
+    broadcast = Broadcast.objects.get(id=broadcast_id)
+    criteria = broadcast.target_criteria
+    event_wide = criteria.get('scope') == 'event'
+
+    for chunk in _chunks(user_ids, _chunk_size()):
+        try:
+            notifications = _create_notifications(broadcast, chunk)
+            if not event_wide:
+                _publish_to_users(notifications)
+            get_queue('notifications').submit(deliver_email_sms, [n.id for n in notifications])
+        except Exception:
+            logger.exception("Announcement fan-out chunk failed for broadcast %s", broadcast_id)
+            Broadcast.objects.filter(id=broadcast_id).update(failed_count=F('failed_count') + len(chunk))
+            continue
+        Broadcast.objects.filter(id=broadcast_id).update(sent_count=F('sent_count') + len(notifications))
+
+    if event_wide:
+        _publish_to_event(broadcast)
+
+    broadcast.refresh_from_db(fields=['sent_count', 'failed_count'])
+    Broadcast.objects.filter(id=broadcast_id).update(
+        status='failed' if broadcast.sent_count == 0 and broadcast.failed_count else 'sent',
+        sent_at=timezone.now(),
+    )
+
+
+def _create_notifications(broadcast: Broadcast, user_ids: List[int]) -> List[Notification]:
+    criteria = broadcast.target_criteria
+    now = timezone.now()
+    notifications = [
+        Notification(
+            user_id=user_id,
+            kind=criteria['kind'],
+            topic=criteria['topic'],
+            title=broadcast.title,
+            body=broadcast.message,
+            link_url=criteria.get('link_url'),
+            created_at=now,
+        )
+        for user_id in user_ids
+    ]
+    with transaction.atomic():
+        # bulk_create skips post_save, so unread counters are bumped in bulk here
+        Notification.objects.bulk_create(notifications)
+        NotificationUnread.bulk_increment(user_ids)
+    return notifications
+
+
+def _announcement_payload(notification: Notification) -> dict:
+    return {
+        "type": "announcement",
+        "id": str(notification.id),
+        "title": notification.title,
+        "body": notification.body,
+        "kind": notification.kind,
+        "topic": notification.topic,
+        "link_url": notification.link_url,
+        "created_at": notification.created_at.isoformat()
+    }
+
+
+def _publish_to_users(notifications: List[Notification]):
+    """Publish a chunk of per-user messages in a single event-loop pass"""
+    channel_layer = get_channel_layer()
+    if not channel_layer:
+        return
+
+    async def send_all():
+        for notification in notifications:
+            await channel_layer.group_send(f"user_{notification.user_id}", _announcement_payload(notification))
+
+    try:
+        async_to_sync(send_all)()
+    except Exception:
+        # Don't fail the announcement for realtime errors
+        logger.warning("Realtime publish failed for announcement chunk", exc_info=True)
+
+
+def _publish_to_event(broadcast: Broadcast):
+    """Publish an event-wide announcement as one group message"""
+    channel_layer = get_channel_layer()
+    if not channel_layer:
+        return
+
+    event_id = broadcast.target_criteria.get('scope_id')
+    try:
+        async_to_sync(channel_layer.group_send)(
+            f"event_{event_id}_announcements",
+            {
+                'type': 'announcements_update',
+                'data': {
+                    'type': 'announcements_update',
+                    'event_id': event_id,
+                    'broadcast_id': broadcast.id,
+                    'title': broadcast.title,
+                    'body': broadcast.message,
+                    'kind': broadcast.target_criteria.get('kind'),
+                    'topic': broadcast.target_criteria.get('topic'),
+                    'link_url': broadcast.target_criteria.get('link_url'),
+                    'timestamp': timezone.now().isoformat(),
+                }
+            }
+        )
+    except Exception:
+        logger.warning("Realtime publish failed for broadcast %s", broadcast.id, exc_info=True)
+
+
+def deliver_email_sms(notification_ids: List):
+    """Render email/SMS for one chunk of notifications and queue them for delivery"""
+    from payments.delivery import EMAIL, SMS, queue_messages
+
+    emails, texts = [], []
+    notifications = Notification.objects.filter(id__in=notification_ids).select_related('user')
+    for notification in notifications:
+        try:
+            emails.append({**render_notification_email(notification), 'notification': notification.id})
+            sms = render_notification_sms(notification)
+            if sms:
+                texts.append({**sms, 'notification': notification.id})
+        except Exception:
+            logger.exception("Email/SMS rendering failed for notification %s", notification.id)
+    with transaction.atomic():
+        queue_messages(EMAIL, emails)
+        queue_messages(SMS, texts)
+
+
+def broadcast_progress(broadcast: Broadcast) -> dict:
+    """Progress payload for the announcement progress endpoint"""
+    processed = broadcast.sent_count + broadcast.failed_count
+    total = broadcast.total_recipients
+    return {
+        'broadcast_id': broadcast.id,
+        'status': broadcast.status,
+        'total_recipients': total,
+        'sent_count': broadcast.sent_count,
+        'failed_count': broadcast.failed_count,
+        'progress': round(processed / total * 100, 1) if total else 100.0,
+        'created_at': broadcast.created_at,
+        'sent_at': broadcast.sent_at,
+    }
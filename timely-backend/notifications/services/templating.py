@@ -45,7 +45,7 @@ Timely Team'''
 
 {body}
 
-{f"View details: {link_url}" if link_url else ""}
+{link_line}
 
 Best regards,
 Timely Team'''
@@ -56,7 +56,7 @@ Timely Team'''
 
 {body}
 
-{f"View ticket: {link_url}" if link_url else ""}
+{link_line}
 
 Best regards,
 Timely Team'''
@@ -78,7 +78,7 @@ Timely Team'''
 
 {body}
 
-{f"Learn more: {link_url}" if link_url else ""}
+{link_line}
 
 Best regards,
 Timely Team'''
@@ -92,7 +92,7 @@ Timely Team'''
 
 {body}
 
-{f"Learn more: {link_url}" if link_url else ""}
+{link_line}
 
 Best regards,
 Timely Team'''
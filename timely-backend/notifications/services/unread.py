@@ -0,0 +1,67 @@
+"""
+Unread counter reconciliation.
+
+NotificationUnread counters are kept with atomic increments and decrements,
+but writes that bypass them (raw queryset updates, restores, manual fixes)
+make them drift. The reconciler recounts unread notifications per batch of
+users and repairs counters that disagree, compare-and-set on the value it
+read so updates landing during the run aren't overwritten.
+"""
+import logging
+from collections import defaultdict
+
+from django.contrib.auth import get_user_model
+from django.db.models import Count
+from django.utils import timezone
+
+from ..models import Notification, NotificationUnread
+
+logger = logging.getLogger(__name__)
+User = get_user_model()
+
+
+def reconcile_unread_counts(user_ids=None, batch_size=1000) -> int:
+    """Repair drifted unread counters; returns how many were fixed"""
+    users = User.objects.order_by('pk').values_list('pk', flat=True)
+    if user_ids is not None:
+        users = users.filter(pk__in=user_ids)
+
+    repaired = 0
+    last_pk = None
+    while True:
+        batch = users.filter(pk__gt=last_pk) if last_pk is not None else users
+        batch = list(batch[:batch_size])
+        if not batch:
+            return repaired
+        last_pk = batch[-1]
+        repaired += _reconcile_batch(batch)
+
+
+def _reconcile_batch(user_ids) -> int:
+    # Read the counters before counting, so a notification arriving in between
+    # changes the counter and makes the compare-and-set below skip that user
+    stored = dict(NotificationUnread.objects.filter(user_id__in=user_ids).values_list('user_id', 'count'))
+    actual = dict(
+        Notification.objects.filter(user_id__in=user_ids, read_at__isnull=True)
+        .order_by().values('user_id').annotate(n=Count('id')).values_list('user_id', 'n')
+    )
+
+    missing = [NotificationUnread(user_id=user_id, count=n) for user_id, n in actual.items() if user_id not in stored]
+    if missing:
+        NotificationUnread.objects.bulk_create(missing, ignore_conflicts=True)
+
+    drifted = defaultdict(list)
+    for user_id, count in stored.items():
+        if count != actual.get(user_id, 0):
+            drifted[(count, actual.get(user_id, 0))].append(user_id)
+
+    now = timezone.now()
+    repaired = len(missing)
+    for (count, fixed), users in drifted.items():
+        repaired += NotificationUnread.objects.filter(user_id__in=users, count=count).update(
+            count=fixed, last_updated=now
+        )
+    if repaired:
+        logger.info("Repaired %d unread counters", repaired)
+        NotificationUnread.forget_cached([m.user_id for m in missing] + [u for users in drifted.values() for u in users])
+    return repaired
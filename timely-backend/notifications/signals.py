@@ -1,18 +1,28 @@
 # notifications/signals.py
-from django.db.models.signals import post_save, post_delete
+from django.db.models.signals import post_init, post_save, post_delete
 from django.dispatch import receiver
 from .models import Notification, NotificationUnread
 
 
+@receiver(post_init, sender=Notification)
+def remember_unread_state(sender, instance, **kwargs):
+    """Remember whether the notification was unread when loaded, to spot read/unread flips on save"""
+    instance._loaded_unread = instance.read_at is None
+
+
 @receiver(post_save, sender=Notification)
-def update_unread_count_on_notification_save(sender, instance, created, **kwargs):
+def update_unread_count_on_notification_save(sender, instance, created, update_fields=None, **kwargs):
     """Update unread count when notification is created or modified"""
+    unread = instance.read_at is None
     if created:
         # New notification - increment count
-        NotificationUnread.increment_for_user(instance.user)
-    else:
-        # Existing notification - recalculate to ensure accuracy
-        NotificationUnread.update_count_for_user(instance.user)
+        if unread:
+            NotificationUnread.increment_for_user(instance.user)
+    elif update_fields is None or 'read_at' in update_fields:
+        # Existing notification - adjust only if it was read or unread since it was loaded
+        if unread != instance._loaded_unread:
+            NotificationUnread.adjust_counts({instance.user_id: 1 if unread else -1})
+    instance._loaded_unread = unread
 
 
 @receiver(post_delete, sender=Notification)
@@ -20,6 +30,3 @@ def update_unread_count_on_notification_delete(sender, instance, **kwargs):
     """Update unread count when notification is deleted"""
     if not instance.read_at:  # Only decrement if it was unread
         NotificationUnread.decrement_for_user(instance.user)
-    else:
-        # Recalculate to ensure accuracy
-        NotificationUnread.update_count_for_user(instance.user)
\ No newline at end of file
@@ -0,0 +1,126 @@
+"""
+Tests for batched announcement fan-out.
+"""
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from rest_framework import status
+from unittest.mock import patch, MagicMock
+
+from events.models import Event
+from payments.models import DeliveryLog
+from ..models import Notification, NotificationUnread, Broadcast
+from ..services.fanout import start_announcement_fanout, broadcast_progress
+
+User = get_user_model()
+
+ANNOUNCEMENT = {
+    'title': 'Weather delay',
+    'body': 'All matches pushed back 30 minutes',
+    'kind': 'announcement',
+    'topic': 'schedule',
+}
+
+
+@override_settings(BACKGROUND_TASKS_EAGER=True, NOTIFICATION_FANOUT_CHUNK_SIZE=4)
+class AnnouncementFanoutTests(TestCase):
+    """Test chunked notification creation and progress tracking"""
+
+    def setUp(self):
+        self.sender = User.objects.create_user(email='admin@example.com', password='testpass123', is_staff=True)
+        self.recipients = [
+            User.objects.create_user(email=f'athlete{i}@example.com', password='testpass123')
+            for i in range(10)
+        ]
+        self.user_ids = [user.id for user in self.recipients]
+
+    @patch('notifications.services.fanout.get_channel_layer')
+    def test_fanout_creates_notifications_in_chunks(self, get_channel_layer):
+        get_channel_layer.return_value = None
+
+        with self.captureOnCommitCallbacks(execute=True):
+            broadcast = start_announcement_fanout(self.sender, ANNOUNCEMENT, 'team', 1, self.user_ids)
+
+        broadcast.refresh_from_db()
+        self.assertEqual(broadcast.status, 'sent')
+        self.assertEqual(broadcast.sent_count, 10)
+        self.assertEqual(broadcast.failed_count, 0)
+        self.assertIsNotNone(broadcast.sent_at)
+        self.assertEqual(Notification.objects.filter(title='Weather delay').count(), 10)
+        self.assertEqual(DeliveryLog.objects.filter(endpoint__endpoint_type='email', status='sent').count(), 10)
+        self.assertEqual(len(mail.outbox), 10)
+        self.assertEqual(Notification.objects.filter(delivered_email=True).count(), 10)
+        self.assertEqual(NotificationUnread.objects.get(user=self.recipients[0]).count, 1)
+        self.assertEqual(broadcast_progress(broadcast)['progress'], 100.0)
+
+    @patch('notifications.services.fanout.async_to_sync')
+    @patch('notifications.services.fanout.get_channel_layer')
+    def test_event_scope_publishes_one_group_message(self, get_channel_layer, async_to_sync):
+        get_channel_layer.return_value = MagicMock()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            start_announcement_fanout(self.sender, ANNOUNCEMENT, 'event', 42, self.user_ids)
+
+        async_to_sync.return_value.assert_called_once()
+        group, message = async_to_sync.return_value.call_args[0]
+        self.assertEqual(group, 'event_42_announcements')
+        self.assertEqual(message['data']['title'], 'Weather delay')
+
+    def test_nothing_is_sent_before_commit(self):
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            broadcast = start_announcement_fanout(self.sender, ANNOUNCEMENT, 'team', 1, self.user_ids)
+
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(broadcast.status, 'sending')
+        self.assertEqual(Notification.objects.count(), 0)
+
+
+@override_settings(BACKGROUND_TASKS_EAGER=True)
+class AnnouncementAPITests(APITestCase):
+    """Test the announce endpoint returns immediately with a progress link"""
+
+    def setUp(self):
+        self.admin = User.objects.create_user(email='admin@example.com', password='testpass123', is_staff=True)
+        self.event = Event.objects.create(
+            name='Championship',
+            sport='Football',
+            start_datetime=timezone.now(),
+            end_datetime=timezone.now() + timezone.timedelta(days=1),
+            created_by=self.admin
+        )
+        self.recipients = User.objects.bulk_create([
+            User(email=f'fan{i}@example.com') for i in range(3)
+        ])
+        self.client.force_authenticate(user=self.admin)
+
+    @patch('notifications.services.fanout.get_channel_layer', return_value=None)
+    @patch('notifications.views.AnnouncementView._get_target_users')
+    def test_announce_returns_broadcast_and_progress(self, get_target_users, _layer):
+        get_target_users.return_value = User.objects.filter(id__in=[u.id for u in self.recipients])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/notifications/announce/', {
+                'scope': 'event',
+                'scope_id': str(self.event.id),
+                **ANNOUNCEMENT,
+            }, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data['total_recipients'], 3)
+
+        progress = self.client.get(response.data['progress_url'])
+        self.assertEqual(progress.status_code, status.HTTP_200_OK)
+        self.assertEqual(progress.data['status'], 'sent')
+        self.assertEqual(progress.data['sent_count'], 3)
+
+    def test_progress_hidden_from_other_users(self):
+        broadcast = Broadcast.objects.create(
+            title='t', message='m', target_type='custom', created_by=self.admin
+        )
+        self.client.force_authenticate(user=self.recipients[0])
+
+        response = self.client.get(f'/api/notifications/announce/{broadcast.id}/')
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
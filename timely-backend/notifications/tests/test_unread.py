@@ -0,0 +1,154 @@
+"""
+Tests for counter-based unread notification tracking.
+"""
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from unittest.mock import patch
+
+from ..models import Notification, NotificationUnread
+from ..services.unread import reconcile_unread_counts
+
+User = get_user_model()
+
+
+def unread_counter(user):
+    return NotificationUnread.objects.get(user=user).count
+
+
+class UnreadCounterTests(TestCase):
+    """Test atomic counter maintenance"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email='fan@example.com', password='testpass123')
+        self.other = User.objects.create_user(email='other@example.com', password='testpass123')
+
+    def _notify(self, user=None, **kwargs):
+        return Notification.objects.create(user=user or self.user, title='Hello', body='World', **kwargs)
+
+    def test_create_read_and_delete_keep_counter_in_step(self):
+        first, second = self._notify(), self._notify()
+        self._notify(read_at=first.created_at)
+        self.assertEqual(unread_counter(self.user), 2)
+
+        first.mark_read()
+        first.mark_read()
+        Notification.objects.get(pk=first.pk).mark_read()  # stale copy of a read notification
+        self.assertEqual(unread_counter(self.user), 1)
+
+        second.delete()
+        first.delete()
+        self.assertEqual(unread_counter(self.user), 0)
+
+    def test_save_marking_unread_increments(self):
+        notification = self._notify()
+        notification.mark_read()
+
+        notification.read_at = None
+        notification.save()
+        notification.save()
+        self.assertEqual(unread_counter(self.user), 1)
+
+        notification.title = 'Edited'
+        notification.save(update_fields=['title'])
+        self.assertEqual(unread_counter(self.user), 1)
+
+    def test_bulk_increment_counts_each_occurrence(self):
+        NotificationUnread.bulk_increment([self.user.id])
+        # Counter rows are inserted if missing, then one UPDATE per distinct delta
+        with self.assertNumQueries(3):
+            NotificationUnread.bulk_increment([self.user.id, self.other.id, self.user.id])
+
+        self.assertEqual(unread_counter(self.user), 3)
+        self.assertEqual(unread_counter(self.other), 1)
+
+    def test_decrement_never_goes_negative(self):
+        NotificationUnread.adjust_counts({self.user.id: 1})
+        NotificationUnread.adjust_counts({self.user.id: -5})
+        self.assertEqual(unread_counter(self.user), 0)
+
+    def test_get_count_is_cached_and_invalidated(self):
+        self._notify()
+        self.assertEqual(NotificationUnread.get_count(self.user.id), 1)
+        with self.assertNumQueries(0):
+            self.assertEqual(NotificationUnread.get_count(self.user.id), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self._notify()
+        self.assertEqual(NotificationUnread.get_count(self.user.id), 2)
+        self.assertEqual(NotificationUnread.get_count(self.other.id), 0)
+
+
+class UnreadReconcileTests(TestCase):
+    """Test repairing counters that drifted"""
+
+    def setUp(self):
+        cache.clear()
+        self.users = [User.objects.create_user(email=f'user{i}@example.com', password='testpass123') for i in range(3)]
+        for user in self.users[:2]:
+            Notification.objects.create(user=user, title='Hello', body='World')
+
+    def test_reconcile_repairs_drift(self):
+        NotificationUnread.objects.filter(user=self.users[0]).update(count=7)
+        NotificationUnread.objects.filter(user=self.users[1]).delete()
+        NotificationUnread.objects.create(user=self.users[2], count=2)
+
+        self.assertEqual(reconcile_unread_counts(batch_size=2), 3)
+        self.assertEqual([unread_counter(user) for user in self.users], [1, 1, 0])
+        self.assertEqual(reconcile_unread_counts(), 0)
+
+    def test_reconcile_skips_counters_changed_since_read(self):
+        NotificationUnread.objects.filter(user=self.users[0]).update(count=7)
+
+        # Another write lands between the reconciler's read and its compare-and-set
+        original = NotificationUnread.objects.filter
+        def racing_filter(*args, **kwargs):
+            if 'count' in kwargs:
+                original(user=self.users[0]).update(count=8)
+            return original(*args, **kwargs)
+
+        with patch.object(NotificationUnread.objects, 'filter', side_effect=racing_filter):
+            self.assertEqual(reconcile_unread_counts(), 0)
+        self.assertEqual(unread_counter(self.users[0]), 8)
+
+    def test_command(self):
+        NotificationUnread.objects.filter(user=self.users[0]).update(count=3)
+        call_command('reconcile_unread_counts', stdout=open('/dev/null', 'w'))
+        self.assertEqual(unread_counter(self.users[0]), 1)
+
+
+class UnreadEndpointTests(APITestCase):
+    """Test the badge and mark-read endpoints"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email='fan@example.com', password='testpass123')
+        self.client.force_authenticate(user=self.user)
+        self.notifications = [
+            Notification.objects.create(user=self.user, title=f'Note {i}', body='Body') for i in range(4)
+        ]
+
+    def test_unread_count_reads_counter_not_notifications(self):
+        NotificationUnread.objects.filter(user=self.user).update(count=9)
+
+        response = self.client.get(reverse('notifications-unread-count'))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 9)
+
+    def test_mark_read_bulk_and_all_decrement_counter(self):
+        ids = [str(n.id) for n in self.notifications[:2]]
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('notifications-mark-read-bulk'), {'ids': ids}, format='json')
+        self.assertEqual(response.data['updated'], 2)
+        self.assertEqual(self.client.get(reverse('notifications-unread-count')).data['count'], 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('notifications-mark-all-read'))
+        self.assertEqual(unread_counter(self.user), 0)
+        self.assertEqual(self.client.get(reverse('notifications-unread-count')).data['count'], 0)
@@ -3,6 +3,7 @@ from rest_framework.routers import DefaultRouter
 from .views import (
     NotificationViewSet,
     AnnouncementView,
+    AnnouncementProgressView,
     MessageThreadViewSet,
     MessageViewSet,
 )
@@ -16,9 +17,12 @@ messages_router.register(r"threads", MessageThreadViewSet, basename="message-thr
 messages_router.register(r"messages", MessageViewSet, basename="messages")
 
 urlpatterns = [
+    # Announcement routes come before the router so "announce" is not taken as a notification pk
+    path("announce/", AnnouncementView.as_view(), name="announcement"),
+    path("announce/<int:broadcast_id>/", AnnouncementProgressView.as_view(), name="announcement-progress"),
+    
     # Notifications endpoints mounted at /api/notifications/
     path("", include(notifications_router.urls)),
-    path("announce/", AnnouncementView.as_view(), name="announcement"),
     
     # Messaging endpoints mounted at /api/notifications/messages/
     path("messages/", include(messages_router.urls)),
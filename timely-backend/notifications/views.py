@@ -5,17 +5,20 @@ Implements REST endpoints with RBAC and rate limiting.
 from __future__ import annotations
 
 from typing import Any
+from django.db import transaction
 from django.db.models import QuerySet, Q
 from django.contrib.auth import get_user_model
+from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from rest_framework import viewsets, permissions, status, pagination
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.reverse import reverse
 from rest_framework.views import APIView
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
 
-from .models import Notification, MessageThread, MessageParticipant, Message
+from .models import Notification, NotificationUnread, MessageThread, MessageParticipant, Message, Broadcast
 from .serializers import (
     NotificationSerializer, NotificationCreateSerializer, AnnouncementSerializer,
     MessageThreadSerializer, MessageThreadCreateSerializer, MessageSerializer,
@@ -25,7 +28,7 @@ from .permissions import (
     NotificationPermissions, AnnouncementPermissions, MessageThreadPermissions,
     MessagePermissions, RateLimitPermission
 )
-from .services.email_sms import send_notification_email, send_notification_sms
+from .services.fanout import start_announcement_fanout, broadcast_progress
 
 User = get_user_model()
 
@@ -74,9 +77,12 @@ class NotificationViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['post', 'patch'])
     def mark_all_read(self, request, *args: Any, **kwargs: Any) -> Response:
         """Mark all notifications as read"""
-        count = self.get_queryset().filter(read_at__isnull=True).update(
-            read_at=timezone.now()
-        )
+        with transaction.atomic():
+            count = self.get_queryset().filter(read_at__isnull=True).update(
+                read_at=timezone.now()
+            )
+            # Queryset updates skip signals, so take exactly what was flipped off the counter
+            NotificationUnread.adjust_counts({request.user.id: -count})
         return Response({"updated": count}, status=status.HTTP_200_OK)
 
     @action(detail=True, methods=['post', 'patch'])
@@ -90,11 +96,8 @@ class NotificationViewSet(viewsets.ModelViewSet):
     def unread_count(self, request, *args: Any, **kwargs: Any) -> Response:
         """Get unread notification count for current user"""
         try:
-            # Count unread notifications for the current user
-            unread_count = Notification.objects.filter(
-                user=request.user,
-                read_at__isnull=True
-            ).count()
+            # Served from the cached counter; the Notification table isn't touched
+            unread_count = NotificationUnread.get_count(request.user.id)
             
             return Response({
                 'count': unread_count
@@ -111,7 +114,9 @@ class NotificationViewSet(viewsets.ModelViewSet):
         ids = request.data.get('ids') or []
         if not isinstance(ids, list) or not ids:
             return Response({"detail": "ids must be a non-empty list"}, status=status.HTTP_400_BAD_REQUEST)
-        updated = Notification.objects.filter(user=request.user, id__in=ids, read_at__isnull=True).update(read_at=timezone.now())
+        with transaction.atomic():
+            updated = Notification.objects.filter(user=request.user, id__in=ids, read_at__isnull=True).update(read_at=timezone.now())
+            NotificationUnread.adjust_counts({request.user.id: -updated})
         return Response({"updated": updated}, status=status.HTTP_200_OK)
 
 
@@ -135,58 +140,23 @@ class AnnouncementView(APIView):
         
         # Get target users based on scope
         target_users = self._get_target_users(scope, scope_id, request.user)
+        user_ids = list(target_users.values_list('id', flat=True))
         
-        if not target_users:
+        if not user_ids:
             return Response(
                 {"detail": "No participants found for the specified scope"},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        # Create notifications for all target users
-        notifications = []
-        for user in target_users:
-            notification = Notification.objects.create(
-                user=user,
-                kind=data['kind'],
-                topic=data['topic'],
-                title=data['title'],
-                body=data['body'],
-                link_url=data.get('link_url')
-            )
-            notifications.append(notification)
-            
-            # Send realtime notification
-            try:
-                from channels.layers import get_channel_layer
-                from asgiref.sync import async_to_sync
-                
-                channel_layer = get_channel_layer()
-                if channel_layer:
-                    async_to_sync(channel_layer.group_send)(
-                        f"user_{user.id}",
-                        {
-                            "type": "announcement",
-                            "id": notification.id,
-                            "title": notification.title,
-                            "body": notification.body,
-                            "kind": notification.kind,
-                            "topic": notification.topic,
-                            "link_url": notification.link_url,
-                            "created_at": notification.created_at.isoformat()
-                        }
-                    )
-            except Exception:
-                # Don't fail the announcement for realtime errors
-                pass
-            
-            # Send email/SMS (stubs)
-            send_notification_email(notification)
-            send_notification_sms(notification)
+        # Notifications, realtime publish and email/SMS run in the background
+        broadcast = start_announcement_fanout(request.user, data, scope, scope_id, user_ids)
 
         return Response({
-            "detail": f"Announcement sent to {len(notifications)} participants",
-            "notifications_created": len(notifications)
-        }, status=status.HTTP_201_CREATED)
+            "detail": f"Announcement queued for {len(user_ids)} participants",
+            "broadcast_id": broadcast.id,
+            "total_recipients": len(user_ids),
+            "progress_url": reverse('announcement-progress', args=[broadcast.id], request=request),
+        }, status=status.HTTP_202_ACCEPTED)
 
     def _get_target_users(self, scope: str, scope_id: str, user) -> QuerySet[User]:
         """Get target users based on scope and user permissions"""
@@ -234,6 +204,23 @@ class AnnouncementView(APIView):
         return User.objects.none()
 
 
+class AnnouncementProgressView(APIView):
+    """
+    Progress of a queued announcement.
+    Visible to the sender and to staff.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, broadcast_id, *args, **kwargs):
+        broadcast = get_object_or_404(Broadcast, id=broadcast_id)
+        if not request.user.is_staff and broadcast.created_by_id != request.user.id:
+            return Response(
+                {"detail": "You do not have permission to view this announcement"},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        return Response(broadcast_progress(broadcast), status=status.HTTP_200_OK)
+
+
 class MessageThreadViewSet(viewsets.ModelViewSet):
     """
     ViewSet for message threads.
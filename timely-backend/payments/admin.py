@@ -5,6 +5,7 @@ from django.urls import reverse
 from django.utils import timezone
 from django.contrib import messages
 from django.db import transaction
+from .inbox import requeue
 from .models import (
     PaymentIntent, WebhookEvent, Refund, PaymentSettings, 
     DeliveryEndpoint, DeliveryLog
@@ -173,13 +174,14 @@ class WebhookEventAdmin(admin.ModelAdmin):
     """Enhanced admin configuration for WebhookEvent model"""
     list_display = [
         'stripe_event_id', 'event_type', 'created_at', 'received_at', 
-        'processed_badge', 'processing_error_preview'
+        'processed_badge', 'attempts', 'processing_error_preview'
     ]
-    list_filter = ['event_type', 'processed', 'created_at', 'received_at']
+    list_filter = ['status', 'event_type', 'created_at', 'received_at']
     search_fields = ['stripe_event_id', 'event_type', 'processing_error']
     readonly_fields = [
         'stripe_event_id', 'event_type', 'api_version', 'created_at', 
-        'received_at', 'data', 'processed', 'processing_error'
+        'received_at', 'data', 'processed', 'processing_error',
+        'ordering_key', 'status', 'attempts', 'next_attempt_at', 'locked_at', 'processed_at'
     ]
     actions = ['replay_failed_webhooks', 'mark_as_processed']
     
@@ -191,7 +193,10 @@ class WebhookEventAdmin(admin.ModelAdmin):
             'fields': ('created_at', 'received_at')
         }),
         ('Processing', {
-            'fields': ('processed', 'processing_error')
+            'fields': (
+                'status', 'ordering_key', 'attempts', 'next_attempt_at',
+                'locked_at', 'processed_at', 'processing_error'
+            )
         }),
         ('Event Data', {
             'fields': ('data',),
@@ -200,10 +205,14 @@ class WebhookEventAdmin(admin.ModelAdmin):
     )
     
     def processed_badge(self, obj):
-        """Display processed status with color coding"""
-        if obj.processed:
+        """Display inbox status with color coding"""
+        if obj.status == WebhookEvent.Status.PROCESSED:
             return format_html('<span style="color: green;">✓ Processed</span>')
-        return format_html('<span style="color: red;">● Failed</span>')
+        if obj.status == WebhookEvent.Status.FAILED:
+            return format_html('<span style="color: red;">● Failed</span>')
+        if obj.attempts:
+            return format_html('<span style="color: orange;">↻ Retrying</span>')
+        return format_html('<span style="color: gray;">{}</span>', obj.get_status_display())
     processed_badge.short_description = 'Status'
     
     def processing_error_preview(self, obj):
@@ -215,15 +224,13 @@ class WebhookEventAdmin(admin.ModelAdmin):
     processing_error_preview.short_description = 'Error'
     
     def replay_failed_webhooks(self, request, queryset):
-        """Replay failed webhook events"""
-        failed_webhooks = queryset.filter(processed=False)
-        count = failed_webhooks.count()
-        
-        if count == 0:
+        """Put failed webhook events back in the inbox"""
+        failed_ids = list(queryset.filter(status=WebhookEvent.Status.FAILED).values_list('id', flat=True))
+        if not failed_ids:
             self.message_user(request, 'No failed webhooks to replay.', level=messages.WARNING)
             return
         
-        # In a real implementation, you would replay the webhooks here
+        count = requeue(failed_ids)
         self.message_user(
             request, 
             f'Replay initiated for {count} failed webhook(s).', 
@@ -233,7 +240,9 @@ class WebhookEventAdmin(admin.ModelAdmin):
     
     def mark_as_processed(self, request, queryset):
         """Mark selected webhooks as processed"""
-        updated = queryset.filter(processed=False).update(processed=True)
+        updated = queryset.exclude(status=WebhookEvent.Status.PROCESSED).exclude(
+            status=WebhookEvent.Status.PROCESSING
+        ).update(processed=True, status=WebhookEvent.Status.PROCESSED, next_attempt_at=None)
         self.message_user(
             request, 
             f'Marked {updated} webhook(s) as processed.', 
@@ -384,11 +393,14 @@ class DeliveryLogAdmin(admin.ModelAdmin):
         (None, {
             'fields': ('endpoint', 'notification', 'webhook_event', 'status')
         }),
+        ('Message', {
+            'fields': ('payload',)
+        }),
         ('Response', {
             'fields': ('response_code', 'response_body', 'error_message')
         }),
         ('Retry Tracking', {
-            'fields': ('retry_count', 'max_retries')
+            'fields': ('retry_count', 'max_retries', 'next_attempt_at', 'locked_at')
         }),
         ('Timestamps', {
             'fields': ('created_at', 'sent_at'),
@@ -414,6 +426,7 @@ class DeliveryLogAdmin(admin.ModelAdmin):
             'sent': 'green',
             'failed': 'red',
             'pending': 'orange',
+            'sending': 'purple',
             'retrying': 'blue'
         }
         color = colors.get(obj.status, 'gray')
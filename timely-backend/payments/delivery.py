@@ -0,0 +1,354 @@
+# payments/delivery.py
+"""
+Outbound delivery engine for email and SMS.
+
+Callers (notification fan-out, reminders, account emails) render their
+messages and store them as DeliveryLog rows against the DeliveryEndpoint
+that carries them, then return; nothing waits on a provider. Workers on the
+"delivery" background queue drain an endpoint's due rows oldest first, in
+batches of DELIVERY_BATCH_SIZE, and every email in a batch goes over one
+backend connection.
+
+A message that fails is retried after exponential backoff with jitter until
+its max_retries are spent. A batch in which nothing could be sent counts
+against the endpoint's failure_count; at DELIVERY_BREAKER_THRESHOLD the
+endpoint trips (status "failed") and is skipped for
+DELIVERY_BREAKER_COOLDOWN seconds, after which a single message probes it
+and one success closes it again. Messages simply wait in the table
+meanwhile, so a slow or failing provider grows the queue instead of
+blocking requests.
+
+The deliver_pending command runs due retries and releases rows held by dead
+workers; delivery_stats() reports queue depth and throughput per endpoint.
+"""
+import logging
+import random
+import threading
+import time
+from datetime import timedelta
+from typing import Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import connection, transaction
+from django.db.models import Count, F, Min, Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from common.background import get_queue
+
+from .models import DeliveryEndpoint, DeliveryLog
+
+logger = logging.getLogger(__name__)
+
+QUEUE_NAME = 'delivery'
+EMAIL = 'email'
+SMS = 'sms'
+
+_QUEUED = ('pending', 'retrying')
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+# ---------------------------------------------------------------------------
+# Queueing
+# ---------------------------------------------------------------------------
+
+def get_endpoint(endpoint_type: str) -> DeliveryEndpoint:
+    """The endpoint messages of a type go through; a default one is created on first use"""
+    endpoint = (
+        DeliveryEndpoint.objects.filter(endpoint_type=endpoint_type).exclude(status='inactive')
+        .order_by('id').first()
+    )
+    if endpoint is None:
+        endpoint = DeliveryEndpoint.objects.create(name=f'Default {endpoint_type}', endpoint_type=endpoint_type)
+    return endpoint
+
+
+def queue_messages(endpoint_type: str, messages: Iterable[Dict]) -> int:
+    """
+    Store messages for delivery and wake a worker once they are committed.
+
+    A message is a payload dict (to, body; for email also subject and
+    optionally html and from_email); a 'notification' key links the row to
+    the Notification it delivers. Returns the number of messages queued.
+    """
+    rows = []
+    for message in messages:
+        payload = dict(message)
+        notification_id = payload.pop('notification', None)
+        if payload.get('to'):
+            rows.append(DeliveryLog(payload=payload, notification_id=notification_id,
+                                    max_retries=_setting('DELIVERY_MAX_RETRIES', 5)))
+    if not rows:
+        return 0
+
+    endpoint = get_endpoint(endpoint_type)
+    for row in rows:
+        row.endpoint = endpoint
+    DeliveryLog.objects.bulk_create(rows, batch_size=500)
+    transaction.on_commit(lambda: get_queue(QUEUE_NAME).submit(drain_endpoint, endpoint.pk))
+    return len(rows)
+
+
+def queue_email(to: Iterable[str], subject: str, body: str, html: Optional[str] = None,
+                from_email: Optional[str] = None) -> int:
+    """Queue one email per recipient"""
+    if isinstance(to, str):
+        to = [to]
+    return queue_messages(EMAIL, (
+        {'to': address, 'subject': subject, 'body': body, 'html': html, 'from_email': from_email}
+        for address in to
+    ))
+
+
+# ---------------------------------------------------------------------------
+# Transports: send a batch over an endpoint, one result per row (None = sent)
+# ---------------------------------------------------------------------------
+
+def send_email_batch(endpoint: DeliveryEndpoint, logs: List[DeliveryLog]) -> List[Optional[Exception]]:
+    """Send every email of the batch over a single backend connection"""
+    config = endpoint.config or {}
+    email_connection = get_connection(backend=config.get('backend'), fail_silently=False, **config.get('options', {}))
+    default_from = config.get('from_email') or settings.DEFAULT_FROM_EMAIL
+    results = []
+    email_connection.open()  # raises if the server is unreachable: the whole batch is retried
+    try:
+        for log in logs:
+            payload = log.payload
+            message = EmailMultiAlternatives(
+                subject=payload.get('subject', ''),
+                body=payload.get('body', ''),
+                from_email=payload.get('from_email') or default_from,
+                to=[payload['to']],
+                connection=email_connection,
+            )
+            if payload.get('html'):
+                message.attach_alternative(payload['html'], 'text/html')
+            try:
+                message.send()
+                results.append(None)
+            except Exception as exc:
+                results.append(exc)
+    finally:
+        email_connection.close()
+    return results
+
+
+def log_sms(to: str, body: str, config: Dict):
+    """Development SMS sender: logs the message instead of calling a provider"""
+    logger.info("SMS to %s: %s", to, body[:160])
+
+
+def send_sms_batch(endpoint: DeliveryEndpoint, logs: List[DeliveryLog]) -> List[Optional[Exception]]:
+    """Send each SMS through the sender named in the endpoint config (dotted path)"""
+    config = endpoint.config or {}
+    send = import_string(config.get('sender', 'payments.delivery.log_sms'))
+    results = []
+    for log in logs:
+        try:
+            send(log.payload['to'], log.payload.get('body', ''), config)
+            results.append(None)
+        except Exception as exc:
+            results.append(exc)
+    return results
+
+
+TRANSPORTS = {
+    EMAIL: send_email_batch,
+    SMS: send_sms_batch,
+}
+
+
+# ---------------------------------------------------------------------------
+# Workers
+# ---------------------------------------------------------------------------
+
+def backoff(retry_count: int) -> timedelta:
+    """Exponential backoff with jitter: half the step, plus up to the other half at random"""
+    base = _setting('DELIVERY_RETRY_BASE_SECONDS', 10)
+    step = min(_setting('DELIVERY_RETRY_MAX_SECONDS', 3600), base * 2 ** (retry_count - 1))
+    return timedelta(seconds=step / 2 + random.uniform(0, step / 2))
+
+
+def breaker_state(endpoint: DeliveryEndpoint, now=None) -> str:
+    """'closed', 'open' (cooling down after repeated failures) or 'half_open' (ready for a probe)"""
+    if endpoint.failure_count < _setting('DELIVERY_BREAKER_THRESHOLD', 5):
+        return 'closed'
+    cooldown = timedelta(seconds=_setting('DELIVERY_BREAKER_COOLDOWN', 60))
+    now = now or timezone.now()
+    if endpoint.last_failure_at and now - endpoint.last_failure_at < cooldown:
+        return 'open'
+    return 'half_open'
+
+
+def _claim(endpoint: DeliveryEndpoint, limit: int) -> List[DeliveryLog]:
+    """Take up to limit due rows of an endpoint, oldest first"""
+    now = timezone.now()
+    with transaction.atomic():
+        due = (
+            DeliveryLog.objects.filter(endpoint=endpoint, status__in=_QUEUED)
+            .filter(Q(next_attempt_at__isnull=True) | Q(next_attempt_at__lte=now))
+            .order_by('created_at', 'id')
+            .only('id', 'payload', 'notification_id', 'retry_count', 'max_retries')
+        )
+        if connection.features.has_select_for_update_skip_locked:
+            # Concurrent workers split the due rows between them
+            due = due.select_for_update(skip_locked=True)
+        logs = list(due[:limit])
+        if logs:
+            DeliveryLog.objects.filter(pk__in=[log.pk for log in logs]).update(status='sending', locked_at=now)
+    return logs
+
+
+_counters = {'batches': 0, 'sent': 0, 'failed': 0, 'send_seconds': 0.0}
+_counters_lock = threading.Lock()
+_started = time.monotonic()
+
+
+def _record(endpoint: DeliveryEndpoint, logs: List[DeliveryLog], results: List[Optional[Exception]], elapsed: float):
+    now = timezone.now()
+    sent = [log for log, error in zip(logs, results) if error is None]
+    failed = [(log, error) for log, error in zip(logs, results) if error is not None]
+
+    if sent:
+        DeliveryLog.objects.filter(pk__in=[log.pk for log in sent]).update(
+            status='sent', sent_at=now, locked_at=None, next_attempt_at=None, error_message='',
+        )
+        notification_ids = [log.notification_id for log in sent if log.notification_id]
+        if notification_ids and endpoint.endpoint_type in (EMAIL, SMS):
+            from notifications.models import Notification
+            flag = 'delivered_email' if endpoint.endpoint_type == EMAIL else 'delivered_sms'
+            Notification.objects.filter(pk__in=notification_ids).update(**{flag: True})
+
+    for log, error in failed:
+        retry_count = log.retry_count + 1
+        exhausted = retry_count > log.max_retries
+        DeliveryLog.objects.filter(pk=log.pk).update(
+            status='failed' if exhausted else 'retrying',
+            retry_count=retry_count,
+            next_attempt_at=None if exhausted else now + backoff(retry_count),
+            error_message=f'{type(error).__name__}: {error}',
+            locked_at=None,
+        )
+
+    if sent:
+        DeliveryEndpoint.objects.filter(pk=endpoint.pk).exclude(status='inactive').update(
+            status='active', failure_count=0, last_success_at=now,
+        )
+    elif failed:
+        # Nothing got through: count it against the endpoint
+        DeliveryEndpoint.objects.filter(pk=endpoint.pk).update(failure_count=F('failure_count') + 1, last_failure_at=now)
+        tripped = DeliveryEndpoint.objects.filter(
+            pk=endpoint.pk, status='active', failure_count__gte=_setting('DELIVERY_BREAKER_THRESHOLD', 5),
+        ).update(status='failed')
+        if tripped:
+            logger.warning("Delivery endpoint %s tripped after repeated failures: %s", endpoint, failed[0][1])
+
+    with _counters_lock:
+        _counters['batches'] += 1
+        _counters['sent'] += len(sent)
+        _counters['failed'] += len(failed)
+        _counters['send_seconds'] += elapsed
+
+
+def drain_endpoint(endpoint_id: int) -> int:
+    """Send an endpoint's due messages batch by batch while its breaker allows; returns messages sent"""
+    total = 0
+    while True:
+        endpoint = DeliveryEndpoint.objects.filter(pk=endpoint_id).exclude(status='inactive').first()
+        if endpoint is None:
+            return total
+        state = breaker_state(endpoint)
+        if state == 'open':
+            return total
+        logs = _claim(endpoint, 1 if state == 'half_open' else _setting('DELIVERY_BATCH_SIZE', 100))
+        if not logs:
+            return total
+
+        started = time.monotonic()
+        transport = TRANSPORTS.get(endpoint.endpoint_type)
+        try:
+            if transport is None:
+                raise ValueError(f'No transport for {endpoint.endpoint_type} endpoints')
+            results = transport(endpoint, logs)
+        except Exception as exc:
+            logger.warning("Delivery batch on %s failed: %s", endpoint, exc)
+            results = [exc] * len(logs)
+        _record(endpoint, logs, results, time.monotonic() - started)
+        total += sum(1 for error in results if error is None)
+
+
+def sweep() -> int:
+    """
+    Release rows held by workers that died, then drain every endpoint with
+    due messages. Returns messages sent.
+    """
+    now = timezone.now()
+    lease = timedelta(seconds=_setting('DELIVERY_LEASE_SECONDS', 300))
+    released = DeliveryLog.objects.filter(status='sending', locked_at__lt=now - lease).update(
+        status='retrying', locked_at=None, next_attempt_at=None,
+    )
+    if released:
+        logger.warning("Released %s deliveries held past their lease", released)
+
+    endpoint_ids = (
+        DeliveryLog.objects.filter(status__in=_QUEUED)
+        .filter(Q(next_attempt_at__isnull=True) | Q(next_attempt_at__lte=now))
+        .order_by().values_list('endpoint_id', flat=True).distinct()
+    )
+    return sum(drain_endpoint(endpoint_id) for endpoint_id in list(endpoint_ids))
+
+
+def delivery_stats() -> Dict:
+    """Queue depth, breaker state and recent throughput per endpoint, plus this process's worker counters"""
+    now = timezone.now()
+    due = Q(status__in=_QUEUED) & (Q(next_attempt_at__isnull=True) | Q(next_attempt_at__lte=now))
+    rows = (
+        DeliveryLog.objects.filter(Q(status__in=(*_QUEUED, 'sending', 'failed')) | Q(sent_at__gte=now - timedelta(hours=1)))
+        .values('endpoint_id').order_by()
+        .annotate(
+            queued=Count('id', filter=Q(status__in=_QUEUED)),
+            due=Count('id', filter=due),
+            sending=Count('id', filter=Q(status='sending')),
+            failed=Count('id', filter=Q(status='failed')),
+            sent_last_minute=Count('id', filter=Q(status='sent', sent_at__gte=now - timedelta(minutes=1))),
+            sent_last_hour=Count('id', filter=Q(status='sent', sent_at__gte=now - timedelta(hours=1))),
+            oldest_queued=Min('created_at', filter=Q(status__in=_QUEUED)),
+        )
+    )
+    by_endpoint = {row.pop('endpoint_id'): row for row in rows}
+
+    endpoints = []
+    for endpoint in DeliveryEndpoint.objects.all():
+        row = by_endpoint.get(endpoint.pk, {})
+        oldest = row.get('oldest_queued')
+        endpoints.append({
+            'id': endpoint.pk,
+            'name': endpoint.name,
+            'type': endpoint.endpoint_type,
+            'status': endpoint.status,
+            'breaker': breaker_state(endpoint, now),
+            'failure_count': endpoint.failure_count,
+            'queued': row.get('queued', 0),
+            'due': row.get('due', 0),
+            'sending': row.get('sending', 0),
+            'failed': row.get('failed', 0),
+            'sent_last_minute': row.get('sent_last_minute', 0),
+            'sent_last_hour': row.get('sent_last_hour', 0),
+            'oldest_queued_seconds': round((now - oldest).total_seconds(), 3) if oldest else 0.0,
+        })
+
+    with _counters_lock:
+        worker = dict(_counters)
+    uptime = time.monotonic() - _started
+    worker['messages_per_second'] = round(worker['sent'] / uptime, 2) if uptime else 0.0
+    worker['send_seconds'] = round(worker['send_seconds'], 3)
+    return {
+        'endpoints': endpoints,
+        'queue_depth': sum(endpoint['queued'] + endpoint['sending'] for endpoint in endpoints),
+        'worker': worker,
+        'queue': get_queue(QUEUE_NAME).stats(),
+    }
@@ -0,0 +1,215 @@
+# payments/inbox.py
+"""
+Durable inbox for Stripe webhooks.
+
+The webhook views only verify the signature, store the event and return 200.
+Each Stripe event id maps to one WebhookEvent row, so Stripe's retries and
+duplicate deliveries collapse onto it. Fulfilment runs afterwards on the
+"webhooks" background queue.
+
+Events are processed in order per ordering key (the order or registration
+they concern). A worker only ever claims the oldest unfinished event of a
+key, with a guarded PENDING -> PROCESSING update, so no two workers run
+events for the same order at once and an event waiting for a retry holds
+back the ones after it. Failures are retried with exponential backoff up to
+STRIPE_WEBHOOK_MAX_ATTEMPTS, then parked as FAILED for replay from the
+admin. The process_webhook_inbox command runs due retries and recovers
+events whose worker died mid-run.
+"""
+import logging
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import stripe
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Min, Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from common.background import get_queue
+
+from .models import WebhookEvent
+
+logger = logging.getLogger(__name__)
+
+QUEUE_NAME = 'webhooks'
+
+# Event type -> handlers, called in turn with the event's data.object
+HANDLERS: Dict[str, Tuple[str, ...]] = {
+    'checkout.session.completed': ('tickets.views_webhook.handle_checkout_session_completed',),
+    'checkout.session.expired': ('tickets.views_webhook.handle_checkout_session_expired',),
+    'payment_intent.succeeded': ('payments.views.handle_payment_succeeded',),
+    'payment_intent.payment_failed': (
+        'tickets.views_webhook.handle_payment_failed',
+        'payments.views.handle_payment_failed',
+    ),
+    'charge.refunded': ('payments.views.handle_refund_processed',),
+}
+
+_UNFINISHED = (WebhookEvent.Status.PENDING, WebhookEvent.Status.PROCESSING)
+
+
+def ordering_key_for(obj: Dict[str, Any]) -> str:
+    """The order or registration an event's object concerns; its events are processed in sequence"""
+    metadata = obj.get('metadata') or {}
+    if metadata.get('order_id'):
+        return f"order:{metadata['order_id']}"
+    if metadata.get('registration_id'):
+        return f"registration:{metadata['registration_id']}"
+    if obj.get('client_reference_id'):
+        return f"ref:{obj['client_reference_id']}"
+    payment_intent = obj.get('payment_intent')
+    if isinstance(payment_intent, dict):
+        payment_intent = payment_intent.get('id')
+    if payment_intent:
+        return f"pi:{payment_intent}"
+    return f"obj:{obj.get('id', '')}"
+
+
+def record_event(event: Dict[str, Any]) -> Tuple[WebhookEvent, bool]:
+    """
+    Store a verified Stripe event; returns (row, created).
+
+    Only new events are queued for processing, after the row is committed.
+    """
+    obj = event.get('data', {}).get('object', {})
+    ordering_key = ordering_key_for(obj)
+    created_ts = event.get('created')
+    webhook_event, created = WebhookEvent.objects.get_or_create(
+        stripe_event_id=event['id'],
+        defaults={
+            'event_type': event.get('type', ''),
+            'api_version': event.get('api_version') or '',
+            'created_at': datetime.fromtimestamp(created_ts, tz=dt_timezone.utc) if created_ts else timezone.now(),
+            'data': event.get('data', {}),
+            'ordering_key': ordering_key,
+        },
+    )
+    if created:
+        transaction.on_commit(lambda: enqueue(ordering_key))
+    return webhook_event, created
+
+
+def enqueue(ordering_key: str):
+    return get_queue(QUEUE_NAME).submit(drain, ordering_key)
+
+
+def _backoff(attempts: int) -> timedelta:
+    base = getattr(settings, 'STRIPE_WEBHOOK_RETRY_BASE_SECONDS', 30)
+    cap = getattr(settings, 'STRIPE_WEBHOOK_RETRY_MAX_SECONDS', 3600)
+    return timedelta(seconds=min(cap, base * 2 ** (attempts - 1)))
+
+
+def _claim_head(ordering_key: str) -> Optional[WebhookEvent]:
+    """Claim the oldest unfinished event of a key, if it is due and nobody holds it"""
+    head = (
+        WebhookEvent.objects.filter(ordering_key=ordering_key, status__in=_UNFINISHED)
+        .order_by('created_at', 'id')
+        .only('id', 'status', 'next_attempt_at', 'attempts', 'event_type', 'data')
+        .first()
+    )
+    now = timezone.now()
+    if head is None or head.status != WebhookEvent.Status.PENDING:
+        return None
+    if head.next_attempt_at and head.next_attempt_at > now:
+        return None
+    claimed = WebhookEvent.objects.filter(pk=head.pk, status=WebhookEvent.Status.PENDING).update(
+        status=WebhookEvent.Status.PROCESSING, locked_at=now, attempts=F('attempts') + 1,
+    )
+    if not claimed:
+        return None
+    head.attempts += 1
+    return head
+
+
+def process_event(webhook_event: WebhookEvent) -> bool:
+    """Run an event's handlers and record the outcome; returns whether it succeeded"""
+    obj = stripe.StripeObject.construct_from(webhook_event.data.get('object', {}), None)
+    try:
+        handlers = HANDLERS.get(webhook_event.event_type, ())
+        if not handlers:
+            logger.info("Unhandled Stripe event type: %s", webhook_event.event_type)
+        for path in handlers:
+            import_string(path)(obj)
+    except Exception as exc:
+        max_attempts = getattr(settings, 'STRIPE_WEBHOOK_MAX_ATTEMPTS', 8)
+        gave_up = webhook_event.attempts >= max_attempts
+        logger.error(
+            "Stripe event %s (%s) failed on attempt %s%s",
+            webhook_event.pk, webhook_event.event_type, webhook_event.attempts,
+            '; giving up' if gave_up else '', exc_info=True,
+        )
+        WebhookEvent.objects.filter(pk=webhook_event.pk).update(
+            status=WebhookEvent.Status.FAILED if gave_up else WebhookEvent.Status.PENDING,
+            next_attempt_at=None if gave_up else timezone.now() + _backoff(webhook_event.attempts),
+            processing_error=f"{type(exc).__name__}: {exc}",
+            locked_at=None,
+        )
+        return False
+
+    WebhookEvent.objects.filter(pk=webhook_event.pk).update(
+        status=WebhookEvent.Status.PROCESSED, processed=True, processed_at=timezone.now(),
+        processing_error='', next_attempt_at=None, locked_at=None,
+    )
+    return True
+
+
+def drain(ordering_key: str) -> int:
+    """Process a key's due events oldest first; stops at the first failure. Returns events processed"""
+    processed = 0
+    while True:
+        webhook_event = _claim_head(ordering_key)
+        if webhook_event is None or not process_event(webhook_event):
+            return processed
+        processed += 1
+
+
+def requeue(event_ids: Iterable[int]) -> int:
+    """Put events (e.g. FAILED ones picked in the admin) back in the inbox for another round of attempts"""
+    keys = set()
+    with transaction.atomic():
+        events = WebhookEvent.objects.filter(pk__in=list(event_ids)).exclude(status=WebhookEvent.Status.PROCESSING)
+        keys.update(events.values_list('ordering_key', flat=True))
+        count = events.update(
+            status=WebhookEvent.Status.PENDING, processed=False, attempts=0, next_attempt_at=None,
+        )
+        for key in keys:
+            transaction.on_commit(lambda key=key: enqueue(key))
+    return count
+
+
+def sweep(limit: int = 500) -> int:
+    """
+    Release events held by workers that died, then drain every key with a
+    due event. Returns events processed.
+    """
+    now = timezone.now()
+    lease = timedelta(seconds=getattr(settings, 'STRIPE_WEBHOOK_LEASE_SECONDS', 300))
+    stale = WebhookEvent.objects.filter(status=WebhookEvent.Status.PROCESSING, locked_at__lt=now - lease)
+    released = stale.update(status=WebhookEvent.Status.PENDING, locked_at=None)
+    if released:
+        logger.warning("Released %s Stripe events held past their lease", released)
+
+    keys = (
+        WebhookEvent.objects.filter(status=WebhookEvent.Status.PENDING)
+        .filter(Q(next_attempt_at__isnull=True) | Q(next_attempt_at__lte=now))
+        .order_by().values_list('ordering_key', flat=True).distinct()[:limit]
+    )
+    return sum(drain(key) for key in list(keys))
+
+
+def inbox_stats() -> Dict[str, Any]:
+    """Backlog and lag of the inbox: unfinished events and the age of the oldest"""
+    stats = WebhookEvent.objects.aggregate(
+        pending=Count('id', filter=Q(status=WebhookEvent.Status.PENDING)),
+        processing=Count('id', filter=Q(status=WebhookEvent.Status.PROCESSING)),
+        failed=Count('id', filter=Q(status=WebhookEvent.Status.FAILED)),
+        retrying=Count('id', filter=Q(status=WebhookEvent.Status.PENDING, attempts__gt=0)),
+        oldest_unfinished=Min('received_at', filter=Q(status__in=_UNFINISHED)),
+    )
+    oldest = stats.pop('oldest_unfinished')
+    stats['backlog'] = stats['pending'] + stats['processing']
+    stats['lag_seconds'] = round((timezone.now() - oldest).total_seconds(), 3) if oldest else 0.0
+    stats['queue'] = get_queue(QUEUE_NAME).stats()
+    return stats
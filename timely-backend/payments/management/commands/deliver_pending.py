@@ -0,0 +1,28 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from payments.delivery import delivery_stats, sweep
+
+
+class Command(BaseCommand):
+    help = 'Send due email/SMS deliveries and release stalled ones (once, or every --interval seconds)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=int, default=0, help='Keep sweeping every N seconds')
+
+    def handle(self, *args, **options):
+        while True:
+            sent = sweep()
+            if sent or not options['interval']:
+                stats = delivery_stats()
+                self.stdout.write(f'Sent {sent} messages; queue depth {stats["queue_depth"]}')
+                for endpoint in stats['endpoints']:
+                    self.stdout.write(
+                        f'  {endpoint["name"]}: queued {endpoint["queued"]} (due {endpoint["due"]}), '
+                        f'failed {endpoint["failed"]}, breaker {endpoint["breaker"]}, '
+                        f'oldest {endpoint["oldest_queued_seconds"]:.1f}s'
+                    )
+            if not options['interval']:
+                return
+            time.sleep(options['interval'])
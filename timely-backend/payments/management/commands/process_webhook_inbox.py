@@ -0,0 +1,26 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from payments.inbox import inbox_stats, sweep
+
+
+class Command(BaseCommand):
+    help = 'Run due Stripe webhook retries and release stalled events (once, or every --interval seconds)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=int, default=0, help='Keep sweeping every N seconds')
+        parser.add_argument('--limit', type=int, default=500, help='Ordering keys drained per sweep')
+
+    def handle(self, *args, **options):
+        while True:
+            processed = sweep(limit=options['limit'])
+            if processed or not options['interval']:
+                stats = inbox_stats()
+                self.stdout.write(
+                    f'Processed {processed} webhook events; backlog {stats["backlog"]} '
+                    f'(retrying {stats["retrying"]}), failed {stats["failed"]}, lag {stats["lag_seconds"]:.1f}s'
+                )
+            if not options['interval']:
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,126 @@
+import hashlib
+import hmac
+import json
+import time
+import uuid
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import RequestFactory, override_settings
+from django.urls import resolve
+
+from payments.inbox import inbox_stats
+
+WEBHOOK_PATH = '/api/stripe/webhook/'
+SYNTHETIC_ORDER_ID_BASE = 2_000_000_000
+
+
+def stripe_signature_header(payload: str, secret: str, timestamp: int = None) -> str:
+    """A Stripe-Signature header for payload, as Stripe computes it"""
+    timestamp = int(time.time()) if timestamp is None else timestamp
+    signature = hmac.new(secret.encode(), f'{timestamp}.{payload}'.encode(), hashlib.sha256).hexdigest()
+    return f't={timestamp},v1={signature}'
+
+
+def load_events(paths):
+    """Events from JSON files: one event, a list, or `stripe events list` output"""
+    events = []
+    for path in paths:
+        with open(path) as fh:
+            data = json.load(fh)
+        if isinstance(data, dict) and data.get('object') == 'list':
+            data = data['data']
+        events.extend(data if isinstance(data, list) else [data])
+    # Stripe lists newest first; replay in creation order
+    return sorted(events, key=lambda event: event.get('created', 0))
+
+
+def synthetic_events(count, orders):
+    """
+    checkout.session.completed / payment_intent.payment_failed pairs spread
+    over `orders` order ids far above any real order, so handlers do their
+    lookups but change nothing
+    """
+    now = int(time.time())
+    events = []
+    for i in range(count):
+        order_id = str(SYNTHETIC_ORDER_ID_BASE + i % orders)
+        if i % 2:
+            event_type, obj = 'payment_intent.payment_failed', {
+                'id': f'pi_{uuid.uuid4().hex[:24]}', 'object': 'payment_intent', 'metadata': {'order_id': order_id},
+            }
+        else:
+            event_type, obj = 'checkout.session.completed', {
+                'id': f'cs_test_{uuid.uuid4().hex[:24]}', 'object': 'checkout.session',
+                'client_reference_id': f'order_{order_id}', 'payment_intent': f'pi_{uuid.uuid4().hex[:24]}',
+                'metadata': {'order_id': order_id, 'quantity': '1', 'mode': 'ticket'},
+            }
+        events.append({
+            'id': f'evt_{uuid.uuid4().hex[:24]}', 'object': 'event', 'type': event_type,
+            'api_version': '2024-06-20', 'created': now + i, 'data': {'object': obj},
+        })
+    return events
+
+
+class Command(BaseCommand):
+    help = (
+        'Replay Stripe webhook payloads through the /api/stripe/webhook/ view (signed with STRIPE_WEBHOOK_SECRET) '
+        'and report acknowledgement latency and how long the inbox takes to drain'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='*', help='JSON files of Stripe events')
+        parser.add_argument('--synthetic', type=int, default=0, help='Also replay N generated events')
+        parser.add_argument('--orders', type=int, default=50, help='Orders the generated events are spread over')
+        parser.add_argument('--duplicates', type=float, default=0.0,
+                            help='Fraction of events delivered a second time, as Stripe retries do')
+        parser.add_argument('--timeout', type=float, default=120, help='Seconds to wait for the inbox to drain')
+
+    def handle(self, *args, **options):
+        events = load_events(options['paths']) + synthetic_events(options['synthetic'], max(1, options['orders']))
+        if not events:
+            raise CommandError('Nothing to replay: pass JSON files and/or --synthetic N')
+
+        repeat_every = int(1 / options['duplicates']) if options['duplicates'] > 0 else 0
+        deliveries = []
+        for i, event in enumerate(events):
+            deliveries.append(event)
+            if repeat_every and i % repeat_every == 0:
+                deliveries.append(event)
+
+        secret = settings.STRIPE_WEBHOOK_SECRET or 'whsec_replay'
+        view = resolve(WEBHOOK_PATH).func
+        factory = RequestFactory()
+        latencies = []
+        statuses = {}
+        with override_settings(STRIPE_WEBHOOK_SECRET=secret):
+            started = time.perf_counter()
+            for event in deliveries:
+                payload = json.dumps(event)
+                sent = time.perf_counter()
+                response = view(factory.post(
+                    WEBHOOK_PATH, payload, content_type='application/json',
+                    HTTP_STRIPE_SIGNATURE=stripe_signature_header(payload, secret),
+                ))
+                latencies.append((time.perf_counter() - sent) * 1000)
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+            acked = time.perf_counter() - started
+
+        latencies.sort()
+        self.stdout.write(f'{len(deliveries)} deliveries ({len(events)} events) acknowledged in {acked:.2f}s; '
+                          f'statuses {statuses}')
+        self.stdout.write(f'ack latency p50 {latencies[len(latencies) // 2]:.2f}ms '
+                          f'p95 {latencies[int(len(latencies) * 0.95)]:.2f}ms max {latencies[-1]:.2f}ms')
+
+        deadline = time.monotonic() + options['timeout']
+        while True:
+            stats = inbox_stats()
+            if (not stats['backlog'] or stats['backlog'] == stats['retrying']) and not stats['queue']['in_flight']:
+                break
+            if time.monotonic() > deadline:
+                self.stdout.write(self.style.WARNING('Timed out waiting for the inbox to drain'))
+                break
+            time.sleep(0.05)
+        self.stdout.write(f'drained {time.perf_counter() - started:.2f}s after the first delivery; '
+                          f'backlog {stats["backlog"]} (retrying {stats["retrying"]}), failed {stats["failed"]}, '
+                          f'lag {stats["lag_seconds"]:.1f}s')
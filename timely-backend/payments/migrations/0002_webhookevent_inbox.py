@@ -0,0 +1,59 @@
+# Generated by Django 5.2.6 on 2026-10-16 22:12
+
+from django.db import migrations, models
+
+
+def mark_existing_events(apps, schema_editor):
+    # Rows from before the inbox were handled inline; never re-run them automatically
+    WebhookEvent = apps.get_model('payments', 'WebhookEvent')
+    WebhookEvent.objects.filter(processed=True).update(status='processed')
+    WebhookEvent.objects.filter(processed=False).update(status='failed')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='webhookevent',
+            name='attempts',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='webhookevent',
+            name='locked_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='webhookevent',
+            name='next_attempt_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='webhookevent',
+            name='ordering_key',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='webhookevent',
+            name='processed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='webhookevent',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('processed', 'Processed'), ('failed', 'Failed')], default='pending', max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='webhookevent',
+            index=models.Index(fields=['ordering_key', 'created_at', 'id'], name='payments_we_orderin_3ffdf5_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='webhookevent',
+            index=models.Index(fields=['status', 'next_attempt_at'], name='payments_we_status_a02aee_idx'),
+        ),
+        migrations.RunPython(mark_existing_events, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.6 on 2026-10-16 22:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0002_notificationtemplate_broadcast_notificationunread'),
+        ('payments', '0002_webhookevent_inbox'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='deliverylog',
+            name='locked_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='deliverylog',
+            name='next_attempt_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='deliverylog',
+            name='payload',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AlterField(
+            model_name='deliverylog',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('sending', 'Sending'), ('sent', 'Sent'), ('failed', 'Failed'), ('retrying', 'Retrying')], default='pending', max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='deliverylog',
+            index=models.Index(fields=['endpoint', 'status', 'next_attempt_at'], name='payments_de_endpoin_8fb64f_idx'),
+        ),
+    ]
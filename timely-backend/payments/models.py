@@ -60,7 +60,13 @@ class PaymentIntent(models.Model):
 
 
 class WebhookEvent(models.Model):
-    """Track Stripe webhook events for debugging and audit"""
+    """Stripe webhook inbox: one row per Stripe event, processed by payments.inbox"""
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        PROCESSING = "processing", "Processing"
+        PROCESSED = "processed", "Processed"
+        FAILED = "failed", "Failed"
+    
     stripe_event_id = models.CharField(max_length=255, unique=True)
     event_type = models.CharField(max_length=100)
     api_version = models.CharField(max_length=20, blank=True)
@@ -72,12 +78,23 @@ class WebhookEvent(models.Model):
     processed = models.BooleanField(default=False)
     processing_error = models.TextField(blank=True)
     
+    # Inbox state: events sharing an ordering key (the order or registration
+    # they concern) are processed one at a time, oldest first
+    ordering_key = models.CharField(max_length=255, blank=True)
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(null=True, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+    
     class Meta:
         ordering = ['-received_at']
         indexes = [
             models.Index(fields=['stripe_event_id']),
             models.Index(fields=['event_type', 'processed']),
             models.Index(fields=['created_at']),
+            models.Index(fields=['ordering_key', 'created_at', 'id']),
+            models.Index(fields=['status', 'next_attempt_at']),
         ]
     
     def __str__(self):
@@ -243,6 +260,7 @@ class DeliveryLog(models.Model):
     
     STATUS_CHOICES = [
         ('pending', 'Pending'),
+        ('sending', 'Sending'),
         ('sent', 'Sent'),
         ('failed', 'Failed'),
         ('retrying', 'Retrying'),
@@ -265,6 +283,8 @@ class DeliveryLog(models.Model):
     )
     
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    # Rendered message: to, body, and for email subject, optional html and from_email
+    payload = models.JSONField(default=dict, blank=True)
     response_code = models.PositiveIntegerField(null=True, blank=True)
     response_body = models.TextField(blank=True)
     error_message = models.TextField(blank=True)
@@ -272,6 +292,8 @@ class DeliveryLog(models.Model):
     # Retry tracking
     retry_count = models.PositiveIntegerField(default=0)
     max_retries = models.PositiveIntegerField(default=3)
+    next_attempt_at = models.DateTimeField(null=True, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
     
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
@@ -283,6 +305,7 @@ class DeliveryLog(models.Model):
             models.Index(fields=['status', 'created_at']),
             models.Index(fields=['endpoint', 'status']),
             models.Index(fields=['notification', 'status']),
+            models.Index(fields=['endpoint', 'status', 'next_attempt_at']),
         ]
     
     def __str__(self):
@@ -0,0 +1,148 @@
+# payments/tests/test_delivery.py
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from notifications.models import Notification
+from notifications.services.fanout import deliver_email_sms
+from payments.delivery import backoff, breaker_state, delivery_stats, drain_endpoint, queue_email, sweep
+from payments.models import DeliveryEndpoint, DeliveryLog
+
+User = get_user_model()
+
+
+class CountingBackend(EmailBackend):
+    """locmem backend that counts connections opened"""
+    opened = 0
+
+    def open(self):
+        CountingBackend.opened += 1
+        return True
+
+
+class FailingBackend(EmailBackend):
+    def send_messages(self, messages):
+        raise ConnectionError('smtp down')
+
+
+def endpoint(backend):
+    return DeliveryEndpoint.objects.create(
+        name='Mail', endpoint_type='email', config={'backend': f'payments.tests.test_delivery.{backend}'},
+    )
+
+
+@override_settings(BACKGROUND_TASKS_EAGER=True, DELIVERY_BATCH_SIZE=10, DELIVERY_BREAKER_THRESHOLD=2,
+                   DELIVERY_BREAKER_COOLDOWN=60, DELIVERY_MAX_RETRIES=2, DELIVERY_RETRY_BASE_SECONDS=10)
+class DeliveryEngineTest(TestCase):
+    """Test batched sending, retries with backoff and the per-endpoint breaker"""
+
+    def setUp(self):
+        CountingBackend.opened = 0
+
+    def _queue(self, count):
+        with self.captureOnCommitCallbacks(execute=True):
+            queue_email([f'fan{i}@test.com' for i in range(count)], 'Kick-off moved', 'Now at 3pm')
+
+    def test_batches_share_one_connection(self):
+        endpoint('CountingBackend')
+        self._queue(25)
+
+        self.assertEqual(len(mail.outbox), 25)
+        self.assertEqual(CountingBackend.opened, 3)
+        self.assertEqual(DeliveryLog.objects.filter(status='sent').count(), 25)
+        self.assertEqual(mail.outbox[0].subject, 'Kick-off moved')
+
+    def test_backoff_grows_with_jitter(self):
+        for retry_count, step in ((1, 10), (2, 20), (3, 40)):
+            for _ in range(20):
+                delay = backoff(retry_count).total_seconds()
+                self.assertGreaterEqual(delay, step / 2)
+                self.assertLessEqual(delay, step)
+
+    def test_failures_retry_then_give_up(self):
+        mail_endpoint = endpoint('FailingBackend')
+        self._queue(1)
+
+        log = DeliveryLog.objects.get()
+        self.assertEqual((log.status, log.retry_count), ('retrying', 1))
+        self.assertIn('smtp down', log.error_message)
+        self.assertGreater(log.next_attempt_at, timezone.now())
+
+        for _ in range(2):
+            DeliveryLog.objects.update(next_attempt_at=timezone.now() - timedelta(seconds=1))
+            DeliveryEndpoint.objects.update(failure_count=0)
+            drain_endpoint(mail_endpoint.pk)
+
+        log.refresh_from_db()
+        self.assertEqual((log.status, log.retry_count), ('failed', 3))
+
+    def test_breaker_trips_and_probes_after_cooldown(self):
+        mail_endpoint = endpoint('FailingBackend')
+        self._queue(3)
+        DeliveryLog.objects.update(next_attempt_at=None)
+        drain_endpoint(mail_endpoint.pk)
+
+        mail_endpoint.refresh_from_db()
+        self.assertEqual((mail_endpoint.status, mail_endpoint.failure_count), ('failed', 2))
+        self.assertEqual(breaker_state(mail_endpoint), 'open')
+
+        # While open nothing is attempted
+        DeliveryLog.objects.update(next_attempt_at=None)
+        self.assertEqual(drain_endpoint(mail_endpoint.pk), 0)
+        self.assertEqual(DeliveryLog.objects.filter(retry_count=2).count(), 3)
+
+        # After the cooldown one message probes the endpoint and closes the breaker
+        DeliveryEndpoint.objects.update(
+            config={'backend': 'payments.tests.test_delivery.CountingBackend'},
+            last_failure_at=timezone.now() - timedelta(minutes=2),
+        )
+        self.assertEqual(sweep(), 3)
+        mail_endpoint.refresh_from_db()
+        self.assertEqual((mail_endpoint.status, mail_endpoint.failure_count), ('active', 0))
+        self.assertEqual(CountingBackend.opened, 2)
+
+    def test_sweep_releases_rows_of_dead_workers(self):
+        endpoint('CountingBackend')
+        with patch('payments.delivery.get_queue'):
+            self._queue(2)
+        DeliveryLog.objects.update(status='sending', locked_at=timezone.now() - timedelta(hours=1))
+
+        self.assertEqual(sweep(), 2)
+        self.assertEqual(len(mail.outbox), 2)
+
+    def test_stats_report_depth_and_throughput(self):
+        endpoint('CountingBackend')
+        self._queue(2)
+        with patch('payments.delivery.get_queue'):
+            self._queue(3)
+
+        stats = delivery_stats()
+        self.assertEqual(stats['queue_depth'], 3)
+        mail_stats = stats['endpoints'][0]
+        self.assertEqual((mail_stats['queued'], mail_stats['due'], mail_stats['sent_last_minute']), (3, 3, 2))
+        self.assertEqual(mail_stats['breaker'], 'closed')
+
+
+@override_settings(BACKGROUND_TASKS_EAGER=True)
+class NotificationDeliveryTest(TestCase):
+    """Test notification email goes through the delivery engine"""
+
+    def test_deliver_email_sms_queues_rendered_email(self):
+        user = User.objects.create_user(email='fan@test.com', password='testpass123')
+        notification = Notification.objects.create(
+            user=user, kind='info', topic='schedule', title='Match moved', body='Now on court 2',
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            deliver_email_sms([notification.id])
+
+        log = DeliveryLog.objects.get()
+        self.assertEqual((log.status, log.notification_id, log.payload['to']), ('sent', notification.id, 'fan@test.com'))
+        self.assertIn('Now on court 2', mail.outbox[0].body)
+        notification.refresh_from_db()
+        self.assertTrue(notification.delivered_email)
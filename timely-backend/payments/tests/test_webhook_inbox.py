@@ -0,0 +1,195 @@
+# payments/tests/test_webhook_inbox.py
+import json
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import MagicMock, patch
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import OperationalError
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from events.models import Event
+from payments.inbox import inbox_stats, sweep
+from payments.management.commands.replay_stripe_webhooks import stripe_signature_header
+from payments.models import WebhookEvent
+from tickets.models import TicketOrder
+
+User = get_user_model()
+
+SECRET = 'whsec_test'
+
+
+def stripe_event(event_type, obj, event_id=None, created=1700000000):
+    return {
+        'id': event_id or f'evt_{obj["id"]}_{event_type}', 'object': 'event', 'type': event_type,
+        'api_version': '2024-06-20', 'created': created, 'data': {'object': obj},
+    }
+
+
+def session_completed(order_id, created=1700000000):
+    return stripe_event('checkout.session.completed', {
+        'id': f'cs_{order_id}', 'object': 'checkout.session', 'client_reference_id': f'order_{order_id}',
+        'payment_intent': f'pi_{order_id}', 'metadata': {'order_id': str(order_id), 'quantity': '1'},
+    }, created=created)
+
+
+def payment_failed(order_id, created=1700000000):
+    return stripe_event('payment_intent.payment_failed', {
+        'id': f'pi_{order_id}_{created}', 'object': 'payment_intent', 'metadata': {'order_id': str(order_id)},
+    }, created=created)
+
+
+@override_settings(STRIPE_WEBHOOK_SECRET=SECRET, BACKGROUND_TASKS_EAGER=True,
+                   STRIPE_WEBHOOK_RETRY_BASE_SECONDS=30, STRIPE_WEBHOOK_MAX_ATTEMPTS=3)
+class WebhookInboxTest(TestCase):
+    """Test the Stripe webhook inbox: fast acknowledgement, dedupe, ordered retries"""
+
+    def setUp(self):
+        patcher = patch('events.signals.broadcaster')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.user = User.objects.create_user(email='fan@test.com', password='testpass123')
+        start = timezone.now() + timedelta(days=7)
+        self.event = Event.objects.create(
+            name='Grand Final', sport='Basketball', start_datetime=start,
+            end_datetime=start + timedelta(hours=3), created_by=self.user,
+        )
+
+    def _deliver(self, event, secret=SECRET):
+        payload = json.dumps(event)
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(
+                '/api/stripe/webhook/', payload, content_type='application/json',
+                HTTP_STRIPE_SIGNATURE=stripe_signature_header(payload, secret),
+            )
+
+    def _handlers(self, handler):
+        return patch('payments.inbox.import_string', return_value=handler)
+
+    def test_event_is_stored_acknowledged_and_fulfilled(self):
+        order = TicketOrder.objects.create(
+            user=self.user, event_id=self.event.id, total_cents=2000,
+            status=TicketOrder.Status.PAYMENT_PENDING, client_reference_id='order_abc',
+        )
+        event = session_completed(order.id)
+        event['data']['object']['client_reference_id'] = 'order_abc'
+
+        response = self._deliver(event)
+
+        self.assertEqual(response.status_code, 200)
+        stored = WebhookEvent.objects.get(stripe_event_id=event['id'])
+        self.assertEqual(stored.status, WebhookEvent.Status.PROCESSED)
+        self.assertEqual(stored.ordering_key, f'order:{order.id}')
+        self.assertTrue(stored.processed)
+        order.refresh_from_db()
+        self.assertEqual(order.status, TicketOrder.Status.PAID)
+
+    def test_bad_signature_is_rejected_without_storing(self):
+        response = self._deliver(session_completed(1), secret='whsec_other')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(WebhookEvent.objects.exists())
+
+    def test_redelivery_is_acknowledged_but_processed_once(self):
+        handler = MagicMock()
+        with self._handlers(handler):
+            event = session_completed(1)
+            self.assertEqual(self._deliver(event).status_code, 200)
+            self.assertEqual(self._deliver(event).status_code, 200)
+
+        self.assertEqual(WebhookEvent.objects.count(), 1)
+        self.assertEqual(handler.call_count, 1)
+
+    def test_failure_is_retried_later_and_holds_back_the_order(self):
+        handler = MagicMock(side_effect=[RuntimeError('db busy'), None, None, None, None])
+        with self._handlers(handler):
+            self._deliver(session_completed(1, created=100))
+            self._deliver(payment_failed(1, created=200))
+            self._deliver(session_completed(2, created=150))
+
+            first, second = WebhookEvent.objects.filter(ordering_key='order:1').order_by('created_at')
+            self.assertEqual((first.status, first.attempts), (WebhookEvent.Status.PENDING, 1))
+            self.assertIn('db busy', first.processing_error)
+            self.assertGreater(first.next_attempt_at, timezone.now() + timedelta(seconds=20))
+            # The later event for the same order waits; other orders are unaffected
+            self.assertEqual((second.status, second.attempts), (WebhookEvent.Status.PENDING, 0))
+            self.assertEqual(WebhookEvent.objects.get(ordering_key='order:2').status, WebhookEvent.Status.PROCESSED)
+
+            # Not due yet
+            self.assertEqual(sweep(), 0)
+            WebhookEvent.objects.filter(pk=first.pk).update(next_attempt_at=timezone.now() - timedelta(seconds=1))
+            self.assertEqual(sweep(), 2)
+
+        self.assertFalse(WebhookEvent.objects.exclude(status=WebhookEvent.Status.PROCESSED).exists())
+        # payment_intent.payment_failed has a handler in tickets and one in payments
+        types = [call.args[0]['object'] for call in handler.call_args_list]
+        self.assertEqual(types, ['checkout.session'] * 3 + ['payment_intent'] * 2)
+
+    def test_payment_handler_errors_are_retried(self):
+        event = stripe_event('payment_intent.succeeded', {
+            'id': 'pi_123', 'object': 'payment_intent', 'status': 'succeeded', 'metadata': {'registration_id': '1'},
+        })
+        with patch('payments.views.PaymentIntent.objects.get', side_effect=OperationalError('lock timeout')):
+            with self.assertLogs('payments.views', level='ERROR'):
+                self._deliver(event)
+
+        stored = WebhookEvent.objects.get()
+        self.assertEqual((stored.status, stored.attempts), (WebhookEvent.Status.PENDING, 1))
+        self.assertIn('lock timeout', stored.processing_error)
+
+        # An intent we never created will not appear on a retry
+        WebhookEvent.objects.update(next_attempt_at=timezone.now() - timedelta(seconds=1))
+        with self.assertLogs('payments.views', level='ERROR'):
+            sweep()
+        self.assertEqual(WebhookEvent.objects.get().status, WebhookEvent.Status.PROCESSED)
+
+    def test_gives_up_after_max_attempts(self):
+        handler = MagicMock(side_effect=RuntimeError('bad payload'))
+        with self._handlers(handler):
+            self._deliver(session_completed(1))
+            for _ in range(2):
+                WebhookEvent.objects.update(next_attempt_at=timezone.now() - timedelta(seconds=1))
+                sweep()
+
+        stored = WebhookEvent.objects.get()
+        self.assertEqual((stored.status, stored.attempts), (WebhookEvent.Status.FAILED, 3))
+        self.assertEqual(inbox_stats()['failed'], 1)
+
+    def test_sweep_releases_events_of_dead_workers(self):
+        handler = MagicMock()
+        with self._handlers(handler):
+            with patch('payments.inbox.enqueue'):
+                self._deliver(session_completed(1))
+            WebhookEvent.objects.update(
+                status=WebhookEvent.Status.PROCESSING, locked_at=timezone.now() - timedelta(hours=1),
+            )
+            self.assertEqual(inbox_stats()['backlog'], 1)
+            self.assertEqual(sweep(), 1)
+
+        self.assertEqual(WebhookEvent.objects.get().status, WebhookEvent.Status.PROCESSED)
+        self.assertEqual(inbox_stats()['backlog'], 0)
+
+    def test_backlog_and_lag(self):
+        with patch('payments.inbox.enqueue'):
+            self._deliver(session_completed(1))
+            self._deliver(session_completed(2))
+        WebhookEvent.objects.update(received_at=timezone.now() - timedelta(seconds=90))
+
+        stats = inbox_stats()
+        self.assertEqual((stats['backlog'], stats['pending']), (2, 2))
+        self.assertGreaterEqual(stats['lag_seconds'], 90)
+
+
+@override_settings(STRIPE_WEBHOOK_SECRET=SECRET, BACKGROUND_TASKS_EAGER=True)
+class ReplayHarnessTest(TransactionTestCase):
+    """Test replaying Stripe payloads through the webhook view"""
+
+    def test_replay_synthetic_events_with_redeliveries(self):
+        out = StringIO()
+        call_command('replay_stripe_webhooks', synthetic=6, orders=2, duplicates=0.5, stdout=out)
+
+        self.assertIn('9 deliveries (6 events)', out.getvalue())
+        self.assertIn('{200: 9}', out.getvalue())
+        self.assertEqual(WebhookEvent.objects.filter(status=WebhookEvent.Status.PROCESSED).count(), 6)
@@ -12,7 +12,8 @@ from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from .models import PaymentIntent, WebhookEvent, Refund
+from .inbox import record_event
+from .models import PaymentIntent, Refund
 from .stripe_gateway import stripe_gateway
 from .provider import PaymentProviderFactory
 from registrations.models import Registration
@@ -447,7 +448,7 @@ def confirm_offline_payment(request):
 @csrf_exempt
 @require_http_methods(["POST"])
 def stripe_webhook(request):
-    """Handle Stripe webhook events with signature verification"""
+    """Verify a Stripe webhook and store it in the inbox for background processing"""
     payload = request.body
     sig_header = request.META.get('HTTP_STRIPE_SIGNATURE')
     
@@ -472,50 +473,18 @@ def stripe_webhook(request):
         log_webhook_event(request, 'stripe', False, {'error': f'Invalid signature: {e}'})
         return HttpResponse(status=400)
     
-    # Save webhook event
-    webhook_event = WebhookEvent.objects.create(
-        stripe_event_id=event.id,
-        event_type=event.type,
-        api_version=event.api_version,
-        created_at=timezone.datetime.fromtimestamp(event.created, tz=timezone.utc),
-        data=event.data
-    )
-    
-    try:
-        # Log successful webhook receipt
-        log_webhook_event(request, 'stripe', True, {
-            'event_type': event.type,
-            'event_id': event.id
-        })
-        
-        # Handle the event
-        if event.type == 'payment_intent.succeeded':
-            handle_payment_succeeded(event.data.object, webhook_event)
-        elif event.type == 'payment_intent.payment_failed':
-            handle_payment_failed(event.data.object, webhook_event)
-        elif event.type == 'charge.refunded':
-            handle_refund_processed(event.data.object, webhook_event)
-        else:
-            logger.info(f"Unhandled event type: {event.type}")
-        
-        webhook_event.processed = True
-        webhook_event.save()
-        
-    except Exception as e:
-        logger.error(f"Webhook processing error: {e}")
-        log_webhook_event(request, 'stripe', False, {
-            'event_type': event.type,
-            'event_id': event.id,
-            'error': str(e)
-        })
-        webhook_event.processing_error = str(e)
-        webhook_event.save()
-        return HttpResponse(status=500)
+    # Store it in the inbox; payments.inbox runs the handlers below in the background
+    webhook_event, created = record_event(json.loads(payload))
+    log_webhook_event(request, 'stripe', True, {
+        'event_type': event.type,
+        'event_id': event.id,
+        'duplicate': not created,
+    })
     
     return HttpResponse(status=200)
 
 
-def handle_payment_succeeded(payment_intent_data, webhook_event):
+def handle_payment_succeeded(payment_intent_data, webhook_event=None):
     """Handle successful payment webhook"""
     try:
         # Find our payment intent record
@@ -545,9 +514,10 @@ def handle_payment_succeeded(payment_intent_data, webhook_event):
         logger.error(f"Payment intent not found: {payment_intent_data.id}")
     except Exception as e:
         logger.error(f"Error handling payment succeeded: {e}")
+        raise  # payments.inbox retries the event with backoff
 
 
-def handle_payment_failed(payment_intent_data, webhook_event):
+def handle_payment_failed(payment_intent_data, webhook_event=None):
     """Handle failed payment webhook"""
     try:
         payment_intent = PaymentIntent.objects.get(
@@ -570,9 +540,10 @@ def handle_payment_failed(payment_intent_data, webhook_event):
         logger.error(f"Payment intent not found: {payment_intent_data.id}")
     except Exception as e:
         logger.error(f"Error handling payment failed: {e}")
+        raise  # payments.inbox retries the event with backoff
 
 
-def handle_refund_processed(refund_data, webhook_event):
+def handle_refund_processed(refund_data, webhook_event=None):
     """Handle refund webhook"""
     try:
         # Create or update refund record
@@ -610,6 +581,7 @@ def handle_refund_processed(refund_data, webhook_event):
         
     except Exception as e:
         logger.error(f"Error handling refund: {e}")
+        raise  # payments.inbox retries the event with backoff
 
 
 @api_view(['GET'])
@@ -0,0 +1,87 @@
+# Generated by Django 5.2.6 on 2026-10-16 22:57
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DataRetentionPolicy',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('data_type', models.CharField(choices=[('user_account', 'User Account'), ('registration_data', 'Registration Data'), ('ticket_data', 'Ticket Data'), ('payment_data', 'Payment Data'), ('audit_logs', 'Audit Logs'), ('media_uploads', 'Media Uploads'), ('notifications', 'Notifications')], help_text='Type of data this policy applies to', max_length=50, unique=True)),
+                ('retention_period_days', models.PositiveIntegerField(help_text='Number of days to retain data')),
+                ('description', models.TextField(help_text='Description of the retention policy')),
+                ('auto_delete', models.BooleanField(default=False, help_text='Automatically delete data after retention period')),
+                ('anonymize_instead', models.BooleanField(default=True, help_text='Anonymize data instead of deleting')),
+                ('legal_basis', models.TextField(help_text='Legal basis for retention')),
+                ('compliance_notes', models.TextField(blank=True, help_text='Compliance notes')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='created_retention_policies', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Data Retention Policy',
+                'verbose_name_plural': 'Data Retention Policies',
+                'ordering': ['data_type'],
+            },
+        ),
+        migrations.CreateModel(
+            name='DataDeletionRequest',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('request_id', models.UUIDField(default=uuid.uuid4, editable=False, unique=True)),
+                ('reason', models.TextField(help_text='Reason for deletion request')),
+                ('confirmation_text', models.CharField(help_text='User confirmation text (e.g., "DELETE MY DATA")', max_length=100)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('approved', 'Approved'), ('rejected', 'Rejected'), ('processing', 'Processing'), ('completed', 'Completed'), ('failed', 'Failed')], db_index=True, default='pending', max_length=20)),
+                ('reviewed_at', models.DateTimeField(blank=True, null=True)),
+                ('admin_notes', models.TextField(blank=True, help_text='Admin notes about the request')),
+                ('processed_at', models.DateTimeField(blank=True, null=True)),
+                ('error_message', models.TextField(blank=True, help_text='Error message if processing failed')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('processed_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='processed_deletions', to=settings.AUTH_USER_MODEL)),
+                ('reviewed_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='reviewed_deletions', to=settings.AUTH_USER_MODEL)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='data_deletion_requests', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['user', 'status'], name='privacy_dat_user_id_7193fc_idx'), models.Index(fields=['status', 'created_at'], name='privacy_dat_status_ff4b7a_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='DataExportRequest',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('request_id', models.UUIDField(default=uuid.uuid4, editable=False, unique=True)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('completed', 'Completed'), ('failed', 'Failed'), ('expired', 'Expired')], db_index=True, default='pending', max_length=20)),
+                ('file_path', models.CharField(blank=True, help_text='Path to exported file', max_length=500)),
+                ('file_size', models.PositiveBigIntegerField(blank=True, help_text='File size in bytes', null=True)),
+                ('expires_at', models.DateTimeField(help_text='When the export file expires')),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('processed_at', models.DateTimeField(blank=True, null=True)),
+                ('duration_ms', models.PositiveIntegerField(blank=True, help_text='Time spent building the export', null=True)),
+                ('uncompressed_bytes', models.PositiveBigIntegerField(blank=True, help_text='Size of the exported data before compression', null=True)),
+                ('row_count', models.PositiveIntegerField(blank=True, help_text='Records written across all sections', null=True)),
+                ('error_message', models.TextField(blank=True, help_text='Error message if processing failed')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('processed_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='processed_exports', to=settings.AUTH_USER_MODEL)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='data_exports', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['user', 'status'], name='privacy_dat_user_id_ce6f65_idx'), models.Index(fields=['status', 'created_at'], name='privacy_dat_status_eea94b_idx'), models.Index(fields=['expires_at'], name='privacy_dat_expires_98f615_idx')],
+            },
+        ),
+    ]
@@ -31,10 +31,11 @@ class DataExportRequest(models.Model):
     
     # File information
     file_path = models.CharField(max_length=500, blank=True, help_text='Path to exported file')
-    file_size = models.PositiveIntegerField(null=True, blank=True, help_text='File size in bytes')
+    file_size = models.PositiveBigIntegerField(null=True, blank=True, help_text='File size in bytes')
     expires_at = models.DateTimeField(help_text='When the export file expires')
     
     # Processing information
+    started_at = models.DateTimeField(null=True, blank=True)
     processed_at = models.DateTimeField(null=True, blank=True)
     processed_by = models.ForeignKey(
         User,
@@ -43,6 +44,9 @@ class DataExportRequest(models.Model):
         blank=True,
         related_name='processed_exports'
     )
+    duration_ms = models.PositiveIntegerField(null=True, blank=True, help_text='Time spent building the export')
+    uncompressed_bytes = models.PositiveBigIntegerField(null=True, blank=True, help_text='Size of the exported data before compression')
+    row_count = models.PositiveIntegerField(null=True, blank=True, help_text='Records written across all sections')
     
     # Error information
     error_message = models.TextField(blank=True, help_text='Error message if processing failed')
@@ -87,7 +91,7 @@ class DataDeletionRequest(models.Model):
         FAILED = "failed", "Failed"
     
     # Core fields
-    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='deletion_requests')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='data_deletion_requests')
     request_id = models.UUIDField(default=uuid.uuid4, unique=True, editable=False)
     
     # Request details
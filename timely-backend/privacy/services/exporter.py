@@ -1,70 +1,151 @@
 # privacy/services/exporter.py
+"""
+Streaming GDPR data export.
+
+Each section is read through values_list().iterator(chunk_size=...), which
+uses a server-side cursor on PostgreSQL, and written as NDJSON straight into
+a zip entry, so no section is ever held in memory. The archive is spooled
+(in memory up to PRIVACY_EXPORT_SPOOL_BYTES, on disk beyond) and handed to
+default_storage in chunks. Exports run on the bounded "exports" background
+queue; the DataExportRequest records duration and size.
+"""
 import json
-import zipfile
+import logging
 import tempfile
-import os
-from datetime import datetime
+import time
+import zipfile
+from dataclasses import dataclass
+from typing import Callable, Dict, Tuple
+
 from django.conf import settings
-from django.utils import timezone
+from django.core.files import File
 from django.core.files.storage import default_storage
 from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
 
 from accounts.models import User
+from common.background import get_queue
+from common.models import AuditLog
 from events.models import Event
 from registrations.models import Registration
 from tickets.models import TicketOrder, Ticket
 from notifications.models import Notification
 from privacy.models import DataExportRequest
 
+logger = logging.getLogger(__name__)
 
-def export_user_data(user, request_id):
+EXPORT_CHUNK_SIZE = getattr(settings, 'PRIVACY_EXPORT_CHUNK_SIZE', 2000)
+EXPORT_SPOOL_BYTES = getattr(settings, 'PRIVACY_EXPORT_SPOOL_BYTES', 8 * 1024 * 1024)
+FLUSH_BYTES = 64 * 1024
+
+
+@dataclass(frozen=True)
+class Section:
+    """One NDJSON file in the export: a per-user queryset and its columns"""
+    name: str
+    queryset: Callable[[User], object]
+    fields: Tuple[str, ...]
+
+    @property
+    def filename(self) -> str:
+        return f'{self.name}.ndjson'
+
+
+def _registrations_of(user):
+    return Q(applicant_user=user) | Q(applicant=user)
+
+
+SECTIONS = (
+    Section(
+        'events_created',
+        lambda user: Event.objects.filter(created_by=user),
+        ('id', 'name', 'sport', 'description', 'start_datetime', 'end_datetime',
+         'location', 'status', 'visibility', 'created_at', 'updated_at'),
+    ),
+    Section(
+        'events_registered',
+        lambda user: Event.objects.filter(
+            pk__in=Registration.objects.filter(_registrations_of(user)).values('event_id')
+        ),
+        ('id', 'name', 'sport', 'start_datetime', 'end_datetime', 'location', 'status'),
+    ),
+    Section(
+        'registrations',
+        lambda user: Registration.objects.filter(_registrations_of(user)),
+        ('id', 'event_id', 'event__name', 'type', 'status', 'submitted_at',
+         'decided_at', 'reason', 'fee_cents', 'payment_status'),
+    ),
+    Section(
+        'ticket_orders',
+        lambda user: TicketOrder.objects.filter(user=user),
+        ('id', 'event_id', 'fixture_id', 'total_cents', 'currency', 'status',
+         'payment_provider', 'created_at', 'updated_at'),
+    ),
+    Section(
+        'tickets',
+        lambda user: Ticket.objects.filter(order__user=user),
+        ('id', 'order_id', 'ticket_type__name', 'serial', 'code', 'status',
+         'issued_at', 'used_at'),
+    ),
+    Section(
+        'notifications',
+        lambda user: Notification.objects.filter(user=user),
+        ('id', 'kind', 'topic', 'title', 'body', 'link_url', 'read_at', 'created_at'),
+    ),
+    Section(
+        'audit_logs',
+        lambda user: AuditLog.objects.filter(actor=user),
+        ('id', 'action', 'target_type__model', 'target_id', 'target_description',
+         'details', 'ip_address', 'user_agent', 'timestamp'),
+    ),
+)
+
+
+class _CountingWriter:
+    """Write-through wrapper that counts the bytes handed to a stream"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.bytes_written = 0
+
+    def write(self, data: bytes) -> int:
+        self.bytes_written += len(data)
+        return self.stream.write(data)
+
+
+def write_section(zip_file: zipfile.ZipFile, section: Section, user) -> Tuple[int, int]:
     """
-    Export all user data to a ZIP file
-    
-    Args:
-        user: User instance
-        request_id: UUID of the export request
-        
+    Stream one section into the archive as NDJSON.
+
     Returns:
-        str: Path to the exported ZIP file
+        (rows, bytes) written before compression
     """
-    # Create temporary directory
-    with tempfile.TemporaryDirectory() as temp_dir:
-        zip_path = os.path.join(temp_dir, f'user_data_{user.id}_{request_id}.zip')
-        
-        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-            # Export user profile data
-            export_user_profile(user, zip_file)
-            
-            # Export events data
-            export_events_data(user, zip_file)
-            
-            # Export registrations data
-            export_registrations_data(user, zip_file)
-            
-            # Export tickets data
-            export_tickets_data(user, zip_file)
-            
-            # Export notifications data
-            export_notifications_data(user, zip_file)
-            
-            # Export audit logs
-            export_audit_logs(user, zip_file)
-            
-            # Create summary
-            create_export_summary(user, zip_file)
-        
-        # Upload to storage
-        with open(zip_path, 'rb') as f:
-            file_path = f'exports/{request_id}.zip'
-            default_storage.save(file_path, f)
-        
-        return file_path
+    encoder = DjangoJSONEncoder(separators=(',', ':'))
+    fields = section.fields
+    rows = section.queryset(user).order_by('pk').values_list(*fields)
 
+    count = 0
+    with zip_file.open(section.filename, 'w', force_zip64=True) as entry:
+        out = _CountingWriter(entry)
+        buffer, buffered = [], 0
+        for row in rows.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+            line = encoder.encode(dict(zip(fields, row))) + '\n'
+            buffer.append(line)
+            buffered += len(line)
+            count += 1
+            if buffered >= FLUSH_BYTES:
+                out.write(''.join(buffer).encode('utf-8'))
+                buffer, buffered = [], 0
+        if buffer:
+            out.write(''.join(buffer).encode('utf-8'))
+    return count, out.bytes_written
 
-def export_user_profile(user, zip_file):
-    """Export user profile data"""
-    profile_data = {
+
+def user_profile(user) -> Dict:
+    """Profile fields exported as profile.json"""
+    return {
         'user_id': user.id,
         'email': user.email,
         'username': user.username,
@@ -77,147 +158,22 @@ def export_user_profile(user, zip_file):
         'date_joined': user.date_joined.isoformat(),
         'last_login': user.last_login.isoformat() if user.last_login else None,
         'email_verified': getattr(user, 'email_verified', False),
-        'phone_number': getattr(user, 'phone_number', ''),
-        'date_of_birth': getattr(user, 'date_of_birth', None),
-        'address': getattr(user, 'address', ''),
-        'emergency_contact': getattr(user, 'emergency_contact', ''),
-        'medical_conditions': getattr(user, 'medical_conditions', ''),
-        'dietary_requirements': getattr(user, 'dietary_requirements', ''),
-        'exported_at': timezone.now().isoformat()
-    }
-    
-    # Add any additional profile fields
-    if hasattr(user, 'profile'):
-        profile = user.profile
-        profile_data.update({
-            'bio': getattr(profile, 'bio', ''),
-            'avatar': getattr(profile, 'avatar', ''),
-            'website': getattr(profile, 'website', ''),
-            'social_links': getattr(profile, 'social_links', {}),
-        })
-    
-    zip_file.writestr('profile.json', json.dumps(profile_data, indent=2, cls=DjangoJSONEncoder))
-
-
-def export_events_data(user, zip_file):
-    """Export events data"""
-    # Events created by user
-    created_events = Event.objects.filter(created_by=user).values(
-        'id', 'name', 'description', 'start_date', 'end_date',
-        'status', 'created_at', 'updated_at'
-    )
-    
-    # Events user is registered for
-    registered_events = Event.objects.filter(
-        registrations__user=user
-    ).values(
-        'id', 'name', 'description', 'start_date', 'end_date',
-        'status', 'created_at', 'updated_at'
-    ).distinct()
-    
-    events_data = {
-        'created_events': list(created_events),
-        'registered_events': list(registered_events),
-        'exported_at': timezone.now().isoformat()
-    }
-    
-    zip_file.writestr('events.json', json.dumps(events_data, indent=2, cls=DjangoJSONEncoder))
-
-
-def export_registrations_data(user, zip_file):
-    """Export registrations data"""
-    registrations = Registration.objects.filter(user=user).values(
-        'id', 'event_id', 'event__name', 'status', 'created_at',
-        'updated_at', 'notes', 'emergency_contact', 'medical_conditions',
-        'dietary_requirements', 't_shirt_size', 'accommodation_required'
-    )
-    
-    registrations_data = {
-        'registrations': list(registrations),
-        'exported_at': timezone.now().isoformat()
-    }
-    
-    zip_file.writestr('registrations.json', json.dumps(registrations_data, indent=2, cls=DjangoJSONEncoder))
-
-
-def export_tickets_data(user, zip_file):
-    """Export tickets data"""
-    # Ticket orders
-    orders = TicketOrder.objects.filter(user=user).values(
-        'id', 'event_id', 'event__name', 'total_cents', 'currency',
-        'status', 'payment_provider', 'created_at', 'updated_at'
-    )
-    
-    # Individual tickets
-    tickets = Ticket.objects.filter(order__user=user).values(
-        'id', 'order_id', 'ticket_type__name', 'serial', 'status',
-        'issued_at', 'used_at'
-    )
-    
-    tickets_data = {
-        'orders': list(orders),
-        'tickets': list(tickets),
         'exported_at': timezone.now().isoformat()
     }
-    
-    zip_file.writestr('tickets.json', json.dumps(tickets_data, indent=2, cls=DjangoJSONEncoder))
 
 
-def export_notifications_data(user, zip_file):
-    """Export notifications data"""
-    notifications = Notification.objects.filter(user=user).values(
-        'id', 'title', 'message', 'notification_type', 'read',
-        'created_at', 'data'
-    )
-    
-    notifications_data = {
-        'notifications': list(notifications),
-        'exported_at': timezone.now().isoformat()
-    }
-    
-    zip_file.writestr('notifications.json', json.dumps(notifications_data, indent=2, cls=DjangoJSONEncoder))
-
-
-def export_audit_logs(user, zip_file):
-    """Export audit logs related to user"""
-    from audit.models import AuditLog
-    
-    audit_logs = AuditLog.objects.filter(
-        user=user
-    ).values(
-        'id', 'action', 'model_name', 'object_id', 'changes',
-        'ip_address', 'user_agent', 'created_at'
-    )
-    
-    audit_data = {
-        'audit_logs': list(audit_logs),
-        'exported_at': timezone.now().isoformat()
-    }
-    
-    zip_file.writestr('audit_logs.json', json.dumps(audit_data, indent=2, cls=DjangoJSONEncoder))
-
-
-def create_export_summary(user, zip_file):
-    """Create export summary"""
-    summary = {
+def export_summary(user, counts: Dict[str, int]) -> Dict:
+    """README contents; counts come from the rows actually written"""
+    return {
         'export_info': {
             'user_id': user.id,
             'user_email': user.email,
             'exported_at': timezone.now().isoformat(),
+            'format': 'One JSON object per line (NDJSON) in each <section>.ndjson file',
             'data_retention_period_days': 365,  # Default retention period
-            'data_types_included': [
-                'profile', 'events', 'registrations', 'tickets', 
-                'notifications', 'audit_logs'
-            ]
-        },
-        'data_summary': {
-            'total_events_created': Event.objects.filter(created_by=user).count(),
-            'total_events_registered': Event.objects.filter(registrations__user=user).distinct().count(),
-            'total_registrations': Registration.objects.filter(user=user).count(),
-            'total_ticket_orders': TicketOrder.objects.filter(user=user).count(),
-            'total_tickets': Ticket.objects.filter(order__user=user).count(),
-            'total_notifications': Notification.objects.filter(user=user).count(),
+            'data_types_included': ['profile'] + [section.name for section in SECTIONS]
         },
+        'data_summary': {f'total_{name}': count for name, count in counts.items()},
         'privacy_notice': {
             'purpose': 'This export contains all personal data associated with your account.',
             'retention': 'Data will be retained for 12 months from the export date.',
@@ -225,8 +181,86 @@ def create_export_summary(user, zip_file):
             'contact': 'For privacy concerns, contact: privacy@timelyevents.com'
         }
     }
+
+
+def export_user_data(user, request_id):
+    """
+    Export all user data to a ZIP file in default_storage
     
-    zip_file.writestr('README.txt', json.dumps(summary, indent=2, cls=DjangoJSONEncoder))
+    Args:
+        user: User instance
+        request_id: UUID of the export request
+        
+    Returns:
+        dict: file_path, file_size, uncompressed_bytes and row_count
+    """
+    counts = {}
+    uncompressed = 0
+    with tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_BYTES) as spool:
+        with zipfile.ZipFile(spool, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+            profile = json.dumps(user_profile(user), indent=2, cls=DjangoJSONEncoder).encode('utf-8')
+            zip_file.writestr('profile.json', profile)
+            uncompressed += len(profile)
+
+            for section in SECTIONS:
+                counts[section.name], written = write_section(zip_file, section, user)
+                uncompressed += written
+
+            zip_file.writestr('README.txt', json.dumps(export_summary(user, counts), indent=2, cls=DjangoJSONEncoder))
+
+        file_size = spool.tell()
+        spool.seek(0)
+        file_path = default_storage.save(f'exports/{request_id}.zip', File(spool))
+
+    return {
+        'file_path': file_path,
+        'file_size': file_size,
+        'uncompressed_bytes': uncompressed,
+        'row_count': sum(counts.values()),
+    }
+
+
+def enqueue_export(export_request) -> None:
+    """Queue an export for the background pool once its request row commits"""
+    export_id = export_request.pk
+    transaction.on_commit(lambda: get_queue('exports').submit(run_export, export_id))
+
+
+def run_export(export_id: int) -> bool:
+    """
+    Build the archive for a pending export request and record the outcome.
+
+    Returns:
+        True if the export completed, False if it was already claimed or failed
+    """
+    # Claim the request so a duplicate submission can't build it twice
+    claimed = DataExportRequest.objects.filter(
+        pk=export_id, status=DataExportRequest.Status.PENDING
+    ).update(status=DataExportRequest.Status.PROCESSING, started_at=timezone.now())
+    if not claimed:
+        return False
+
+    export_request = DataExportRequest.objects.select_related('user').get(pk=export_id)
+    started = time.monotonic()
+    try:
+        result = export_user_data(export_request.user, str(export_request.request_id))
+    except Exception as e:
+        logger.exception(f"Data export {export_request.request_id} failed")
+        DataExportRequest.objects.filter(pk=export_id).update(
+            status=DataExportRequest.Status.FAILED,
+            error_message=str(e),
+            duration_ms=int((time.monotonic() - started) * 1000),
+            processed_at=timezone.now(),
+        )
+        return False
+
+    DataExportRequest.objects.filter(pk=export_id).update(
+        status=DataExportRequest.Status.COMPLETED,
+        duration_ms=int((time.monotonic() - started) * 1000),
+        processed_at=timezone.now(),
+        **result,
+    )
+    return True
 
 
 def anonymize_user_data(user):
@@ -0,0 +1,121 @@
+"""
+Privacy tests for the streaming data export.
+"""
+import json
+import shutil
+import tempfile
+import zipfile
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from events.models import Event
+from notifications.models import Notification
+from privacy.models import DataExportRequest
+from privacy.services.exporter import SECTIONS, run_export
+
+User = get_user_model()
+
+
+@override_settings(BACKGROUND_TASKS_EAGER=True)
+class DataExportTest(TestCase):
+    """Test exports written on the background queue"""
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+
+        self.user = User.objects.create_user(email='fan@example.com', password='testpass123')
+        self.other = User.objects.create_user(email='other@example.com', password='testpass123')
+        start = timezone.now() + timedelta(days=7)
+        self.events = [
+            Event.objects.create(
+                name=f'Event {i}', sport='Football', start_datetime=start,
+                end_datetime=start + timedelta(hours=3), created_by=self.user
+            )
+            for i in range(3)
+        ]
+        Event.objects.create(
+            name='Not mine', sport='Football', start_datetime=start,
+            end_datetime=start + timedelta(hours=3), created_by=self.other
+        )
+        for i in range(5):
+            Notification.objects.create(user=self.user, title=f'Hello {i}', body='Line one\nline "two"')
+        Notification.objects.create(user=self.other, title='Not mine')
+
+    def _rows(self, archive, name):
+        return [json.loads(line) for line in archive.read(f'{name}.ndjson').decode('utf-8').splitlines()]
+
+    def test_request_builds_archive_after_commit(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = client.post('/api/privacy/export/request/')
+        self.assertEqual(response.status_code, 202)
+
+        export_request = DataExportRequest.objects.get(request_id=response.data['request_id'])
+        self.assertEqual(export_request.status, DataExportRequest.Status.COMPLETED)
+
+        with default_storage.open(export_request.file_path, 'rb') as f:
+            self.assertEqual(f.size, export_request.file_size)
+            with zipfile.ZipFile(f) as archive:
+                self.assertEqual(
+                    set(archive.namelist()),
+                    {'profile.json', 'README.txt'} | {section.filename for section in SECTIONS},
+                )
+                events = self._rows(archive, 'events_created')
+                notifications = self._rows(archive, 'notifications')
+                readme = json.loads(archive.read('README.txt'))
+                # README is written after the sizes are counted
+                data_bytes = sum(info.file_size for info in archive.infolist() if info.filename != 'README.txt')
+
+        self.assertEqual([row['id'] for row in events], [event.id for event in self.events])
+        self.assertEqual(events[0]['name'], 'Event 0')
+        self.assertEqual(set(events[0]), set(SECTIONS[0].fields))
+        self.assertEqual(sorted(row['title'] for row in notifications), [f'Hello {i}' for i in range(5)])
+        self.assertEqual(notifications[0]['body'], 'Line one\nline "two"')
+
+        self.assertEqual(readme['data_summary']['total_events_created'], 3)
+        self.assertEqual(readme['data_summary']['total_notifications'], 5)
+        self.assertEqual(readme['data_summary']['total_tickets'], 0)
+        self.assertEqual(export_request.row_count, 8)
+        self.assertEqual(export_request.uncompressed_bytes, data_bytes)
+        self.assertIsNotNone(export_request.started_at)
+        self.assertIsNotNone(export_request.duration_ms)
+
+        response = client.get(f'/api/privacy/export/{export_request.request_id}/status/')
+        self.assertEqual(response.data['row_count'], 8)
+        self.assertEqual(response.data['uncompressed_bytes'], data_bytes)
+        self.assertEqual(response.data['duration_ms'], export_request.duration_ms)
+        self.assertTrue(response.data['can_download'])
+
+    def test_sections_stream_in_chunks(self):
+        export_request = DataExportRequest.objects.create(
+            user=self.user, expires_at=timezone.now() + timedelta(days=7)
+        )
+
+        # Smaller than a section, so every section spans several fetches and flushes
+        with patch.multiple('privacy.services.exporter', EXPORT_CHUNK_SIZE=2, FLUSH_BYTES=64):
+            self.assertTrue(run_export(export_request.pk))
+
+        export_request.refresh_from_db()
+        with default_storage.open(export_request.file_path, 'rb') as f, zipfile.ZipFile(f) as archive:
+            self.assertEqual(len(self._rows(archive, 'notifications')), 5)
+            self.assertEqual(len(self._rows(archive, 'events_created')), 3)
+
+    def test_request_is_built_once(self):
+        export_request = DataExportRequest.objects.create(
+            user=self.user, expires_at=timezone.now() + timedelta(days=7)
+        )
+
+        self.assertTrue(run_export(export_request.pk))
+        self.assertFalse(run_export(export_request.pk))
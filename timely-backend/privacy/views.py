@@ -5,12 +5,12 @@ from rest_framework import status, permissions
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from django.shortcuts import get_object_or_404
-from django.http import HttpResponse, Http404
+from django.http import FileResponse, Http404
 from django.utils import timezone
 from django.core.files.storage import default_storage
 
 from .models import DataExportRequest, DataDeletionRequest, DataRetentionPolicy
-from .services.exporter import export_user_data, anonymize_user_data, delete_user_data
+from .services.exporter import enqueue_export, anonymize_user_data, delete_user_data
 
 
 @api_view(['POST'])
@@ -37,37 +37,15 @@ def request_data_export(request):
         expires_at=timezone.now() + timedelta(days=7)  # Export expires in 7 days
     )
     
-    # Process export asynchronously (in production, use Celery)
-    try:
-        file_path = export_user_data(request.user, str(export_request.request_id))
-        
-        # Update request with file info
-        export_request.status = DataExportRequest.Status.COMPLETED
-        export_request.file_path = file_path
-        export_request.processed_at = timezone.now()
-        
-        # Get file size
-        if default_storage.exists(file_path):
-            export_request.file_size = default_storage.size(file_path)
-        
-        export_request.save()
-        
-        return Response({
-            'request_id': str(export_request.request_id),
-            'status': export_request.status,
-            'expires_at': export_request.expires_at,
-            'message': 'Data export completed successfully'
-        })
-        
-    except Exception as e:
-        export_request.status = DataExportRequest.Status.FAILED
-        export_request.error_message = str(e)
-        export_request.save()
-        
-        return Response(
-            {'error': f'Export failed: {str(e)}'}, 
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR
-        )
+    # Built on the bounded "exports" background queue; poll the status endpoint
+    enqueue_export(export_request)
+    
+    return Response({
+        'request_id': str(export_request.request_id),
+        'status': export_request.status,
+        'expires_at': export_request.expires_at,
+        'message': 'Data export queued'
+    }, status=status.HTTP_202_ACCEPTED)
 
 
 @api_view(['GET'])
@@ -90,6 +68,9 @@ def get_export_status(request, request_id):
             'processed_at': export_request.processed_at,
             'expires_at': export_request.expires_at,
             'file_size': export_request.file_size,
+            'uncompressed_bytes': export_request.uncompressed_bytes,
+            'row_count': export_request.row_count,
+            'duration_ms': export_request.duration_ms,
             'can_download': export_request.can_download(),
             'error_message': export_request.error_message
         })
@@ -127,11 +108,13 @@ def download_export(request, request_id):
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        file = default_storage.open(export_request.file_path)
-        response = HttpResponse(file.read(), content_type='application/zip')
-        response['Content-Disposition'] = f'attachment; filename="user_data_{request_id}.zip"'
-        
-        return response
+        # Streamed in chunks rather than read into memory
+        return FileResponse(
+            default_storage.open(export_request.file_path, 'rb'),
+            as_attachment=True,
+            filename=f'user_data_{request_id}.zip',
+            content_type='application/zip'
+        )
         
     except ValueError:
         return Response(
@@ -8,20 +8,23 @@ from rest_framework.response import Response
 from common.auth import NoAuthentication
 from common.cache import cache_page_seconds
 from django.core.paginator import Paginator
-from django.db.models import Q, Count
+from django.db.models import Count
 from django.utils import timezone
 from django.http import HttpResponse
+from django.utils.http import parse_etags
 from typing import Dict, Any
 
 from .cache import get_home_data, set_home_data, get_news_data, set_news_data
 from events.models import Event
 from fixtures.models import Fixture
-from results.models import Result
+from results.models import EventResultsSnapshot
+from results.services.snapshot import rebuild_results_snapshot
 from content.models import Announcement, News, Banner
 from tickets.models import TicketOrder
 from teams.models import Team
 from accounts.models import User
 from venues.models import Venue
+from search.services import search_queryset
 
 
 @api_view(['GET'])
@@ -129,24 +132,18 @@ def public_events_list(request) -> Response:
         ).select_related('venue')
         
         # Apply filters
-        if search:
-            events = events.filter(
-                Q(name__icontains=search) | 
-                Q(description__icontains=search) |
-                Q(sport__icontains=search)
-            )
-        
         if sport:
             events = events.filter(sport__iexact=sport)
             
         if date_from:
-            events = events.filter(start_date__gte=date_from)
+            events = events.filter(start_datetime__gte=date_from)
             
         if date_to:
-            events = events.filter(end_date__lte=date_to)
+            events = events.filter(end_datetime__lte=date_to)
         
-        # Order by start date
-        events = events.order_by('start_date', 'created_at')
+        # Best matches first when searching, otherwise by start date
+        events = events.order_by('start_datetime', 'created_at')
+        events = search_queryset(events, 'event', search)
         
         # Paginate
         paginator = Paginator(events, page_size)
@@ -159,8 +156,8 @@ def public_events_list(request) -> Response:
                 'name': event.name,
                 'sport': event.sport,
                 'description': event.description,
-                'start_date': event.start_date,
-                'end_date': event.end_date,
+                'start_date': event.start_datetime,
+                'end_date': event.end_datetime,
                 'location': event.location,
                 'venue': {
                     'id': event.venue.id,
@@ -335,13 +332,16 @@ def public_event_results(request, event_id: int) -> Response:
     """
     GET /api/public/events/{id}/results/
     Returns published results and leaderboard for an event
+
+    Served from the event's materialized snapshot (one query) with a strong
+    ETag; a matching If-None-Match gets 304 Not Modified.
     """
     try:
-        # Verify event exists and is published
+        # Verify event exists and is published; the snapshot rides along
         event = Event.objects.filter(
             id=event_id,
             status=Event.Status.UPCOMING
-        ).first()
+        ).select_related('results_snapshot').first()
         
         if not event:
             return Response(
@@ -349,95 +349,18 @@ def public_event_results(request, event_id: int) -> Response:
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        # Get results for this event's fixtures
-        results = Result.objects.filter(
-            fixture__event=event
-        ).select_related(
-            'fixture__venue'
-        ).prefetch_related(
-            'fixture__entries__team',
-            'fixture__entries__participant'
-        ).order_by('-fixture__starts_at')
+        try:
+            snapshot = event.results_snapshot
+        except EventResultsSnapshot.DoesNotExist:
+            snapshot = rebuild_results_snapshot(event.id)
         
-        # Serialize results
-        results_data = []
-        for result in results:
-            # Get home and away entries
-            home_entry = result.fixture.entries.filter(side='home').first()
-            away_entry = result.fixture.entries.filter(side='away').first()
-            
-            result_data = {
-                'id': result.id,
-                'fixture': {
-                    'id': result.fixture.id,
-                    'round_no': result.fixture.round_no,
-                    'starts_at': result.fixture.starts_at,
-                    'venue': result.fixture.venue.name if result.fixture.venue else None
-                },
-                'home_team': {
-                    'id': home_entry.team.id,
-                    'name': home_entry.team.name
-                } if home_entry and home_entry.team else None,
-                'away_team': {
-                    'id': away_entry.team.id,
-                    'name': away_entry.team.name
-                } if away_entry and away_entry.team else None,
-                'score_home': result.score_home,
-                'score_away': result.score_away,
-                'notes': result.notes,
-                'created_at': result.created_at
-            }
-            results_data.append(result_data)
-        
-        # Simple leaderboard calculation (wins/losses)
-        team_stats = {}
-        for result in results:
-            home_entry = result.fixture.entries.filter(side='home').first()
-            away_entry = result.fixture.entries.filter(side='away').first()
-            
-            if home_entry and home_entry.team and away_entry and away_entry.team:
-                home_team = home_entry.team.name
-                away_team = away_entry.team.name
-                
-                if home_team not in team_stats:
-                    team_stats[home_team] = {'wins': 0, 'losses': 0, 'points_for': 0, 'points_against': 0}
-                if away_team not in team_stats:
-                    team_stats[away_team] = {'wins': 0, 'losses': 0, 'points_for': 0, 'points_against': 0}
-                
-                team_stats[home_team]['points_for'] += result.score_home
-                team_stats[home_team]['points_against'] += result.score_away
-                team_stats[away_team]['points_for'] += result.score_away
-                team_stats[away_team]['points_against'] += result.score_home
-                
-                if result.score_home > result.score_away:
-                    team_stats[home_team]['wins'] += 1
-                    team_stats[away_team]['losses'] += 1
-                elif result.score_away > result.score_home:
-                    team_stats[away_team]['wins'] += 1
-                    team_stats[home_team]['losses'] += 1
-        
-        # Sort leaderboard by wins
-        leaderboard = [
-            {
-                'team': team,
-                'wins': stats['wins'],
-                'losses': stats['losses'],
-                'points_for': stats['points_for'],
-                'points_against': stats['points_against'],
-                'point_difference': stats['points_for'] - stats['points_against']
-            }
-            for team, stats in sorted(
-                team_stats.items(), 
-                key=lambda x: (x[1]['wins'], x[1]['point_difference']), 
-                reverse=True
-            )
-        ]
+        etag = f'"{snapshot.etag}"'
+        headers = {'ETag': etag, 'Cache-Control': 'public, no-cache'}
+        if_none_match = request.headers.get('If-None-Match')
+        if if_none_match and (etag in parse_etags(if_none_match) or if_none_match.strip() == '*'):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
         
-        return Response({
-            'results': results_data,
-            'leaderboard': leaderboard,
-            'count': len(results_data)
-        })
+        return Response(snapshot.payload, headers=headers)
         
     except Exception as e:
         return Response(
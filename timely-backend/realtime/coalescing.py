@@ -0,0 +1,121 @@
+# realtime/coalescing.py
+"""
+Per-key coalescing window for realtime broadcasts.
+
+The first update for a key opens a window; further updates for the same key
+that arrive before the window closes are merged into it. When the window
+closes the flush callback runs once with everything that was collected.
+"""
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PendingUpdate:
+    """Updates collected for one key during a window"""
+
+    key: Any
+    count: int = 0
+    result_id: Optional[int] = None
+    result_ids: Set[int] = field(default_factory=set)
+    messages: List[str] = field(default_factory=list)
+
+    def merge(self, result_id: Optional[int] = None, message: Optional[str] = None):
+        self.count += 1
+        if result_id is not None:
+            # Latest result is sent in full; the others only pick the groups to notify
+            self.result_id = result_id
+            self.result_ids.add(result_id)
+        if message:
+            self.messages.append(message)
+
+    @property
+    def merged(self) -> int:
+        """Number of updates folded into this one beyond the first"""
+        return max(self.count - 1, 0)
+
+
+class BroadcastCoalescer:
+    """Collapses bursts of updates per key into a single flush"""
+
+    def __init__(self, flush: Callable[[PendingUpdate], None], window: float = 1.0):
+        self._flush = flush
+        self.window = window
+        self._lock = threading.Lock()
+        self._pending: Dict[Any, PendingUpdate] = {}
+        self._timers: Dict[Any, threading.Timer] = {}
+        self._stats = {'submitted': 0, 'merged': 0, 'flushed': 0, 'errors': 0}
+
+    def submit(self, key, result_id: Optional[int] = None, message: Optional[str] = None):
+        """Queue an update for key, opening a window if none is open"""
+        with self._lock:
+            self._stats['submitted'] += 1
+            pending = self._pending.get(key)
+            if pending is not None:
+                pending.merge(result_id, message)
+                self._stats['merged'] += 1
+                return
+
+            pending = self._pending[key] = PendingUpdate(key)
+            pending.merge(result_id, message)
+
+            if self.window > 0:
+                timer = threading.Timer(self.window, self._flush_from_timer, args=(key,))
+                timer.daemon = True
+                self._timers[key] = timer
+                timer.start()
+                return
+
+        # No window configured: flush inline
+        self.flush(key)
+
+    def flush(self, key) -> bool:
+        """Flush the pending update for key now; returns False if nothing was pending"""
+        with self._lock:
+            pending = self._pending.pop(key, None)
+            timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        if pending is None:
+            return False
+
+        try:
+            self._flush(pending)
+        except Exception:
+            logger.exception("Error flushing coalesced broadcast for %s", key)
+            with self._lock:
+                self._stats['errors'] += 1
+            return False
+
+        with self._lock:
+            self._stats['flushed'] += 1
+        return True
+
+    def flush_all(self) -> int:
+        """Flush every open window; returns how many were flushed"""
+        with self._lock:
+            keys = list(self._pending)
+        return sum(1 for key in keys if self.flush(key))
+
+    def _flush_from_timer(self, key):
+        try:
+            self.flush(key)
+        finally:
+            # Timer threads get their own DB connection; don't leak it
+            connection.close()
+
+    def pending_keys(self) -> List[Any]:
+        with self._lock:
+            return list(self._pending)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats['pending'] = len(self._pending)
+        return stats
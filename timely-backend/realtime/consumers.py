@@ -3,11 +3,12 @@ import json
 from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
 from django.contrib.auth import get_user_model
+from .frames import FrameForwardingMixin
 
 User = get_user_model()
 
 
-class EventConsumer(AsyncWebsocketConsumer):
+class EventConsumer(FrameForwardingMixin, AsyncWebsocketConsumer):
     """WebSocket consumer for event-specific real-time updates"""
     
     async def connect(self):
@@ -76,10 +77,7 @@ class EventConsumer(AsyncWebsocketConsumer):
     
     async def results_update(self, event):
         """Handle results updates"""
-        await self.send(text_data=json.dumps({
-            'type': 'results_update',
-            'data': event['data']
-        }))
+        await self.send_frame(event, 'results_update')
 
     # Aliases for upstream message types
     async def result_update(self, event):
@@ -89,10 +87,7 @@ class EventConsumer(AsyncWebsocketConsumer):
     
     async def schedule_update(self, event):
         """Handle schedule updates"""
-        await self.send(text_data=json.dumps({
-            'type': 'schedule_update',
-            'data': event['data']
-        }))
+        await self.send_frame(event, 'schedule_update')
 
     # Alias for single-fixture schedule updates
     async def fixture_update(self, event):
@@ -100,13 +95,10 @@ class EventConsumer(AsyncWebsocketConsumer):
     
     async def announcements_update(self, event):
         """Handle announcements updates"""
-        await self.send(text_data=json.dumps({
-            'type': 'announcements_update',
-            'data': event['data']
-        }))
+        await self.send_frame(event, 'announcements_update')
 
 
-class AdminConsumer(AsyncWebsocketConsumer):
+class AdminConsumer(FrameForwardingMixin, AsyncWebsocketConsumer):
     """WebSocket consumer for admin real-time updates"""
     
     async def connect(self):
@@ -154,27 +146,18 @@ class AdminConsumer(AsyncWebsocketConsumer):
     
     async def event_update(self, event):
         """Handle event updates"""
-        await self.send(text_data=json.dumps({
-            'type': 'event_update',
-            'data': event['data']
-        }))
+        await self.send_frame(event, 'event_update')
     
     async def venue_update(self, event):
         """Handle venue updates"""
-        await self.send(text_data=json.dumps({
-            'type': 'venue_update',
-            'data': event['data']
-        }))
+        await self.send_frame(event, 'venue_update')
     
     async def user_update(self, event):
         """Handle user updates"""
-        await self.send(text_data=json.dumps({
-            'type': 'user_update',
-            'data': event['data']
-        }))
+        await self.send_frame(event, 'user_update')
 
 
-class OrganizerConsumer(AsyncWebsocketConsumer):
+class OrganizerConsumer(FrameForwardingMixin, AsyncWebsocketConsumer):
     """WebSocket consumer for organizer real-time updates"""
     
     async def connect(self):
@@ -231,27 +214,18 @@ class OrganizerConsumer(AsyncWebsocketConsumer):
     
     async def event_update(self, event):
         """Handle event updates"""
-        await self.send(text_data=json.dumps({
-            'type': 'event_update',
-            'data': event['data']
-        }))
+        await self.send_frame(event, 'event_update')
     
     async def venue_update(self, event):
         """Handle venue updates"""
-        await self.send(text_data=json.dumps({
-            'type': 'venue_update',
-            'data': event['data']
-        }))
+        await self.send_frame(event, 'venue_update')
     
     async def user_update(self, event):
         """Handle user updates"""
-        await self.send(text_data=json.dumps({
-            'type': 'user_update',
-            'data': event['data']
-        }))
+        await self.send_frame(event, 'user_update')
 
 
-class PublicConsumer(AsyncWebsocketConsumer):
+class PublicConsumer(FrameForwardingMixin, AsyncWebsocketConsumer):
     """WebSocket consumer for public real-time updates"""
     
     async def connect(self):
@@ -290,20 +264,14 @@ class PublicConsumer(AsyncWebsocketConsumer):
     
     async def event_update(self, event):
         """Handle event updates"""
-        await self.send(text_data=json.dumps({
-            'type': 'event_update',
-            'data': event['data']
-        }))
+        await self.send_frame(event, 'event_update')
     
     async def content_update(self, event):
         """Handle content updates"""
-        await self.send(text_data=json.dumps({
-            'type': 'content_update',
-            'data': event['data']
-        }))
+        await self.send_frame(event, 'content_update')
 
 
-class AthleteConsumer(AsyncWebsocketConsumer):
+class AthleteConsumer(FrameForwardingMixin, AsyncWebsocketConsumer):
     """WebSocket consumer for athlete real-time updates"""
     
     async def connect(self):
@@ -362,55 +330,34 @@ class AthleteConsumer(AsyncWebsocketConsumer):
     
     async def registration_update(self, event):
         """Handle registration updates"""
-        await self.send(text_data=json.dumps({
-            'type': 'registration_update',
-            'data': event['data']
-        }))
+        await self.send_frame(event, 'registration_update')
     
     async def ticket_update(self, event):
         """Handle ticket updates"""
-        await self.send(text_data=json.dumps({
-            'type': 'ticket_update',
-            'data': event['data']
-        }))
+        await self.send_frame(event, 'ticket_update')
     
     async def message_update(self, event):
         """Handle message updates"""
-        await self.send(text_data=json.dumps({
-            'type': 'message_update',
-            'data': event['data']
-        }))
+        await self.send_frame(event, 'message_update')
     
     async def announcement_update(self, event):
         """Handle announcement updates"""
-        await self.send(text_data=json.dumps({
-            'type': 'announcement_update',
-            'data': event['data']
-        }))
+        await self.send_frame(event, 'announcement_update')
     
     async def schedule_update(self, event):
         """Handle schedule updates"""
-        await self.send(text_data=json.dumps({
-            'type': 'schedule_update',
-            'data': event['data']
-        }))
+        await self.send_frame(event, 'schedule_update')
     
     async def results_update(self, event):
         """Handle results updates"""
-        await self.send(text_data=json.dumps({
-            'type': 'results_update',
-            'data': event['data']
-        }))
+        await self.send_frame(event, 'results_update')
     
     async def content_update(self, event):
         """Handle content updates"""
-        await self.send(text_data=json.dumps({
-            'type': 'content_update',
-            'data': event['data']
-        }))
+        await self.send_frame(event, 'content_update')
 
 
-class CoachConsumer(AsyncWebsocketConsumer):
+class CoachConsumer(FrameForwardingMixin, AsyncWebsocketConsumer):
     """WebSocket consumer for coach real-time updates"""
     
     async def connect(self):
@@ -472,55 +419,34 @@ class CoachConsumer(AsyncWebsocketConsumer):
     
     async def registration_update(self, event):
         """Handle registration updates"""
-        await self.send(text_data=json.dumps({
-            'type': 'registration_update',
-            'data': event['data']
-        }))
+        await self.send_frame(event, 'registration_update')
     
     async def message_update(self, event):
         """Handle message updates"""
-        await self.send(text_data=json.dumps({
-            'type': 'message_update',
-            'data': event['data']
-        }))
+        await self.send_frame(event, 'message_update')
     
     async def announcement_update(self, event):
         """Handle announcement updates"""
-        await self.send(text_data=json.dumps({
-            'type': 'announcement_update',
-            'data': event['data']
-        }))
+        await self.send_frame(event, 'announcement_update')
     
     async def event_update(self, event):
         """Handle event updates"""
-        await self.send(text_data=json.dumps({
-            'type': 'event_update',
-            'data': event['data']
-        }))
+        await self.send_frame(event, 'event_update')
     
     async def schedule_update(self, event):
         """Handle schedule updates"""
-        await self.send(text_data=json.dumps({
-            'type': 'schedule_update',
-            'data': event['data']
-        }))
+        await self.send_frame(event, 'schedule_update')
     
     async def results_update(self, event):
         """Handle results updates"""
-        await self.send(text_data=json.dumps({
-            'type': 'results_update',
-            'data': event['data']
-        }))
+        await self.send_frame(event, 'results_update')
     
     async def content_update(self, event):
         """Handle content updates"""
-        await self.send(text_data=json.dumps({
-            'type': 'content_update',
-            'data': event['data']
-        }))
+        await self.send_frame(event, 'content_update')
 
 
-class SpectatorConsumer(AsyncWebsocketConsumer):
+class SpectatorConsumer(FrameForwardingMixin, AsyncWebsocketConsumer):
     """WebSocket consumer for spectator real-time updates"""
     
     async def connect(self):
@@ -562,24 +488,15 @@ class SpectatorConsumer(AsyncWebsocketConsumer):
     
     async def content_update(self, event):
         """Handle content updates"""
-        await self.send(text_data=json.dumps({
-            'type': 'content_update',
-            'data': event['data']
-        }))
+        await self.send_frame(event, 'content_update')
     
     async def schedule_update(self, event):
         """Handle schedule updates"""
-        await self.send(text_data=json.dumps({
-            'type': 'schedule_update',
-            'data': event['data']
-        }))
+        await self.send_frame(event, 'schedule_update')
     
     async def results_update(self, event):
         """Handle results updates"""
-        await self.send(text_data=json.dumps({
-            'type': 'results_update',
-            'data': event['data']
-        }))
+        await self.send_frame(event, 'results_update')
 
 
 class UserConsumer(AsyncWebsocketConsumer):
@@ -632,3 +549,11 @@ class UserConsumer(AsyncWebsocketConsumer):
             'type': 'role_update',
             'role': event['role']
         }))
+    
+    async def media_update(self, event):
+        """Handle media messages for the uploader (mediahub)"""
+        await self.send(text_data=json.dumps({
+            'type': 'media_update',
+            'event_type': event['event_type'],
+            'data': event['data']
+        }, default=str))
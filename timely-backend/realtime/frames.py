@@ -0,0 +1,43 @@
+# realtime/frames.py
+"""
+Serialize-once frames for group broadcasts.
+
+A group message built with group_message() carries the JSON text frame that
+consumers would send, next to the raw data. The frame is encoded once by the
+broadcaster, and every consumer in the group forwards the same string instead
+of running json.dumps per socket. Messages without a frame (older producers,
+or a handler that sends under a different type) are encoded per consumer as
+before, with the same output.
+"""
+import json
+from typing import Any, Optional
+
+
+def encode_frame(message_type: str, data: Any) -> str:
+    """The {'type', 'data'} text frame consumers send to clients"""
+    return json.dumps({'type': message_type, 'data': data}, default=str)
+
+
+def group_message(message_type: str, data: Any) -> dict:
+    """A channel layer group message with its text frame pre-encoded"""
+    return {
+        'type': message_type,
+        'data': data,
+        'frame': encode_frame(message_type, data),
+    }
+
+
+def frame_for(event: dict, frame_type: Optional[str] = None) -> str:
+    """The text frame for a group message, reusing the pre-encoded one when it matches"""
+    frame_type = frame_type or event['type']
+    frame = event.get('frame')
+    if frame is not None and event.get('type') == frame_type:
+        return frame
+    return encode_frame(frame_type, event.get('data'))
+
+
+class FrameForwardingMixin:
+    """Consumer mixin that forwards pre-encoded broadcast frames verbatim"""
+
+    async def send_frame(self, event: dict, frame_type: Optional[str] = None):
+        await self.send(text_data=frame_for(event, frame_type))
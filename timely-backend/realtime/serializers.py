@@ -10,6 +10,9 @@ class MinimalResultSerializer(serializers.ModelSerializer):
     home_team_name = serializers.CharField(source='fixture.home.name', read_only=True)
     away_team_name = serializers.CharField(source='fixture.away.name', read_only=True)
     winner_name = serializers.CharField(source='winner.name', read_only=True)
+    home_score = serializers.IntegerField(source='score_home', read_only=True)
+    away_score = serializers.IntegerField(source='score_away', read_only=True)
+    finalized_at = serializers.DateTimeField(source='verified_at', read_only=True)
     
     class Meta:
         model = Result
@@ -23,20 +26,20 @@ class MinimalResultSerializer(serializers.ModelSerializer):
 class MinimalLeaderboardEntrySerializer(serializers.ModelSerializer):
     """Minimal leaderboard entry serializer for real-time updates"""
     team_name = serializers.CharField(source='team.name', read_only=True)
-    position = serializers.SerializerMethodField()
+    pts = serializers.IntegerField(source='points', read_only=True)
+    w = serializers.IntegerField(source='wins', read_only=True)
+    d = serializers.IntegerField(source='draws', read_only=True)
+    l = serializers.IntegerField(source='losses', read_only=True)
+    gf = serializers.IntegerField(source='goals_for', read_only=True)
+    ga = serializers.IntegerField(source='goals_against', read_only=True)
+    gd = serializers.IntegerField(source='goal_difference', read_only=True)
     
     class Meta:
         model = LeaderboardEntry
         fields = [
             'id', 'team_name', 'pts', 'w', 'd', 'l', 'gf', 'ga', 'gd',
-            'win_percentage', 'points_per_match', 'matches_played', 'position'
+            'matches_played', 'position'
         ]
-    
-    def get_position(self, obj):
-        """Get position in leaderboard"""
-        # This would need to be calculated based on the current leaderboard
-        # For now, return a placeholder
-        return 1
 
 
 class MinimalFixtureSerializer(serializers.ModelSerializer):
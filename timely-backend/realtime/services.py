@@ -1,6 +1,8 @@
 # realtime/services.py
 import json
 from datetime import datetime
+from django.conf import settings
+from django.core.cache import cache
 from django.utils import timezone
 from channels.layers import get_channel_layer
 from asgiref.sync import async_to_sync
@@ -9,8 +11,27 @@ from .serializers import (
     MinimalFixtureSerializer, MinimalAnnouncementSerializer,
     ResultsUpdateSerializer, ScheduleUpdateSerializer, AnnouncementsUpdateSerializer
 )
-from results.models import LeaderboardEntry
-from results.services.compute import recompute_event_standings
+from results.models import Result, LeaderboardEntry
+from .coalescing import BroadcastCoalescer
+from .frames import group_message
+
+
+def next_frame_version(event_id):
+    """
+    Monotonically increasing per-event frame version so clients can drop stale frames.
+
+    The counter lives in the default cache, so versions only increase across
+    workers when that cache is shared (Redis, with CACHE_REDIS_URL set). On
+    the per-process locmem cache each worker counts on its own.
+    """
+    key = f"realtime:results_version:{event_id}"
+    cache.add(key, 0, timeout=None)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # Key evicted between add and incr
+        cache.set(key, 1, timeout=None)
+        return 1
 
 
 class RealtimeBroadcaster:
@@ -18,36 +39,66 @@ class RealtimeBroadcaster:
     
     def __init__(self):
         self.channel_layer = get_channel_layer()
+        # Result and leaderboard updates share one window per event, so a burst
+        # of score edits costs one standings read and one frame per group
+        self.results_coalescer = BroadcastCoalescer(
+            self._flush_results_update,
+            window=getattr(settings, 'REALTIME_CONFIG', {}).get('RESULTS_COALESCE_WINDOW', 1.0),
+        )
     
     def broadcast_results_update(self, event_id, result=None, message=None):
-        """Broadcast results update to event subscribers"""
-        group_name = f"event_{event_id}_results"
+        """Queue a results update for event subscribers (coalesced per event)"""
+        self.results_coalescer.submit(
+            int(event_id),
+            result_id=result.pk if result is not None else None,
+            message=message,
+        )
+    
+    def _flush_results_update(self, pending):
+        """
+        Send one versioned frame for a window to the event's results group and
+        to the results group of every team whose result changed in it.
+
+        The stored standings are kept current by the result signals, so the
+        leaderboard is read as is rather than recomputed.
+        """
+        event_id = pending.key
+        groups = [f"event_{event_id}_results"]
         
         # Prepare data
         data = {
             'type': 'results_update',
             'event_id': event_id,
+            'version': next_frame_version(event_id),
+            'merged': pending.merged,
             'timestamp': timezone.now().isoformat()
         }
         
-        if result:
-            data['result'] = MinimalResultSerializer(result).data
-            
-            # Recompute leaderboard and include it
-            leaderboard = recompute_event_standings(event_id)
-            data['leaderboard'] = MinimalLeaderboardEntrySerializer(leaderboard, many=True).data
-        
-        if message:
-            data['message'] = message
-        
-        # Broadcast to WebSocket group
-        async_to_sync(self.channel_layer.group_send)(
-            group_name,
-            {
-                'type': 'results_update',
-                'data': data
-            }
-        )
+        if pending.result_ids:
+            results = Result.objects.select_related(
+                'fixture__home', 'fixture__away', 'winner'
+            ).filter(pk__in=pending.result_ids)
+            team_ids = set()
+            for result in results:
+                team_ids.update(team_id for team_id in (result.fixture.home_id, result.fixture.away_id) if team_id)
+                if result.pk == pending.result_id:
+                    data['result'] = MinimalResultSerializer(result).data
+            groups.extend(f"team_{team_id}_results" for team_id in sorted(team_ids))
+        
+        leaderboard = LeaderboardEntry.objects.filter(event_id=event_id).select_related('team').order_by('position')
+        data['leaderboard'] = MinimalLeaderboardEntrySerializer(leaderboard, many=True).data
+        
+        if pending.messages:
+            data['message'] = pending.messages[-1]
+        
+        # Encoded once and shared by every group
+        group_event = group_message('results_update', data)
+        for group_name in groups:
+            async_to_sync(self.channel_layer.group_send)(group_name, group_event)
+    
+    def coalescing_stats(self):
+        """Counters for submitted, merged and flushed results updates"""
+        return self.results_coalescer.stats()
     
     def broadcast_schedule_update(self, event_id, fixture=None, fixtures=None, message=None):
         """Broadcast schedule update to event subscribers"""
@@ -70,13 +121,7 @@ class RealtimeBroadcaster:
             data['message'] = message
         
         # Broadcast to WebSocket group
-        async_to_sync(self.channel_layer.group_send)(
-            group_name,
-            {
-                'type': 'schedule_update',
-                'data': data
-            }
-        )
+        async_to_sync(self.channel_layer.group_send)(group_name, group_message('schedule_update', data))
     
     def broadcast_announcements_update(self, event_id, announcement=None, message=None):
         """Broadcast announcements update to event subscribers"""
@@ -96,40 +141,11 @@ class RealtimeBroadcaster:
             data['message'] = message
         
         # Broadcast to WebSocket group
-        async_to_sync(self.channel_layer.group_send)(
-            group_name,
-            {
-                'type': 'announcements_update',
-                'data': data
-            }
-        )
+        async_to_sync(self.channel_layer.group_send)(group_name, group_message('announcements_update', data))
     
     def broadcast_leaderboard_update(self, event_id, message=None):
-        """Broadcast leaderboard update to event subscribers"""
-        group_name = f"event_{event_id}_results"
-        
-        # Recompute leaderboard
-        leaderboard = recompute_event_standings(event_id)
-        
-        # Prepare data
-        data = {
-            'type': 'leaderboard_update',
-            'event_id': event_id,
-            'leaderboard': MinimalLeaderboardEntrySerializer(leaderboard, many=True).data,
-            'timestamp': timezone.now().isoformat()
-        }
-        
-        if message:
-            data['message'] = message
-        
-        # Broadcast to WebSocket group
-        async_to_sync(self.channel_layer.group_send)(
-            group_name,
-            {
-                'type': 'results_update',
-                'data': data
-            }
-        )
+        """Queue a leaderboard update for event subscribers (coalesced per event)"""
+        self.results_coalescer.submit(int(event_id), message=message)
     
     def broadcast_event_update(self, event_id, event_data, message=None):
         """Broadcast general event update to event subscribers"""
@@ -150,14 +166,10 @@ class RealtimeBroadcaster:
         if message:
             data['message'] = message
         
+        # Encoded once and shared by all three groups
+        group_event = group_message('event_update', data)
         for group_name in groups:
-            async_to_sync(self.channel_layer.group_send)(
-                group_name,
-                {
-                    'type': 'event_update',
-                    'data': data
-                }
-            )
+            async_to_sync(self.channel_layer.group_send)(group_name, group_event)
 
 
 # Global broadcaster instance
@@ -1,6 +1,7 @@
 # realtime/signals.py
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
+from django.db import transaction
 from results.models import Result
 from api.models import Announcement
 from .services import broadcast_result_update, broadcast_announcement_update
@@ -9,16 +10,17 @@ from .services import broadcast_result_update, broadcast_announcement_update
 @receiver(post_save, sender=Result)
 def result_created_or_updated(sender, instance, created, **kwargs):
     """Broadcast real-time update when result is created or updated"""
+    fixture = instance.fixture
+    home_name = fixture.home.name if fixture.home else 'TBD'
+    away_name = fixture.away.name if fixture.away else 'TBD'
     if created:
-        message = f"New result recorded: {instance.fixture.home.name} {instance.home_score}-{instance.away_score} {instance.fixture.away.name}"
+        message = f"New result recorded: {home_name} {instance.score_home}-{instance.score_away} {away_name}"
     else:
-        message = f"Result updated: {instance.fixture.home.name} {instance.home_score}-{instance.away_score} {instance.fixture.away.name}"
+        message = f"Result updated: {home_name} {instance.score_home}-{instance.score_away} {away_name}"
     
-    broadcast_result_update(
-        instance.fixture.event.id,
-        instance,
-        message
-    )
+    # Coalesced with the other Result hooks, so this does not add a recompute
+    event_id = fixture.event_id
+    transaction.on_commit(lambda: broadcast_result_update(event_id, instance, message))
 
 
 @receiver(post_save, sender=Announcement)
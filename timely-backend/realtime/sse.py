@@ -0,0 +1,289 @@
+# realtime/sse.py
+"""
+Push-driven Server-Sent Events hub.
+
+Each process keeps one feed per event. A feed joins the event's channel layer
+groups (the ones RealtimeBroadcaster publishes to) on a single channel, so
+2,000 spectators on one event cost one subscription, not 2,000. Every message
+is encoded into an SSE frame once and the same bytes are handed to every
+connected client through a small per-client queue.
+
+Frames carry ids of the form "<epoch>-<seq>". The last frames of each feed are
+kept in a bounded replay buffer; a client reconnecting with Last-Event-ID from
+the same feed epoch gets the frames it missed, anything else gets a fresh
+snapshot. Slow clients whose queue fills up are disconnected and resume the
+same way.
+"""
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import AsyncIterator, Awaitable, Callable, Deque, Dict, FrozenSet, List, Optional, Set
+
+from channels.layers import get_channel_layer
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+EVENT_GROUPS = ('results', 'schedule', 'announcements')
+
+# Message types that reach the results stream; the event stream gets everything.
+# result_update and leaderboard_update still come from events.realtime_service
+RESULTS_TYPES = frozenset({'results_update', 'result_update', 'leaderboard_update', 'event_update'})
+
+DEFAULTS = {
+    'SSE_REPLAY_BUFFER': 256,  # frames kept per event for Last-Event-ID resume
+    'SSE_CLIENT_QUEUE': 64,  # frames buffered per client before it is dropped
+    'SSE_HEARTBEAT_INTERVAL': 15,  # seconds between keep-alive comments
+    'SSE_IDLE_TIMEOUT': 60,  # seconds a feed outlives its last client
+    'SSE_RETRY_MS': 3000,  # reconnect delay suggested to clients
+}
+
+# Identical payloads seen within this many frames are dropped; event_update is
+# sent to every event group and would otherwise arrive once per group
+DEDUPE_WINDOW = 8
+
+HEARTBEAT = b': ping\n\n'
+_CLOSE = object()
+
+
+def sse_config(name):
+    return getattr(settings, 'REALTIME_CONFIG', {}).get(name, DEFAULTS[name])
+
+
+def sse_frame(body: str, frame_id: Optional[str] = None) -> bytes:
+    """Wrap a JSON body as one SSE message, delivered as a default 'message' event"""
+    if frame_id is None:
+        return f'data: {body}\n\n'.encode('utf-8')
+    return f'id: {frame_id}\ndata: {body}\n\n'.encode('utf-8')
+
+
+def encode_frame(payload: dict, frame_id: Optional[str] = None) -> bytes:
+    return sse_frame(json.dumps(payload, separators=(',', ':'), default=str), frame_id)
+
+
+@dataclass(frozen=True)
+class Frame:
+    seq: int
+    message_type: str
+    data: bytes
+
+
+class Subscriber:
+    """One connected client: a bounded queue of pre-encoded frames"""
+
+    def __init__(self, types: Optional[FrozenSet[str]], maxsize: int):
+        self.types = types
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.dropped = False
+
+    def wants(self, frame: Frame) -> bool:
+        return self.types is None or frame.message_type in self.types
+
+    def offer(self, frame: Frame) -> bool:
+        """Queue a frame; False when the client has fallen too far behind"""
+        try:
+            self.queue.put_nowait(frame.data)
+            return True
+        except asyncio.QueueFull:
+            return False
+
+    def close(self):
+        # Make room for the sentinel so the client loop wakes up and exits
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(_CLOSE)
+
+
+class EventFeed:
+    """Channel layer subscription and replay buffer for one event"""
+
+    def __init__(self, hub: 'SSEHub', event_id: int):
+        self.hub = hub
+        self.event_id = event_id
+        self.groups = [f'event_{event_id}_{name}' for name in EVENT_GROUPS]
+        self.epoch = format(time.time_ns() // 1000, 'x')
+        self.seq = 0
+        self.buffer: Deque[Frame] = deque(maxlen=sse_config('SSE_REPLAY_BUFFER'))
+        self.subscribers: Set[Subscriber] = set()
+        self.loop = asyncio.get_running_loop()
+        self.ready = asyncio.Event()
+        self._recent: Deque[str] = deque(maxlen=DEDUPE_WINDOW)
+        self._idle_handle: Optional[asyncio.TimerHandle] = None
+        self._task = asyncio.create_task(self._listen())
+
+    def frame_id(self, seq: int) -> str:
+        return f'{self.epoch}-{seq}'
+
+    async def _listen(self):
+        channel_layer = get_channel_layer()
+        if channel_layer is None:
+            self.ready.set()
+            return
+        channel = await channel_layer.new_channel('sse.')
+        try:
+            for group in self.groups:
+                await channel_layer.group_add(group, channel)
+            self.ready.set()
+            while True:
+                message = await channel_layer.receive(channel)
+                self.publish(message)
+        except asyncio.CancelledError:
+            pass
+        except Exception:
+            logger.exception('SSE feed for event %s stopped', self.event_id)
+        finally:
+            self.ready.set()
+            for group in self.groups:
+                try:
+                    await channel_layer.group_discard(group, channel)
+                except Exception:
+                    pass
+            # Clients reconnect and land on a fresh feed
+            self.hub._forget(self)
+            for subscriber in list(self.subscribers):
+                subscriber.close()
+
+    def publish(self, message: dict):
+        """Encode a channel layer message once and fan it out"""
+        message_type = message.get('type', 'message')
+        # Broadcasters pre-encode the {'type', 'data'} frame (realtime.frames)
+        body = message.get('frame')
+        if body is None:
+            payload = {'type': message_type, 'data': message.get('data')}
+            if 'event_type' in message:
+                payload['event_type'] = message['event_type']
+            body = json.dumps(payload, separators=(',', ':'), sort_keys=True, default=str)
+        if body in self._recent:
+            return
+        self._recent.append(body)
+
+        self.seq += 1
+        frame = Frame(self.seq, message_type, sse_frame(body, self.frame_id(self.seq)))
+        self.buffer.append(frame)
+
+        for subscriber in list(self.subscribers):
+            if subscriber.wants(frame) and not subscriber.offer(frame):
+                logger.info('Dropping slow SSE client on event %s', self.event_id)
+                subscriber.dropped = True
+                self.subscribers.discard(subscriber)
+                subscriber.close()
+        self.hub.stats['frames'] += 1
+
+    def replay_after(self, last_event_id: Optional[str], subscriber: Subscriber) -> Optional[List[bytes]]:
+        """
+        Frames after last_event_id, or None when it cannot be resumed from
+        this feed (another epoch, or older than the buffer).
+        """
+        if not last_event_id:
+            return None
+        epoch, _, seq = last_event_id.strip().rpartition('-')
+        if epoch != self.epoch or not seq.isdigit():
+            return None
+        seq = int(seq)
+        oldest = self.buffer[0].seq if self.buffer else self.seq + 1
+        if seq > self.seq or seq < oldest - 1:
+            return None
+        return [frame.data for frame in self.buffer if frame.seq > seq and subscriber.wants(frame)]
+
+    def add(self, subscriber: Subscriber):
+        if self._idle_handle is not None:
+            self._idle_handle.cancel()
+            self._idle_handle = None
+        self.subscribers.add(subscriber)
+
+    def remove(self, subscriber: Subscriber):
+        self.subscribers.discard(subscriber)
+        if not self.subscribers and self._idle_handle is None:
+            # Linger so clients that reconnect straight away can still resume
+            self._idle_handle = self.loop.call_later(sse_config('SSE_IDLE_TIMEOUT'), self.stop)
+
+    def stop(self):
+        self._idle_handle = None
+        if not self.subscribers:
+            self._task.cancel()
+
+
+class SSEHub:
+    """Process-wide registry of event feeds"""
+
+    def __init__(self):
+        self.feeds: Dict[int, EventFeed] = {}
+        self.stats = {'clients': 0, 'frames': 0, 'resumed': 0}
+
+    def feed(self, event_id: int) -> EventFeed:
+        feed = self.feeds.get(event_id)
+        if feed is None or feed.loop is not asyncio.get_running_loop() or feed._task.done():
+            feed = self.feeds[event_id] = EventFeed(self, event_id)
+        return feed
+
+    async def close(self):
+        """Stop every feed, e.g. on shutdown"""
+        feeds = list(self.feeds.values())
+        for feed in feeds:
+            feed._task.cancel()
+        for feed in feeds:
+            try:
+                await feed._task
+            except asyncio.CancelledError:
+                pass
+
+    def _forget(self, feed: EventFeed):
+        if self.feeds.get(feed.event_id) is feed:
+            del self.feeds[feed.event_id]
+
+    async def stream(
+        self,
+        event_id: int,
+        snapshot: Callable[[], Awaitable[List[dict]]],
+        last_event_id: Optional[str] = None,
+        types: Optional[FrozenSet[str]] = None,
+    ) -> AsyncIterator[bytes]:
+        """
+        Frames for one client: a resume or snapshot, then live frames with
+        keep-alive comments in between. Runs until the client disconnects.
+        """
+        feed = self.feed(event_id)
+        subscriber = Subscriber(types, sse_config('SSE_CLIENT_QUEUE'))
+        # Subscribe before reading the snapshot so nothing published meanwhile is lost
+        feed.add(subscriber)
+        self.stats['clients'] += 1
+        heartbeat = sse_config('SSE_HEARTBEAT_INTERVAL')
+        try:
+            await feed.ready.wait()
+            yield f'retry: {sse_config("SSE_RETRY_MS")}\n\n'.encode('ascii')
+
+            missed = feed.replay_after(last_event_id, subscriber)
+            if missed is not None:
+                self.stats['resumed'] += 1
+                # Live frames already queued may repeat the tail of the replay
+                replayed = set(missed)
+                for data in missed:
+                    yield data
+            else:
+                replayed = set()
+                for payload in await snapshot():
+                    yield encode_frame(payload)
+
+            while True:
+                try:
+                    data = await asyncio.wait_for(subscriber.queue.get(), timeout=heartbeat)
+                except asyncio.TimeoutError:
+                    yield HEARTBEAT
+                    continue
+                if data is _CLOSE:
+                    break
+                if replayed:
+                    if data in replayed:
+                        continue
+                    replayed = set()
+                yield data
+        finally:
+            self.stats['clients'] -= 1
+            feed.remove(subscriber)
+
+
+# Global hub instance
+hub = SSEHub()
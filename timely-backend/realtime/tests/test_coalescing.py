@@ -0,0 +1,109 @@
+# realtime/tests/test_coalescing.py
+from unittest.mock import MagicMock, patch
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, SimpleTestCase
+from django.utils import timezone
+
+from events.models import Event
+from teams.models import Team
+from fixtures.models import Fixture
+from results.models import Result
+from ..coalescing import BroadcastCoalescer
+from ..services import RealtimeBroadcaster
+
+User = get_user_model()
+
+
+class BroadcastCoalescerTest(SimpleTestCase):
+    """Test per-key coalescing windows"""
+
+    def test_burst_collapses_into_one_flush(self):
+        flushed = []
+        coalescer = BroadcastCoalescer(flushed.append, window=60)
+
+        for result_id in range(5):
+            coalescer.submit(7, result_id=result_id, message=f'edit {result_id}')
+        coalescer.submit(8)
+
+        self.assertEqual(coalescer.flush_all(), 2)
+        by_key = {pending.key: pending for pending in flushed}
+        self.assertEqual(by_key[7].merged, 4)
+        self.assertEqual(by_key[7].result_id, 4)
+        self.assertEqual(by_key[7].messages[-1], 'edit 4')
+        self.assertEqual(by_key[8].merged, 0)
+        self.assertEqual(
+            coalescer.stats(),
+            {'submitted': 6, 'merged': 4, 'flushed': 2, 'errors': 0, 'pending': 0}
+        )
+
+    def test_zero_window_flushes_inline(self):
+        flushed = []
+        coalescer = BroadcastCoalescer(flushed.append, window=0)
+
+        coalescer.submit(1)
+        coalescer.submit(1)
+
+        self.assertEqual(len(flushed), 2)
+        self.assertEqual(coalescer.stats()['merged'], 0)
+
+    def test_flush_errors_are_counted(self):
+        coalescer = BroadcastCoalescer(MagicMock(side_effect=RuntimeError), window=60)
+        coalescer.submit(1)
+
+        self.assertFalse(coalescer.flush(1))
+        self.assertEqual(coalescer.stats()['errors'], 1)
+        self.assertFalse(coalescer.flush(1))
+
+
+class RealtimeBroadcasterCoalescingTest(TestCase):
+    """Test that result bursts produce one versioned frame per group"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email='org@example.com', password='testpass123')
+        self.event = Event.objects.create(
+            name='Cup',
+            sport='Football',
+            start_datetime=timezone.now(),
+            end_datetime=timezone.now() + timezone.timedelta(days=1),
+            created_by=self.user
+        )
+        home = self.home = Team.objects.create(name='Home', manager=self.user, event=self.event)
+        away = self.away = Team.objects.create(name='Away', manager=self.user, event=self.event)
+        fixture = Fixture.objects.create(event=self.event, home=home, away=away, start_at=timezone.now())
+        self.result = Result.objects.create(fixture=fixture, score_home=1, score_away=0, status='FINALIZED')
+
+        self.broadcaster = RealtimeBroadcaster()
+        self.broadcaster.channel_layer = MagicMock()
+        self.broadcaster.results_coalescer.window = 60
+
+    @patch('realtime.services.async_to_sync')
+    def test_burst_sends_one_frame_per_window(self, async_to_sync):
+        send = async_to_sync.return_value
+
+        for _ in range(3):
+            self.broadcaster.broadcast_results_update(self.event.id, self.result)
+        self.broadcaster.broadcast_leaderboard_update(self.event.id, 'Standings recomputed')
+        # Result, leaderboard and version read; the standings are not recomputed
+        with self.assertNumQueries(2):
+            self.broadcaster.results_coalescer.flush_all()
+
+        self.assertEqual(
+            [call[0][0] for call in send.call_args_list],
+            [f'event_{self.event.id}_results', f'team_{self.home.id}_results', f'team_{self.away.id}_results']
+        )
+        group, message = send.call_args_list[0][0]
+        self.assertIs(send.call_args_list[1][0][1], message)
+        self.assertEqual([row['team_name'] for row in message['data']['leaderboard']], ['Home', 'Away'])
+        self.assertEqual(message['data']['version'], 1)
+        self.assertEqual(message['data']['merged'], 3)
+        self.assertEqual(message['data']['result']['home_score'], 1)
+        self.assertEqual(message['data']['message'], 'Standings recomputed')
+        self.assertEqual(self.broadcaster.coalescing_stats()['merged'], 3)
+
+        self.broadcaster.broadcast_leaderboard_update(self.event.id)
+        self.broadcaster.results_coalescer.flush_all()
+        self.assertEqual(send.call_args[0][0], f'event_{self.event.id}_results')
+        self.assertEqual(send.call_args[0][1]['data']['version'], 2)
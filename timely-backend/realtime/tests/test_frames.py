@@ -0,0 +1,71 @@
+# realtime/tests/test_frames.py
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from django.test import SimpleTestCase
+
+from events.realtime_service import RealtimeBroadcastService
+from ..consumers import EventConsumer, SpectatorConsumer
+from ..frames import encode_frame, frame_for, group_message
+from ..services import RealtimeBroadcaster
+
+
+class GroupFrameTest(SimpleTestCase):
+    """Test pre-encoded group broadcast frames"""
+
+    def test_frame_matches_per_socket_encoding(self):
+        data = {'leaderboard': [{'team_name': 'Home', 'pts': 3}]}
+        message = group_message('results_update', data)
+        self.assertEqual(message['frame'], json.dumps({'type': 'results_update', 'data': data}))
+        self.assertEqual(message['data'], data)
+
+    def test_alias_handler_reencodes_under_its_own_type(self):
+        message = group_message('result_update', {'id': 1})
+        self.assertIs(frame_for(message, 'result_update'), message['frame'])
+        self.assertEqual(json.loads(frame_for(message, 'results_update'))['type'], 'results_update')
+        # Producers that do not pre-encode still work
+        self.assertEqual(frame_for({'type': 'schedule_update', 'data': {}}), encode_frame('schedule_update', {}))
+
+    async def test_consumers_forward_the_same_string(self):
+        message = group_message('results_update', {'version': 3})
+        sockets = [SpectatorConsumer() for _ in range(3)]
+        for consumer in sockets:
+            consumer.send = AsyncMock()
+            await consumer.results_update(message)
+
+        for consumer in sockets:
+            self.assertIs(consumer.send.await_args.kwargs['text_data'], message['frame'])
+
+    async def test_aliased_handler_sends_canonical_type(self):
+        consumer = EventConsumer()
+        consumer.send = AsyncMock()
+        await consumer.leaderboard_update(group_message('leaderboard_update', {'version': 1}))
+        sent = json.loads(consumer.send.await_args.kwargs['text_data'])
+        self.assertEqual(sent, {'type': 'results_update', 'data': {'version': 1}})
+
+
+class BroadcasterFrameTest(SimpleTestCase):
+    """Test that broadcasters encode frames once"""
+
+    def test_event_update_encoded_once_for_all_groups(self):
+        broadcaster = RealtimeBroadcaster()
+        broadcaster.channel_layer = MagicMock(group_send=AsyncMock())
+
+        with patch('realtime.frames.json.dumps', wraps=json.dumps) as dumps:
+            broadcaster.broadcast_event_update(5, {'name': 'Final'})
+
+        self.assertEqual(dumps.call_count, 1)
+        messages = [call.args[1] for call in broadcaster.channel_layer.group_send.await_args_list]
+        self.assertEqual(len(messages), 3)
+        self.assertTrue(all(message is messages[0] for message in messages))
+        self.assertEqual(json.loads(messages[0]['frame'])['data']['event'], {'name': 'Final'})
+
+    def test_broadcast_service_sends_frames(self):
+        service = RealtimeBroadcastService()
+        service.channel_layer = MagicMock(group_send=AsyncMock())
+
+        service._broadcast_to_group('event_5_results', 'result_update', {'id': 9})
+
+        group, message = service.channel_layer.group_send.await_args.args
+        self.assertEqual(group, 'event_5_results')
+        self.assertEqual(message['frame'], encode_frame('result_update', {'id': 9}))
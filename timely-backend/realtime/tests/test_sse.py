@@ -0,0 +1,208 @@
+# realtime/tests/test_sse.py
+import asyncio
+import json
+from datetime import timedelta
+
+from channels.layers import get_channel_layer
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from events.models import Event
+from teams.models import Team
+from results.models import LeaderboardEntry
+from ..sse import HEARTBEAT, RESULTS_TYPES, SSEHub, hub as global_hub
+
+User = get_user_model()
+
+
+def decode(frame):
+    """(id, payload) of an SSE data frame"""
+    frame_id, payload = None, None
+    for line in frame.decode().splitlines():
+        if line.startswith('id: '):
+            frame_id = line[4:]
+        elif line.startswith('data: '):
+            payload = json.loads(line[6:])
+    return frame_id, payload
+
+
+async def next_frame(stream):
+    return await asyncio.wait_for(stream.__anext__(), timeout=2)
+
+
+async def connected(stream):
+    """Skip the retry hint and return the snapshot frame"""
+    retry = await next_frame(stream)
+    assert retry.startswith(b'retry:')
+    return await next_frame(stream)
+
+
+async def snapshot():
+    return [{'type': 'snapshot'}]
+
+
+def send(event_id, group, message_type, data):
+    return get_channel_layer().group_send(f'event_{event_id}_{group}', {'type': message_type, 'data': data})
+
+
+class SSEHubTest(SimpleTestCase):
+    """Test fan-out, filtering and resume in the SSE hub"""
+
+    def setUp(self):
+        self.hub = SSEHub()
+
+    async def asyncTearDown(self):
+        await self.hub.close()
+
+    async def test_one_subscription_fans_out_to_all_clients(self):
+        first = self.hub.stream(1, snapshot)
+        second = self.hub.stream(1, snapshot)
+        self.assertEqual(decode(await connected(first))[1], {'type': 'snapshot'})
+        await connected(second)
+        self.assertEqual(len(self.hub.feeds), 1)
+
+        await send(1, 'results', 'results_update', {'version': 1})
+        frame = await next_frame(first)
+        # Every client gets the very same pre-encoded bytes
+        self.assertIs(await next_frame(second), frame)
+        frame_id, payload = decode(frame)
+        self.assertEqual(payload, {'type': 'results_update', 'data': {'version': 1}})
+        self.assertTrue(frame_id.endswith('-1'))
+
+        await first.aclose()
+        await second.aclose()
+
+    async def test_resume_replays_missed_frames(self):
+        stream = self.hub.stream(1, snapshot)
+        await connected(stream)
+        for version in range(1, 4):
+            await send(1, 'schedule', 'schedule_update', {'version': version})
+        frame_ids = [decode(await next_frame(stream))[0] for _ in range(3)]
+        await stream.aclose()
+
+        resumed = self.hub.stream(1, snapshot, last_event_id=frame_ids[0])
+        retry = await next_frame(resumed)
+        self.assertTrue(retry.startswith(b'retry:'))
+        replayed = [decode(await next_frame(resumed)) for _ in range(2)]
+        self.assertEqual([frame_id for frame_id, _ in replayed], frame_ids[1:])
+        self.assertEqual(self.hub.stats['resumed'], 1)
+
+        await send(1, 'schedule', 'schedule_update', {'version': 4})
+        self.assertEqual(decode(await next_frame(resumed))[1]['data'], {'version': 4})
+        await resumed.aclose()
+
+    @override_settings(REALTIME_CONFIG={'SSE_REPLAY_BUFFER': 2})
+    async def test_unknown_or_expired_id_gets_snapshot(self):
+        stream = self.hub.stream(1, snapshot)
+        await connected(stream)
+        for version in range(1, 5):
+            await send(1, 'schedule', 'schedule_update', {'version': version})
+        first_id = decode(await next_frame(stream))[0]
+        await stream.aclose()
+
+        for last_event_id in ('someotherepoch-1', first_id):
+            resumed = self.hub.stream(1, snapshot, last_event_id=last_event_id)
+            self.assertEqual(decode(await connected(resumed))[1], {'type': 'snapshot'})
+            await resumed.aclose()
+
+    async def test_results_stream_filters_types(self):
+        stream = self.hub.stream(1, snapshot, types=RESULTS_TYPES)
+        await connected(stream)
+
+        await send(1, 'schedule', 'schedule_update', {})
+        await send(1, 'results', 'results_update', {'version': 1})
+        await send(1, 'results', 'result_update', {'result': {'result_id': 3}})
+        await send(1, 'results', 'leaderboard_update', {'leaderboard': []})
+        self.assertEqual(
+            [decode(await next_frame(stream))[1]['type'] for _ in range(3)],
+            ['results_update', 'result_update', 'leaderboard_update']
+        )
+        await stream.aclose()
+
+    async def test_event_update_sent_to_every_group_is_published_once(self):
+        stream = self.hub.stream(1, snapshot)
+        await connected(stream)
+
+        data = {'event_id': 1, 'timestamp': 'now'}
+        for group in ('results', 'schedule', 'announcements'):
+            await send(1, group, 'event_update', data)
+        await send(1, 'results', 'results_update', {'version': 2})
+
+        self.assertEqual(decode(await next_frame(stream))[1]['type'], 'event_update')
+        self.assertEqual(decode(await next_frame(stream))[1]['type'], 'results_update')
+        await stream.aclose()
+
+    @override_settings(REALTIME_CONFIG={'SSE_CLIENT_QUEUE': 2})
+    async def test_slow_client_is_dropped(self):
+        stream = self.hub.stream(1, snapshot)
+        await connected(stream)
+        feed = self.hub.feeds[1]
+
+        for version in range(3):
+            feed.publish({'type': 'results_update', 'data': {'version': version}})
+        self.assertEqual(feed.subscribers, set())
+        with self.assertRaises(StopAsyncIteration):
+            await next_frame(stream)
+
+    @override_settings(REALTIME_CONFIG={'SSE_HEARTBEAT_INTERVAL': 0.01})
+    async def test_heartbeat_when_idle(self):
+        stream = self.hub.stream(1, snapshot)
+        await connected(stream)
+        self.assertEqual(await next_frame(stream), HEARTBEAT)
+        await stream.aclose()
+
+    @override_settings(REALTIME_CONFIG={'SSE_IDLE_TIMEOUT': 0})
+    async def test_feed_stops_after_last_client(self):
+        stream = self.hub.stream(1, snapshot)
+        await connected(stream)
+        await stream.aclose()
+        await asyncio.sleep(0.05)
+        self.assertEqual(self.hub.feeds, {})
+
+
+class EventSSEViewTest(TestCase):
+    """Test the async event SSE endpoints"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(email='organizer@test.com', password='testpass123')
+        start = timezone.now() + timedelta(days=1)
+        self.event = Event.objects.create(
+            name='Final',
+            sport='Football',
+            start_datetime=start,
+            end_datetime=start + timedelta(days=1),
+            created_by=self.user,
+        )
+        team = Team.objects.create(name='Home', manager=self.user, event=self.event)
+        LeaderboardEntry.objects.create(event=self.event, team=team, points=3, position=1)
+
+    async def asyncTearDown(self):
+        await global_hub.close()
+
+    async def test_results_stream_starts_with_leaderboard(self):
+        response = await self.async_client.get(f'/api/events/{self.event.id}/results/stream/',
+                                               HTTP_ACCEPT='text/event-stream')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+
+        stream = response.streaming_content
+        _, payload = decode(await connected(stream))
+        self.assertEqual(payload['type'], 'leaderboard_update')
+        self.assertEqual(payload['data'][0]['team_name'], 'Home')
+
+        await send(self.event.id, 'results', 'results_update', {'version': 7})
+        self.assertEqual(decode(await next_frame(stream))[1]['data'], {'version': 7})
+        await stream.aclose()
+
+    async def test_event_stream_snapshot(self):
+        response = await self.async_client.get(f'/api/events/{self.event.id}/stream/')
+        stream = response.streaming_content
+        _, payload = decode(await connected(stream))
+        self.assertEqual(payload['type'], 'connected')
+        self.assertEqual(payload['event_name'], 'Final')
+        await stream.aclose()
+
+    async def test_unknown_event_404(self):
+        response = await self.async_client.get('/api/events/999999/stream/')
+        self.assertEqual(response.status_code, 404)
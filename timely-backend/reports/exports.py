@@ -0,0 +1,277 @@
+# reports/exports.py
+"""
+Streaming CSV export engine shared by the report CSV endpoints.
+
+An export is a queryset plus a list of columns. Rows are read with
+values_list() through QuerySet.iterator(chunk_size=...), which uses a
+server-side cursor on PostgreSQL, so only the needed columns are fetched and
+no model instances are built. Rows are rendered straight into CSV text and
+yielded in buffered blocks, optionally gzip-compressed, so memory stays flat
+however many rows are exported.
+"""
+import csv
+import zlib
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from django.db.models import Count, OuterRef, Subquery
+from django.http import StreamingHttpResponse
+
+DEFAULT_CHUNK_SIZE = 2000
+FLUSH_BYTES = 64 * 1024
+
+
+@dataclass(frozen=True)
+class Column:
+    """One CSV column: the values it reads and how they become a cell"""
+    header: str
+    fields: Tuple[str, ...]
+    render: Optional[Callable[..., Any]] = None
+
+    def value(self, values: Sequence[Any]) -> Any:
+        if self.render is not None:
+            return self.render(*values)
+        value = values[0]
+        return '' if value is None else value
+
+
+def col(header: str, *fields: str, render: Optional[Callable[..., Any]] = None) -> Column:
+    return Column(header, fields, render)
+
+
+def fmt_datetime(value: Optional[datetime]) -> str:
+    return value.strftime('%Y-%m-%d %H:%M:%S') if value else ''
+
+
+def choice_label(model, field_name: str) -> Callable[[Any], str]:
+    """Render a choice value as its display label, like get_FOO_display()"""
+    labels = {key: str(label) for key, label in model._meta.get_field(field_name).flatchoices}
+    return lambda value: labels.get(value, value if value is not None else '')
+
+
+def first_of(*values: Any) -> Any:
+    return next((value for value in values if value not in (None, '')), '')
+
+
+class _Echo:
+    """File-like object whose write() hands the line back to the caller"""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+class StreamingCSVExport:
+    """Render a queryset as CSV without loading it into memory"""
+
+    def __init__(self, queryset, columns: List[Column], chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self.queryset = queryset
+        self.columns = columns
+        self.chunk_size = chunk_size
+
+        # Each distinct field path is selected once; columns index into the row
+        self.fields: List[str] = []
+        positions: Dict[str, int] = {}
+        for column in columns:
+            for field in column.fields:
+                if field not in positions:
+                    positions[field] = len(self.fields)
+                    self.fields.append(field)
+        self._plan = [(column, tuple(positions[field] for field in column.fields)) for column in columns]
+
+    def header(self) -> List[str]:
+        return [column.header for column in self.columns]
+
+    def rows(self) -> Iterator[List[Any]]:
+        """Rendered rows, read in chunks through a server-side cursor"""
+        plan = self._plan
+        for row in self.queryset.values_list(*self.fields).iterator(chunk_size=self.chunk_size):
+            yield [column.value([row[i] for i in indexes]) for column, indexes in plan]
+
+    def iter_text(self, flush_bytes: int = FLUSH_BYTES) -> Iterator[str]:
+        """CSV text in blocks of roughly flush_bytes"""
+        writer = csv.writer(_Echo())
+        buffer = [writer.writerow(self.header())]
+        size = len(buffer[0])
+        for row in self.rows():
+            line = writer.writerow(row)
+            buffer.append(line)
+            size += len(line)
+            if size >= flush_bytes:
+                yield ''.join(buffer)
+                buffer, size = [], 0
+        if buffer:
+            yield ''.join(buffer)
+
+    def iter_bytes(self, compress: bool = False) -> Iterator[bytes]:
+        """UTF-8 encoded CSV, gzip-compressed when compress is set"""
+        if not compress:
+            for block in self.iter_text():
+                yield block.encode('utf-8')
+            return
+
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)  # gzip container
+        for block in self.iter_text():
+            data = compressor.compress(block.encode('utf-8'))
+            if data:
+                yield data
+        yield compressor.flush()
+
+    def response(self, filename: str, compress: bool = False) -> StreamingHttpResponse:
+        if compress:
+            response = StreamingHttpResponse(self.iter_bytes(compress=True), content_type='application/gzip')
+            filename = f'{filename}.gz'
+        else:
+            response = StreamingHttpResponse(self.iter_bytes(), content_type='text/csv; charset=utf-8')
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        response['Cache-Control'] = 'no-cache'
+        return response
+
+
+# ---------------------------------------------------------------------------
+# Report exports. filters may hold: event (Event), date_from, date_to (date),
+# status (str).
+# ---------------------------------------------------------------------------
+
+def _full_name(first_name, last_name):
+    return f'{first_name or ""} {last_name or ""}'.strip()
+
+
+def registrations_export(filters: Dict[str, Any]) -> StreamingCSVExport:
+    from registrations.models import Registration
+
+    queryset = Registration.objects.order_by('-submitted_at')
+    if filters.get('event'):
+        queryset = queryset.filter(event=filters['event'])
+    if filters.get('date_from'):
+        queryset = queryset.filter(submitted_at__date__gte=filters['date_from'])
+    if filters.get('date_to'):
+        queryset = queryset.filter(submitted_at__date__lte=filters['date_to'])
+    if filters.get('status'):
+        queryset = queryset.filter(status=filters['status'])
+
+    # applicant_user / applicant_team supersede the legacy applicant / team fields
+    return StreamingCSVExport(queryset, [
+        col('ID', 'id'),
+        col('Event', 'event__name'),
+        col('Applicant Name', 'applicant_user__first_name', 'applicant_user__last_name',
+            'applicant__first_name', 'applicant__last_name',
+            render=lambda f1, l1, f2, l2: _full_name(f1, l1) or _full_name(f2, l2)),
+        col('Applicant Email', 'applicant_user__email', 'applicant__email', render=first_of),
+        col('Team', 'applicant_team__name', 'team__name', render=first_of),
+        col('Type', 'type', render=choice_label(Registration, 'type')),
+        col('Status', 'status', render=choice_label(Registration, 'status')),
+        col('Submitted At', 'submitted_at', render=fmt_datetime),
+        col('Decided At', 'decided_at', render=fmt_datetime),
+        col('Decided By', 'decided_by__email'),
+        col('Reason', 'reason'),
+    ])
+
+
+def fixtures_export(filters: Dict[str, Any]) -> StreamingCSVExport:
+    from fixtures.models import Fixture
+
+    queryset = Fixture.objects.order_by('start_at', 'id')
+    if filters.get('event'):
+        queryset = queryset.filter(event=filters['event'])
+    if filters.get('date_from'):
+        queryset = queryset.filter(start_at__date__gte=filters['date_from'])
+    if filters.get('date_to'):
+        queryset = queryset.filter(start_at__date__lte=filters['date_to'])
+    if filters.get('status'):
+        queryset = queryset.filter(status=filters['status'])
+
+    return StreamingCSVExport(queryset, [
+        col('ID', 'id'),
+        col('Event', 'event__name'),
+        col('Round', 'round'),
+        col('Phase', 'phase', render=choice_label(Fixture, 'phase')),
+        col('Home Team', 'home__name'),
+        col('Away Team', 'away__name'),
+        col('Venue', 'venue__name'),
+        col('Start Time', 'start_at', render=fmt_datetime),
+        col('Status', 'status', render=choice_label(Fixture, 'status')),
+        col('Created At', 'created_at', render=fmt_datetime),
+    ])
+
+
+def results_export(filters: Dict[str, Any]) -> StreamingCSVExport:
+    from results.models import Result
+
+    queryset = Result.objects.order_by('-created_at', '-id')
+    if filters.get('event'):
+        queryset = queryset.filter(fixture__event=filters['event'])
+    if filters.get('date_from'):
+        queryset = queryset.filter(created_at__date__gte=filters['date_from'])
+    if filters.get('date_to'):
+        queryset = queryset.filter(created_at__date__lte=filters['date_to'])
+    if filters.get('status'):
+        queryset = queryset.filter(status=filters['status'])
+
+    return StreamingCSVExport(queryset, [
+        col('ID', 'id'),
+        col('Event', 'fixture__event__name'),
+        col('Fixture', 'fixture__home__name', 'fixture__away__name',
+            render=lambda home, away: f'{home or "TBD"} vs {away or "TBD"}'),
+        col('Home Team', 'fixture__home__name'),
+        col('Away Team', 'fixture__away__name'),
+        col('Home Score', 'score_home'),
+        col('Away Score', 'score_away'),
+        col('Winner', 'winner__name', render=lambda name: name or 'Draw'),
+        col('Finalized At', 'verified_at', render=fmt_datetime),
+        col('Created At', 'created_at', render=fmt_datetime),
+    ])
+
+
+def ticket_sales_export(filters: Dict[str, Any]) -> StreamingCSVExport:
+    from events.models import Event
+    from fixtures.models import Fixture
+    from tickets.models import TicketOrder
+
+    # event_id / fixture_id are plain integers, so names come from subqueries
+    fixtures = Fixture.objects.filter(id=OuterRef('fixture_id'))
+    queryset = TicketOrder.objects.annotate(
+        event_name=Subquery(Event.objects.filter(id=OuterRef('event_id')).values('name')[:1]),
+        fixture_round=Subquery(fixtures.values('round')[:1]),
+        fixture_home=Subquery(fixtures.values('home__name')[:1]),
+        fixture_away=Subquery(fixtures.values('away__name')[:1]),
+        tickets_count=Count('tickets'),
+    ).order_by('-created_at', '-id')
+    if filters.get('event'):
+        queryset = queryset.filter(event_id=filters['event'].id)
+    if filters.get('date_from'):
+        queryset = queryset.filter(created_at__date__gte=filters['date_from'])
+    if filters.get('date_to'):
+        queryset = queryset.filter(created_at__date__lte=filters['date_to'])
+    if filters.get('status'):
+        queryset = queryset.filter(status=filters['status'])
+
+    def fixture_label(fixture_id, round_no, home, away):
+        if not fixture_id:
+            return ''
+        if round_no is None:
+            return f'Fixture {fixture_id}'
+        return f'R{round_no}: {home or "TBD"} vs {away or "TBD"}'
+
+    return StreamingCSVExport(queryset, [
+        col('Order ID', 'id'),
+        col('User Name', 'user__first_name', 'user__last_name', render=_full_name),
+        col('User Email', 'user__email'),
+        col('Event', 'event_id', 'event_name', render=lambda event_id, name: name or f'Event {event_id}'),
+        col('Fixture', 'fixture_id', 'fixture_round', 'fixture_home', 'fixture_away', render=fixture_label),
+        col('Total Amount', 'total_cents', render=lambda cents: f'{cents / 100:.2f}'),
+        col('Currency', 'currency'),
+        col('Status', 'status', render=choice_label(TicketOrder, 'status')),
+        col('Created At', 'created_at', render=fmt_datetime),
+        col('Tickets Count', 'tickets_count'),
+        col('Payment Method', 'payment_provider'),
+        col('Stripe Payment Intent ID', 'provider_payment_intent_id'),
+    ])
+
+
+REPORT_EXPORTS = {
+    'registrations': registrations_export,
+    'fixtures': fixtures_export,
+    'results': results_export,
+    'ticket_sales': ticket_sales_export,
+}
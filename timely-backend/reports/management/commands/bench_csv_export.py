@@ -0,0 +1,107 @@
+import csv
+import io
+import time
+import tracemalloc
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from datetime import timedelta
+
+from events.models import Event
+from registrations.models import Registration
+from reports.exports import registrations_export
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Benchmark CSV export: legacy instance-based chunks vs the streaming export engine'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=str, default='10000,50000', help='Comma-separated registration counts')
+        parser.add_argument('--applicants', type=int, default=500, help='Distinct applicant users')
+
+    def handle(self, *args, **options):
+        sizes = sorted(int(size) for size in options['rows'].split(',') if size.strip())
+
+        # Everything runs inside a transaction that is rolled back at the end
+        with transaction.atomic():
+            event, users = self._setup(options['applicants'])
+            created = 0
+            for size in sizes:
+                created += self._add_registrations(event, users, size - created)
+                self.stdout.write(f'--- {size} registrations')
+                self._measure('legacy chunks (instances)', size, lambda: self._legacy(event))
+                export = registrations_export({'event': event})
+                self._measure('engine', size, lambda: export.iter_bytes())
+                self._measure('engine + gzip', size, lambda: export.iter_bytes(compress=True))
+            transaction.set_rollback(True)
+
+    def _setup(self, applicant_count):
+        stamp = time.time_ns()
+        owner = User.objects.create_user(email=f'bench-{stamp}@timely.local', password='bench-password')
+        start = timezone.now() + timedelta(days=30)
+        event = Event.objects.create(
+            name='Export benchmark', sport='Football',
+            start_datetime=start, end_datetime=start + timedelta(days=2), created_by=owner,
+        )
+        users = User.objects.bulk_create([
+            User(email=f'bench-{stamp}-{i}@timely.local', first_name='Bench', last_name=f'User {i}')
+            for i in range(applicant_count)
+        ])
+        return event, users
+
+    @staticmethod
+    def _add_registrations(event, users, count):
+        if count <= 0:
+            return 0
+        Registration.objects.bulk_create(
+            [
+                Registration(event=event, applicant_user=users[i % len(users)],
+                             type=Registration.Type.ATHLETE, status=Registration.Status.APPROVED)
+                for i in range(count)
+            ],
+            batch_size=2000,
+        )
+        return count
+
+    @staticmethod
+    def _legacy(event):
+        """The previous generator: count, then slice chunks of full instances"""
+        output = io.StringIO()
+        writer = csv.writer(output)
+        queryset = Registration.objects.select_related(
+            'event', 'applicant_user', 'decided_by'
+        ).filter(event=event).order_by('-submitted_at')
+        for i in range(0, queryset.count(), 1000):
+            for reg in queryset[i:i + 1000]:
+                writer.writerow([
+                    reg.id, reg.event.name,
+                    reg.applicant_user.full_name if reg.applicant_user else '',
+                    reg.applicant_user.email if reg.applicant_user else '',
+                    reg.get_type_display(), reg.get_status_display(),
+                    reg.submitted_at.strftime('%Y-%m-%d %H:%M:%S') if reg.submitted_at else '',
+                    reg.decided_by.email if reg.decided_by else '', reg.reason or '',
+                ])
+            yield output.getvalue().encode('utf-8')
+            output.seek(0)
+            output.truncate(0)
+
+    def _measure(self, label, rows, make_stream):
+        started = time.perf_counter()
+        total_bytes = sum(len(block) for block in make_stream())
+        elapsed = time.perf_counter() - started
+
+        # Second pass under tracemalloc, which would skew the timing
+        tracemalloc.start()
+        for _ in make_stream():
+            pass
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        self.stdout.write(
+            f'{label:28s} {elapsed * 1000:9.1f} ms {rows / elapsed:10.0f} rows/s '
+            f'{total_bytes / 1024:9.0f} KiB out, peak {peak / 1024 / 1024:6.2f} MiB'
+        )
@@ -0,0 +1,128 @@
+# reports/tests/test_exports.py
+import csv
+import gzip
+import io
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from events.models import Event
+from fixtures.models import Fixture
+from registrations.models import Registration
+from results.models import Result
+from teams.models import Team
+from tickets.models import TicketOrder
+from tickets.services.issuance import issue_tickets
+from venues.models import Venue
+from reports.exports import (
+    StreamingCSVExport, col, fixtures_export, registrations_export, results_export, ticket_sales_export,
+)
+from reports.views_csv import stream_registrations_csv
+
+User = get_user_model()
+
+
+def read_csv(export):
+    return list(csv.reader(io.StringIO(''.join(export.iter_text()))))
+
+
+class StreamingCSVExportTest(TestCase):
+    """Test the streaming CSV export engine and report exports"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='fan@test.com', password='testpass123', first_name='Sam', last_name='Lee',
+        )
+        start = timezone.now() + timedelta(days=2)
+        self.event = Event.objects.create(
+            name='Cup',
+            sport='Football',
+            start_datetime=start,
+            end_datetime=start + timedelta(days=5),
+            created_by=self.user,
+        )
+        venue = Venue.objects.create(name='Main Ground', address='1 Park Rd', created_by=self.user)
+        self.home = Team.objects.create(name='Home', manager=self.user, event=self.event)
+        self.away = Team.objects.create(name='Away', manager=self.user, event=self.event)
+        self.fixture = Fixture.objects.create(
+            event=self.event, home=self.home, away=self.away, venue=venue, start_at=start,
+        )
+
+    def test_reads_only_needed_columns_in_one_query(self):
+        Registration.objects.bulk_create([
+            Registration(event=self.event, applicant_user=self.user, type=Registration.Type.ATHLETE,
+                         status=Registration.Status.APPROVED)
+            for _ in range(25)
+        ])
+        export = registrations_export({'event': self.event})
+        export.chunk_size = 10
+
+        with self.assertNumQueries(1):
+            rows = read_csv(export)
+
+        self.assertEqual(rows[0][:4], ['ID', 'Event', 'Applicant Name', 'Applicant Email'])
+        self.assertEqual(len(rows), 26)
+        self.assertEqual(rows[1][1:7], ['Cup', 'Sam Lee', 'fan@test.com', '', 'Athlete', 'Approved'])
+
+    def test_blocks_are_buffered(self):
+        export = StreamingCSVExport(Fixture.objects.all(), [col('ID', 'id'), col('Event', 'event__name')])
+        blocks = list(export.iter_text())
+        # Header and the single row share one block
+        self.assertEqual(blocks, [f'ID,Event\r\n{self.fixture.id},Cup\r\n'])
+
+    def test_fixture_and_result_columns(self):
+        Result.objects.create(fixture=self.fixture, score_home=3, score_away=1, winner=self.home)
+
+        fixture_rows = read_csv(fixtures_export({'event': self.event}))
+        self.assertEqual(fixture_rows[1][2:9], [
+            '1', 'Round Robin', 'Home', 'Away', 'Main Ground',
+            self.fixture.start_at.strftime('%Y-%m-%d %H:%M:%S'), 'Scheduled',
+        ])
+
+        result_rows = read_csv(results_export({}))
+        self.assertEqual(result_rows[1][1:8], ['Cup', 'Home vs Away', 'Home', 'Away', '3', '1', 'Home'])
+
+    def test_ticket_sales_without_per_row_queries(self):
+        for _ in range(3):
+            order = TicketOrder.objects.create(
+                user=self.user, event_id=self.event.id, fixture_id=self.fixture.id, total_cents=2500,
+            )
+            issue_tickets(order, [(None, 2)])
+        TicketOrder.objects.create(user=self.user, event_id=999999, total_cents=0)
+
+        with self.assertNumQueries(1):
+            rows = read_csv(ticket_sales_export({}))
+
+        self.assertEqual(len(rows), 5)
+        by_event = {row[3]: row for row in rows[1:]}
+        self.assertEqual(by_event['Cup'][4], 'R1: Home vs Away')
+        self.assertEqual(by_event['Cup'][5], '25.00')
+        self.assertEqual(by_event['Cup'][9], '2')
+        self.assertEqual(by_event['Event 999999'][4], '')
+
+    def test_gzip_stream(self):
+        export = fixtures_export({})
+        plain = b''.join(export.iter_bytes())
+        compressed = b''.join(export.iter_bytes(compress=True))
+        self.assertEqual(gzip.decompress(compressed), plain)
+
+    def test_view_streams_gzip_download(self):
+        admin = User.objects.create_superuser(email='admin@test.com', password='testpass123')
+        request = APIRequestFactory().get('/reports/registrations.csv', {'compress': 'gzip'})
+        force_authenticate(request, user=admin)
+
+        response = stream_registrations_csv(request)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/gzip')
+        self.assertIn('.csv.gz', response['Content-Disposition'])
+        header = gzip.decompress(b''.join(response.streaming_content)).decode().splitlines()[0]
+        self.assertTrue(header.startswith('ID,Event,Applicant Name'))
+
+    def test_view_rejects_bad_dates(self):
+        admin = User.objects.create_superuser(email='admin@test.com', password='testpass123')
+        request = APIRequestFactory().get('/reports/registrations.csv', {'date_from': '01/02/2030'})
+        force_authenticate(request, user=admin)
+        self.assertEqual(stream_registrations_csv(request).status_code, 400)
@@ -4,9 +4,10 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from django.shortcuts import get_object_or_404
 from django.http import JsonResponse, HttpResponse
-import csv
+from datetime import datetime
 import io
 
+from .exports import REPORT_EXPORTS
 from .pdf import generate_pdf_report, get_report_data
 from events.models import Event
 
@@ -262,6 +263,7 @@ def export_csv(request, report_type):
     - event: event ID to filter by
     - date_from: start date (YYYY-MM-DD)
     - date_to: end date (YYYY-MM-DD)
+    - compress: "gzip" to download a .csv.gz
     """
     # Check permissions (admin or organizer)
     if not (request.user.is_staff or request.user.is_superuser):
@@ -291,157 +293,17 @@ def export_csv(request, report_type):
                 status=status.HTTP_404_NOT_FOUND
             )
     
-    # Create CSV response
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = f'attachment; filename="{report_type}_report.csv"'
-    
-    # Generate CSV data based on report type
-    if report_type == 'registrations':
-        _generate_registrations_csv(response, filters)
-    elif report_type == 'fixtures':
-        _generate_fixtures_csv(response, filters)
-    elif report_type == 'results':
-        _generate_results_csv(response, filters)
-    elif report_type == 'ticket_sales':
-        _generate_ticket_sales_csv(response, filters)
-    
-    return response
-
-
-def _generate_registrations_csv(response, filters):
-    """Generate registrations CSV"""
-    from registrations.models import Registration
-    from django.db.models import Q
-    
-    queryset = Registration.objects.select_related('event', 'applicant', 'team')
-    
-    if filters.get('event'):
-        queryset = queryset.filter(event=filters['event'])
-    
-    writer = csv.writer(response)
-    writer.writerow([
-        'ID', 'Event', 'Applicant', 'Team', 'Type', 'Status', 
-        'Submitted At', 'Decided At', 'Decided By', 'Reason'
-    ])
-    
-    for reg in queryset:
-        writer.writerow([
-            reg.id,
-            reg.event.name,
-            reg.applicant.email if reg.applicant else '',
-            reg.team.name if reg.team else '',
-            reg.get_type_display(),
-            reg.get_status_display(),
-            reg.submitted_at.strftime('%Y-%m-%d %H:%M:%S'),
-            reg.decided_at.strftime('%Y-%m-%d %H:%M:%S') if reg.decided_at else '',
-            reg.decided_by.email if reg.decided_by else '',
-            reg.reason
-        ])
-
-
-def _generate_fixtures_csv(response, filters):
-    """Generate fixtures CSV"""
-    from fixtures.models import Fixture
-    
-    queryset = Fixture.objects.select_related('event', 'home', 'away', 'venue')
-    
-    if filters.get('event'):
-        queryset = queryset.filter(event=filters['event'])
-    
-    writer = csv.writer(response)
-    writer.writerow([
-        'ID', 'Event', 'Round', 'Phase', 'Home Team', 'Away Team', 
-        'Venue', 'Start Time', 'Status'
-    ])
-    
-    for fixture in queryset:
-        writer.writerow([
-            fixture.id,
-            fixture.event.name,
-            fixture.round,
-            fixture.get_phase_display(),
-            fixture.home.name if fixture.home else '',
-            fixture.away.name if fixture.away else '',
-            fixture.venue.name if fixture.venue else '',
-            fixture.start_at.strftime('%Y-%m-%d %H:%M:%S'),
-            fixture.get_status_display()
-        ])
-
-
-def _generate_results_csv(response, filters):
-    """Generate results CSV"""
-    from results.models import Result
-    
-    queryset = Result.objects.select_related('fixture', 'fixture__event', 'fixture__home', 'fixture__away', 'winner')
-    
-    if filters.get('event'):
-        queryset = queryset.filter(fixture__event=filters['event'])
-    
-    writer = csv.writer(response)
-    writer.writerow([
-        'ID', 'Event', 'Fixture', 'Home Team', 'Away Team', 
-        'Home Score', 'Away Score', 'Winner', 'Finalized At'
-    ])
-    
-    for result in queryset:
-        writer.writerow([
-            result.id,
-            result.fixture.event.name,
-            f"{result.fixture.home.name if result.fixture.home else 'TBD'} vs {result.fixture.away.name if result.fixture.away else 'TBD'}",
-            result.fixture.home.name if result.fixture.home else '',
-            result.fixture.away.name if result.fixture.away else '',
-            result.score_home,
-            result.score_away,
-            result.winner.name if result.winner else 'Draw',
-            result.verified_at.strftime('%Y-%m-%d %H:%M:%S') if result.verified_at else ''
-        ])
-
-
-def _generate_ticket_sales_csv(response, filters):
-    """Generate ticket sales CSV"""
-    from tickets.models import TicketOrder, Ticket
-    
-    queryset = TicketOrder.objects.select_related('user')
-    
-    if filters.get('event'):
-        queryset = queryset.filter(event_id=filters['event'].id)
-    
-    writer = csv.writer(response)
-    writer.writerow([
-        'Order ID', 'User', 'Event', 'Fixture', 'Total Amount', 
-        'Currency', 'Status', 'Created At', 'Tickets Count'
-    ])
-    
-    for order in queryset:
-        ticket_count = order.tickets.count()
-        # Get event name if possible
-        event_name = ''
-        if order.event_id:
-            try:
-                from events.models import Event
-                event = Event.objects.get(id=order.event_id)
-                event_name = event.name
-            except Event.DoesNotExist:
-                event_name = f'Event {order.event_id}'
-        
-        # Get fixture info if possible
-        fixture_info = ''
-        if order.fixture_id:
+    for param in ('date_from', 'date_to'):
+        value = request.query_params.get(param)
+        if value:
             try:
-                from fixtures.models import Fixture
-                fixture = Fixture.objects.get(id=order.fixture_id)
-                fixture_info = str(fixture)
-            except Fixture.DoesNotExist:
-                fixture_info = f'Fixture {order.fixture_id}'
-        
-        writer.writerow([
-            order.id,
-            order.user.email,
-            event_name,
-            fixture_info,
-            f"{order.total_cents / 100:.2f}",
-            order.currency,
-            order.get_status_display(),
-            order.created_at.strftime('%Y-%m-%d %H:%M:%S'),
-            ticket_count
-        ])
\ No newline at end of file
+                filters[param] = datetime.strptime(value, '%Y-%m-%d').date()
+            except ValueError:
+                return Response(
+                    {'error': f'Invalid {param} format. Use YYYY-MM-DD'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+    
+    # Stream the CSV through the shared export engine
+    export = REPORT_EXPORTS[report_type](filters)
+    return export.response(f'{report_type}_report.csv', compress=request.query_params.get('compress') == 'gzip')
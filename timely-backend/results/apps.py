@@ -8,4 +8,19 @@ class ResultsConfig(AppConfig):
     def ready(self):
         """Import signals when app is ready"""
         # from . import signals  # noqa  # Temporarily commented out for migration
-        pass
\ No newline at end of file
+        from common.cache import invalidate_on_change
+        from .models import Result, LeaderboardEntry
+
+        invalidate_on_change(Result, ('results', 'leaderboard'), scope=_result_event_id)
+        invalidate_on_change(LeaderboardEntry, ('leaderboard',), scope=lambda entry: entry.event_id)
+
+        from .services.snapshot import connect_snapshot_signals
+        connect_snapshot_signals()
+
+
+def _result_event_id(result):
+    from fixtures.models import Fixture
+    try:
+        return result.fixture.event_id
+    except Fixture.DoesNotExist:
+        return None
\ No newline at end of file
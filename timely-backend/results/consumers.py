@@ -7,11 +7,12 @@ from django.core.serializers.json import DjangoJSONEncoder
 
 from .models import Result, LeaderboardEntry
 from .serializers import ResultSerializer, LeaderboardEntrySerializer
+from realtime.frames import FrameForwardingMixin, group_message
 
 User = get_user_model()
 
 
-class ResultsConsumer(AsyncWebsocketConsumer):
+class ResultsConsumer(FrameForwardingMixin, AsyncWebsocketConsumer):
     """WebSocket consumer for real-time results updates"""
     
     async def connect(self):
@@ -103,41 +104,26 @@ class ResultsConsumer(AsyncWebsocketConsumer):
     # Group message handlers
     async def result_created(self, event):
         """Handle result created message"""
-        await self.send(text_data=json.dumps({
-            'type': 'result_created',
-            'data': event['data']
-        }))
+        await self.send_frame(event, 'result_created')
     
     async def result_updated(self, event):
         """Handle result updated message"""
-        await self.send(text_data=json.dumps({
-            'type': 'result_updated',
-            'data': event['data']
-        }))
+        await self.send_frame(event, 'result_updated')
     
     async def result_published(self, event):
         """Handle result published message"""
-        await self.send(text_data=json.dumps({
-            'type': 'result_published',
-            'data': event['data']
-        }))
+        await self.send_frame(event, 'result_published')
     
     async def leaderboard_updated(self, event):
         """Handle leaderboard updated message"""
-        await self.send(text_data=json.dumps({
-            'type': 'leaderboard_updated',
-            'data': event['data']
-        }))
+        await self.send_frame(event, 'leaderboard_updated')
     
     async def standings_recomputed(self, event):
         """Handle standings recomputed message"""
-        await self.send(text_data=json.dumps({
-            'type': 'standings_recomputed',
-            'data': event['data']
-        }))
+        await self.send_frame(event, 'standings_recomputed')
 
 
-class GlobalResultsConsumer(AsyncWebsocketConsumer):
+class GlobalResultsConsumer(FrameForwardingMixin, AsyncWebsocketConsumer):
     """WebSocket consumer for global results updates (admin)"""
     
     async def connect(self):
@@ -182,82 +168,46 @@ class GlobalResultsConsumer(AsyncWebsocketConsumer):
     # Group message handlers
     async def result_created(self, event):
         """Handle result created message"""
-        await self.send(text_data=json.dumps({
-            'type': 'result_created',
-            'data': event['data']
-        }))
+        await self.send_frame(event, 'result_created')
     
     async def result_updated(self, event):
         """Handle result updated message"""
-        await self.send(text_data=json.dumps({
-            'type': 'result_updated',
-            'data': event['data']
-        }))
+        await self.send_frame(event, 'result_updated')
     
     async def result_published(self, event):
         """Handle result published message"""
-        await self.send(text_data=json.dumps({
-            'type': 'result_published',
-            'data': event['data']
-        }))
+        await self.send_frame(event, 'result_published')
     
     async def leaderboard_updated(self, event):
         """Handle leaderboard updated message"""
-        await self.send(text_data=json.dumps({
-            'type': 'leaderboard_updated',
-            'data': event['data']
-        }))
+        await self.send_frame(event, 'leaderboard_updated')
 
 
 # Utility functions for sending WebSocket messages
 async def send_result_update(channel_layer, event_id, result, update_type):
     """Send result update to event group"""
     serializer = ResultSerializer(result)
+    message = group_message(f'result_{update_type}', serializer.data)
     
-    await channel_layer.group_send(
-        f'results_event_{event_id}',
-        {
-            'type': f'result_{update_type}',
-            'data': serializer.data
-        }
-    )
+    await channel_layer.group_send(f'results_event_{event_id}', message)
     
     # Also send to global group for admin updates
-    await channel_layer.group_send(
-        'results_global',
-        {
-            'type': f'result_{update_type}',
-            'data': serializer.data
-        }
-    )
+    await channel_layer.group_send('results_global', message)
 
 
 async def send_leaderboard_update(channel_layer, event_id, leaderboard_data):
     """Send leaderboard update to event group"""
-    await channel_layer.group_send(
-        f'results_event_{event_id}',
-        {
-            'type': 'leaderboard_updated',
-            'data': leaderboard_data
-        }
-    )
+    message = group_message('leaderboard_updated', leaderboard_data)
+    
+    await channel_layer.group_send(f'results_event_{event_id}', message)
     
     # Also send to global group for admin updates
-    await channel_layer.group_send(
-        'results_global',
-        {
-            'type': 'leaderboard_updated',
-            'data': leaderboard_data
-        }
-    )
+    await channel_layer.group_send('results_global', message)
 
 
 async def send_standings_recomputed(channel_layer, event_id, leaderboard_data):
     """Send standings recomputed message to event group"""
     await channel_layer.group_send(
         f'results_event_{event_id}',
-        {
-            'type': 'standings_recomputed',
-            'data': leaderboard_data
-        }
+        group_message('standings_recomputed', leaderboard_data)
     )
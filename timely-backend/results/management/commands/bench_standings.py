@@ -0,0 +1,97 @@
+import random
+import time
+from itertools import combinations
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, reset_queries, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from datetime import timedelta
+
+from events.models import Event
+from teams.models import Team
+from fixtures.models import Fixture
+from results.models import Result
+from results.services.compute import StandingsComputer
+from results.services.standings import ResultSnapshot, StandingsEngine
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the standings engine against the per-team standings path on a synthetic league'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--teams', type=int, default=40, help='Number of teams in the synthetic league')
+        parser.add_argument('--repeat', type=int, default=3, help='Runs per measurement (best time is reported)')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed for scores')
+
+    def handle(self, *args, **options):
+        random.seed(options['seed'])
+
+        # Everything runs inside a transaction that is rolled back at the end
+        with transaction.atomic():
+            event, results = self._build_league(options['teams'])
+            computer = StandingsComputer(event)
+            engine = StandingsEngine(event.id)
+
+            self._measure('per-team path', computer.compute_standings_per_team, options['repeat'])
+            self._measure('engine rebuild', engine.rebuild, options['repeat'])
+
+            result = results[0]
+            before = ResultSnapshot.from_result(result)
+            after = ResultSnapshot(before.home_id, before.away_id, before.score_home + 1, before.score_away)
+
+            def amend_once():
+                engine.apply_delta(before, after)
+                engine.apply_delta(after, before)
+
+            self._measure('engine delta (amend + revert)', amend_once, options['repeat'])
+            transaction.set_rollback(True)
+
+    def _build_league(self, team_count):
+        owner = User.objects.create_user(
+            email=f'bench-{time.time_ns()}@timely.local',
+            password='bench-password',
+        )
+        start = timezone.now()
+        event = Event.objects.create(
+            name='Standings benchmark',
+            sport='Football',
+            start_datetime=start,
+            end_datetime=start + timedelta(days=30),
+            created_by=owner,
+        )
+        teams = Team.objects.bulk_create([
+            Team(name=f'Team {i}', manager=owner, event=event) for i in range(team_count)
+        ])
+        fixtures = Fixture.objects.bulk_create([
+            Fixture(event=event, home=home, away=away, start_at=start + timedelta(hours=i))
+            for i, (home, away) in enumerate(combinations(teams, 2))
+        ])
+        results = Result.objects.bulk_create([
+            Result(
+                fixture=fixture,
+                score_home=random.randint(0, 4),
+                score_away=random.randint(0, 4),
+                status='FINALIZED',
+            )
+            for fixture in fixtures
+        ])
+        self.stdout.write(f'League: {team_count} teams, {len(fixtures)} finalized results')
+        return event, results
+
+    def _measure(self, label, func, repeat):
+        best = None
+        queries = 0
+        for _ in range(repeat):
+            # The captured query log is bounded; start each run from empty
+            reset_queries()
+            with CaptureQueriesContext(connection) as ctx:
+                started = time.perf_counter()
+                func()
+                elapsed = time.perf_counter() - started
+            queries = len(ctx.captured_queries)
+            best = elapsed if best is None else min(best, elapsed)
+        self.stdout.write(f'{label:32s} {best * 1000:9.2f} ms  {queries:6d} queries')
@@ -0,0 +1,23 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0009_alter_announcement_options_alter_event_options_and_more'),
+        ('results', '0004_alter_leaderboardentry_options_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventResultsSnapshot',
+            fields=[
+                ('event', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='results_snapshot', serialize=False, to='events.event')),
+                ('payload', models.JSONField(default=dict, help_text='Rendered public results payload')),
+                ('etag', models.CharField(help_text='SHA-256 of the canonical payload', max_length=64)),
+                ('result_count', models.PositiveIntegerField(default=0)),
+                ('built_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
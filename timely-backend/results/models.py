@@ -1,6 +1,6 @@
 # results/models.py
 from __future__ import annotations
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 from django.core.exceptions import ValidationError
@@ -105,7 +105,10 @@ class Result(models.Model):
         elif self.is_draw:
             self.winner = None
         
-        super().save(*args, **kwargs)
+        # One transaction for the save and its signals: the standings delta
+        # locks this row in pre_save and applies the change in post_save
+        with transaction.atomic(using=kwargs.get('using')):
+            super().save(*args, **kwargs)
 
     @property
     def is_draw(self):
@@ -171,4 +174,15 @@ class LeaderboardEntry(models.Model):
     def save(self, *args, **kwargs):
         # Auto-calculate goal difference
         self.goal_difference = self.goals_for - self.goals_against
-        super().save(*args, **kwargs)
\ No newline at end of file
+        super().save(*args, **kwargs)
+
+class EventResultsSnapshot(models.Model):
+    """Materialized public results and leaderboard payload for one event"""
+    event = models.OneToOneField(Event, on_delete=models.CASCADE, primary_key=True, related_name="results_snapshot")
+    payload = models.JSONField(default=dict, help_text="Rendered public results payload")
+    etag = models.CharField(max_length=64, help_text="SHA-256 of the canonical payload")
+    result_count = models.PositiveIntegerField(default=0)
+    built_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Results snapshot for event {self.event_id}"
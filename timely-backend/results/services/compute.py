@@ -8,6 +8,7 @@ from events.models import Event
 from teams.models import Team
 from fixtures.models import Fixture
 from ..models import Result, LeaderboardEntry
+from .standings import ResultSnapshot, StandingsEngine
 
 
 class StandingsComputer:
@@ -25,6 +26,17 @@ class StandingsComputer:
         Compute standings for all teams in the event.
         Returns list of LeaderboardEntry objects ordered by position.
         """
+        return StandingsEngine(self.event.id).rebuild()
+    
+    def apply_result_change(self, before: Optional[ResultSnapshot], after: Optional[ResultSnapshot]) -> List[LeaderboardEntry]:
+        """Apply a single result change without rescanning the event"""
+        return StandingsEngine(self.event.id).apply_delta(before, after)
+    
+    def compute_standings_per_team(self) -> List[LeaderboardEntry]:
+        """
+        Per-team standings computation (one query and one upsert per team).
+        Kept as the reference implementation for benchmarks and tests.
+        """
         with transaction.atomic():
             # Get all teams participating in the event
             teams = self._get_participating_teams()
@@ -45,13 +57,14 @@ class StandingsComputer:
                     event=self.event,
                     team_id=team_id,
                     defaults={
-                        'pts': stats['points'],
-                        'w': stats['wins'],
-                        'd': stats['draws'],
-                        'l': stats['losses'],
-                        'gf': stats['goals_for'],
-                        'ga': stats['goals_against'],
-                        'gd': stats['goal_difference'],
+                        'points': stats['points'],
+                        'matches_played': stats['matches_played'],
+                        'wins': stats['wins'],
+                        'draws': stats['draws'],
+                        'losses': stats['losses'],
+                        'goals_for': stats['goals_for'],
+                        'goals_against': stats['goals_against'],
+                        'position': position,
                     }
                 )
                 leaderboard_entries.append(entry)
@@ -78,7 +91,7 @@ class StandingsComputer:
         results = Result.objects.filter(
             Q(fixture__home=team) | Q(fixture__away=team),
             fixture__event=self.event,
-            finalized_at__isnull=False
+            status='FINALIZED'
         ).select_related('fixture')
         
         stats = {
@@ -99,11 +112,11 @@ class StandingsComputer:
             is_home = result.fixture.home == team
             
             if is_home:
-                team_score = result.home_score
-                opponent_score = result.away_score
+                team_score = result.score_home
+                opponent_score = result.score_away
             else:
-                team_score = result.away_score
-                opponent_score = result.home_score
+                team_score = result.score_away
+                opponent_score = result.score_home
             
             stats['goals_for'] += team_score
             stats['goals_against'] += opponent_score
@@ -0,0 +1,149 @@
+# results/services/snapshot.py
+"""
+Materialized public results snapshot.
+
+The public results page (results plus a win/loss leaderboard) is rendered once
+per change and stored per event with a strong ETag. Reads are a single
+query; the payload is rebuilt after a result for the event is saved or
+deleted, and dropped (rebuilt on next read) when its fixtures, teams or
+venues change.
+"""
+import hashlib
+import json
+from typing import Any, Dict, List, Optional
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, transaction
+
+from ..models import EventResultsSnapshot, Result
+
+
+def _team(team_id: Optional[int], name: Optional[str]) -> Optional[Dict[str, Any]]:
+    return {'id': team_id, 'name': name} if team_id else None
+
+
+def _iso(value) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
+def build_results_payload(event_id: int) -> Dict[str, Any]:
+    """Render the public results payload for an event from one query"""
+    rows = Result.objects.filter(fixture__event_id=event_id).values(
+        'id', 'score_home', 'score_away', 'notes', 'created_at',
+        'fixture_id', 'fixture__round', 'fixture__start_at', 'fixture__venue__name',
+        'fixture__home_id', 'fixture__home__name', 'fixture__away_id', 'fixture__away__name',
+    ).order_by('-fixture__start_at', '-id')
+
+    results: List[Dict[str, Any]] = []
+    team_stats: Dict[int, Dict[str, Any]] = {}
+    for row in rows:
+        results.append({
+            'id': row['id'],
+            'fixture': {
+                'id': row['fixture_id'],
+                'round_no': row['fixture__round'],
+                'starts_at': _iso(row['fixture__start_at']),
+                'venue': row['fixture__venue__name'],
+            },
+            'home_team': _team(row['fixture__home_id'], row['fixture__home__name']),
+            'away_team': _team(row['fixture__away_id'], row['fixture__away__name']),
+            'score_home': row['score_home'],
+            'score_away': row['score_away'],
+            'notes': row['notes'],
+            'created_at': _iso(row['created_at']),
+        })
+
+        home_id, away_id = row['fixture__home_id'], row['fixture__away_id']
+        if not (home_id and away_id):
+            continue
+        home = team_stats.setdefault(home_id, {'team': row['fixture__home__name'], 'wins': 0, 'losses': 0,
+                                               'points_for': 0, 'points_against': 0})
+        away = team_stats.setdefault(away_id, {'team': row['fixture__away__name'], 'wins': 0, 'losses': 0,
+                                               'points_for': 0, 'points_against': 0})
+        home['points_for'] += row['score_home']
+        home['points_against'] += row['score_away']
+        away['points_for'] += row['score_away']
+        away['points_against'] += row['score_home']
+        if row['score_home'] > row['score_away']:
+            home['wins'] += 1
+            away['losses'] += 1
+        elif row['score_away'] > row['score_home']:
+            away['wins'] += 1
+            home['losses'] += 1
+
+    leaderboard = [
+        {'team_id': team_id, **stats, 'point_difference': stats['points_for'] - stats['points_against']}
+        for team_id, stats in team_stats.items()
+    ]
+    # Sort leaderboard by wins, then point difference
+    leaderboard.sort(key=lambda entry: (-entry['wins'], -entry['point_difference'], entry['team']))
+
+    return {'results': results, 'leaderboard': leaderboard, 'count': len(results)}
+
+
+def payload_etag(payload: Dict[str, Any]) -> str:
+    canonical = json.dumps(payload, sort_keys=True, separators=(',', ':'), cls=DjangoJSONEncoder)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def rebuild_results_snapshot(event_id: int) -> EventResultsSnapshot:
+    """Render and store the snapshot for an event"""
+    payload = build_results_payload(event_id)
+    values = {'payload': payload, 'etag': payload_etag(payload), 'result_count': payload['count']}
+    try:
+        with transaction.atomic():
+            snapshot, _ = EventResultsSnapshot.objects.update_or_create(event_id=event_id, defaults=values)
+    except IntegrityError:
+        # A concurrent rebuild created the row first
+        EventResultsSnapshot.objects.filter(event_id=event_id).update(**values)
+        snapshot = EventResultsSnapshot(event_id=event_id, **values)
+    return snapshot
+
+
+def schedule_snapshot_rebuild(event_id: Optional[int]):
+    """Rebuild the event's snapshot once the current transaction commits"""
+    if event_id:
+        transaction.on_commit(lambda: rebuild_results_snapshot(event_id))
+
+
+def drop_results_snapshot(event_id: Optional[int]):
+    """Discard a stale snapshot; the next read rebuilds it"""
+    if event_id:
+        EventResultsSnapshot.objects.filter(event_id=event_id).delete()
+
+
+def connect_snapshot_signals():
+    """Keep snapshots current: rebuild on result writes, drop on fixture, team or venue edits"""
+    from django.db.models.signals import post_delete, post_save, pre_delete
+    from fixtures.models import Fixture
+    from teams.models import Team
+    from venues.models import Venue
+
+    def result_changed(sender, instance, **kwargs):
+        try:
+            event_id = instance.fixture.event_id
+        except Fixture.DoesNotExist:
+            return
+        schedule_snapshot_rebuild(event_id)
+
+    def fixture_changed(sender, instance, **kwargs):
+        drop_results_snapshot(instance.event_id)
+
+    def team_changed(sender, instance, **kwargs):
+        drop_results_snapshot(instance.event_id)
+
+    def venue_changed(sender, instance, **kwargs):
+        # Payloads carry the venue name of every fixture played there
+        EventResultsSnapshot.objects.filter(
+            event_id__in=Fixture.objects.filter(venue_id=instance.pk).values('event_id')
+        ).delete()
+
+    for model, handler in ((Result, result_changed), (Fixture, fixture_changed), (Team, team_changed)):
+        uid = f'results-snapshot:{model._meta.label}'
+        post_save.connect(handler, sender=model, weak=False, dispatch_uid=f'{uid}:save')
+        post_delete.connect(handler, sender=model, weak=False, dispatch_uid=f'{uid}:delete')
+
+    # Before delete: once the venue is gone its fixtures' venue is already NULL
+    uid = f'results-snapshot:{Venue._meta.label}'
+    post_save.connect(venue_changed, sender=Venue, weak=False, dispatch_uid=f'{uid}:save')
+    pre_delete.connect(venue_changed, sender=Venue, weak=False, dispatch_uid=f'{uid}:delete')
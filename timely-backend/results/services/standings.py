@@ -0,0 +1,250 @@
+# results/services/standings.py
+"""
+Incremental standings engine.
+
+The full table is built from a single query over the event's fixtures
+(left-joined to their results) and persisted with one bulk upsert. A single
+result change is applied as a delta against the stored table, so saving,
+amending or retracting one result never rescans the event.
+"""
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from django.db import transaction
+
+from common.cache import bump_cache_version
+from fixtures.models import Fixture
+from ..models import Result, LeaderboardEntry
+
+
+FINALIZED = 'FINALIZED'
+
+STAT_FIELDS = (
+    'points',
+    'matches_played',
+    'wins',
+    'draws',
+    'losses',
+    'goals_for',
+    'goals_against',
+)
+
+
+@dataclass(frozen=True)
+class ResultSnapshot:
+    """The parts of a finalized result that affect the standings table"""
+
+    home_id: int
+    away_id: int
+    score_home: int
+    score_away: int
+
+    @classmethod
+    def from_values(cls, home_id, away_id, score_home, score_away, status) -> Optional['ResultSnapshot']:
+        """Build a snapshot, or None when the result does not count towards standings"""
+        if status != FINALIZED or not home_id or not away_id:
+            return None
+        return cls(home_id, away_id, score_home or 0, score_away or 0)
+
+    @classmethod
+    def from_result(cls, result: Optional[Result]) -> Optional['ResultSnapshot']:
+        """Snapshot an in-memory result instance"""
+        if result is None:
+            return None
+        fixture = result.fixture
+        return cls.from_values(
+            fixture.home_id, fixture.away_id,
+            result.score_home, result.score_away, result.status
+        )
+
+    @classmethod
+    def from_db(cls, result_id: Optional[int], for_update: bool = False) -> Optional['ResultSnapshot']:
+        """
+        Snapshot the persisted state of a result with one narrow query.
+
+        With for_update the result row stays locked until the transaction
+        ends, so concurrent amends of one result apply their deltas in turn.
+        """
+        if not result_id:
+            return None
+        queryset = Result.objects.filter(pk=result_id)
+        if for_update:
+            queryset = queryset.select_for_update(of=('self',))
+        row = queryset.values_list(
+            'fixture__home_id', 'fixture__away_id', 'score_home', 'score_away', 'status'
+        ).first()
+        return cls.from_values(*row) if row else None
+
+
+class StandingsTable:
+    """In-memory standings counters keyed by team id"""
+
+    WIN_POINTS = 3
+    DRAW_POINTS = 1
+    LOSS_POINTS = 0
+
+    def __init__(self):
+        self.rows: Dict[int, Dict[str, int]] = {}
+
+    @staticmethod
+    def _empty_row() -> Dict[str, int]:
+        return {field: 0 for field in STAT_FIELDS}
+
+    def ensure_team(self, team_id: int) -> Dict[str, int]:
+        """Return the counters for a team, creating a zeroed row if needed"""
+        row = self.rows.get(team_id)
+        if row is None:
+            row = self.rows[team_id] = self._empty_row()
+        return row
+
+    def _apply_side(self, team_id: int, scored: int, conceded: int, sign: int):
+        row = self.ensure_team(team_id)
+        row['matches_played'] += sign
+        row['goals_for'] += sign * scored
+        row['goals_against'] += sign * conceded
+
+        if scored > conceded:
+            row['wins'] += sign
+            row['points'] += sign * self.WIN_POINTS
+        elif scored == conceded:
+            row['draws'] += sign
+            row['points'] += sign * self.DRAW_POINTS
+        else:
+            row['losses'] += sign
+            row['points'] += sign * self.LOSS_POINTS
+
+    def add(self, snapshot: Optional[ResultSnapshot]):
+        """Count a finalized result"""
+        if snapshot is None:
+            return
+        self._apply_side(snapshot.home_id, snapshot.score_home, snapshot.score_away, 1)
+        self._apply_side(snapshot.away_id, snapshot.score_away, snapshot.score_home, 1)
+
+    def retract(self, snapshot: Optional[ResultSnapshot]):
+        """Remove a previously counted result"""
+        if snapshot is None:
+            return
+        self._apply_side(snapshot.home_id, snapshot.score_home, snapshot.score_away, -1)
+        self._apply_side(snapshot.away_id, snapshot.score_away, snapshot.score_home, -1)
+
+    def amend(self, before: Optional[ResultSnapshot], after: Optional[ResultSnapshot]):
+        """Replace one result's contribution with another"""
+        self.retract(before)
+        self.add(after)
+
+    def is_consistent(self) -> bool:
+        """False when a delta drove any counter negative (the stored table had drifted)"""
+        return all(value >= 0 for row in self.rows.values() for value in row.values())
+
+    def ranked(self) -> List[Tuple[int, Dict[str, int]]]:
+        """
+        Rows sorted by standings criteria:
+        1. Points (descending)
+        2. Goal difference (descending)
+        3. Goals for (descending)
+        4. Team id (ascending) - for consistency
+        """
+        def sort_key(item):
+            team_id, row = item
+            return (
+                -row['points'],
+                -(row['goals_for'] - row['goals_against']),
+                -row['goals_for'],
+                team_id,
+            )
+
+        return sorted(self.rows.items(), key=sort_key)
+
+    @classmethod
+    def from_entries(cls, entries) -> 'StandingsTable':
+        """Rehydrate a table from stored leaderboard rows"""
+        table = cls()
+        for entry in entries:
+            table.rows[entry.team_id] = {field: getattr(entry, field) for field in STAT_FIELDS}
+        return table
+
+
+class StandingsEngine:
+    """Builds, updates and persists the standings table for one event"""
+
+    def __init__(self, event_id: int):
+        self.event_id = event_id
+
+    def build_table(self) -> StandingsTable:
+        """Aggregate the whole table in one pass over the event's fixtures"""
+        table = StandingsTable()
+        rows = Fixture.objects.filter(event_id=self.event_id).order_by().values_list(
+            'home_id', 'away_id', 'result__score_home', 'result__score_away', 'result__status'
+        )
+        for home_id, away_id, score_home, score_away, status in rows.iterator():
+            # Teams with fixtures but no finalized results still get a row
+            if home_id:
+                table.ensure_team(home_id)
+            if away_id:
+                table.ensure_team(away_id)
+            table.add(ResultSnapshot.from_values(home_id, away_id, score_home, score_away, status))
+        return table
+
+    def load_table(self, for_update: bool = False) -> StandingsTable:
+        """Load the stored table, optionally locking its rows"""
+        queryset = LeaderboardEntry.objects.filter(event_id=self.event_id)
+        if for_update:
+            queryset = queryset.select_for_update()
+        return StandingsTable.from_entries(queryset.only('team_id', *STAT_FIELDS))
+
+    def persist(self, table: StandingsTable) -> List[LeaderboardEntry]:
+        """Write the table with a single bulk upsert and return entries in position order"""
+        entries = []
+        for position, (team_id, row) in enumerate(table.ranked(), 1):
+            # Fresh instances: the upsert resolves existing rows by (event, team)
+            entry = LeaderboardEntry(event_id=self.event_id, team_id=team_id, **row)
+            # bulk_create bypasses save(), so derive goal difference here
+            entry.goal_difference = row['goals_for'] - row['goals_against']
+            entry.position = position
+            entries.append(entry)
+
+        if entries:
+            LeaderboardEntry.objects.bulk_create(
+                entries,
+                update_conflicts=True,
+                unique_fields=['event', 'team'],
+                update_fields=list(STAT_FIELDS) + ['goal_difference', 'position', 'updated_at'],
+            )
+            # The bulk upsert sends no save signals, so invalidate the cached leaderboard here
+            event_id = self.event_id
+            transaction.on_commit(lambda: bump_cache_version('leaderboard', event_id))
+        return entries
+
+    def rebuild(self) -> List[LeaderboardEntry]:
+        """Recompute the full table from results and replace the stored one"""
+        with transaction.atomic():
+            table = self.build_table()
+            LeaderboardEntry.objects.filter(event_id=self.event_id).exclude(
+                team_id__in=list(table.rows)
+            ).delete()
+            return self.persist(table)
+
+    def apply_delta(self, before: Optional[ResultSnapshot], after: Optional[ResultSnapshot]) -> List[LeaderboardEntry]:
+        """
+        Apply a single result change (add when before is None, retract when
+        after is None, amend otherwise) to the stored table.
+
+        Falls back to a full rebuild when there is no stored table yet or the
+        stored table turns out to have drifted from the results.
+        """
+        with transaction.atomic():
+            table = self.load_table(for_update=True)
+            if not table.rows:
+                return self.rebuild()
+
+            table.amend(before, after)
+            if not table.is_consistent():
+                return self.rebuild()
+            return self.persist(table)
+
+
+def apply_result_delta(event_id: int, before: Optional[ResultSnapshot], after: Optional[ResultSnapshot]) -> List[LeaderboardEntry]:
+    """Convenience function to apply one result change to an event's standings"""
+    if before == after:
+        return []
+    return StandingsEngine(event_id).apply_delta(before, after)
@@ -2,23 +2,23 @@
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from .models import Result
-from events.realtime_service import realtime_service
+from django.db import transaction
+from realtime.services import broadcaster
 
 
 @receiver(post_save, sender=Result)
 def result_saved(sender, instance, created, **kwargs):
     """Broadcast result update when a result is saved"""
-    if instance.fixture and instance.fixture.event:
-        # Update leaderboard
-        realtime_service.update_leaderboard(instance.fixture.event, instance)
-        
-        # Broadcast results update
-        realtime_service.broadcast_results_update(instance.fixture.event, instance)
+    if instance.fixture and instance.fixture.event_id:
+        # Leaderboard recompute and results broadcast are coalesced per event
+        event_id = instance.fixture.event_id
+        transaction.on_commit(lambda: broadcaster.broadcast_results_update(event_id, instance))
 
 
 @receiver(post_delete, sender=Result)
 def result_deleted(sender, instance, **kwargs):
     """Broadcast result update when a result is deleted"""
-    if instance.fixture and instance.fixture.event:
+    if instance.fixture and instance.fixture.event_id:
         # Recompute leaderboard without this result
-        realtime_service.broadcast_results_update(instance.fixture.event)
\ No newline at end of file
+        event_id = instance.fixture.event_id
+        transaction.on_commit(lambda: broadcaster.broadcast_leaderboard_update(event_id))
\ No newline at end of file
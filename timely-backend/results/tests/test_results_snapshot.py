@@ -0,0 +1,140 @@
+# results/tests/test_results_snapshot.py
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import resolve
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory
+
+from events.models import Event
+from fixtures.models import Fixture
+from teams.models import Team
+from venues.models import Venue
+from api.views import PublicEventResultsView
+from results.models import EventResultsSnapshot, Result
+from results.services.snapshot import build_results_payload
+
+User = get_user_model()
+
+
+class ResultsSnapshotTest(TestCase):
+    """Test the materialized public results snapshot"""
+
+    def setUp(self):
+        # Keep the realtime broadcaster's coalescing timers out of these tests
+        patcher = patch('events.signals.broadcaster')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.user = User.objects.create_user(email='organizer@test.com', password='testpass123')
+        start = timezone.now() + timedelta(days=1)
+        self.event = Event.objects.create(
+            name='Cup',
+            sport='Basketball',
+            start_datetime=start,
+            end_datetime=start + timedelta(days=5),
+            created_by=self.user,
+            status=Event.Status.UPCOMING,
+        )
+        self.venue = Venue.objects.create(name='Main Court', address='1 Park Rd', created_by=self.user)
+        self.teams = [Team.objects.create(name=f'Team {i}', manager=self.user, event=self.event) for i in range(4)]
+        self.start = start
+        self.factory = APIRequestFactory()
+
+    def _result(self, home, away, score_home, score_away, hours=0):
+        fixture = Fixture.objects.create(
+            event=self.event, home=self.teams[home], away=self.teams[away], venue=self.venue,
+            start_at=self.start + timedelta(hours=hours),
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            return Result.objects.create(fixture=fixture, score_home=score_home, score_away=score_away)
+
+    def _get(self, **headers):
+        path = f'/api/public/events/{self.event.id}/results/'
+        self.assertIs(resolve(path).func.view_class, PublicEventResultsView)
+        return PublicEventResultsView.as_view()(self.factory.get(path, **headers), event_id=self.event.id)
+
+    def test_payload_and_leaderboard(self):
+        self._result(0, 1, 85, 78)
+        self._result(2, 0, 60, 70, hours=3)
+
+        payload = build_results_payload(self.event.id)
+        self.assertEqual(payload['count'], 2)
+        latest = payload['results'][0]
+        self.assertEqual(latest['home_team'], {'id': self.teams[2].id, 'name': 'Team 2'})
+        self.assertEqual(latest['fixture']['venue'], 'Main Court')
+        self.assertEqual(payload['leaderboard'][0], {
+            'team_id': self.teams[0].id, 'team': 'Team 0', 'wins': 2, 'losses': 0,
+            'points_for': 155, 'points_against': 138, 'point_difference': 17,
+        })
+
+    def test_constant_queries_regardless_of_result_count(self):
+        for i in range(6):
+            self._result(i % 4, (i + 1) % 4, 10 + i, 5, hours=2 * i)
+
+        with self.assertNumQueries(1):
+            response = self._get()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 6)
+
+    def test_rebuilt_when_result_changes(self):
+        result = self._result(0, 1, 85, 78)
+        etag = self._get()['ETag']
+
+        with self.captureOnCommitCallbacks(execute=True):
+            result.score_away = 90
+            result.save()
+
+        response = self._get()
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response.data['results'][0]['score_away'], 90)
+        self.assertEqual(response.data['leaderboard'][0]['team'], 'Team 1')
+
+    def test_not_modified_with_matching_etag(self):
+        self._result(0, 1, 85, 78)
+        etag = self._get()['ETag']
+        self.assertTrue(etag.startswith('"'))
+
+        with self.assertNumQueries(1):
+            response = self._get(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(self._get(HTTP_IF_NONE_MATCH='"stale"').status_code, 200)
+
+    def test_missing_snapshot_built_on_read(self):
+        self._result(0, 1, 85, 78)
+        # Editing a team drops the snapshot; the next read rebuilds it
+        Team.objects.filter(id=self.teams[0].id).first().save()
+        self.assertFalse(EventResultsSnapshot.objects.filter(event=self.event).exists())
+
+        response = self._get()
+        self.assertEqual(response.data['count'], 1)
+        self.assertTrue(EventResultsSnapshot.objects.filter(event=self.event).exists())
+
+    def test_venue_rename_refreshes_payload(self):
+        self._result(0, 1, 85, 78)
+        other_event = Event.objects.create(
+            name='Other', sport='Basketball', start_datetime=self.start,
+            end_datetime=self.start + timedelta(days=1), created_by=self.user,
+        )
+        fixture = Fixture.objects.create(event=other_event, start_at=self.start)
+        with self.captureOnCommitCallbacks(execute=True):
+            Result.objects.create(fixture=fixture, score_home=1, score_away=0)
+        self.assertTrue(EventResultsSnapshot.objects.filter(event=other_event).exists())
+
+        self.venue.name = 'Centre Court'
+        self.venue.save()
+
+        # Only events with fixtures at the venue are dropped
+        self.assertFalse(EventResultsSnapshot.objects.filter(event=self.event).exists())
+        self.assertTrue(EventResultsSnapshot.objects.filter(event=other_event).exists())
+        self.assertEqual(self._get().data['results'][0]['fixture']['venue'], 'Centre Court')
+
+        self.venue.delete()
+        self.assertIsNone(self._get().data['results'][0]['fixture']['venue'])
+
+    def test_private_event_404(self):
+        Event.objects.filter(id=self.event.id).update(visibility='PRIVATE')
+        self.assertEqual(self._get().status_code, 404)
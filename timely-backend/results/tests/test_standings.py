@@ -0,0 +1,173 @@
+# results/tests/test_standings.py
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from unittest.mock import patch
+
+from events.models import Event
+from teams.models import Team
+from fixtures.models import Fixture
+from ..models import Result, LeaderboardEntry
+from ..services.compute import StandingsComputer
+from ..services.standings import ResultSnapshot, StandingsEngine, StandingsTable, apply_result_delta
+
+User = get_user_model()
+
+
+class StandingsTableTest(TestCase):
+    """Test in-memory standings arithmetic"""
+
+    def test_add_and_retract_are_inverse(self):
+        table = StandingsTable()
+        snapshot = ResultSnapshot(1, 2, 3, 1)
+
+        table.add(snapshot)
+        self.assertEqual(table.rows[1]['points'], 3)
+        self.assertEqual(table.rows[2]['losses'], 1)
+
+        table.retract(snapshot)
+        self.assertTrue(all(value == 0 for row in table.rows.values() for value in row.values()))
+
+    def test_amend_draw_to_win(self):
+        table = StandingsTable()
+        table.add(ResultSnapshot(1, 2, 1, 1))
+        table.amend(ResultSnapshot(1, 2, 1, 1), ResultSnapshot(1, 2, 1, 2))
+
+        self.assertEqual(table.rows[1]['points'], 0)
+        self.assertEqual(table.rows[2]['points'], 3)
+        self.assertEqual(table.rows[2]['draws'], 0)
+        self.assertEqual(table.ranked()[0][0], 2)
+
+    def test_snapshot_ignores_unfinalized_results(self):
+        self.assertIsNone(ResultSnapshot.from_values(1, 2, 1, 0, 'PENDING'))
+        self.assertIsNone(ResultSnapshot.from_values(None, 2, 1, 0, 'FINALIZED'))
+
+
+class StandingsEngineTest(TestCase):
+    """Test the aggregate and incremental standings paths"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='organizer@example.com',
+            password='testpass123',
+            first_name='Test',
+            last_name='Organizer'
+        )
+        self.event = Event.objects.create(
+            name='Test Tournament',
+            sport='Football',
+            start_datetime=timezone.now(),
+            end_datetime=timezone.now() + timezone.timedelta(days=3),
+            created_by=self.user
+        )
+        self.teams = [
+            Team.objects.create(name=f'Team {name}', manager=self.user, event=self.event)
+            for name in 'ABCD'
+        ]
+        a, b, c, d = self.teams
+        self.fixtures = [
+            Fixture.objects.create(event=self.event, home=home, away=away, start_at=timezone.now())
+            for home, away in [(a, b), (a, c), (b, c), (c, d)]
+        ]
+
+    def _finalize(self, fixture, home, away):
+        return Result.objects.create(fixture=fixture, score_home=home, score_away=away, status='FINALIZED')
+
+    def _table(self):
+        return {
+            entry.team_id: (entry.points, entry.wins, entry.draws, entry.losses,
+                            entry.goals_for, entry.goals_against, entry.position)
+            for entry in LeaderboardEntry.objects.filter(event=self.event)
+        }
+
+    @patch('events.signals.realtime_service')
+    def test_rebuild_matches_per_team_path(self, _realtime):
+        self._finalize(self.fixtures[0], 2, 1)
+        self._finalize(self.fixtures[1], 1, 1)
+        self._finalize(self.fixtures[2], 0, 3)
+        Result.objects.create(fixture=self.fixtures[3], score_home=5, score_away=0, status='PENDING')
+
+        computer = StandingsComputer(self.event)
+        computer.compute_standings_per_team()
+        expected = self._table()
+
+        LeaderboardEntry.objects.all().delete()
+        entries = computer.compute_standings()
+
+        self.assertEqual(self._table(), expected)
+        self.assertEqual([entry.position for entry in entries], [1, 2, 3, 4])
+        self.assertEqual(entries[0].team_id, self.teams[2].id)
+
+    @patch('events.signals.realtime_service')
+    def test_rebuild_uses_constant_queries(self, _realtime):
+        for fixture in self.fixtures:
+            self._finalize(fixture, 1, 0)
+
+        # Savepoint, aggregate read, stale-row delete, bulk upsert, release
+        with self.assertNumQueries(5):
+            StandingsEngine(self.event.id).rebuild()
+
+    def test_delta_add_amend_retract(self):
+        engine = StandingsEngine(self.event.id)
+        engine.rebuild()
+        a, b = self.teams[0].id, self.teams[1].id
+
+        apply_result_delta(self.event.id, None, ResultSnapshot(a, b, 2, 0))
+        self.assertEqual(self._table()[a][:6], (3, 1, 0, 0, 2, 0))
+        self.assertEqual(self._table()[a][6], 1)
+
+        apply_result_delta(self.event.id, ResultSnapshot(a, b, 2, 0), ResultSnapshot(a, b, 0, 0))
+        self.assertEqual(self._table()[a][:3], (1, 0, 1))
+        self.assertEqual(self._table()[b][:3], (1, 0, 1))
+
+        apply_result_delta(self.event.id, ResultSnapshot(a, b, 0, 0), None)
+        self.assertTrue(all(row[:6] == (0, 0, 0, 0, 0, 0) for row in self._table().values()))
+
+    def test_delta_rebuilds_when_table_missing(self):
+        result = self._finalize(self.fixtures[0], 3, 0)
+        LeaderboardEntry.objects.all().delete()
+
+        StandingsEngine(self.event.id).apply_delta(None, ResultSnapshot.from_result(result))
+
+        self.assertEqual(self._table()[self.teams[0].id][0], 3)
+        self.assertEqual(LeaderboardEntry.objects.filter(event=self.event).count(), 4)
+
+    @patch('events.signals.realtime_service')
+    def test_result_signals_keep_table_in_sync(self, _realtime):
+        StandingsEngine(self.event.id).rebuild()
+        result = Result.objects.create(fixture=self.fixtures[0], score_home=1, score_away=0)
+        self.assertEqual(self._table()[self.teams[0].id][0], 0)
+
+        result.status = 'FINALIZED'
+        result.save()
+        self.assertEqual(self._table()[self.teams[0].id][0], 3)
+
+        result.score_away = 2
+        result.save()
+        self.assertEqual(self._table()[self.teams[1].id][0], 3)
+        incremental = self._table()
+        StandingsEngine(self.event.id).rebuild()
+        self.assertEqual(incremental, self._table())
+
+        result.delete()
+        self.assertEqual(self._table()[self.teams[1].id][0], 0)
+
+    @patch('events.signals.realtime_service')
+    def test_stale_instances_apply_persisted_state(self, _realtime):
+        StandingsEngine(self.event.id).rebuild()
+        result = self._finalize(self.fixtures[0], 2, 0)
+        first = Result.objects.get(pk=result.pk)
+        second = Result.objects.get(pk=result.pk)
+
+        # Two amends of one result in turn: each retracts what the other stored
+        first.score_away = 3
+        first.save()
+        second.score_home = 4
+        second.save()
+        incremental = self._table()
+        StandingsEngine(self.event.id).rebuild()
+        self.assertEqual(incremental, self._table())
+        self.assertEqual(self._table()[self.teams[0].id][:6], (3, 1, 0, 0, 4, 0))
+
+        first.delete()
+        self.assertTrue(all(row[:6] == (0, 0, 0, 0, 0, 0) for row in self._table().values()))
@@ -26,6 +26,7 @@ from accounts.permissions import (
     IsSpectatorReadOnly, IsAdmin
 )
 from accounts.audit_mixin import AuditLogMixin
+from accounts.rbac_permissions import scope_queryset
 from realtime.services import (
     broadcast_result_update, broadcast_leaderboard_update
 )
@@ -59,76 +60,22 @@ class ResultViewSet(viewsets.ModelViewSet):
         try:
             queryset = super().get_queryset()
             
-            # Apply role-based filtering
-            if not self.request.user.is_authenticated:
-                # Public users can only see finalized results
-                queryset = queryset.filter(status='FINALIZED')
-            elif self.request.user.is_staff or self.request.user.role == 'ADMIN':
-                # Admin sees all results
-                pass
-            elif self.request.user.role == 'ORGANIZER':
-                # Organizer sees results for their events + finalized results
-                queryset = queryset.filter(
-                    Q(fixture__event__created_by=self.request.user) |
-                    Q(status='FINALIZED')
-                )
-            elif self.request.user.role == 'COACH':
-                # Coach sees results for teams they coach + finalized results
-                from teams.models import Team
-                
-                # Support recorded_by parameter for coaches recording results
-                recorded_by = self.request.query_params.get('recorded_by')
-                if recorded_by:
-                    try:
-                        recorded_by_id = int(recorded_by)
-                        if recorded_by_id == self.request.user.id:
-                            # Coach viewing their own recorded results
-                            queryset = queryset.filter(verified_by=self.request.user)
-                        else:
-                            # Invalid recorded_by, return empty
-                            return queryset.none()
-                    except (ValueError, TypeError):
-                        # Invalid recorded_by parameter, return empty queryset
-                        return queryset.none()
-                else:
-                    # Default: show results for teams they coach + finalized results
-                    try:
-                        team_ids = list(Team.objects.filter(coach=self.request.user).values_list('id', flat=True))
-                        if team_ids:
-                            queryset = queryset.filter(
-                                Q(fixture__home_id__in=team_ids) |
-                                Q(fixture__away_id__in=team_ids) |
-                                Q(status='FINALIZED')
-                            ).distinct()
-                        else:
-                            # Coach has no teams, show only finalized results
-                            queryset = queryset.filter(status='FINALIZED')
-                    except Exception as e:
-                        # If team lookup fails, return empty queryset to prevent 500
-                        import logging
-                        logging.error(f"Error fetching coach teams: {e}")
-                        return queryset.none()
-            elif self.request.user.role == 'ATHLETE':
-                # Athlete sees results for teams they're in + finalized results
-                from teams.models import TeamMember
+            # Support recorded_by parameter for coaches recording results
+            recorded_by = self.request.query_params.get('recorded_by')
+            if recorded_by and self.request.user.is_authenticated and self.request.user.role == 'COACH':
                 try:
-                    team_ids = list(TeamMember.objects.filter(athlete=self.request.user).values_list('team_id', flat=True))
-                    if team_ids:
-                        queryset = queryset.filter(
-                            Q(fixture__home_id__in=team_ids) |
-                            Q(fixture__away_id__in=team_ids) |
-                            Q(status='FINALIZED')
-                        ).distinct()
-                    else:
-                        queryset = queryset.filter(status='FINALIZED')
-                except Exception as e:
-                    # If team member lookup fails, return empty queryset
-                    import logging
-                    logging.error(f"Error fetching athlete teams: {e}")
+                    recorded_by_id = int(recorded_by)
+                except (ValueError, TypeError):
+                    # Invalid recorded_by parameter, return empty queryset
+                    return queryset.none()
+                if recorded_by_id != self.request.user.id:
+                    # Invalid recorded_by, return empty
                     return queryset.none()
+                # Coach viewing their own recorded results
+                queryset = queryset.filter(verified_by=self.request.user)
             else:
-                # Spectator sees only finalized results
-                queryset = queryset.filter(status='FINALIZED')
+                # Apply role-based filtering: results the user's role gives access to, plus finalized ones
+                queryset = scope_queryset(self.request, queryset, public=Q(status='FINALIZED'))
             
             # Filter by event if specified
             event_id = self.request.query_params.get('event_id')
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.6 on 2026-10-16 21:05
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('fixtures', '0006_fixture_fixtures_fi_status_46ff81_idx'),
+        ('notifications', '0002_notificationtemplate_broadcast_notificationunread'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReminderDispatch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('reminder_type', models.CharField(choices=[('24h', '24 hours before'), ('2h', '2 hours before')], max_length=10)),
+                ('sent_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('fixture', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reminder_dispatches', to='fixtures.fixture')),
+                ('notification', models.ForeignKey(blank=True, help_text='In-app notification created for this reminder', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='notifications.notification')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reminder_dispatches', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-sent_at'],
+                'constraints': [models.UniqueConstraint(fields=('fixture', 'user', 'reminder_type'), name='unique_reminder_per_fixture_user_type')],
+            },
+        ),
+    ]
@@ -0,0 +1,37 @@
+# scheduler/models.py
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+
+
+class ReminderDispatch(models.Model):
+    """Ledger of fixture reminders sent: one row per (fixture, user, reminder type)"""
+
+    class Type(models.TextChoices):
+        T24H = "24h", "24 hours before"
+        T2H = "2h", "2 hours before"
+
+    fixture = models.ForeignKey('fixtures.Fixture', on_delete=models.CASCADE, related_name='reminder_dispatches')
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='reminder_dispatches')
+    reminder_type = models.CharField(max_length=10, choices=Type.choices)
+    notification = models.ForeignKey(
+        'notifications.Notification',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+        help_text="In-app notification created for this reminder"
+    )
+    sent_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['-sent_at']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['fixture', 'user', 'reminder_type'],
+                name='unique_reminder_per_fixture_user_type',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.reminder_type} reminder for fixture {self.fixture_id} to user {self.user_id}"
@@ -1,312 +1,334 @@
 # scheduler/tasks.py
+"""
+Fixture reminder engine
+
+Reminders go out 24 hours and 2 hours before each scheduled fixture. Every
+reminder sent is recorded in the ReminderDispatch ledger, keyed by (fixture,
+user, reminder type), so each one is sent exactly once however often the
+scheduler runs: a sweep only sends reminders missing from the ledger, and the
+ledger's unique constraint rolls back a batch that raced another sweep.
+
+Recipients for all due fixtures are resolved with a handful of set-based
+queries, and each batch's notifications and ledger rows are bulk-created in
+one transaction. Email and SMS go out on the notifications queue after commit.
+"""
+import logging
+import threading
+from collections import defaultdict
 from datetime import timedelta
-from django.utils import timezone
+from typing import Dict, List, Set, Tuple
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
 from django.db.models import Q
+from django.utils import timezone
 from django.contrib.auth import get_user_model
 
+from common.background import get_queue
 from fixtures.models import Fixture
 from events.models import Event
-from notifications.models import Notification
-from notifications.services.email import send_email_notification
-from notifications.services.sms import send_sms_notification
+from notifications.models import Notification, NotificationUnread
+from notifications.services.fanout import deliver_email_sms
+from .models import ReminderDispatch
+
+logger = logging.getLogger(__name__)
 
 User = get_user_model()
 
+# Reminder type -> lead time before kick-off, latest reminder last
+REMINDER_LEADS = (
+    (ReminderDispatch.Type.T24H, timedelta(hours=24)),
+    (ReminderDispatch.Type.T2H, timedelta(hours=2)),
+)
 
-def send_fixture_reminders():
+FIXTURE_FIELDS = (
+    'id', 'event_id', 'event__name', 'event__created_by_id', 'start_at', 'venue__name',
+    'home_id', 'home__name', 'home__manager_id', 'away_id', 'away__name', 'away__manager_id',
+)
+
+
+def due_fixtures(now=None) -> Dict[str, List[dict]]:
     """
-    Send T-24h and T-2h reminders for upcoming fixtures
+    Scheduled fixtures due a reminder, by reminder type.
+
+    A reminder is due from its lead time before kick-off until the next
+    reminder takes over (the 2h reminder until kick-off), so a sweep that was
+    missed still sends it late rather than never.
     """
-    now = timezone.now()
-    
-    # T-24h window (23-25 hours from now)
-    t24h_start = now + timedelta(hours=23)
-    t24h_end = now + timedelta(hours=25)
-    
-    # T-2h window (1.5-2.5 hours from now)
-    t2h_start = now + timedelta(hours=1.5)
-    t2h_end = now + timedelta(hours=2.5)
-    
-    # Get fixtures in T-24h window
-    fixtures_24h = Fixture.objects.filter(
-        starts_at__range=[t24h_start, t24h_end],
-        status=Fixture.Status.SCHEDULED
-    ).select_related('event', 'home_team', 'away_team', 'venue')
-    
-    # Get fixtures in T-2h window
-    fixtures_2h = Fixture.objects.filter(
-        starts_at__range=[t2h_start, t2h_end],
-        status=Fixture.Status.SCHEDULED
-    ).select_related('event', 'home_team', 'away_team', 'venue')
-    
-    # Send T-24h reminders
-    for fixture in fixtures_24h:
-        send_fixture_reminder(fixture, '24h')
-    
-    # Send T-2h reminders
-    for fixture in fixtures_2h:
-        send_fixture_reminder(fixture, '2h')
-    
-    return {
-        't24h_count': fixtures_24h.count(),
-        't2h_count': fixtures_2h.count(),
-        'total_reminders': fixtures_24h.count() + fixtures_2h.count()
-    }
+    now = now or timezone.now()
+    due = {}
+    latest_start = now
+    for reminder_type, lead in reversed(REMINDER_LEADS):
+        due[reminder_type] = list(
+            Fixture.objects.filter(
+                status=Fixture.Status.SCHEDULED,
+                start_at__gt=latest_start,
+                start_at__lte=now + lead,
+            ).order_by('start_at').values(*FIXTURE_FIELDS)
+        )
+        latest_start = now + lead
+    return due
+
+
+def resolve_recipients(fixtures: List[dict]) -> Dict[int, Set[int]]:
+    """
+    User ids to remind per fixture id, in one query per recipient source:
+    event organizers, team managers and active members, paid ticket holders
+    for the fixture, and approved registrants for the event.
+    """
+    recipients: Dict[int, Set[int]] = defaultdict(set)
+    if not fixtures:
+        return recipients
+
+    fixtures_by_team = defaultdict(list)
+    fixtures_by_event = defaultdict(list)
+    for fixture in fixtures:
+        users = recipients[fixture['id']]
+        users.add(fixture['event__created_by_id'])
+        fixtures_by_event[fixture['event_id']].append(fixture['id'])
+        for side in ('home', 'away'):
+            if fixture[f'{side}_id']:
+                fixtures_by_team[fixture[f'{side}_id']].append(fixture['id'])
+                users.add(fixture[f'{side}__manager_id'])
+
+    from teams.models import TeamMember
+    from tickets.models import TicketOrder
+    from registrations.models import Registration
+
+    members = TeamMember.objects.filter(
+        team_id__in=list(fixtures_by_team), status='active'
+    ).order_by().values_list('team_id', 'athlete_id')
+    for team_id, user_id in members:
+        for fixture_id in fixtures_by_team[team_id]:
+            recipients[fixture_id].add(user_id)
+
+    ticket_holders = TicketOrder.objects.filter(
+        fixture_id__in=list(recipients), status=TicketOrder.Status.PAID
+    ).order_by().values_list('fixture_id', 'user_id').distinct()
+    for fixture_id, user_id in ticket_holders:
+        recipients[fixture_id].add(user_id)
+
+    registrants = Registration.objects.filter(
+        event_id__in=list(fixtures_by_event), status=Registration.Status.APPROVED
+    ).order_by().values_list('event_id', 'applicant_user_id', 'applicant_id')
+    for event_id, applicant_user_id, applicant_id in registrants:
+        for fixture_id in fixtures_by_event[event_id]:
+            recipients[fixture_id].update(user_id for user_id in (applicant_user_id, applicant_id) if user_id)
+
+    for users in recipients.values():
+        users.discard(None)
+    return recipients
+
+
+def send_fixture_reminders(now=None, dry_run=False):
+    """
+    Send every due T-24h and T-2h reminder that hasn't been sent yet.
+
+    Safe to run at any cadence and from several workers at once.
+    """
+    due = due_fixtures(now)
+    results = {'t24h_count': len(due[ReminderDispatch.Type.T24H]), 't2h_count': len(due[ReminderDispatch.Type.T2H])}
+
+    sent = 0
+    for reminder_type, fixtures in due.items():
+        if fixtures:
+            sent += send_reminder_batch(fixtures, reminder_type, dry_run=dry_run)
+
+    results['total_reminders'] = results['t24h_count'] + results['t2h_count']
+    results['sent'] = sent
+    return results
 
 
 def send_fixture_reminder(fixture, reminder_type):
+    """Send one fixture's reminder to whoever hasn't had it yet"""
+    fixtures = list(Fixture.objects.filter(id=fixture.id).values(*FIXTURE_FIELDS))
+    return send_reminder_batch(fixtures, reminder_type)
+
+
+def send_reminder_batch(fixtures: List[dict], reminder_type: str, dry_run=False) -> int:
     """
-    Send reminder for a specific fixture
+    Send reminder_type to the recipients of fixtures (FIXTURE_FIELDS rows)
+    not yet in the ledger. Returns the number of reminders sent.
     """
-    # Get all users who should receive this reminder
-    users = get_fixture_reminder_recipients(fixture)
-    
-    for user in users:
-        # Create notification
-        notification = create_fixture_notification(fixture, user, reminder_type)
-        
-        # Send email (stub implementation)
-        send_fixture_email_reminder(fixture, user, reminder_type)
-        
-        # Send SMS (stub implementation)
-        send_fixture_sms_reminder(fixture, user, reminder_type)
+    fixture_ids = [fixture['id'] for fixture in fixtures]
+    try:
+        with transaction.atomic():
+            if connection.features.has_select_for_update_skip_locked and not dry_run:
+                # Concurrent sweeps split the due fixtures between them
+                locked = set(
+                    Fixture.objects.select_for_update(skip_locked=True)
+                    .filter(id__in=fixture_ids).values_list('id', flat=True)
+                )
+                fixtures = [fixture for fixture in fixtures if fixture['id'] in locked]
+
+            pending = _pending_reminders(fixtures, reminder_type)
+            if dry_run or not pending:
+                return len(pending)
+
+            notifications = [
+                fixture_notification(fixture, user_id, reminder_type) for fixture, user_id in pending
+            ]
+            Notification.objects.bulk_create(notifications)
+            ReminderDispatch.objects.bulk_create([
+                ReminderDispatch(
+                    fixture_id=fixture['id'], user_id=user_id, reminder_type=reminder_type,
+                    notification=notification, sent_at=notification.created_at,
+                )
+                for (fixture, user_id), notification in zip(pending, notifications)
+            ])
+            # bulk_create skips post_save, so unread counters are bumped in bulk here
+            NotificationUnread.bulk_increment(user_id for _, user_id in pending)
+    except IntegrityError:
+        # Another sweep recorded some of these first; its batch owns them
+        logger.info("Reminder batch for fixtures %s raced another sweep; skipped", fixture_ids)
+        return 0
+
+    notification_ids = [notification.id for notification in notifications]
+    transaction.on_commit(lambda: get_queue('notifications').submit(deliver_email_sms, notification_ids))
+    return len(notifications)
+
+
+def _pending_reminders(fixtures: List[dict], reminder_type: str) -> List[Tuple[dict, int]]:
+    """(fixture, user_id) pairs due reminder_type and missing from the ledger"""
+    recipients = resolve_recipients(fixtures)
+    sent = set(
+        ReminderDispatch.objects.filter(
+            fixture_id__in=list(recipients), reminder_type=reminder_type
+        ).order_by().values_list('fixture_id', 'user_id')
+    )
+    return [
+        (fixture, user_id)
+        for fixture in fixtures
+        for user_id in sorted(recipients[fixture['id']])
+        if (fixture['id'], user_id) not in sent
+    ]
 
 
 def get_fixture_reminder_recipients(fixture):
     """
     Get users who should receive reminders for this fixture
     """
-    users = set()
-    
-    # Event organizers and admins
-    users.add(fixture.event.created_by)
-    
-    # Team members (if teams are assigned)
-    if fixture.home_team:
-        for member in fixture.home_team.members.all():
-            users.add(member.user)
-    
-    if fixture.away_team:
-        for member in fixture.away_team.members.all():
-            users.add(member.user)
-    
-    # Users with tickets for this fixture
-    from tickets.models import Ticket
-    ticket_users = User.objects.filter(
-        ticket_orders__tickets__order__fixture=fixture,
-        ticket_orders__status='paid'
-    ).distinct()
-    users.update(ticket_users)
-    
-    # Users registered for the event
-    from registrations.models import Registration
-    registered_users = User.objects.filter(
-        registrations__event=fixture.event,
-        registrations__status='approved'
-    ).distinct()
-    users.update(registered_users)
-    
-    return list(users)
+    fixtures = list(Fixture.objects.filter(id=fixture.id).values(*FIXTURE_FIELDS))
+    return list(User.objects.filter(id__in=resolve_recipients(fixtures)[fixture.id]))
 
 
-def create_fixture_notification(fixture, user, reminder_type):
+def fixture_notification(fixture: dict, user_id: int, reminder_type: str) -> Notification:
     """
-    Create in-app notification for fixture reminder
+    Unsaved in-app notification for a fixture reminder (fixture is a FIXTURE_FIELDS row)
     """
-    if reminder_type == '24h':
-        title = f"Fixture Reminder: {fixture.event.name}"
-        message = f"Your fixture {fixture.home_team.name} vs {fixture.away_team.name} starts in 24 hours at {fixture.starts_at.strftime('%H:%M')}."
+    home = fixture['home__name'] or 'TBD'
+    away = fixture['away__name'] or 'TBD'
+    kick_off = timezone.localtime(fixture['start_at']).strftime('%H:%M')
+    if reminder_type == ReminderDispatch.Type.T24H:
+        title = f"Fixture Reminder: {fixture['event__name']}"
+        body = f"Your fixture {home} vs {away} starts in 24 hours at {kick_off}."
     else:  # 2h
-        title = f"Fixture Starting Soon: {fixture.event.name}"
-        message = f"Your fixture {fixture.home_team.name} vs {fixture.away_team.name} starts in 2 hours at {fixture.starts_at.strftime('%H:%M')}."
-    
-    notification = Notification.objects.create(
-        user=user,
+        title = f"Fixture Starting Soon: {fixture['event__name']}"
+        body = f"Your fixture {home} vs {away} starts in 2 hours at {kick_off}."
+    if fixture['venue__name']:
+        body += f" Venue: {fixture['venue__name']}."
+
+    return Notification(
+        user_id=user_id,
+        kind='info',
+        topic='schedule',
         title=title,
-        message=message,
-        notification_type='fixture_reminder',
-        data={
-            'fixture_id': fixture.id,
-            'event_id': fixture.event.id,
-            'reminder_type': reminder_type,
-            'starts_at': fixture.starts_at.isoformat(),
-            'venue': fixture.venue.name if fixture.venue else None
-        }
+        body=body,
+        link_url=f"/events/{fixture['event_id']}/fixtures/{fixture['id']}",
+        created_at=timezone.now(),
     )
-    
-    return notification
 
 
-def send_fixture_email_reminder(fixture, user, reminder_type):
+def run_scheduler(interval=None, stop=None, on_tick=None):
     """
-    Send email reminder for fixture (stub implementation)
+    Long-lived alternative to cron: sweep for due reminders every interval
+    seconds until stop (a threading.Event) is set.
     """
-    # This would integrate with your email service
-    # For now, just log the action
-    print(f"Email reminder {reminder_type} sent to {user.email} for fixture {fixture.id}")
-    
-    # In production, you would:
-    # 1. Render email template
-    # 2. Send via email service (SendGrid, AWS SES, etc.)
-    # 3. Track delivery status
-    
-    # Example implementation:
-    # try:
-    #     send_email_notification(
-    #         to_email=user.email,
-    #         subject=f"Fixture Reminder: {fixture.event.name}",
-    #         template='fixture_reminder',
-    #         context={
-    #             'user': user,
-    #             'fixture': fixture,
-    #             'reminder_type': reminder_type
-    #         }
-    #     )
-    # except Exception as e:
-    #     print(f"Failed to send email to {user.email}: {e}")
-
-
-def send_fixture_sms_reminder(fixture, user, reminder_type):
-    """
-    Send SMS reminder for fixture (stub implementation)
-    """
-    # This would integrate with your SMS service
-    # For now, just log the action
-    if hasattr(user, 'phone_number') and user.phone_number:
-        print(f"SMS reminder {reminder_type} sent to {user.phone_number} for fixture {fixture.id}")
-    
-    # In production, you would:
-    # 1. Format SMS message
-    # 2. Send via SMS service (Twilio, AWS SNS, etc.)
-    # 3. Track delivery status
-    
-    # Example implementation:
-    # try:
-    #     send_sms_notification(
-    #         to_phone=user.phone_number,
-    #         message=f"Fixture reminder: {fixture.home_team.name} vs {fixture.away_team.name} starts in {reminder_type}",
-    #         context={
-    #             'fixture': fixture,
-    #             'reminder_type': reminder_type
-    #         }
-    #     )
-    # except Exception as e:
-    #     print(f"Failed to send SMS to {user.phone_number}: {e}")
+    interval = interval or getattr(settings, 'REMINDER_SCHEDULER_INTERVAL', 60)
+    stop = stop or threading.Event()
+    while not stop.is_set():
+        try:
+            results = send_fixture_reminders()
+            if on_tick:
+                on_tick(results)
+        except Exception:
+            logger.exception("Reminder sweep failed")
+        stop.wait(interval)
 
 
 def send_event_reminders():
     """
-    Send reminders for upcoming events (not fixtures)
+    Send reminders for events (not fixtures) starting in about 24 hours
     """
     now = timezone.now()
-    
-    # T-24h window for events
-    t24h_start = now + timedelta(hours=23)
-    t24h_end = now + timedelta(hours=25)
-    
-    # Get events starting in T-24h window
     events = Event.objects.filter(
-        start_date__range=[t24h_start.date(), t24h_end.date()],
-        status=Event.Status.PUBLISHED
-    ).select_related('created_by')
-    
-    for event in events:
-        send_event_reminder(event)
+        start_datetime__range=(now + timedelta(hours=23), now + timedelta(hours=25)),
+        status=Event.Status.UPCOMING,
+    ).only('id', 'name', 'start_datetime', 'created_by_id')
+    return sum(send_event_reminder(event) for event in events)
 
 
-def send_event_reminder(event):
+def send_event_reminder(event) -> int:
     """
-    Send reminder for a specific event
+    Send reminder for a specific event to everyone not already reminded; returns reminders created
     """
-    # Get all users who should receive this reminder
-    users = get_event_reminder_recipients(event)
-    
-    for user in users:
-        # Create notification
-        notification = create_event_notification(event, user)
-        
-        # Send email (stub implementation)
-        send_event_email_reminder(event, user)
-        
-        # Send SMS (stub implementation)
-        send_event_sms_reminder(event, user)
+    title = f"Event Reminder: {event.name}"
+    link_url = f"/events/{event.id}"
+    starts = timezone.localtime(event.start_datetime).strftime('%Y-%m-%d %H:%M')
+    with transaction.atomic():
+        user_ids = set(get_event_reminder_recipients(event).values_list('id', flat=True))
+        user_ids -= set(
+            Notification.objects.filter(user_id__in=user_ids, link_url=link_url, title=title)
+            .values_list('user_id', flat=True)
+        )
+        notifications = [
+            Notification(
+                user_id=user_id,
+                kind='info',
+                topic='schedule',
+                title=title,
+                body=f"Your event {event.name} starts tomorrow at {starts}.",
+                link_url=link_url,
+                created_at=timezone.now(),
+            )
+            for user_id in sorted(user_ids)
+        ]
+        Notification.objects.bulk_create(notifications)
+        NotificationUnread.bulk_increment(user_ids)
+
+    notification_ids = [notification.id for notification in notifications]
+    if notification_ids:
+        transaction.on_commit(lambda: get_queue('notifications').submit(deliver_email_sms, notification_ids))
+    return len(notifications)
 
 
 def get_event_reminder_recipients(event):
     """
-    Get users who should receive reminders for this event
+    Get users who should receive reminders for this event: the organizer,
+    approved registrants and paid ticket holders
     """
-    users = set()
-    
-    # Event organizers and admins
-    users.add(event.created_by)
-    
-    # Users registered for the event
     from registrations.models import Registration
-    registered_users = User.objects.filter(
-        registrations__event=event,
-        registrations__status='approved'
-    ).distinct()
-    users.update(registered_users)
+    from tickets.models import TicketOrder
     
-    # Users with tickets for this event
-    from tickets.models import Ticket
-    ticket_users = User.objects.filter(
-        ticket_orders__tickets__order__event=event,
-        ticket_orders__status='paid'
+    return User.objects.filter(
+        Q(id=event.created_by_id)
+        | Q(user_registrations__event_id=event.id, user_registrations__status=Registration.Status.APPROVED)
+        | Q(ticket_orders__event_id=event.id, ticket_orders__status=TicketOrder.Status.PAID)
     ).distinct()
-    users.update(ticket_users)
-    
-    return list(users)
-
-
-def create_event_notification(event, user):
-    """
-    Create in-app notification for event reminder
-    """
-    title = f"Event Reminder: {event.name}"
-    message = f"Your event {event.name} starts tomorrow at {event.start_date.strftime('%Y-%m-%d')}."
-    
-    notification = Notification.objects.create(
-        user=user,
-        title=title,
-        message=message,
-        notification_type='event_reminder',
-        data={
-            'event_id': event.id,
-            'start_date': event.start_date.isoformat(),
-            'venue': event.venue.name if event.venue else None
-        }
-    )
-    
-    return notification
-
-
-def send_event_email_reminder(event, user):
-    """
-    Send email reminder for event (stub implementation)
-    """
-    print(f"Event email reminder sent to {user.email} for event {event.id}")
-
-
-def send_event_sms_reminder(event, user):
-    """
-    Send SMS reminder for event (stub implementation)
-    """
-    if hasattr(user, 'phone_number') and user.phone_number:
-        print(f"Event SMS reminder sent to {user.phone_number} for event {event.id}")
 
 
 def cleanup_old_notifications():
     """
-    Clean up old notifications to prevent database bloat
+    Clean up old schedule notifications (the reminders sent here) to prevent
+    database bloat. Dispatch ledger rows survive with their notification unset,
+    so deleted reminders are not sent again.
     """
     # Delete notifications older than 30 days
     cutoff_date = timezone.now() - timedelta(days=30)
     
     deleted_count = Notification.objects.filter(
         created_at__lt=cutoff_date,
-        notification_type__in=['fixture_reminder', 'event_reminder']
-    ).delete()[0]
+        topic='schedule'
+    ).delete()[1].get(Notification._meta.label, 0)
     
     return {'deleted_count': deleted_count}
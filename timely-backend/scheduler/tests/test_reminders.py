@@ -1,216 +1,254 @@
-# scheduler/tests/test_reminders.py
 from datetime import timedelta
-from django.test import TestCase
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
 from django.utils import timezone
 from django.contrib.auth import get_user_model
 
 from events.models import Event
 from fixtures.models import Fixture
-from teams.models import Team
-from notifications.models import Notification
+from registrations.models import Registration
+from teams.models import Team, TeamMember
+from tickets.models import TicketOrder
+from notifications.models import Notification, NotificationUnread
+from scheduler.models import ReminderDispatch
 from scheduler.tasks import (
     send_fixture_reminders,
     send_fixture_reminder,
     get_fixture_reminder_recipients,
-    create_fixture_notification
+    fixture_notification,
+    due_fixtures,
+    cleanup_old_notifications,
+    FIXTURE_FIELDS,
 )
 
 User = get_user_model()
 
 
+@override_settings(BACKGROUND_TASKS_EAGER=True)
 class ReminderTestCase(TestCase):
     def setUp(self):
         """Set up test data"""
+        # Keep the realtime broadcaster's coalescing timers out of these tests
+        patcher = patch('events.signals.broadcaster')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
         self.user1 = User.objects.create_user(
             email='user1@test.com',
             password='testpass123',
             first_name='User',
             last_name='One'
         )
-        
+
         self.user2 = User.objects.create_user(
             email='user2@test.com',
             password='testpass123',
             first_name='User',
             last_name='Two'
         )
-        
+
         self.organizer = User.objects.create_user(
             email='organizer@test.com',
             password='testpass123',
             first_name='Organizer',
             last_name='User'
         )
-        
+
         # Create event
         self.event = Event.objects.create(
             name='Test Event',
+            sport='Basketball',
             description='Test event description',
-            start_date=timezone.now().date() + timedelta(days=1),
-            end_date=timezone.now().date() + timedelta(days=2),
+            start_datetime=timezone.now() + timedelta(hours=1),
+            end_datetime=timezone.now() + timedelta(days=2),
             created_by=self.organizer,
-            status=Event.Status.PUBLISHED
-        )
-        
-        # Create teams
-        self.team1 = Team.objects.create(
-            name='Team A',
-            created_by=self.user1
-        )
-        self.team2 = Team.objects.create(
-            name='Team B',
-            created_by=self.user2
+            status=Event.Status.UPCOMING
         )
-        
+
+        # Create teams, managed by the organizer with one player each
+        self.team1 = Team.objects.create(name='Team A', manager=self.organizer, event=self.event)
+        self.team2 = Team.objects.create(name='Team B', manager=self.organizer, event=self.event)
+        TeamMember.objects.create(team=self.team1, athlete=self.user1, jersey_no=7)
+        TeamMember.objects.create(team=self.team2, athlete=self.user2, jersey_no=9)
+
         # Create fixture in T-24h window
         self.fixture_24h = Fixture.objects.create(
             event=self.event,
-            home_team=self.team1,
-            away_team=self.team2,
-            starts_at=timezone.now() + timedelta(hours=24),
+            home=self.team1,
+            away=self.team2,
+            start_at=timezone.now() + timedelta(hours=24),
             status=Fixture.Status.SCHEDULED
         )
-        
+
         # Create fixture in T-2h window
         self.fixture_2h = Fixture.objects.create(
             event=self.event,
-            home_team=self.team1,
-            away_team=self.team2,
-            starts_at=timezone.now() + timedelta(hours=2),
+            home=self.team1,
+            away=self.team2,
+            start_at=timezone.now() + timedelta(hours=2),
             status=Fixture.Status.SCHEDULED
         )
-    
+
     def test_get_fixture_reminder_recipients(self):
         """Test getting reminder recipients for a fixture"""
         recipients = get_fixture_reminder_recipients(self.fixture_24h)
-        
+
         # Should include event organizer
         self.assertIn(self.organizer, recipients)
-        
+
         # Should include team members
         self.assertIn(self.user1, recipients)  # Team A member
         self.assertIn(self.user2, recipients)  # Team B member
-    
-    def test_create_fixture_notification(self):
-        """Test creating fixture notification"""
-        notification = create_fixture_notification(
-            self.fixture_24h, 
-            self.user1, 
-            '24h'
+
+    def test_ticket_holders_and_registrants_included(self):
+        """Paid ticket holders for the fixture and approved registrants are reminded"""
+        fan = User.objects.create_user(email='fan@test.com', password='testpass123')
+        athlete = User.objects.create_user(email='athlete@test.com', password='testpass123')
+        pending = User.objects.create_user(email='pending@test.com', password='testpass123')
+        TicketOrder.objects.create(
+            user=fan, event_id=self.event.id, fixture_id=self.fixture_24h.id,
+            total_cents=1000, status=TicketOrder.Status.PAID
+        )
+        TicketOrder.objects.create(
+            user=pending, event_id=self.event.id, fixture_id=self.fixture_24h.id, total_cents=1000
+        )
+        Registration.objects.create(
+            event=self.event, applicant_user=athlete, status=Registration.Status.APPROVED
         )
-        
-        self.assertEqual(notification.user, self.user1)
-        self.assertEqual(notification.notification_type, 'fixture_reminder')
-        self.assertIn('24 hours', notification.message)
-        self.assertEqual(notification.data['fixture_id'], self.fixture_24h.id)
-        self.assertEqual(notification.data['reminder_type'], '24h')
-    
+
+        recipients = get_fixture_reminder_recipients(self.fixture_24h)
+
+        self.assertIn(fan, recipients)
+        self.assertIn(athlete, recipients)
+        self.assertNotIn(pending, recipients)
+
+    def test_fixture_notification(self):
+        """Test building a fixture notification"""
+        fixture = Fixture.objects.filter(id=self.fixture_24h.id).values(*FIXTURE_FIELDS).get()
+        notification = fixture_notification(fixture, self.user1.id, '24h')
+
+        self.assertEqual(notification.user_id, self.user1.id)
+        self.assertEqual(notification.topic, 'schedule')
+        self.assertIn('24 hours', notification.body)
+        self.assertIn('Team A vs Team B', notification.body)
+        self.assertEqual(notification.link_url, f'/events/{self.event.id}/fixtures/{self.fixture_24h.id}')
+
     def test_send_fixture_reminder(self):
         """Test sending fixture reminder"""
-        # Count initial notifications
-        initial_count = Notification.objects.count()
-        
-        # Send reminder
-        send_fixture_reminder(self.fixture_24h, '24h')
-        
-        # Check notifications were created
-        new_count = Notification.objects.count()
-        self.assertGreater(new_count, initial_count)
-        
-        # Check notification content
-        notification = Notification.objects.filter(
-            notification_type='fixture_reminder',
-            data__fixture_id=self.fixture_24h.id
-        ).first()
-        
-        self.assertIsNotNone(notification)
-        self.assertEqual(notification.data['reminder_type'], '24h')
-    
+        sent = send_fixture_reminder(self.fixture_24h, '24h')
+
+        # Organizer and both players
+        self.assertEqual(sent, 3)
+        self.assertEqual(Notification.objects.filter(title__startswith='Fixture Reminder').count(), 3)
+        dispatch = ReminderDispatch.objects.get(fixture=self.fixture_24h, user=self.user1, reminder_type='24h')
+        self.assertEqual(dispatch.notification.user, self.user1)
+        self.assertEqual(NotificationUnread.objects.get(user=self.user1).count, 1)
+
     def test_send_fixture_reminders_integration(self):
         """Test the full reminder sending process"""
-        # Count initial notifications
-        initial_count = Notification.objects.count()
-        
-        # Send all reminders
-        results = send_fixture_reminders()
-        
-        # Check results
-        self.assertIn('t24h_count', results)
-        self.assertIn('t2h_count', results)
-        self.assertIn('total_reminders', results)
-        
-        # Should have found our test fixtures
-        self.assertGreaterEqual(results['t24h_count'], 1)  # Our T-24h fixture
-        self.assertGreaterEqual(results['t2h_count'], 1)   # Our T-2h fixture
-        
-        # Check notifications were created
-        new_count = Notification.objects.count()
-        self.assertGreater(new_count, initial_count)
-    
+        with self.captureOnCommitCallbacks(execute=True):
+            results = send_fixture_reminders()
+
+        self.assertEqual(results['t24h_count'], 1)
+        self.assertEqual(results['t2h_count'], 1)
+        self.assertEqual(results['total_reminders'], 2)
+        self.assertEqual(results['sent'], 6)
+        self.assertEqual(Notification.objects.count(), 6)
+        # Two reminders each, counted in bulk
+        self.assertEqual(NotificationUnread.objects.get(user=self.user2).count, 2)
+        # Email and SMS go out for every reminder
+        self.assertFalse(Notification.objects.filter(delivered_email=False).exists())
+
     def test_reminder_idempotency(self):
-        """Test that reminders are idempotent (don't send duplicates)"""
-        # Send reminder twice
-        send_fixture_reminder(self.fixture_24h, '24h')
+        """Each reminder goes out once however often the scheduler runs"""
+        send_fixture_reminders()
         first_count = Notification.objects.count()
-        
+
+        results = send_fixture_reminders()
         send_fixture_reminder(self.fixture_24h, '24h')
-        second_count = Notification.objects.count()
-        
-        # Should create new notifications each time (no deduplication in this implementation)
-        # In production, you might want to add deduplication logic
-        self.assertGreaterEqual(second_count, first_count)
-    
+
+        self.assertEqual(results['sent'], 0)
+        self.assertEqual(Notification.objects.count(), first_count)
+        self.assertEqual(ReminderDispatch.objects.count(), first_count)
+
+    def test_new_recipient_reminded_on_next_sweep(self):
+        """Recipients added after a sweep get only their own reminder"""
+        send_fixture_reminders()
+        late = User.objects.create_user(email='late@test.com', password='testpass123')
+        TeamMember.objects.create(team=self.team1, athlete=late, jersey_no=11)
+
+        results = send_fixture_reminders()
+
+        self.assertEqual(results['sent'], 2)  # one per fixture
+        self.assertEqual(set(Notification.objects.filter(user=late).values_list('title', flat=True)), {
+            'Fixture Reminder: Test Event', 'Fixture Starting Soon: Test Event'
+        })
+
+    def test_constant_queries_for_due_fixtures(self):
+        """Recipients for all due fixtures resolve in a fixed number of queries"""
+        for hours in (20, 21, 22, 23):
+            Fixture.objects.create(
+                event=self.event, home=self.team1, away=self.team2,
+                start_at=timezone.now() + timedelta(hours=hours)
+            )
+
+        due = due_fixtures()[ReminderDispatch.Type.T24H]
+        self.assertEqual(len(due), 5)
+        # Two due-fixture selects, then per reminder type: three recipient sources,
+        # the ledger read, two bulk inserts and the unread counters, in a savepoint
+        with self.assertNumQueries(22):
+            send_fixture_reminders()
+
     def test_reminder_windows(self):
         """Test that reminders are only sent for fixtures in correct time windows"""
         # Create fixture outside any reminder window
-        future_fixture = Fixture.objects.create(
+        Fixture.objects.create(
             event=self.event,
-            home_team=self.team1,
-            away_team=self.team2,
-            starts_at=timezone.now() + timedelta(days=7),  # 7 days from now
+            home=self.team1,
+            away=self.team2,
+            start_at=timezone.now() + timedelta(days=7),  # 7 days from now
             status=Fixture.Status.SCHEDULED
         )
-        
+
         # Send reminders
         results = send_fixture_reminders()
-        
+
         # Should only find fixtures in the correct windows
         # Our future fixture should not be included
         total_expected = 2  # Our T-24h and T-2h fixtures
         self.assertEqual(results['total_reminders'], total_expected)
-    
-    def test_reminder_for_cancelled_fixture(self):
-        """Test that reminders are not sent for cancelled fixtures"""
-        # Cancel the T-24h fixture
-        self.fixture_24h.status = Fixture.Status.CANCELLED
+
+    def test_reminder_for_started_fixture(self):
+        """Test that reminders are not sent for fixtures no longer scheduled"""
+        self.fixture_24h.status = Fixture.Status.LIVE
         self.fixture_24h.save()
-        
+
         # Send reminders
         results = send_fixture_reminders()
-        
+
         # Should only find the T-2h fixture
         self.assertEqual(results['t24h_count'], 0)
         self.assertEqual(results['t2h_count'], 1)
         self.assertEqual(results['total_reminders'], 1)
-    
-    def test_reminder_data_structure(self):
-        """Test that reminder data contains expected fields"""
-        notification = create_fixture_notification(
-            self.fixture_24h, 
-            self.user1, 
-            '24h'
+
+    def test_dry_run_sends_nothing(self):
+        results = send_fixture_reminders(dry_run=True)
+
+        self.assertEqual(results['sent'], 6)
+        self.assertFalse(Notification.objects.exists())
+        self.assertFalse(ReminderDispatch.objects.exists())
+
+    def test_cleanup_removes_old_schedule_notifications_only(self):
+        send_fixture_reminders()
+        old = timezone.now() - timedelta(days=31)
+        Notification.objects.update(created_at=old)
+        other = Notification.objects.create(
+            user=self.organizer, topic='payment', title='Receipt', body='Paid', created_at=old
         )
-        
-        data = notification.data
-        
-        # Check required fields
-        self.assertIn('fixture_id', data)
-        self.assertIn('event_id', data)
-        self.assertIn('reminder_type', data)
-        self.assertIn('starts_at', data)
-        
-        # Check values
-        self.assertEqual(data['fixture_id'], self.fixture_24h.id)
-        self.assertEqual(data['event_id'], self.event.id)
-        self.assertEqual(data['reminder_type'], '24h')
-        self.assertIsNotNone(data['starts_at'])
+        dispatches = ReminderDispatch.objects.count()
+
+        self.assertEqual(cleanup_old_notifications(), {'deleted_count': dispatches})
+        self.assertEqual(list(Notification.objects.all()), [other])
+        self.assertEqual(ReminderDispatch.objects.filter(notification__isnull=True).count(), dispatches)
+        self.assertEqual(send_fixture_reminders()['sent'], 0)
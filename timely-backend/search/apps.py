@@ -0,0 +1,27 @@
+# search/apps.py
+from django.apps import AppConfig
+from django.db.models.signals import post_migrate
+
+
+def _build_empty_index(sender, **kwargs):
+    """Fill the index the first time the app is migrated; rebuild_search_index refreshes it later"""
+    from .backends import PostgresBackend, get_backend
+    from .models import SearchDocument
+    from .services import rebuild
+
+    # The local index loads lazily and keeps nothing; built now, it would go stale
+    # under TestCase, whose writes never commit
+    if not isinstance(get_backend(), PostgresBackend):
+        return
+    if not SearchDocument.objects.exists():
+        rebuild()
+
+
+class SearchConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'search'
+
+    def ready(self):
+        from .signals import connect_search_signals
+        connect_search_signals()
+        post_migrate.connect(_build_empty_index, sender=self, dispatch_uid='search:build-empty-index')
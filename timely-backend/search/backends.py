@@ -0,0 +1,291 @@
+# search/backends.py
+"""
+Search backends.
+
+PostgresBackend stores one SearchDocument row per object. A query matches a
+document when every query word is a prefix of one of its words (a GIN-indexed
+tsvector, 'simple' configuration) or when the query is similar enough to its
+title and keywords (a GIN trigram index, pg_trgm's word similarity operator),
+which catches typos. Documents rank by ts_rank plus a smaller share of the
+trigram similarity, so exact and prefix hits come first.
+
+LocalBackend answers the same queries from an in-process inverted index built
+from the models on first use, for tests and SQLite. Each process keeps its
+own copy, updated by the signals of writes made in that process.
+"""
+import bisect
+import threading
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Set
+
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector, TrigramWordSimilarity
+from django.core.signals import setting_changed
+from django.db import connection
+from django.db.models import Case, F, FloatField, OuterRef, Q, QuerySet, Subquery, Value, When
+from django.dispatch import receiver
+
+from .documents import Document, build_documents, tokenize
+from .models import SearchDocument
+
+CONFIG = 'simple'
+RANK_WEIGHTS = {'title': 1.0, 'keywords': 0.4, 'body': 0.2}  # ts_rank's defaults for A, B, C
+TRIGRAM_WEIGHT = 0.1
+WRITE_BATCH_SIZE = 1000
+
+
+class PostgresBackend:
+    """Full-text and trigram search over SearchDocument rows"""
+
+    def index(self, documents: Iterable[Document]) -> int:
+        count = 0
+        batch: List[Document] = []
+        for document in documents:
+            batch.append(document)
+            if len(batch) >= WRITE_BATCH_SIZE:
+                count += self._write(batch)
+                batch = []
+        if batch:
+            count += self._write(batch)
+        return count
+
+    @staticmethod
+    def _write(documents: List[Document]) -> int:
+        SearchDocument.objects.bulk_create(
+            [
+                SearchDocument(kind=document.kind, object_id=document.object_id, title=document.title[:255],
+                               keywords=document.keywords, body=document.body, text=document.text)
+                for document in documents
+            ],
+            update_conflicts=True,
+            unique_fields=['kind', 'object_id'],
+            update_fields=['title', 'keywords', 'body', 'text', 'updated_at'],
+        )
+        by_kind = defaultdict(list)
+        for document in documents:
+            by_kind[document.kind].append(document.object_id)
+        for kind, ids in by_kind.items():
+            SearchDocument.objects.filter(kind=kind, object_id__in=ids).update(vector=(
+                SearchVector('title', weight='A', config=CONFIG)
+                + SearchVector('keywords', weight='B', config=CONFIG)
+                + SearchVector('body', weight='C', config=CONFIG)
+            ))
+        return len(documents)
+
+    def remove(self, kind: str, ids: Iterable[int]):
+        SearchDocument.objects.filter(kind=kind, object_id__in=list(ids)).delete()
+
+    def clear(self, kind: Optional[str] = None):
+        documents = SearchDocument.objects.all()
+        if kind:
+            documents = documents.filter(kind=kind)
+        documents.delete()
+
+    def apply(self, queryset: QuerySet, kind: str, terms: List[str]) -> QuerySet:
+        # Words are \w+ runs, so none carries tsquery syntax
+        query = SearchQuery(' & '.join(f"{term}:*" for term in terms), search_type='raw', config=CONFIG)
+        phrase = ' '.join(terms)
+        matches = SearchDocument.objects.filter(kind=kind).filter(
+            Q(vector=query) | Q(text__trigram_word_similar=phrase)
+        )
+        rank = (
+            SearchDocument.objects.filter(kind=kind, object_id=OuterRef('pk'))
+            .annotate(rank=SearchRank(F('vector'), query) + TrigramWordSimilarity(phrase, 'text') * TRIGRAM_WEIGHT)
+            .values('rank')[:1]
+        )
+        return queryset.filter(pk__in=matches.values('object_id')).annotate(
+            search_rank=Subquery(rank, output_field=FloatField())
+        )
+
+
+def trigrams(word: str) -> Set[str]:
+    """pg_trgm's trigrams of a word: padded with two spaces before and one after"""
+    padded = f'  {word} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class _KindIndex:
+    """Inverted index of one kind's documents"""
+
+    def __init__(self):
+        self.documents: Dict[int, Dict[str, float]] = {}
+        self.postings: Dict[str, Dict[int, float]] = defaultdict(dict)
+        self.fuzzy_documents: Dict[int, Set[str]] = {}
+        self.fuzzy_postings: Dict[str, Set[int]] = defaultdict(set)
+        self.trigram_words: Dict[str, Set[str]] = defaultdict(set)
+        self._vocabulary: Optional[List[str]] = None
+
+    def add(self, document: Document):
+        self.remove(document.object_id)
+        weights: Dict[str, float] = {}
+        for field in ('body', 'keywords', 'title'):  # heaviest last, so it wins
+            for word in tokenize(getattr(document, field)):
+                weights[word] = RANK_WEIGHTS[field]
+        self.documents[document.object_id] = weights
+        for word, weight in weights.items():
+            self.postings[word][document.object_id] = weight
+
+        fuzzy = set(tokenize(document.text))
+        self.fuzzy_documents[document.object_id] = fuzzy
+        for word in fuzzy:
+            if not self.fuzzy_postings[word]:
+                for trigram in trigrams(word):
+                    self.trigram_words[trigram].add(word)
+            self.fuzzy_postings[word].add(document.object_id)
+        self._vocabulary = None
+
+    def remove(self, object_id: int):
+        for word in self.documents.pop(object_id, {}):
+            postings = self.postings[word]
+            postings.pop(object_id, None)
+            if not postings:
+                del self.postings[word]
+        for word in self.fuzzy_documents.pop(object_id, ()):
+            postings = self.fuzzy_postings[word]
+            postings.discard(object_id)
+            if not postings:
+                del self.fuzzy_postings[word]
+                for trigram in trigrams(word):
+                    self.trigram_words[trigram].discard(word)
+        self._vocabulary = None
+
+    def _prefixed(self, term: str) -> List[str]:
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self.postings)
+        start = bisect.bisect_left(self._vocabulary, term)
+        end = bisect.bisect_left(self._vocabulary, term + '\uffff')
+        return self._vocabulary[start:end]
+
+    def _similar(self, term: str, threshold: float) -> Dict[str, float]:
+        """Words whose trigrams cover at least threshold of the term's (pg_trgm word similarity, per word)"""
+        term_trigrams = trigrams(term)
+        shared = Counter(word for trigram in term_trigrams for word in self.trigram_words.get(trigram, ()))
+        return {
+            word: count / len(term_trigrams)
+            for word, count in shared.items()
+            if count / len(term_trigrams) >= threshold
+        }
+
+    def search(self, terms: List[str], threshold: float) -> Dict[int, float]:
+        """Scores of documents matching every term by prefix or, failing that, by similarity"""
+        scores: Optional[Dict[int, float]] = None
+        for term in terms:
+            term_scores: Dict[int, float] = {}
+            for word in self._prefixed(term):
+                for object_id, weight in self.postings[word].items():
+                    if weight > term_scores.get(object_id, 0.0):
+                        term_scores[object_id] = weight
+            for word, similarity in self._similar(term, threshold).items():
+                for object_id in self.fuzzy_postings[word]:
+                    term_scores.setdefault(object_id, similarity * TRIGRAM_WEIGHT)
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {
+                    object_id: score + term_scores[object_id]
+                    for object_id, score in scores.items() if object_id in term_scores
+                }
+            if not scores:
+                return {}
+        return scores or {}
+
+
+class LocalBackend:
+    """In-process inverted index, loaded from the models per kind on first search"""
+
+    def __init__(self, threshold: float = 0.6, max_results: int = 1000):
+        self.threshold = threshold
+        self.max_results = max_results
+        self._kinds: Dict[str, _KindIndex] = {}
+        self._lock = threading.Lock()
+
+    def _kind(self, kind: str) -> _KindIndex:
+        index = self._kinds.get(kind)
+        if index is None:
+            index = _KindIndex()
+            for document in build_documents(kind):
+                index.add(document)
+            self._kinds[kind] = index
+        return index
+
+    def index(self, documents: Iterable[Document]) -> int:
+        count = 0
+        with self._lock:
+            for document in documents:
+                count += 1
+                # A kind not loaded yet reads current rows when first searched
+                if document.kind in self._kinds:
+                    self._kinds[document.kind].add(document)
+        return count
+
+    def remove(self, kind: str, ids: Iterable[int]):
+        with self._lock:
+            index = self._kinds.get(kind)
+            if index is not None:
+                for object_id in ids:
+                    index.remove(object_id)
+
+    def clear(self, kind: Optional[str] = None):
+        """Empty one kind's index, which the caller then refills, or drop them all to reload on use"""
+        with self._lock:
+            if kind:
+                self._kinds[kind] = _KindIndex()
+            else:
+                self._kinds.clear()
+
+    def search(self, kind: str, terms: List[str]) -> List[tuple]:
+        """(object id, score) pairs, best first"""
+        with self._lock:
+            scores = self._kind(kind).search(terms, self.threshold)
+        return sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:self.max_results]
+
+    def apply(self, queryset: QuerySet, kind: str, terms: List[str]) -> QuerySet:
+        ranked = self.search(kind, terms)
+        if not ranked:
+            return queryset.none().annotate(search_rank=Value(0.0, output_field=FloatField()))
+        # Scores repeat a lot (they are sums of a few field weights): one WHEN per score
+        by_score = defaultdict(list)
+        for object_id, score in ranked:
+            by_score[score].append(object_id)
+        return queryset.filter(pk__in=[object_id for object_id, _ in ranked]).annotate(search_rank=Case(
+            *[When(pk__in=ids, then=Value(score)) for score, ids in by_score.items()],
+            output_field=FloatField(),
+        ))
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend():
+    """The process-wide backend chosen by SEARCH_BACKEND ('auto' picks by database vendor)"""
+    global _backend
+    backend = _backend
+    if backend is None:
+        with _backend_lock:
+            if _backend is None:
+                name = getattr(settings, 'SEARCH_BACKEND', 'auto')
+                if name == 'auto':
+                    name = 'postgres' if connection.vendor == 'postgresql' else 'local'
+                if name == 'postgres':
+                    _backend = PostgresBackend()
+                else:
+                    _backend = LocalBackend(
+                        threshold=getattr(settings, 'SEARCH_TRIGRAM_THRESHOLD', 0.6),
+                        max_results=getattr(settings, 'SEARCH_MAX_RESULTS', 1000),
+                    )
+            backend = _backend
+    return backend
+
+
+def reset_backend():
+    """Drop the process-wide backend (and any local index); rebuilt on next use"""
+    global _backend
+    with _backend_lock:
+        _backend = None
+
+
+@receiver(setting_changed)
+def _reset_on_setting_change(setting, **kwargs):
+    if setting.startswith('SEARCH_'):
+        reset_backend()
@@ -0,0 +1,84 @@
+# search/documents.py
+"""
+What each searchable model contributes to the index.
+
+A document has a title (weight A), keywords (B) and a body (C); the title and
+keywords also feed typo-tolerant matching. Event documents carry their
+venue's name, so renaming a venue re-indexes its events.
+"""
+import re
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from django.apps import apps
+from django.db.models import Model, QuerySet
+
+CHUNK_SIZE = 2000
+
+_WORD = re.compile(r'\w+')
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased words of text, as the 'simple' text search configuration splits them"""
+    return _WORD.findall(text.lower())
+
+
+class Document(NamedTuple):
+    kind: str
+    object_id: int
+    title: str
+    keywords: str
+    body: str
+
+    @property
+    def text(self) -> str:
+        """Title and keywords, matched by trigram for typos"""
+        return ' '.join(part for part in (self.title, self.keywords) if part).lower()
+
+
+class SearchKind(NamedTuple):
+    model: str
+    related: Tuple[str, ...]
+    fields: Callable[[Model], Tuple[str, Iterable[Optional[str]], Iterable[Optional[str]]]]
+
+    def get_model(self):
+        return apps.get_model(self.model)
+
+
+def _join(parts: Iterable[Optional[str]]) -> str:
+    return ' '.join(part for part in parts if part)
+
+
+KINDS: Dict[str, SearchKind] = {
+    'event': SearchKind(
+        'events.Event', ('venue',),
+        lambda event: (
+            event.name,
+            (event.sport, event.location, event.venue.name if event.venue_id else None),
+            (event.description,),
+        ),
+    ),
+    'news': SearchKind(
+        'content.News', (),
+        lambda news: (news.title, (news.excerpt, news.seo_title), (news.body,)),
+    ),
+    'venue': SearchKind(
+        'venues.Venue', (),
+        lambda venue: (venue.name, (venue.address,), ()),
+    ),
+}
+
+
+def kind_for_model(model) -> Optional[str]:
+    label = model._meta.label
+    return next((kind for kind, spec in KINDS.items() if spec.model == label), None)
+
+
+def build_documents(kind: str, ids: Optional[Iterable[int]] = None) -> Iterator[Document]:
+    """Documents for the given objects of a kind (all of them without ids)"""
+    spec = KINDS[kind]
+    queryset: QuerySet = spec.get_model().objects.select_related(*spec.related).order_by()
+    if ids is not None:
+        queryset = queryset.filter(pk__in=list(ids))
+    for obj in queryset.iterator(chunk_size=CHUNK_SIZE):
+        title, keywords, body = spec.fields(obj)
+        yield Document(kind, obj.pk, title or '', _join(keywords), _join(body))
@@ -0,0 +1,23 @@
+# search/filters.py
+from rest_framework.filters import SearchFilter
+from rest_framework.settings import api_settings
+
+from .services import search_queryset
+
+
+class IndexedSearchFilter(SearchFilter):
+    """
+    ?search= (or ?q=) through the search index for views that set
+    search_kind; others get DRF's icontains search over search_fields.
+
+    List it after OrderingFilter: matches come best first unless the request
+    asks for an ordering, which is then kept.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        kind = getattr(view, 'search_kind', None)
+        if kind is None:
+            return super().filter_queryset(request, queryset, view)
+        params = request.query_params
+        query = params.get(self.search_param) or params.get('q')
+        return search_queryset(queryset, kind, query, order=not params.get(api_settings.ORDERING_PARAM))
@@ -0,0 +1,106 @@
+import random
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Q
+from django.test import override_settings
+from django.utils import timezone
+
+from events.models import Event
+from search.backends import get_backend
+from search.services import rebuild, search_queryset
+
+User = get_user_model()
+
+SPORTS = ['Basketball', 'Football', 'Netball', 'Cricket', 'Volleyball', 'Hockey', 'Tennis', 'Rugby', 'Swimming']
+PLACES = ['Melbourne', 'Sydney', 'Brisbane', 'Perth', 'Adelaide', 'Hobart', 'Darwin', 'Canberra', 'Geelong']
+STAGES = ['Championship', 'Cup', 'League Round', 'Invitational', 'Open', 'Classic', 'Shield', 'Carnival']
+WORDS = (
+    'junior senior masters regional state national club school charity social community mixed '
+    'division finals qualifier knockout friendly twilight weekend indoor outdoor youth women men'
+).split()
+
+QUERIES = ['basketball', 'bask', 'basketbal', 'perth netball', 'twilight cup', 'zzzz']
+
+
+class Command(BaseCommand):
+    help = 'Benchmark event search at scale: the legacy icontains filter vs the search index'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--events', type=int, default=100000, help='Events to generate')
+        parser.add_argument('--repeat', type=int, default=5, help='Runs per query')
+        parser.add_argument('--backend', choices=['auto', 'postgres', 'local'], default='auto')
+
+    def handle(self, *args, **options):
+        # Everything runs inside a transaction that is rolled back at the end
+        with override_settings(SEARCH_BACKEND=options['backend']), transaction.atomic():
+            self._setup(options['events'])
+            started = time.perf_counter()
+            rebuild(['event'])
+            if connection.vendor == 'postgresql':
+                with connection.cursor() as cursor:
+                    cursor.execute('ANALYZE events_event')
+                    cursor.execute('ANALYZE search_searchdocument')
+            self.stdout.write(
+                f'{options["events"]} events, {type(get_backend()).__name__} '
+                f'indexed in {time.perf_counter() - started:.2f}s'
+            )
+            self.stdout.write(f'{"query":16s} {"icontains ms":>12} {"hits":>7} {"index ms":>9} {"hits":>7} {"speedup":>8}')
+
+            events = Event.objects.filter(visibility='PUBLIC', status=Event.Status.UPCOMING)
+            for query in QUERIES:
+                legacy_ms, legacy_hits = self._measure(lambda: self._legacy(events, query), options['repeat'])
+                index_ms, index_hits = self._measure(
+                    lambda: search_queryset(events, 'event', query), options['repeat']
+                )
+                self.stdout.write(
+                    f'{query:16s} {legacy_ms:12.2f} {legacy_hits:7d} {index_ms:9.2f} {index_hits:7d} '
+                    f'{legacy_ms / index_ms if index_ms else 0:7.1f}x'
+                )
+            transaction.set_rollback(True)
+
+    def _setup(self, count):
+        rng = random.Random(42)
+        owner = User.objects.create_user(email=f'bench-{time.time_ns()}@timely.local', password='bench-password')
+        start = timezone.now() + timedelta(days=30)
+        batch = []
+        for i in range(count):
+            sport = rng.choice(SPORTS)
+            place = rng.choice(PLACES)
+            batch.append(Event(
+                name=f'{place} {sport} {rng.choice(STAGES)} {2025 + i % 3}',
+                sport=sport,
+                location=f'{place} {rng.choice(WORDS).title()} Centre',
+                description=' '.join(rng.choice(WORDS) for _ in range(30)),
+                start_datetime=start + timedelta(hours=i % 2000),
+                end_datetime=start + timedelta(hours=i % 2000 + 3),
+                created_by=owner,
+            ))
+            if len(batch) == 5000:
+                Event.objects.bulk_create(batch)
+                batch = []
+        if batch:
+            Event.objects.bulk_create(batch)
+
+    @staticmethod
+    def _legacy(events, query):
+        """The previous filter: icontains over name, description and location, OR'ed"""
+        return events.filter(
+            Q(name__icontains=query) | Q(description__icontains=query) | Q(location__icontains=query)
+        ).order_by('start_datetime', 'created_at')
+
+    @staticmethod
+    def _measure(make_queryset, repeat):
+        """Mean ms to fetch a listing's first page and its count"""
+        elapsed = 0.0
+        hits = 0
+        for _ in range(repeat):
+            started = time.perf_counter()
+            queryset = make_queryset()
+            list(queryset[:20])
+            hits = queryset.count()
+            elapsed += time.perf_counter() - started
+        return elapsed / repeat * 1000, hits
@@ -0,0 +1,27 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from search.backends import get_backend
+from search.documents import KINDS
+from search.services import rebuild
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the event, news and venue search index from the current rows (e.g. after bulk imports)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('kinds', nargs='*', help=f'Kinds to rebuild (default all: {", ".join(KINDS)})')
+
+    def handle(self, *args, **options):
+        unknown = set(options['kinds']) - set(KINDS)
+        if unknown:
+            raise CommandError(f'Unknown kinds: {", ".join(sorted(unknown))}')
+
+        started = time.perf_counter()
+        counts = rebuild(options['kinds'] or None)
+        self.stdout.write(
+            f'{type(get_backend()).__name__}: indexed '
+            + ', '.join(f'{count} {kind}' for kind, count in counts.items())
+            + f' in {time.perf_counter() - started:.2f}s'
+        )
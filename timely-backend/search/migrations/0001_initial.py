@@ -0,0 +1,55 @@
+# Generated by Django 5.2.6 on 2026-10-16 22:25
+
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+# GIN indexes are PostgreSQL-only; other databases use the local backend
+INDEXES = (
+    ('search_document_vector_gin', 'USING gin (vector)'),
+    ('search_document_text_trgm', 'USING gin (text gin_trgm_ops)'),
+)
+
+
+def create_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, method in INDEXES:
+        schema_editor.execute(f'CREATE INDEX IF NOT EXISTS {name} ON search_searchdocument {method}')
+
+
+def drop_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, _ in INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('event', 'Event'), ('news', 'News'), ('venue', 'Venue')], max_length=10)),
+                ('object_id', models.PositiveIntegerField()),
+                ('title', models.CharField(max_length=255)),
+                ('keywords', models.TextField(blank=True)),
+                ('body', models.TextField(blank=True)),
+                ('text', models.TextField(blank=True)),
+                ('vector', django.contrib.postgres.search.SearchVectorField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('kind', 'object_id'), name='search_document_unique_object')],
+            },
+        ),
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
@@ -0,0 +1,34 @@
+# search/models.py
+from django.contrib.postgres.search import SearchVectorField
+from django.db import models
+
+
+class SearchDocument(models.Model):
+    """
+    Searchable text of one event, news article or venue, kept in sync by
+    search.signals. Full-text matching uses vector (title weighted A,
+    keywords B, body C); typo-tolerant matching uses text, the title and
+    keywords, through a trigram index.
+    """
+
+    class Kind(models.TextChoices):
+        EVENT = 'event', 'Event'
+        NEWS = 'news', 'News'
+        VENUE = 'venue', 'Venue'
+
+    kind = models.CharField(max_length=10, choices=Kind.choices)
+    object_id = models.PositiveIntegerField()
+    title = models.CharField(max_length=255)
+    keywords = models.TextField(blank=True)
+    body = models.TextField(blank=True)
+    text = models.TextField(blank=True)
+    vector = SearchVectorField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'object_id'], name='search_document_unique_object'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind}:{self.object_id} {self.title}"
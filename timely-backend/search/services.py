@@ -0,0 +1,62 @@
+# search/services.py
+"""
+Indexing and querying, whichever backend is configured.
+
+Listings call search_queryset() with the queryset they would show anyway, so
+visibility rules stay in the views: search only narrows it to the matches
+and annotates each row with search_rank.
+"""
+from typing import Iterable, List, Optional
+
+from django.db import transaction
+from django.db.models import QuerySet
+
+from .backends import get_backend
+from .documents import KINDS, build_documents, tokenize
+
+MAX_TERMS = 8
+
+
+def search_terms(query: Optional[str]) -> List[str]:
+    """The words of a query that are searched (at most MAX_TERMS)"""
+    return tokenize(query or '')[:MAX_TERMS]
+
+
+def search_queryset(queryset: QuerySet, kind: str, query: Optional[str], order: bool = True) -> QuerySet:
+    """
+    Narrow queryset to the objects of kind matching query, best match first
+    (unless order is False); a query without words leaves it unchanged.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return queryset
+    results = get_backend().apply(queryset, kind, terms)
+    return results.order_by('-search_rank', 'pk') if order else results
+
+
+def index_objects(kind: str, ids: Iterable[int]) -> int:
+    """(Re)index the given objects of a kind; ids that no longer exist are dropped from the index"""
+    ids = set(ids)
+    backend = get_backend()
+    documents = list(build_documents(kind, ids))
+    backend.index(documents)
+    missing = ids.difference(document.object_id for document in documents)
+    if missing:
+        backend.remove(kind, missing)
+    return len(documents)
+
+
+def remove_objects(kind: str, ids: Iterable[int]):
+    get_backend().remove(kind, list(ids))
+
+
+def rebuild(kinds: Optional[Iterable[str]] = None) -> dict:
+    """Replace the index of each kind (all by default) with its current rows; returns documents per kind"""
+    backend = get_backend()
+    counts = {}
+    for kind in kinds or KINDS:
+        # One transaction per kind, so searches never see it half-built
+        with transaction.atomic():
+            backend.clear(kind)
+            counts[kind] = backend.index(build_documents(kind))
+    return counts
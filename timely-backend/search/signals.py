@@ -0,0 +1,44 @@
+# search/signals.py
+"""
+Keep the search index in step with events, news and venues.
+
+Writes are indexed after commit. A venue's events are re-indexed with it,
+since their documents carry its name. Bulk updates bypass these signals;
+rebuild_search_index catches the index up after them.
+"""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete
+
+from .documents import KINDS, kind_for_model
+from .services import index_objects, remove_objects
+
+
+def _index_on_save(sender, instance, **kwargs):
+    kind = kind_for_model(sender)
+    pk = instance.pk
+    transaction.on_commit(lambda: index_objects(kind, [pk]), robust=True)
+    if kind == 'venue':
+        event_ids = list(instance.events.values_list('pk', flat=True))
+        if event_ids:
+            transaction.on_commit(lambda: index_objects('event', event_ids), robust=True)
+
+
+def _remove_on_delete(sender, instance, **kwargs):
+    kind = kind_for_model(sender)
+    pk = instance.pk
+    transaction.on_commit(lambda: remove_objects(kind, [pk]), robust=True)
+
+
+def _reindex_venue_events(sender, instance, **kwargs):
+    # Captured before the delete clears their venue
+    event_ids = list(instance.events.values_list('pk', flat=True))
+    if event_ids:
+        transaction.on_commit(lambda: index_objects('event', event_ids), robust=True)
+
+
+def connect_search_signals() -> None:
+    for kind, spec in KINDS.items():
+        model = spec.get_model()
+        post_save.connect(_index_on_save, sender=model, dispatch_uid=f'search:{kind}:save')
+        post_delete.connect(_remove_on_delete, sender=model, dispatch_uid=f'search:{kind}:delete')
+    pre_delete.connect(_reindex_venue_events, sender=KINDS['venue'].get_model(), dispatch_uid='search:venue:events')
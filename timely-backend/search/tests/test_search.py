@@ -0,0 +1,174 @@
+# search/tests/test_search.py
+from datetime import timedelta
+from unittest import skipUnless
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from events.models import Event
+from search.apps import _build_empty_index
+from search.backends import LocalBackend, get_backend, reset_backend
+from search.documents import Document
+from search.models import SearchDocument
+from search.services import rebuild, search_queryset
+from venues.models import Venue
+
+User = get_user_model()
+
+
+def document(object_id, title, keywords='', body=''):
+    return Document('event', object_id, title, keywords, body)
+
+
+class LocalIndexTest(SimpleTestCase):
+    """Test the in-process inverted index on its own"""
+
+    def setUp(self):
+        self.backend = LocalBackend(threshold=0.6)
+        with patch('search.backends.build_documents', return_value=[]):
+            self.backend._kind('event')  # loaded, empty
+        self.backend.index([
+            document(1, 'Perth Basketball Cup', 'Basketball Perth Arena', 'Junior finals'),
+            document(2, 'Sydney Netball Open', 'Netball Sydney', 'Basketball clinic after the finals'),
+            document(3, 'Hobart Football League', 'Football Hobart', 'Twilight round'),
+        ])
+
+    def search(self, query):
+        return [object_id for object_id, _ in self.backend.search('event', query.lower().split())]
+
+    def test_prefix_matches_rank_title_hits_first(self):
+        self.assertEqual(self.search('bask'), [1, 2])
+
+    def test_every_word_must_match(self):
+        self.assertEqual(self.search('basketball perth'), [1])
+        self.assertEqual(self.search('basketball hobart'), [])
+
+    def test_typos_match_titles_and_keywords(self):
+        self.assertEqual(self.search('basketbal'), [1, 2])  # 2 by prefix of its body
+        self.assertEqual(self.search('netbal sydny'), [2])
+        self.assertEqual(self.search('footbll'), [3])
+        self.assertEqual(self.search('twilite'), [])  # body words are not typo-matched
+
+    def test_reindex_and_remove(self):
+        self.backend.index([document(3, 'Hobart Basketball League', 'Basketball Hobart')])
+        self.assertEqual(self.search('football'), [])
+        self.assertEqual(self.search('basketball hobart'), [3])
+
+        self.backend.remove('event', [1])
+        self.assertEqual(self.search('perth'), [])
+
+
+class SearchFixtureMixin:
+    def make_event(self, name, **fields):
+        start = timezone.now() + timedelta(days=7)
+        fields.setdefault('sport', 'Basketball')
+        return Event.objects.create(
+            name=name, start_datetime=start, end_datetime=start + timedelta(hours=3),
+            created_by=self.owner, **fields,
+        )
+
+    def setUp(self):
+        reset_backend()
+        self.addCleanup(reset_backend)
+        self.owner = User.objects.create_user(email='organizer@test.com', password='testpass123')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.arena = Venue.objects.create(name='Docklands Arena', address='1 Harbour St', created_by=self.owner)
+            self.final = self.make_event('Grand Final', description='Season decider', venue=self.arena)
+            self.clinic = self.make_event('Junior Clinic', sport='Netball', description='Skills for grand juniors')
+            self.cup = self.make_event('Winter Cup', sport='Football', location='Perth')
+
+
+@override_settings(SEARCH_BACKEND='local')
+class LocalSearchTest(SearchFixtureMixin, APITestCase):
+    """Test listings searched through the local backend"""
+
+    def test_search_ranks_and_narrows_the_queryset(self):
+        results = search_queryset(Event.objects.all(), 'event', 'grand')
+        self.assertEqual(list(results), [self.final, self.clinic])
+        self.assertGreater(results[0].search_rank, results[1].search_rank)
+
+        # Visibility filters of the listing still apply
+        results = search_queryset(Event.objects.exclude(pk=self.final.pk), 'event', 'grand')
+        self.assertEqual(list(results), [self.clinic])
+
+    def test_signals_keep_the_index_current(self):
+        self.assertEqual(list(search_queryset(Event.objects.all(), 'event', 'docklands')), [self.final])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.arena.name = 'Riverside Stadium'
+            self.arena.save()
+            self.cup.name = 'Winter Shield'
+            self.cup.save()
+        self.assertEqual(list(search_queryset(Event.objects.all(), 'event', 'docklands')), [])
+        self.assertEqual(list(search_queryset(Event.objects.all(), 'event', 'riverside')), [self.final])
+        self.assertEqual(list(search_queryset(Event.objects.all(), 'event', 'shield')), [self.cup])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.cup.delete()
+        self.assertEqual(list(search_queryset(Event.objects.all(), 'event', 'winter')), [])
+
+    def test_public_listing_searches_the_index(self):
+        response = self.client.get('/api/public/events/', {'search': 'footbal'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([event['id'] for event in response.data], [self.cup.id])
+
+    def test_authenticated_listing_orders_by_relevance_unless_asked(self):
+        self.client.force_authenticate(self.owner)
+
+        response = self.client.get('/api/events/', {'search': 'grand'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([event['id'] for event in response.data['results']], [self.final.id, self.clinic.id])
+
+        response = self.client.get('/api/events/', {'q': 'grand', 'ordering': '-name'})
+        self.assertEqual([event['id'] for event in response.data['results']], [self.clinic.id, self.final.id])
+
+
+@override_settings(SEARCH_BACKEND='local')
+class MigrateHookTest(TestCase):
+    """Test that migrating leaves the local index to load on first search"""
+
+    def test_local_index_is_not_built_on_migrate(self):
+        reset_backend()
+        self.addCleanup(reset_backend)
+        _build_empty_index(sender=None)
+        self.assertEqual(get_backend()._kinds, {})
+
+        # Not committed, so no signal reaches the index; the first search reads the row
+        owner = User.objects.create_user(email='organizer@test.com', password='testpass123')
+        start = timezone.now() + timedelta(days=7)
+        event = Event.objects.create(
+            name='Harbour Regatta', sport='Sailing', start_datetime=start,
+            end_datetime=start + timedelta(hours=3), created_by=owner,
+        )
+        self.assertEqual(list(search_queryset(Event.objects.all(), 'event', 'regatta')), [event])
+
+
+@skipUnless(connection.vendor == 'postgresql', 'PostgreSQL full-text and trigram search')
+@override_settings(SEARCH_BACKEND='postgres')
+class PostgresSearchTest(SearchFixtureMixin, TestCase):
+    """Test the full-text and trigram backend"""
+
+    def search(self, query):
+        return list(search_queryset(Event.objects.all(), 'event', query))
+
+    def test_documents_are_written_on_commit(self):
+        self.assertEqual(SearchDocument.objects.filter(kind='event').count(), 3)
+        self.assertEqual(SearchDocument.objects.filter(kind='venue').count(), 1)
+
+    def test_prefix_typo_and_ranking(self):
+        self.assertEqual(self.search('grand'), [self.final, self.clinic])
+        self.assertEqual(self.search('dock'), [self.final])
+        self.assertEqual(self.search('footbal perth'), [self.cup])
+        self.assertEqual(self.search('netbal'), [self.clinic])
+        self.assertEqual(self.search('cricket'), [])
+
+    def test_rebuild_catches_up_after_bulk_updates(self):
+        Event.objects.filter(pk=self.cup.pk).update(name='Summer Shield')
+        self.assertEqual(self.search('shield'), [])
+
+        self.assertEqual(rebuild(['event']), {'event': 3})
+        self.assertEqual(self.search('shield'), [self.cup])
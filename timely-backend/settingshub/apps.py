@@ -5,3 +5,7 @@ from django.apps import AppConfig
 class SettingshubConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'settingshub'
+
+    def ready(self):
+        from .services.snapshot import connect_snapshot_signals
+        connect_snapshot_signals()
@@ -0,0 +1,72 @@
+# Generated by Django 5.2.6 on 2026-10-16 22:59
+
+import django.core.validators
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeatureFlag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(help_text='Feature flag name (e.g., "enable_payments")', max_length=100, unique=True)),
+                ('description', models.TextField(blank=True, help_text='Description of what this feature flag controls')),
+                ('enabled', models.BooleanField(default=False, help_text='Whether this feature is enabled')),
+                ('enabled_for_all', models.BooleanField(default=False, help_text='Enable for all users (overrides user-specific settings)')),
+                ('enabled_for_roles', models.JSONField(blank=True, default=list, help_text='List of roles this feature is enabled for')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='created_feature_flags', to=settings.AUTH_USER_MODEL)),
+                ('enabled_for_users', models.ManyToManyField(blank=True, help_text='Specific users this feature is enabled for', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='SiteSetting',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('site_name', models.CharField(default='Timely Events', help_text='Site name displayed in header and emails', max_length=200)),
+                ('site_logo', models.ImageField(blank=True, help_text='Site logo (PNG/JPG, recommended 200x60px)', null=True, upload_to='settings/')),
+                ('site_favicon', models.ImageField(blank=True, help_text='Site favicon (PNG/ICO, recommended 32x32px)', null=True, upload_to='settings/')),
+                ('primary_color', models.CharField(default='#007bff', help_text='Primary brand color (hex code)', max_length=7, validators=[django.core.validators.RegexValidator(message='Enter a valid hex color code (e.g., #007bff)', regex='^#[0-9A-Fa-f]{6}$')])),
+                ('secondary_color', models.CharField(default='#6c757d', help_text='Secondary brand color (hex code)', max_length=7, validators=[django.core.validators.RegexValidator(message='Enter a valid hex color code (e.g., #6c757d)', regex='^#[0-9A-Fa-f]{6}$')])),
+                ('support_email', models.EmailField(default='support@timelyevents.com', help_text='Support email address', max_length=254)),
+                ('support_phone', models.CharField(blank=True, help_text='Support phone number', max_length=20)),
+                ('contact_address', models.TextField(blank=True, help_text='Contact address')),
+                ('allow_spectator_uploads', models.BooleanField(default=True, help_text='Allow spectators to upload media')),
+                ('require_email_verification', models.BooleanField(default=True, help_text='Require email verification for new accounts')),
+                ('allow_public_registration', models.BooleanField(default=True, help_text='Allow public registration for events')),
+                ('maintenance_mode', models.BooleanField(default=False, help_text='Enable maintenance mode (blocks non-admin access)')),
+                ('maintenance_banner', models.TextField(blank=True, help_text='Maintenance message displayed to users')),
+                ('facebook_url', models.URLField(blank=True, help_text='Facebook page URL')),
+                ('twitter_url', models.URLField(blank=True, help_text='Twitter profile URL')),
+                ('instagram_url', models.URLField(blank=True, help_text='Instagram profile URL')),
+                ('linkedin_url', models.URLField(blank=True, help_text='LinkedIn page URL')),
+                ('google_analytics_id', models.CharField(blank=True, help_text='Google Analytics tracking ID', max_length=20)),
+                ('google_tag_manager_id', models.CharField(blank=True, help_text='Google Tag Manager container ID', max_length=20)),
+                ('from_email', models.EmailField(default='noreply@timelyevents.com', help_text='Default from email address', max_length=254)),
+                ('email_signature', models.TextField(blank=True, help_text='Email signature for automated emails')),
+                ('max_file_size_mb', models.PositiveIntegerField(default=10, help_text='Maximum file upload size in MB')),
+                ('allowed_file_types', models.CharField(default='jpg,jpeg,png,gif,pdf,doc,docx', help_text='Comma-separated list of allowed file extensions', max_length=500)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('updated_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='updated_settings', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Site Setting',
+                'verbose_name_plural': 'Site Settings',
+            },
+        ),
+    ]
@@ -0,0 +1 @@
+# settingshub/services/__init__.py
@@ -0,0 +1,127 @@
+# settingshub/services/snapshot.py
+"""
+Process-local snapshot of site settings and feature flags.
+
+Flags and the SiteSetting singleton are read on nearly every page load but
+change only when an admin edits them. Each process compiles them once into
+immutable rules (role sets, targeted user-id sets) and evaluates flags in
+memory. Edits bump a shared version key on commit; a process compares its
+snapshot against that key at most every SETTINGS_SNAPSHOT_RECHECK_SECONDS
+and recompiles when it moved, so an edit reaches every worker without a
+query per request. The key is only shared when the cache is (Redis), so a
+snapshot is also recompiled once it is SETTINGS_SNAPSHOT_MAX_AGE_SECONDS old.
+"""
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Optional, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from common.cache import bump_cache_version, get_cache_versions
+
+from ..models import FeatureFlag, SiteSetting
+
+NAMESPACE = 'settingshub'
+DEFAULT_RECHECK_SECONDS = 1.0
+DEFAULT_MAX_AGE_SECONDS = 30.0
+
+
+@dataclass(frozen=True)
+class FlagRule:
+    """A compiled feature flag; evaluation never touches the database"""
+    name: str
+    enabled: bool
+    enabled_for_all: bool
+    roles: FrozenSet[str]
+    user_ids: FrozenSet[int]
+
+    def is_enabled_for(self, user) -> bool:
+        if not self.enabled:
+            return False
+        if self.enabled_for_all:
+            return True
+        return getattr(user, 'role', None) in self.roles or user.pk in self.user_ids
+
+
+@dataclass(frozen=True)
+class SettingsSnapshot:
+    version: int
+    built_at: float  # time.monotonic()
+    site: SiteSetting  # shared by every request; never save() it
+    flags: Tuple[FlagRule, ...]
+
+    def flags_for(self, user) -> Dict[str, bool]:
+        return {rule.name: rule.is_enabled_for(user) for rule in self.flags}
+
+
+def build_snapshot(version: int) -> SettingsSnapshot:
+    """Compile settings and flags in three queries, however many flags or targeted users"""
+    site = SiteSetting.get_settings()
+
+    targeted: Dict[int, set] = {}
+    through = FeatureFlag.enabled_for_users.through
+    for flag_id, user_id in through.objects.values_list('featureflag_id', 'user_id'):
+        targeted.setdefault(flag_id, set()).add(user_id)
+
+    rules = tuple(
+        FlagRule(
+            name=flag.name,
+            enabled=flag.enabled,
+            enabled_for_all=flag.enabled_for_all,
+            roles=frozenset(flag.enabled_for_roles or ()),
+            user_ids=frozenset(targeted.get(flag.pk, ())),
+        )
+        for flag in FeatureFlag.objects.only('id', 'name', 'enabled', 'enabled_for_all', 'enabled_for_roles')
+    )
+    return SettingsSnapshot(version=version, built_at=time.monotonic(), site=site, flags=rules)
+
+
+_snapshot: Optional[SettingsSnapshot] = None
+_checked_at = 0.0
+_lock = threading.Lock()
+
+
+def get_snapshot() -> SettingsSnapshot:
+    """The current snapshot, recompiled when the shared version has moved or it is too old"""
+    global _snapshot, _checked_at
+    snapshot = _snapshot
+    now = time.monotonic()
+    recheck = getattr(settings, 'SETTINGS_SNAPSHOT_RECHECK_SECONDS', DEFAULT_RECHECK_SECONDS)
+    max_age = getattr(settings, 'SETTINGS_SNAPSHOT_MAX_AGE_SECONDS', DEFAULT_MAX_AGE_SECONDS)
+    if snapshot is not None and now - _checked_at < recheck and now - snapshot.built_at < max_age:
+        return snapshot
+
+    version = get_cache_versions([NAMESPACE])[NAMESPACE]
+    with _lock:
+        snapshot = _snapshot
+        if snapshot is None or snapshot.version != version or now - snapshot.built_at >= max_age:
+            snapshot = _snapshot = build_snapshot(version)
+        _checked_at = now
+    return snapshot
+
+
+def invalidate_snapshot() -> None:
+    """Drop this process's snapshot and tell the others to recompile theirs"""
+    global _snapshot
+    bump_cache_version(NAMESPACE)
+    with _lock:
+        _snapshot = None
+
+
+def _invalidate_on_change(sender, action=None, **kwargs):
+    if action is not None and not action.startswith('post_'):
+        return  # m2m_changed also fires pre_add/pre_remove/pre_clear
+    # After commit, so no worker can recompile from the pre-edit rows
+    transaction.on_commit(invalidate_snapshot)
+
+
+def connect_snapshot_signals() -> None:
+    for model in (SiteSetting, FeatureFlag):
+        label = model._meta.label
+        post_save.connect(_invalidate_on_change, sender=model, dispatch_uid=f'settings-snapshot:{label}:save')
+        post_delete.connect(_invalidate_on_change, sender=model, dispatch_uid=f'settings-snapshot:{label}:delete')
+    m2m_changed.connect(_invalidate_on_change, sender=FeatureFlag.enabled_for_users.through,
+                        dispatch_uid='settings-snapshot:flag-users')
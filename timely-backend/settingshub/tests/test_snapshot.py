@@ -0,0 +1,148 @@
+"""
+Settings hub tests for the compiled settings and flags snapshot.
+"""
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from common.cache import bump_cache_version, get_cache_versions
+from settingshub.models import FeatureFlag, SiteSetting
+from settingshub.services.snapshot import NAMESPACE, get_snapshot, invalidate_snapshot
+
+User = get_user_model()
+
+
+def current_version():
+    return get_cache_versions([NAMESPACE])[NAMESPACE]
+
+
+@override_settings(SETTINGS_SNAPSHOT_RECHECK_SECONDS=60, SETTINGS_SNAPSHOT_MAX_AGE_SECONDS=600)
+class SettingsSnapshotTest(TestCase):
+    """Test flag evaluation from the per-process snapshot"""
+
+    def setUp(self):
+        # The snapshot outlives each test's rollback
+        invalidate_snapshot()
+        self.addCleanup(invalidate_snapshot)
+
+        self.admin = User.objects.create_superuser(email='admin@example.com', password='testpass123')
+        self.organizer = User.objects.create_user(email='org@example.com', password='testpass123', role='ORGANIZER')
+        self.athlete = User.objects.create_user(email='athlete@example.com', password='testpass123', role='ATHLETE')
+        self.spectator = User.objects.create_user(email='fan@example.com', password='testpass123')
+        self.users = [self.admin, self.organizer, self.athlete, self.spectator, AnonymousUser()]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            SiteSetting.get_settings()
+            self.everyone = FeatureFlag.objects.create(name='everyone', enabled=True, enabled_for_all=True)
+            self.off = FeatureFlag.objects.create(name='off', enabled=False, enabled_for_all=True)
+            self.organizers = FeatureFlag.objects.create(
+                name='organizers', enabled=True, enabled_for_roles=['ORGANIZER', 'ADMIN']
+            )
+            self.beta = FeatureFlag.objects.create(name='beta', enabled=True, enabled_for_roles=['ADMIN'])
+            self.beta.enabled_for_users.add(self.athlete)
+            self.disabled_beta = FeatureFlag.objects.create(name='disabled_beta', enabled=False)
+            self.disabled_beta.enabled_for_users.add(self.spectator)
+
+    def assert_matches_models(self):
+        snapshot = get_snapshot()
+        for user in self.users:
+            expected = {flag.name: flag.is_enabled_for_user(user) for flag in FeatureFlag.objects.all()}
+            self.assertEqual(snapshot.flags_for(user), expected, user)
+
+    def test_matches_model_evaluation(self):
+        self.assert_matches_models()
+        self.assertEqual(get_snapshot().flags_for(self.athlete)['beta'], True)
+        self.assertEqual(get_snapshot().flags_for(self.spectator)['disabled_beta'], False)
+
+    def test_built_in_three_queries_then_evaluated_without_any(self):
+        with self.assertNumQueries(3):
+            get_snapshot()
+
+        with self.assertNumQueries(0):
+            for _ in range(10):
+                snapshot = get_snapshot()
+                for user in self.users:
+                    snapshot.flags_for(user)
+                snapshot.site.maintenance_mode
+
+    def test_admin_edit_bumps_version_and_rebuilds(self):
+        before = get_snapshot()
+        version = current_version()
+        client = APIClient()
+        client.force_authenticate(self.admin)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = client.patch(
+                f'/api/settings/admin/flags/{self.organizers.pk}/', {'enabled': False}, format='json'
+            )
+        self.assertEqual(response.status_code, 200)
+
+        self.assertGreater(current_version(), version)
+        after = get_snapshot()
+        self.assertIsNot(after, before)
+        self.assertEqual(after.version, current_version())
+        self.assertFalse(after.flags_for(self.organizer)['organizers'])
+        self.assert_matches_models()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = client.patch('/api/settings/site/', {'maintenance_mode': True}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(get_snapshot().site.maintenance_mode)
+
+    def test_targeted_users_change_bumps_version_and_rebuilds(self):
+        self.assertFalse(get_snapshot().flags_for(self.spectator)['beta'])
+
+        for change in (lambda: self.beta.enabled_for_users.add(self.spectator),
+                       lambda: self.beta.enabled_for_users.remove(self.athlete)):
+            version = current_version()
+            with self.captureOnCommitCallbacks(execute=True):
+                change()
+            self.assertGreater(current_version(), version)
+            self.assert_matches_models()
+
+        self.assertTrue(get_snapshot().flags_for(self.spectator)['beta'])
+        self.assertFalse(get_snapshot().flags_for(self.athlete)['beta'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.beta.enabled_for_users.clear()
+        self.assertFalse(get_snapshot().flags_for(self.spectator)['beta'])
+
+    def test_edit_uncommitted_is_not_compiled(self):
+        snapshot = get_snapshot()
+        version = current_version()
+
+        with self.captureOnCommitCallbacks(execute=False):
+            self.everyone.enabled = False
+            self.everyone.save()
+
+        self.assertEqual(current_version(), version)
+        self.assertIs(get_snapshot(), snapshot)
+
+    def test_other_process_edits_picked_up_on_recheck(self):
+        snapshot = get_snapshot()
+        # An edit committed by another worker only moves the shared version
+        SiteSetting.objects.filter(pk=1).update(site_name='Renamed')
+        bump_cache_version(NAMESPACE)
+
+        self.assertIs(get_snapshot(), snapshot)
+        with override_settings(SETTINGS_SNAPSHOT_RECHECK_SECONDS=0):
+            self.assertEqual(get_snapshot().site.site_name, 'Renamed')
+
+    def test_rebuilt_once_too_old_without_a_shared_version(self):
+        clock = [1000.0]
+        patcher = patch('settingshub.services.snapshot.time.monotonic', side_effect=lambda: clock[0])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        snapshot = get_snapshot()
+        # Another worker's edit, with a version bump this process cannot see (per-process cache)
+        FeatureFlag.objects.filter(pk=self.off.pk).update(enabled=True)
+
+        clock[0] += 599
+        self.assertIs(get_snapshot(), snapshot)
+
+        clock[0] += 1
+        self.assertTrue(get_snapshot().flags_for(self.spectator)['off'])
+        self.assert_matches_models()
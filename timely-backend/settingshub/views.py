@@ -5,6 +5,7 @@ from rest_framework.response import Response
 from django.shortcuts import get_object_or_404
 
 from .models import SiteSetting, FeatureFlag
+from .services.snapshot import get_snapshot
 from .serializers import (
     SiteSettingSerializer, SiteSettingUpdateSerializer,
     FeatureFlagSerializer, FeatureFlagUpdateSerializer,
@@ -44,8 +45,7 @@ def public_site_settings(request):
     """
     Get public site settings (no authentication required)
     """
-    settings = SiteSetting.get_settings()
-    serializer = PublicSiteSettingSerializer(settings)
+    serializer = PublicSiteSettingSerializer(get_snapshot().site)
     return Response(serializer.data)
 
 
@@ -55,15 +55,8 @@ def feature_flags(request):
     """
     Get feature flags for the current user
     """
-    flags = FeatureFlag.objects.all()
-    
-    # Filter flags based on user permissions
-    user_flags = {}
-    for flag in flags:
-        user_flags[flag.name] = flag.is_enabled_for_user(request.user)
-    
     return Response({
-        'flags': user_flags,
+        'flags': get_snapshot().flags_for(request.user),
         'user_role': getattr(request.user, 'role', 'SPECTATOR')
     })
 
@@ -197,7 +190,7 @@ def system_status(request):
         'status': 'healthy',
         'database': db_status,
         'cache': cache_status,
-        'maintenance_mode': SiteSetting.get_settings().maintenance_mode,
+        'maintenance_mode': get_snapshot().site.maintenance_mode,
         'stats': stats,
         'version': getattr(settings, 'VERSION', '1.0.0'),
         'debug': settings.DEBUG
@@ -8,11 +8,12 @@ from .models import Team, TeamMember
 from events.models import Event
 from fixtures.models import Fixture
 from results.models import Result
+from realtime.frames import FrameForwardingMixin
 
 User = get_user_model()
 
 
-class TeamConsumer(AsyncWebsocketConsumer):
+class TeamConsumer(FrameForwardingMixin, AsyncWebsocketConsumer):
     """WebSocket consumer for team-specific real-time updates"""
     
     async def connect(self):
@@ -117,45 +118,27 @@ class TeamConsumer(AsyncWebsocketConsumer):
     # Team update handlers
     async def team_update(self, event):
         """Handle team updates"""
-        await self.send(text_data=json.dumps({
-            'type': 'team_update',
-            'data': event['data']
-        }))
+        await self.send_frame(event, 'team_update')
     
     async def schedule_update(self, event):
         """Handle schedule updates"""
-        await self.send(text_data=json.dumps({
-            'type': 'schedule_update',
-            'data': event['data']
-        }))
+        await self.send_frame(event, 'schedule_update')
     
     async def results_update(self, event):
         """Handle results updates"""
-        await self.send(text_data=json.dumps({
-            'type': 'results_update',
-            'data': event['data']
-        }))
+        await self.send_frame(event, 'results_update')
     
     async def leaderboard_update(self, event):
         """Handle leaderboard updates"""
-        await self.send(text_data=json.dumps({
-            'type': 'leaderboard_update',
-            'data': event['data']
-        }))
+        await self.send_frame(event, 'leaderboard_update')
     
     async def result_update(self, event):
         """Handle individual result updates"""
-        await self.send(text_data=json.dumps({
-            'type': 'result_update',
-            'data': event['data']
-        }))
+        await self.send_frame(event, 'result_update')
     
     async def fixture_update(self, event):
         """Handle individual fixture updates"""
-        await self.send(text_data=json.dumps({
-            'type': 'fixture_update',
-            'data': event['data']
-        }))
+        await self.send_frame(event, 'fixture_update')
     
     @database_sync_to_async
     def get_team(self, team_id):
@@ -205,7 +188,7 @@ class TeamConsumer(AsyncWebsocketConsumer):
         return False
 
 
-class PurchaseConsumer(AsyncWebsocketConsumer):
+class PurchaseConsumer(FrameForwardingMixin, AsyncWebsocketConsumer):
     """WebSocket consumer for purchase/ticket status updates"""
     
     async def connect(self):
@@ -270,17 +253,11 @@ class PurchaseConsumer(AsyncWebsocketConsumer):
     # Purchase update handlers
     async def purchase_update(self, event):
         """Handle purchase updates"""
-        await self.send(text_data=json.dumps({
-            'type': 'purchase_update',
-            'data': event['data']
-        }))
+        await self.send_frame(event, 'purchase_update')
     
     async def ticket_status_update(self, event):
         """Handle ticket status updates"""
-        await self.send(text_data=json.dumps({
-            'type': 'ticket_status_update',
-            'data': event['data']
-        }))
+        await self.send_frame(event, 'ticket_status_update')
     
     @database_sync_to_async
     def get_purchase(self, purchase_id):
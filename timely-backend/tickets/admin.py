@@ -4,8 +4,10 @@ from django.utils.html import format_html
 from django.urls import reverse
 from django.utils.safestring import mark_safe
 from django.utils import timezone
+from django.db import transaction
 
-from .models import TicketType, TicketOrder, Ticket, Refund
+from .models import TicketType, TicketOrder, Ticket, TicketHold, Refund
+from .services.inventory import SoldOut, sell
 
 
 @admin.register(TicketType)
@@ -185,8 +187,11 @@ class TicketOrderAdmin(admin.ModelAdmin):
     actions_quick.short_description = 'Quick Actions'
 
     def _validate_or_issue_tickets(self, order: TicketOrder) -> int:
-        """Ensure tickets for the order are VALID. If none exist, issue one generic ticket."""
-        made_valid = 0
+        """
+        Ensure tickets for the order are VALID. If none exist, issue one generic ticket.
+        Seats not sold yet are sold through the inventory counters, all or nothing;
+        raises SoldOut (changing nothing) when they no longer fit.
+        """
         tickets = list(order.tickets.all()) if hasattr(order, 'tickets') else []
         if not tickets:
             # Create a generic ticket type if needed, then issue one ticket so it shows up for the buyer
@@ -202,33 +207,35 @@ class TicketOrderAdmin(admin.ModelAdmin):
                     'on_sale': True,
                 }
             )
-            ticket = Ticket.objects.create(order=order, ticket_type=ticket_type, status='valid')
-            # Update inventory accounting
-            ticket_type.quantity_sold = (ticket_type.quantity_sold or 0) + 1
-            ticket_type.save(update_fields=['quantity_sold'])
+            with transaction.atomic():
+                sell([(ticket_type.id, 1)])
+                Ticket.objects.create(order=order, ticket_type=ticket_type, status='valid')
             return 1
         
-        for t in tickets:
-            if t.status != 'valid':
+        to_validate = [t for t in tickets if t.status != 'valid']
+        with transaction.atomic():
+            # Seats of converted checkout holds were sold when the payment completed
+            if not order.holds.filter(status=TicketHold.Status.CONVERTED).exists():
+                sell((t.ticket_type_id, 1) for t in to_validate if t.ticket_type_id)
+            for t in to_validate:
                 t.status = 'valid'
                 t.save(update_fields=['status'])
-                if t.ticket_type:
-                    tt = t.ticket_type
-                    tt.quantity_sold = (tt.quantity_sold or 0) + 1
-                    tt.save(update_fields=['quantity_sold'])
-                made_valid += 1
-        return made_valid
+        return len(to_validate)
 
     def mark_paid(self, request, queryset):
         """Mark selected orders as paid and auto-validate their tickets."""
         updated = 0
         validated_total = 0
         for order in queryset:
+            try:
+                validated_total += self._validate_or_issue_tickets(order)
+            except SoldOut as e:
+                self.message_user(request, f'Order {order.id} left unpaid: {e}', level=messages.ERROR)
+                continue
             if order.status != 'paid':
                 order.status = 'paid'
                 order.save(update_fields=['status'])
                 updated += 1
-            validated_total += self._validate_or_issue_tickets(order)
         self.message_user(
             request,
             f'Marked {updated} orders as paid. Validated/issued {validated_total} ticket(s).',
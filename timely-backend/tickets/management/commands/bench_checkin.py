@@ -0,0 +1,104 @@
+import random
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, reset_queries, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from tickets.models import Ticket, TicketOrder
+from tickets.services.checkin import CheckinEngine, TicketIndex
+from tickets.services.issuance import issue_tickets
+from tickets.services.qr import verify_qr_payload
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Load-test gate check-in: legacy per-scan lookups vs the check-in engine (single and batched scans)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tickets', type=int, default=2000, help='Tickets issued for the synthetic event')
+        parser.add_argument('--scans', type=int, default=1000, help='Scans per measurement')
+        parser.add_argument('--batch-size', type=int, default=100, help='Scans per offline batch upload')
+        parser.add_argument('--duplicates', type=float, default=0.05, help='Fraction of scans that re-scan an admitted ticket')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed for scan order')
+
+    def handle(self, *args, **options):
+        random.seed(options['seed'])
+
+        # Everything runs inside a transaction that is rolled back at the end
+        with transaction.atomic():
+            event_id, payloads = self._issue(options['tickets'])
+            scans = options['scans']
+            chunks = [payloads[i:i + scans] for i in range(0, len(payloads), scans)]
+            if len(chunks) < 3:
+                self.stderr.write('Need at least 3 x --scans tickets so each run scans fresh tickets')
+                transaction.set_rollback(True)
+                return
+
+            started = time.perf_counter()
+            index = TicketIndex.build(event_id)
+            self.stdout.write(f'Index build: {len(index)} tickets in {(time.perf_counter() - started) * 1000:.2f} ms')
+
+            self._measure('legacy lookup + save', self._with_duplicates(chunks[0], options['duplicates']), self._legacy_scan)
+
+            engine = CheckinEngine(event_id, index=index)
+            self._measure('engine single scans', self._with_duplicates(chunks[1], options['duplicates']),
+                          lambda payload: engine.scan(payload, gate='A'))
+
+            batch = self._with_duplicates(chunks[2], options['duplicates'])
+            size = options['batch_size']
+
+            def run_batches(_):
+                for start in range(0, len(batch), size):
+                    engine.scan_batch([
+                        {'qr_payload': payload, 'gate': 'B', 'scanned_at': timezone.now().isoformat()}
+                        for payload in batch[start:start + size]
+                    ])
+
+            self._measure(f'engine batches of {size}', batch, run_batches, once=True)
+            transaction.set_rollback(True)
+
+    def _issue(self, count):
+        owner = User.objects.create_user(
+            email=f'bench-{time.time_ns()}@timely.local',
+            password='bench-password',
+        )
+        order = TicketOrder.objects.create(user=owner, event_id=10 ** 6 + random.randint(0, 10 ** 6), total_cents=0)
+        tickets = issue_tickets(order, [(None, count)], status=Ticket.Status.VALID)
+        payloads = [ticket.qr_payload for ticket in tickets]
+        random.shuffle(payloads)
+        self.stdout.write(f'Event {order.event_id}: {count} valid tickets issued')
+        return order.event_id, payloads
+
+    @staticmethod
+    def _with_duplicates(payloads, fraction):
+        extra = random.sample(payloads, int(len(payloads) * fraction))
+        return payloads + extra
+
+    @staticmethod
+    def _legacy_scan(payload):
+        """The previous per-scan path: parse, fetch, check, save"""
+        verified = verify_qr_payload(payload)
+        ticket = Ticket.objects.select_related('order').get(id=verified['ticket_id'], serial=verified['serial'])
+        if ticket.status == Ticket.Status.VALID:
+            ticket.use_ticket()
+
+    def _measure(self, label, payloads, func, once=False):
+        reset_queries()
+        with CaptureQueriesContext(connection) as ctx:
+            started = time.perf_counter()
+            if once:
+                func(payloads)
+            else:
+                for payload in payloads:
+                    func(payload)
+            elapsed = time.perf_counter() - started
+        rate = len(payloads) / elapsed if elapsed else float('inf')
+        self.stdout.write(
+            f'{label:28s} {len(payloads):6d} scans {elapsed * 1000:9.2f} ms '
+            f'{rate:10.0f} scans/s {len(ctx.captured_queries):6d} queries'
+        )
@@ -0,0 +1,22 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from tickets.services.inventory import release_expired_holds
+
+
+class Command(BaseCommand):
+    help = 'Return seats held by expired checkouts to sale (once, or every --interval seconds)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=int, default=0, help='Keep sweeping every N seconds')
+        parser.add_argument('--batch-size', type=int, default=500, help='Holds released per transaction')
+
+    def handle(self, *args, **options):
+        while True:
+            released = release_expired_holds(batch_size=options['batch_size'])
+            if released or not options['interval']:
+                self.stdout.write(f'Released {released} expired holds')
+            if not options['interval']:
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.6 on 2026-10-16 20:49
+
+import django.core.validators
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tickets', '0008_ticket_approved_at_ticket_approved_by_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tickettype',
+            name='quantity_held',
+            field=models.PositiveIntegerField(default=0, help_text='Quantity held by open checkouts'),
+        ),
+        migrations.CreateModel(
+            name='TicketHold',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('quantity', models.PositiveIntegerField(validators=[django.core.validators.MinValueValidator(1)])),
+                ('status', models.CharField(choices=[('active', 'Active'), ('converted', 'Converted'), ('released', 'Released'), ('expired', 'Expired')], default='active', max_length=20)),
+                ('expires_at', models.DateTimeField(help_text='When the held seats return to sale')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('order', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='holds', to='tickets.ticketorder')),
+                ('ticket_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='holds', to='tickets.tickettype')),
+            ],
+            options={
+                'verbose_name': 'Ticket Hold',
+                'verbose_name_plural': 'Ticket Holds',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'expires_at'], name='tickets_tic_status_42d628_idx')],
+            },
+        ),
+    ]
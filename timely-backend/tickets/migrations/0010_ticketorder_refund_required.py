@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-16 22:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tickets', '0009_ticket_holds'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='ticketorder',
+            name='status',
+            field=models.CharField(choices=[('payment_pending', 'Payment Pending'), ('pending', 'Pending'), ('paid', 'Paid'), ('free', 'Free'), ('failed', 'Failed'), ('refunded', 'Refunded'), ('refund_required', 'Refund Required')], db_index=True, default='payment_pending', max_length=20),
+        ),
+    ]
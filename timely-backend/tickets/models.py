@@ -23,6 +23,7 @@ class TicketType(models.Model):
     currency = models.CharField(max_length=3, default='USD')
     quantity_total = models.PositiveIntegerField(help_text="Total quantity available")
     quantity_sold = models.PositiveIntegerField(default=0, help_text="Quantity sold")
+    quantity_held = models.PositiveIntegerField(default=0, help_text="Quantity held by open checkouts")
     on_sale = models.BooleanField(default=True, help_text="Whether tickets are on sale")
     
     # Audit fields
@@ -49,8 +50,8 @@ class TicketType(models.Model):
     
     @property
     def available_quantity(self):
-        """Get available quantity"""
-        return max(0, self.quantity_total - self.quantity_sold)
+        """Get available quantity (seats held by open checkouts are not available)"""
+        return max(0, self.quantity_total - self.quantity_sold - self.quantity_held)
     
     def can_purchase(self, quantity):
         """Check if quantity can be purchased"""
@@ -67,6 +68,7 @@ class TicketOrder(models.Model):
         FREE = "free", "Free"
         FAILED = "failed", "Failed"
         REFUNDED = "refunded", "Refunded"
+        REFUND_REQUIRED = "refund_required", "Refund Required"
     
     class Provider(models.TextChoices):
         STRIPE = "stripe", "Stripe"
@@ -217,6 +219,36 @@ class Ticket(models.Model):
         self.save()
 
 
+class TicketHold(models.Model):
+    """Seats of a ticket type held for an order while its checkout is open"""
+    
+    class Status(models.TextChoices):
+        ACTIVE = "active", "Active"
+        CONVERTED = "converted", "Converted"
+        RELEASED = "released", "Released"
+        EXPIRED = "expired", "Expired"
+    
+    ticket_type = models.ForeignKey(TicketType, on_delete=models.CASCADE, related_name="holds")
+    order = models.ForeignKey(TicketOrder, on_delete=models.CASCADE, related_name="holds", null=True, blank=True)
+    quantity = models.PositiveIntegerField(validators=[MinValueValidator(1)])
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.ACTIVE)
+    expires_at = models.DateTimeField(help_text="When the held seats return to sale")
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = 'Ticket Hold'
+        verbose_name_plural = 'Ticket Holds'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'expires_at']),
+        ]
+    
+    def __str__(self):
+        return f"Hold {self.id} - {self.quantity} x {self.ticket_type_id} ({self.status})"
+
+
 class Refund(models.Model):
     """Refund model for ticket orders"""
     
@@ -3,22 +3,14 @@ from __future__ import annotations
 
 from django.contrib.auth import get_user_model
 from django.db import transaction
-from django.db.models import Sum
-from rest_framework import status, permissions, throttling
+from rest_framework import status, permissions
 from rest_framework.views import APIView
 from rest_framework.response import Response
 
 from fixtures.models import Fixture
 from .models import Ticket
 from .serializers import TicketSerializer
-
-
-class PublicCheckoutThrottle(throttling.AnonRateThrottle):
-    """
-    Basic abuse protection for public checkout.
-    Set REST_FRAMEWORK['DEFAULT_THROTTLE_RATES']['public_checkout'] in settings.
-    """
-    scope = "public_checkout"
+from .services.inventory import SoldOut, available_quantity, default_ticket_type, sell
 
 
 class PublicCheckoutView(APIView):
@@ -34,7 +26,7 @@ class PublicCheckoutView(APIView):
     → 201 with created Ticket (uses TicketSerializer for response)
     """
     permission_classes = [permissions.AllowAny]
-    throttle_classes = [PublicCheckoutThrottle]
+    # Not routed; add its path to the "public_checkout" policy in RATE_LIMIT_POLICIES when it is
 
     @transaction.atomic
     def post(self, request, *args, **kwargs):
@@ -56,19 +48,17 @@ class PublicCheckoutView(APIView):
 
         # Match lookup
         try:
-            fixture = Fixture.objects.select_related("event", "venue").get(pk=fixture_id)
+            fixture = Fixture.objects.select_related("event", "venue").get(pk=match_id)
         except Fixture.DoesNotExist:
             return Response({"detail": "match not found"}, status=status.HTTP_404_NOT_FOUND)
 
-        # (Optional) capacity control via venue.capacity (or add fixture.capacity later)
-        cap = getattr(fixture.venue, "capacity", None)
-        if cap:
-            sold = (
-                Ticket.objects.filter(fixture=fixture, status=Ticket.Status.ACTIVE)
-                .aggregate(n=Sum("quantity"))["n"] or 0
-            )
-            if sold + quantity > cap:
-                remaining = max(cap - sold, 0)
+        # Capacity control via the fixture's ticket type inventory (one conditional UPDATE)
+        ticket_type = default_ticket_type(fixture.event_id, fixture.id)
+        if ticket_type:
+            try:
+                sell([(ticket_type.id, quantity)])
+            except SoldOut:
+                remaining = available_quantity(ticket_type.id)
                 return Response(
                     {"detail": f"Not enough seats. Remaining: {remaining}"},
                     status=status.HTTP_400_BAD_REQUEST,
@@ -0,0 +1,315 @@
+# tickets/services/checkin.py
+"""
+Gate check-in engine
+
+Each event's admissible tickets are loaded once into a compact in-memory
+index (8-byte digests of ticket id + serial), so a scan verifies the QR
+signature and index membership without touching the database. Admission is
+a conditional UPDATE that only succeeds while the ticket is still valid, so
+two gates scanning the same ticket at once can't both admit it. Offline gate
+devices can upload scans in batches, which are admitted with one locking
+read and one update.
+"""
+import hashlib
+import threading
+import time
+from datetime import datetime
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, When, Value, DateTimeField
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from ..models import Ticket
+from .qr import verify_qr_payload
+
+ADMISSIBLE_STATUSES = (Ticket.Status.VALID, Ticket.Status.APPROVED)
+
+DEFAULT_INDEX_TTL = 300  # seconds
+
+
+class ScanStatus:
+    ADMITTED = 'admitted'
+    ALREADY_USED = 'already_used'
+    INVALID = 'invalid'
+    NOT_ADMISSIBLE = 'not_admissible'
+
+
+def ticket_digest(ticket_id: int, serial: str) -> bytes:
+    """Compact index key for a ticket"""
+    return hashlib.blake2b(f"{ticket_id}:{serial}".encode(), digest_size=8).digest()
+
+
+@dataclass
+class ScanResult:
+    """Outcome of one gate scan"""
+
+    status: str
+    ticket_id: Optional[int] = None
+    serial: Optional[str] = None
+    gate: str = ''
+    scanned_at: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def admitted(self) -> bool:
+        return self.status == ScanStatus.ADMITTED
+
+    def as_dict(self) -> dict:
+        return {
+            'status': self.status,
+            'ticket_id': self.ticket_id,
+            'serial': self.serial,
+            'gate': self.gate,
+            'scanned_at': self.scanned_at,
+            'error': self.error,
+        }
+
+
+@dataclass
+class TicketIndex:
+    """Admissible and used ticket digests for one event"""
+
+    event_id: int
+    admissible: Set[bytes] = field(default_factory=set)
+    used: Set[bytes] = field(default_factory=set)
+    built_at: float = field(default_factory=time.monotonic)
+
+    @classmethod
+    def build(cls, event_id: int) -> 'TicketIndex':
+        """Load the event's admissible and used tickets in one query"""
+        index = cls(event_id)
+        rows = Ticket.objects.filter(
+            order__event_id=event_id,
+            status__in=ADMISSIBLE_STATUSES + (Ticket.Status.USED,),
+        ).order_by().values_list('id', 'serial', 'status')
+        for ticket_id, serial, status in rows.iterator():
+            target = index.used if status == Ticket.Status.USED else index.admissible
+            target.add(ticket_digest(ticket_id, serial))
+        return index
+
+    def mark_used(self, digest: bytes):
+        self.admissible.discard(digest)
+        self.used.add(digest)
+
+    def __len__(self):
+        return len(self.admissible) + len(self.used)
+
+
+class CheckinEngine:
+    """Admits scanned tickets for one event"""
+
+    def __init__(self, event_id: int, index: Optional[TicketIndex] = None):
+        self.event_id = event_id
+        self.index = index if index is not None else get_ticket_index(event_id)
+
+    def scan(self, qr_payload: str, gate: str = '', scanned_at=None) -> ScanResult:
+        """Admit a single scan with at most one conditional UPDATE"""
+        scanned_at = scanned_at or timezone.now()
+        result, digest = self._precheck(qr_payload, gate, scanned_at)
+        if result is not None:
+            return result
+
+        result = self._result_for(qr_payload, gate, scanned_at)
+        admitted = Ticket.objects.filter(
+            id=result.ticket_id, status__in=ADMISSIBLE_STATUSES,
+        ).update(status=Ticket.Status.USED, used_at=scanned_at)
+
+        if admitted:
+            result.status = ScanStatus.ADMITTED
+            transaction.on_commit(lambda: self._committed([result], [digest]))
+        else:
+            result.status, result.error = self._explain_rejection(result.ticket_id, digest)
+        return result
+
+    def scan_batch(self, scans: Iterable[dict]) -> List[ScanResult]:
+        """
+        Admit a batch of scans uploaded by a gate device.
+
+        Each scan is a dict with 'qr_payload' and optional 'gate' and
+        'scanned_at' (ISO 8601). Duplicate scans of one ticket within the batch
+        are resolved in favour of the earliest scan. Results keep input order.
+        """
+        results: List[ScanResult] = []
+        candidates: Dict[int, ScanResult] = {}
+        digests: Dict[int, bytes] = {}
+        scan_times: Dict[int, datetime] = {}
+
+        for scan in scans:
+            qr_payload = scan.get('qr_payload')
+            if not isinstance(qr_payload, str):
+                qr_payload = ''
+            gate = scan.get('gate') or ''
+            try:
+                scanned_at = _parse_scanned_at(scan.get('scanned_at'))
+            except ValueError:
+                results.append(ScanResult(ScanStatus.INVALID, gate=gate, error='Invalid scanned_at'))
+                continue
+            result, digest = self._precheck(qr_payload, gate, scanned_at)
+            if result is None:
+                result = self._result_for(qr_payload, gate, scanned_at)
+                earlier = candidates.get(result.ticket_id)
+                if earlier is None or scanned_at < scan_times[result.ticket_id]:
+                    if earlier is not None:
+                        earlier.status, earlier.error = ScanStatus.ALREADY_USED, 'Duplicate scan in batch'
+                    candidates[result.ticket_id] = result
+                    digests[result.ticket_id] = digest
+                    scan_times[result.ticket_id] = scanned_at
+                else:
+                    result.status, result.error = ScanStatus.ALREADY_USED, 'Duplicate scan in batch'
+            results.append(result)
+
+        if candidates:
+            self._admit_candidates(candidates, digests, scan_times)
+        return results
+
+    def _admit_candidates(self, candidates: Dict[int, ScanResult], digests: Dict[int, bytes],
+                          scan_times: Dict[int, datetime]):
+        with transaction.atomic():
+            # Lock the still-admissible rows so concurrent batches can't double-admit
+            admissible = set(
+                Ticket.objects.select_for_update().filter(
+                    id__in=list(candidates), status__in=ADMISSIBLE_STATUSES,
+                ).values_list('id', flat=True)
+            )
+            if admissible:
+                Ticket.objects.filter(id__in=admissible).update(
+                    status=Ticket.Status.USED,
+                    used_at=Case(
+                        *[When(id=ticket_id, then=Value(scan_times[ticket_id])) for ticket_id in admissible],
+                        output_field=DateTimeField(),
+                    ),
+                )
+
+            admitted = []
+            for ticket_id, result in candidates.items():
+                if ticket_id in admissible:
+                    result.status = ScanStatus.ADMITTED
+                    admitted.append(result)
+                else:
+                    result.status, result.error = self._explain_rejection(ticket_id, digests[ticket_id])
+
+            if admitted:
+                admitted_digests = [digests[result.ticket_id] for result in admitted]
+                transaction.on_commit(lambda: self._committed(admitted, admitted_digests))
+
+    def _committed(self, admitted: List[ScanResult], digests: List[bytes]):
+        # Only record admissions in the index once they are durable
+        for digest in digests:
+            self.index.mark_used(digest)
+        broadcast_checkins(self.event_id, admitted)
+
+    def _precheck(self, qr_payload: str, gate: str, scanned_at):
+        """
+        Signature and index checks; only an index miss touches the database.
+        Returns (result, None) when the scan is rejected outright, or
+        (None, digest) when it may be admitted.
+        """
+        verified = verify_qr_payload(qr_payload)
+        if not verified['valid']:
+            return ScanResult(ScanStatus.INVALID, gate=gate, scanned_at=_isoformat(scanned_at), error=verified['error']), None
+
+        digest = ticket_digest(verified['ticket_id'], verified['serial'])
+        if digest in self.index.used:
+            return ScanResult(
+                ScanStatus.ALREADY_USED, verified['ticket_id'], verified['serial'], gate, _isoformat(scanned_at),
+                'Ticket already used'
+            ), None
+        if digest not in self.index.admissible and not self._admissible_in_db(verified['ticket_id'], verified['serial'], digest):
+            return ScanResult(
+                ScanStatus.NOT_ADMISSIBLE, verified['ticket_id'], verified['serial'], gate, _isoformat(scanned_at),
+                'Ticket is not valid for this event'
+            ), None
+        return None, digest
+
+    def _admissible_in_db(self, ticket_id: int, serial: str, digest: bytes) -> bool:
+        """Index miss: the ticket may have been issued or approved after the index was built"""
+        exists = Ticket.objects.filter(
+            id=ticket_id, serial=serial, order__event_id=self.event_id, status__in=ADMISSIBLE_STATUSES,
+        ).exists()
+        if exists:
+            self.index.admissible.add(digest)
+        return exists
+
+    def _explain_rejection(self, ticket_id: int, digest: bytes):
+        """The conditional update lost: find out why (rare path)"""
+        status = Ticket.objects.filter(id=ticket_id).values_list('status', flat=True).first()
+        if status == Ticket.Status.USED:
+            self.index.mark_used(digest)
+            return ScanStatus.ALREADY_USED, 'Ticket already used'
+        self.index.admissible.discard(digest)
+        return ScanStatus.NOT_ADMISSIBLE, f'Ticket is {status}' if status else 'Ticket not found'
+
+    @staticmethod
+    def _result_for(qr_payload: str, gate: str, scanned_at) -> ScanResult:
+        _, ticket_id, _, serial, _ = qr_payload.split(':')
+        return ScanResult(ScanStatus.NOT_ADMISSIBLE, int(ticket_id), serial, gate, _isoformat(scanned_at))
+
+
+def _isoformat(value) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
+def _parse_scanned_at(value):
+    """
+    Gate devices report their own scan time; fall back to now when absent.
+    Raises ValueError for anything but an ISO 8601 string naming a real time.
+    """
+    if not value:
+        return timezone.now()
+    if isinstance(value, datetime):
+        parsed = value
+    elif isinstance(value, str):
+        # parse_datetime itself raises ValueError for well-formed impossible dates
+        parsed = parse_datetime(value)
+        if parsed is None:
+            raise ValueError(f'Not an ISO 8601 datetime: {value!r}')
+    else:
+        raise ValueError(f'Not an ISO 8601 datetime: {value!r}')
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def broadcast_checkins(event_id: int, results: List[ScanResult]):
+    """One realtime message per admitted batch (queryset updates skip post_save)"""
+    from ..signals import safe_broadcast
+
+    safe_broadcast(f"orders:event:{event_id}", 'tickets.checked_in', {
+        'event_id': event_id,
+        'count': len(results),
+        'tickets': [
+            {'ticket_id': r.ticket_id, 'serial': r.serial, 'gate': r.gate, 'used_at': r.scanned_at}
+            for r in results
+        ],
+    })
+
+
+_indexes: Dict[int, TicketIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_ticket_index(event_id: int, refresh: bool = False) -> TicketIndex:
+    """Return the process-local index for an event, rebuilding it after TICKET_CHECKIN_INDEX_TTL"""
+    ttl = getattr(settings, 'TICKET_CHECKIN_INDEX_TTL', DEFAULT_INDEX_TTL)
+    with _indexes_lock:
+        index = _indexes.get(event_id)
+        if index is not None and not refresh and time.monotonic() - index.built_at < ttl:
+            return index
+
+    index = TicketIndex.build(event_id)
+    with _indexes_lock:
+        _indexes[event_id] = index
+    return index
+
+
+def invalidate_ticket_index(event_id: Optional[int] = None):
+    """Drop one event's index (or all of them)"""
+    with _indexes_lock:
+        if event_id is None:
+            _indexes.clear()
+        else:
+            _indexes.pop(event_id, None)
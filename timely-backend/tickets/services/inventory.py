@@ -0,0 +1,234 @@
+# tickets/services/inventory.py
+"""
+Ticket inventory and checkout holds
+
+A ticket type's seats are counted by quantity_total, quantity_sold and
+quantity_held. Every change to the counters is a single conditional UPDATE
+that only succeeds while quantity_sold + quantity_held + n still fits in
+quantity_total, so concurrent checkouts can never oversell and no row is read
+or locked first.
+
+Paid checkouts hold their seats for the life of the Stripe session. The hold
+is converted to sold seats when the payment completes, and released when the
+payment fails, the session expires, or (as a fallback for missed webhooks)
+release_expired_holds() finds it past its expiry.
+"""
+import logging
+from collections import defaultdict
+from datetime import timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from ..models import TicketHold, TicketType
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOLD_TTL = 35 * 60  # seconds
+DEFAULT_HOLD_GRACE = 5 * 60  # seconds
+
+# Stripe only accepts checkout session expiries between 30 minutes and 24 hours
+# after the session is created; the minimum leaves a minute for request latency
+STRIPE_SESSION_MIN_TTL = 31 * 60
+STRIPE_SESSION_MAX_TTL = 24 * 60 * 60
+
+LAPSED_STATUSES = (TicketHold.Status.EXPIRED, TicketHold.Status.RELEASED)
+
+
+class SoldOut(Exception):
+    """Not enough unsold, unheld seats left for a sale or hold; available_quantity() gives the remainder"""
+
+    def __init__(self, ticket_type_id: int, requested: int):
+        self.ticket_type_id = ticket_type_id
+        self.requested = requested
+        super().__init__(f"Not enough tickets left for ticket type {ticket_type_id} ({requested} requested)")
+
+
+class _Contended(Exception):
+    """A hold was settled by another worker mid-batch"""
+
+
+def hold_ttl() -> int:
+    """Seconds a checkout session stays open, within Stripe's limits"""
+    ttl = getattr(settings, 'TICKET_HOLD_TTL', DEFAULT_HOLD_TTL)
+    return min(max(ttl, STRIPE_SESSION_MIN_TTL), STRIPE_SESSION_MAX_TTL)
+
+
+def session_expires_at():
+    """When a checkout session created now should expire"""
+    return timezone.now() + timedelta(seconds=hold_ttl())
+
+
+def available_quantity(ticket_type_id: int) -> int:
+    """Seats currently available for a ticket type"""
+    ticket_type = TicketType.objects.filter(id=ticket_type_id).only(
+        'quantity_total', 'quantity_sold', 'quantity_held'
+    ).first()
+    return ticket_type.available_quantity if ticket_type else 0
+
+
+def default_ticket_type(event_id: int, fixture_id: Optional[int] = None) -> Optional[TicketType]:
+    """The ticket type sold by the single-price checkout for an event or fixture, if any"""
+    ticket_types = TicketType.objects.filter(event_id=event_id, on_sale=True).order_by('price_cents', 'id')
+    if fixture_id:
+        return ticket_types.filter(fixture_id=fixture_id).first() or ticket_types.filter(fixture_id__isnull=True).first()
+    return ticket_types.filter(fixture_id__isnull=True).first()
+
+
+def _claim(ticket_type_id: int, quantity: int, counter: str):
+    """Add quantity to a counter if it fits in the remaining capacity; raises SoldOut otherwise"""
+    claimed = TicketType.objects.filter(
+        id=ticket_type_id,
+        on_sale=True,
+        quantity_total__gte=F('quantity_sold') + F('quantity_held') + quantity,
+    ).update(**{counter: F(counter) + quantity})
+    if not claimed:
+        raise SoldOut(ticket_type_id, quantity)
+
+
+def _merge(items: Iterable[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Sum quantities per ticket type, in id order so concurrent orders lock rows consistently"""
+    quantities: Dict[int, int] = defaultdict(int)
+    for ticket_type_id, quantity in items:
+        quantities[ticket_type_id] += quantity
+    return sorted(quantities.items())
+
+
+def sell(items: Iterable[Tuple[int, int]]):
+    """
+    Sell (ticket_type_id, quantity) items outright, all or nothing.
+
+    Raises SoldOut, leaving every counter untouched, if any item doesn't fit.
+    """
+    items = _merge(items)
+    if len(items) == 1:
+        _claim(*items[0], 'quantity_sold')
+        return
+    with transaction.atomic():
+        for ticket_type_id, quantity in items:
+            _claim(ticket_type_id, quantity, 'quantity_sold')
+
+
+def place_hold(ticket_type_id: int, quantity: int, order=None, expires_at=None) -> TicketHold:
+    """Hold seats for an open checkout until expires_at; raises SoldOut if they don't fit"""
+    if expires_at is None:
+        grace = getattr(settings, 'TICKET_HOLD_GRACE', DEFAULT_HOLD_GRACE)
+        expires_at = timezone.now() + timedelta(seconds=hold_ttl() + grace)
+    with transaction.atomic():
+        _claim(ticket_type_id, quantity, 'quantity_held')
+        return TicketHold.objects.create(
+            ticket_type_id=ticket_type_id,
+            order=order,
+            quantity=quantity,
+            expires_at=expires_at,
+        )
+
+
+def _settle(holds: List[Tuple[int, int, int]], status: str) -> int:
+    """
+    Move (hold_id, ticket_type_id, quantity) holds out of ACTIVE.
+
+    Only holds still active are moved, so a hold is settled once even when the
+    webhook and the expiry sweep race for it. Returns the number moved.
+    """
+    if not holds:
+        return 0
+    ids = [hold_id for hold_id, _, _ in holds]
+    moved = TicketHold.objects.filter(id__in=ids, status=TicketHold.Status.ACTIVE).update(
+        status=status, updated_at=timezone.now()
+    )
+    if moved != len(ids):
+        # Another worker settled some of these first; their counters are theirs to adjust
+        raise _Contended()
+
+    totals: Dict[int, int] = defaultdict(int)
+    for _, ticket_type_id, quantity in holds:
+        totals[ticket_type_id] += quantity
+    for ticket_type_id, quantity in sorted(totals.items()):
+        counters = {'quantity_held': F('quantity_held') - quantity}
+        if status == TicketHold.Status.CONVERTED:
+            counters['quantity_sold'] = F('quantity_sold') + quantity
+        TicketType.objects.filter(id=ticket_type_id).update(**counters)
+    return moved
+
+
+def _locked_holds(queryset):
+    """Lock and list active holds as (id, ticket_type_id, quantity)"""
+    queryset = queryset.filter(status=TicketHold.Status.ACTIVE).order_by('id')
+    if connection.features.has_select_for_update_skip_locked:
+        queryset = queryset.select_for_update(skip_locked=True)
+    else:
+        queryset = queryset.select_for_update()
+    return list(queryset.values_list('id', 'ticket_type_id', 'quantity'))
+
+
+def _settle_locked(queryset, status: str) -> int:
+    try:
+        with transaction.atomic():
+            return _settle(_locked_holds(queryset), status)
+    except _Contended:
+        # Without row locks (SQLite) a concurrent settle can win; retry one by one
+        settled = 0
+        for hold in queryset.filter(status=TicketHold.Status.ACTIVE).values_list('id', 'ticket_type_id', 'quantity'):
+            try:
+                with transaction.atomic():
+                    settled += _settle([hold], status)
+            except _Contended:
+                continue
+        return settled
+
+
+def convert_holds(order) -> int:
+    """
+    Turn an order's holds into sold seats once its payment completes.
+
+    Idempotent: repeated webhook deliveries convert nothing further. If the
+    holds already lapsed, the seats are sold again if still available;
+    a sold-out event is logged for a refund rather than oversold.
+    """
+    converted = _settle_locked(TicketHold.objects.filter(order=order), TicketHold.Status.CONVERTED)
+    if converted:
+        return converted
+
+    lapsed = list(TicketHold.objects.filter(order=order, status__in=LAPSED_STATUSES)
+                  .values_list('id', 'ticket_type_id', 'quantity'))
+    if not lapsed:
+        return 0
+    try:
+        with transaction.atomic():
+            # Claim the lapsed holds first so a redelivered webhook can't sell them twice
+            claimed = TicketHold.objects.filter(
+                id__in=[hold_id for hold_id, _, _ in lapsed], status__in=LAPSED_STATUSES
+            ).update(status=TicketHold.Status.CONVERTED, updated_at=timezone.now())
+            if claimed != len(lapsed):
+                raise _Contended()
+            sell((ticket_type_id, quantity) for _, ticket_type_id, quantity in lapsed)
+    except _Contended:
+        return 0
+    except SoldOut as e:
+        logger.error(f"Order {order.id} paid after its hold expired and {e}; refund required")
+        return 0
+    return len(lapsed)
+
+
+def release_holds(order, status: str = TicketHold.Status.RELEASED) -> int:
+    """Return an order's held seats to sale (payment failed or checkout abandoned)"""
+    return _settle_locked(TicketHold.objects.filter(order=order), status)
+
+
+def release_expired_holds(now=None, batch_size: int = 500) -> int:
+    """Return seats of holds past their expiry to sale, batch_size holds per transaction"""
+    now = now or timezone.now()
+    released = 0
+    while True:
+        batch = TicketHold.objects.filter(
+            id__in=list(TicketHold.objects.filter(status=TicketHold.Status.ACTIVE, expires_at__lte=now)
+                        .order_by('expires_at').values_list('id', flat=True)[:batch_size])
+        )
+        settled = _settle_locked(batch, TicketHold.Status.EXPIRED)
+        released += settled
+        if not settled:
+            return released
@@ -0,0 +1,133 @@
+# tickets/services/issuance.py
+"""
+Bulk ticket issuance service
+
+Tickets for an order are built in memory with their serials and signed QR
+payloads, then written with a single bulk insert. On PostgreSQL the ticket
+ids are reserved from the table sequence up front so the payload (which
+embeds the id) is known before the insert; other backends insert first and
+fill in the payloads with one bulk update.
+"""
+import logging
+import uuid
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from django.db import connection, transaction
+
+from ..models import Ticket, TicketOrder
+from .qr import generate_qr_payload
+
+logger = logging.getLogger(__name__)
+
+
+def generate_serial() -> str:
+    """Generate a ticket serial number"""
+    return f"TKT-{uuid.uuid4().hex[:12].upper()}"
+
+
+def allocate_ticket_ids(count: int) -> Optional[List[int]]:
+    """
+    Reserve count ticket ids from the database sequence in one query.
+
+    Returns None when the backend has no sequence to draw from.
+    """
+    if count <= 0 or connection.vendor != 'postgresql':
+        return None
+
+    table = Ticket._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT nextval(pg_get_serial_sequence(%s, 'id')) FROM generate_series(1, %s)",
+            [table, count]
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def _unique_serials(count: int) -> List[str]:
+    serials = set()
+    while len(serials) < count:
+        serials.add(generate_serial())
+    return list(serials)
+
+
+def issue_tickets(
+    order: TicketOrder,
+    items: Iterable[Tuple[Optional[int], int]],
+    status: str = Ticket.Status.PENDING_APPROVAL,
+    with_codes: bool = False,
+) -> List[Ticket]:
+    """
+    Issue all tickets for an order in bulk
+
+    Args:
+        order: Saved order the tickets belong to
+        items: (ticket_type_id, quantity) pairs; ticket_type_id may be None
+        status: Initial ticket status
+        with_codes: Also assign display codes (TKT-<event>-<order>-<seq>)
+
+    Returns:
+        Issued tickets in creation order, with ids and QR payloads set
+    """
+    ticket_type_ids: List[Optional[int]] = []
+    for ticket_type_id, quantity in items:
+        ticket_type_ids.extend([ticket_type_id] * quantity)
+
+    count = len(ticket_type_ids)
+    if not count:
+        return []
+
+    serials = _unique_serials(count)
+    tickets = [
+        Ticket(
+            order=order,
+            ticket_type_id=ticket_type_id,
+            serial=serial,
+            code=f"TKT-{order.event_id}-{order.id}-{seq}" if with_codes else '',
+            status=status,
+        )
+        for seq, (ticket_type_id, serial) in enumerate(zip(ticket_type_ids, serials), 1)
+    ]
+
+    with transaction.atomic():
+        ids = allocate_ticket_ids(count)
+        if ids is not None:
+            for ticket, ticket_id in zip(tickets, ids):
+                ticket.id = ticket_id
+                ticket.qr_payload = generate_qr_payload(ticket_id, order.id, ticket.serial)
+            Ticket.objects.bulk_create(tickets)
+        else:
+            Ticket.objects.bulk_create(tickets)
+            if tickets[0].pk is None:
+                # Backend can't return ids from a bulk insert; look them up by serial
+                id_by_serial = dict(
+                    Ticket.objects.filter(serial__in=serials).values_list('serial', 'id')
+                )
+                for ticket in tickets:
+                    ticket.id = id_by_serial[ticket.serial]
+            for ticket in tickets:
+                ticket.qr_payload = generate_qr_payload(ticket.id, order.id, ticket.serial)
+            Ticket.objects.bulk_update(tickets, ['qr_payload'])
+
+    transaction.on_commit(lambda: broadcast_tickets_issued(order, tickets))
+    return tickets
+
+
+def broadcast_tickets_issued(order: TicketOrder, tickets: Sequence[Ticket]):
+    """
+    Announce a batch of issued tickets with one message per group
+    (bulk inserts don't fire the per-ticket post_save broadcast)
+    """
+    from ..signals import safe_broadcast
+
+    payload = {
+        'order_id': order.id,
+        'user_id': order.user_id,
+        'event_id': order.event_id,
+        'count': len(tickets),
+        'tickets': [
+            {'ticket_id': ticket.id, 'serial': ticket.serial, 'ticket_type_id': ticket.ticket_type_id}
+            for ticket in tickets
+        ],
+    }
+    safe_broadcast(f"orders:user:{order.user_id}", 'tickets.issued', payload)
+    safe_broadcast(f"orders:event:{order.event_id}", 'tickets.issued', payload)
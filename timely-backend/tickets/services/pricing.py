@@ -6,6 +6,13 @@ from typing import Dict, List, Tuple
 from decimal import Decimal
 
 
+def _load_ticket_types(ticket_items: List[Dict]) -> Dict[int, "TicketType"]:
+    """Fetch every ticket type referenced by the items in one query"""
+    from ..models import TicketType
+    
+    return TicketType.objects.in_bulk({item['ticket_type_id'] for item in ticket_items})
+
+
 def calculate_order_total(ticket_items: List[Dict]) -> Tuple[int, str]:
     """
     Calculate total price for ticket order items
@@ -16,25 +23,24 @@ def calculate_order_total(ticket_items: List[Dict]) -> Tuple[int, str]:
     Returns:
         Tuple of (total_cents, currency)
     """
-    from ..models import TicketType
-    
     total_cents = 0
     currency = 'USD'
     
+    ticket_types = _load_ticket_types(ticket_items)
+    
     for item in ticket_items:
         ticket_type_id = item['ticket_type_id']
         quantity = item['qty']
         
-        try:
-            ticket_type = TicketType.objects.get(id=ticket_type_id)
-            currency = ticket_type.currency  # Use currency from first ticket type
-            
-            # Calculate subtotal for this item
-            subtotal_cents = ticket_type.price_cents * quantity
-            total_cents += subtotal_cents
-            
-        except TicketType.DoesNotExist:
+        ticket_type = ticket_types.get(ticket_type_id)
+        if ticket_type is None:
             raise ValueError(f"Ticket type {ticket_type_id} not found")
+        
+        currency = ticket_type.currency  # Use currency from first ticket type
+        
+        # Calculate subtotal for this item
+        subtotal_cents = ticket_type.price_cents * quantity
+        total_cents += subtotal_cents
     
     return total_cents, currency
 
@@ -90,46 +96,45 @@ def validate_inventory(ticket_items: List[Dict]) -> Dict[str, any]:
     Returns:
         Dict with validation results
     """
-    from ..models import TicketType
-    
     validation_results = {
         'valid': True,
         'errors': [],
         'warnings': []
     }
     
+    ticket_types = _load_ticket_types(ticket_items)
+    
     for item in ticket_items:
         ticket_type_id = item['ticket_type_id']
         quantity = item['qty']
         
-        try:
-            ticket_type = TicketType.objects.get(id=ticket_type_id)
-            
-            # Check if ticket type is on sale
-            if not ticket_type.on_sale:
-                validation_results['valid'] = False
-                validation_results['errors'].append(
-                    f"Ticket type '{ticket_type.name}' is not currently on sale"
-                )
-                continue
-            
-            # Check availability
-            if not ticket_type.can_purchase(quantity):
-                validation_results['valid'] = False
-                validation_results['errors'].append(
-                    f"Insufficient inventory for '{ticket_type.name}'. "
-                    f"Requested: {quantity}, Available: {ticket_type.available_quantity}"
-                )
-            
-            # Check if low inventory warning
-            if ticket_type.available_quantity <= 5:
-                validation_results['warnings'].append(
-                    f"Low inventory for '{ticket_type.name}': {ticket_type.available_quantity} remaining"
-                )
-                
-        except TicketType.DoesNotExist:
+        ticket_type = ticket_types.get(ticket_type_id)
+        if ticket_type is None:
             validation_results['valid'] = False
             validation_results['errors'].append(f"Ticket type {ticket_type_id} not found")
+            continue
+        
+        # Check if ticket type is on sale
+        if not ticket_type.on_sale:
+            validation_results['valid'] = False
+            validation_results['errors'].append(
+                f"Ticket type '{ticket_type.name}' is not currently on sale"
+            )
+            continue
+        
+        # Check availability
+        if not ticket_type.can_purchase(quantity):
+            validation_results['valid'] = False
+            validation_results['errors'].append(
+                f"Insufficient inventory for '{ticket_type.name}'. "
+                f"Requested: {quantity}, Available: {ticket_type.available_quantity}"
+            )
+        
+        # Check if low inventory warning
+        if ticket_type.available_quantity <= 5:
+            validation_results['warnings'].append(
+                f"Low inventory for '{ticket_type.name}': {ticket_type.available_quantity} remaining"
+            )
     
     return validation_results
 
@@ -0,0 +1,178 @@
+# tickets/tests/test_checkin.py
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from events.models import Event
+from tickets.models import TicketOrder, Ticket
+from tickets.services.checkin import CheckinEngine, ScanStatus, TicketIndex, invalidate_ticket_index
+from tickets.services.issuance import issue_tickets
+
+User = get_user_model()
+
+
+class CheckinEngineTest(TestCase):
+    """Test the gate check-in engine"""
+
+    def setUp(self):
+        invalidate_ticket_index()
+        self.user = User.objects.create_user(email='fan@test.com', password='testpass123')
+        self.order = TicketOrder.objects.create(user=self.user, event_id=11, total_cents=0)
+        self.tickets = issue_tickets(self.order, [(None, 5)], status=Ticket.Status.VALID)
+        self.other_order = TicketOrder.objects.create(user=self.user, event_id=12, total_cents=0)
+        self.other_ticket, = issue_tickets(self.other_order, [(None, 1)], status=Ticket.Status.VALID)
+
+    def test_index_holds_event_tickets_only(self):
+        with self.assertNumQueries(1):
+            index = TicketIndex.build(11)
+        self.assertEqual(len(index.admissible), 5)
+        self.assertEqual(len(index.used), 0)
+
+    def test_scan_admits_with_one_update(self):
+        engine = CheckinEngine(11)
+        with self.assertNumQueries(1):
+            result = engine.scan(self.tickets[0].qr_payload, gate='North')
+
+        self.assertEqual(result.status, ScanStatus.ADMITTED)
+        self.assertEqual(result.gate, 'North')
+        ticket = Ticket.objects.get(id=self.tickets[0].id)
+        self.assertEqual(ticket.status, Ticket.Status.USED)
+        self.assertIsNotNone(ticket.used_at)
+
+    def test_second_gate_cannot_readmit(self):
+        # Two gates with their own engines and indexes scan the same ticket
+        gate_a = CheckinEngine(11, index=TicketIndex.build(11))
+        gate_b = CheckinEngine(11, index=TicketIndex.build(11))
+
+        self.assertTrue(gate_a.scan(self.tickets[0].qr_payload).admitted)
+        result = gate_b.scan(self.tickets[0].qr_payload)
+        self.assertEqual(result.status, ScanStatus.ALREADY_USED)
+
+    def test_used_tickets_rejected_from_index(self):
+        engine = CheckinEngine(11)
+        with patch('tickets.signals.safe_broadcast') as broadcast, self.captureOnCommitCallbacks(execute=True):
+            engine.scan(self.tickets[0].qr_payload)
+        broadcast.assert_called_once()
+
+        with self.assertNumQueries(0):
+            result = engine.scan(self.tickets[0].qr_payload)
+        self.assertEqual(result.status, ScanStatus.ALREADY_USED)
+
+    def test_rejects_forged_and_foreign_tickets(self):
+        engine = CheckinEngine(11)
+        forged = self.tickets[0].qr_payload[:-1] + ('0' if self.tickets[0].qr_payload[-1] != '0' else '1')
+        with self.assertNumQueries(0):
+            self.assertEqual(engine.scan(forged).status, ScanStatus.INVALID)
+            self.assertEqual(engine.scan('garbage').status, ScanStatus.INVALID)
+
+        self.assertEqual(engine.scan(self.other_ticket.qr_payload).status, ScanStatus.NOT_ADMISSIBLE)
+        self.assertEqual(Ticket.objects.get(id=self.other_ticket.id).status, Ticket.Status.VALID)
+
+    def test_voided_after_index_build(self):
+        engine = CheckinEngine(11)
+        Ticket.objects.filter(id=self.tickets[1].id).update(status=Ticket.Status.VOID)
+
+        result = engine.scan(self.tickets[1].qr_payload)
+        self.assertEqual(result.status, ScanStatus.NOT_ADMISSIBLE)
+        self.assertEqual(Ticket.objects.get(id=self.tickets[1].id).status, Ticket.Status.VOID)
+
+    def test_issued_after_index_build(self):
+        engine = CheckinEngine(11)
+        late, = issue_tickets(self.order, [(None, 1)], status=Ticket.Status.VALID)
+        self.assertTrue(engine.scan(late.qr_payload).admitted)
+
+    def test_batch_admits_earliest_duplicate(self):
+        engine = CheckinEngine(11)
+        now = timezone.now()
+        scans = [
+            {'qr_payload': self.tickets[0].qr_payload, 'gate': 'A', 'scanned_at': (now + timedelta(seconds=5)).isoformat()},
+            {'qr_payload': self.tickets[0].qr_payload, 'gate': 'B', 'scanned_at': now.isoformat()},
+            {'qr_payload': self.tickets[1].qr_payload, 'gate': 'A', 'scanned_at': now.isoformat()},
+            {'qr_payload': 'TKT:1:2:3:bad', 'gate': 'A'},
+        ]
+        with self.assertNumQueries(4):
+            results = engine.scan_batch(scans)
+
+        self.assertEqual([r.status for r in results], [
+            ScanStatus.ALREADY_USED, ScanStatus.ADMITTED, ScanStatus.ADMITTED, ScanStatus.INVALID,
+        ])
+        ticket = Ticket.objects.get(id=self.tickets[0].id)
+        self.assertEqual(ticket.status, Ticket.Status.USED)
+        self.assertEqual(ticket.used_at, now)
+
+
+class CheckinAPITest(APITestCase):
+    """Test check-in endpoints"""
+
+    def setUp(self):
+        invalidate_ticket_index()
+        self.organizer = User.objects.create_user(email='org@test.com', password='testpass123')
+        self.staff = User.objects.create_user(email='staff@test.com', password='testpass123', is_staff=True)
+        self.fan = User.objects.create_user(email='fan@test.com', password='testpass123')
+        self.event = Event.objects.create(
+            name='Final',
+            sport='Football',
+            start_datetime=timezone.now() + timedelta(days=1),
+            end_datetime=timezone.now() + timedelta(days=2),
+            created_by=self.organizer,
+        )
+        order = TicketOrder.objects.create(user=self.fan, event_id=self.event.id, total_cents=0)
+        self.tickets = issue_tickets(order, [(None, 3)], status=Ticket.Status.APPROVED)
+
+    def test_verify_accepts_signed_payload(self):
+        self.client.force_authenticate(self.staff)
+        url = reverse('tickets:verify-ticket')
+
+        response = self.client.post(url, {'qr_payload': self.tickets[0].qr_payload, 'gate': 'East'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['ticket']['id'], self.tickets[0].id)
+
+        response = self.client.post(url, {'qr_payload': self.tickets[0].qr_payload}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['status'], ScanStatus.ALREADY_USED)
+
+    def test_batch_upload(self):
+        self.client.force_authenticate(self.organizer)
+        url = reverse('tickets:checkin-batch', args=[self.event.id])
+        scans = [{'qr_payload': ticket.qr_payload, 'gate': 'West'} for ticket in self.tickets]
+
+        response = self.client.post(url, {'scans': scans}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['summary'], {ScanStatus.ADMITTED: 3})
+        self.assertFalse(Ticket.objects.exclude(status=Ticket.Status.USED).filter(order__event_id=self.event.id).exists())
+
+    def test_batch_upload_requires_event_staff(self):
+        self.client.force_authenticate(self.fan)
+        url = reverse('tickets:checkin-batch', args=[self.event.id])
+        response = self.client.post(url, {'scans': [{'qr_payload': self.tickets[0].qr_payload}]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_malformed_input_is_rejected_not_raised(self):
+        self.client.force_authenticate(self.staff)
+        response = self.client.post(
+            reverse('tickets:verify-ticket'),
+            {'qr_payload': self.tickets[0].qr_payload, 'event_id': 'final'}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        url = reverse('tickets:checkin-batch', args=[self.event.id])
+        scans = [
+            {'qr_payload': self.tickets[0].qr_payload, 'scanned_at': 1700000000},
+            {'qr_payload': self.tickets[1].qr_payload, 'scanned_at': '2025-02-30T10:00:00'},
+            {'qr_payload': self.tickets[2].qr_payload, 'scanned_at': 'yesterday'},
+            {'qr_payload': 42},
+            {'qr_payload': self.tickets[2].qr_payload},
+        ]
+        response = self.client.post(url, {'scans': scans}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [result['status'] for result in response.data['results']],
+            [ScanStatus.INVALID] * 4 + [ScanStatus.ADMITTED]
+        )
+        self.assertEqual(response.data['results'][0]['error'], 'Invalid scanned_at')
@@ -0,0 +1,322 @@
+# tickets/tests/test_inventory.py
+import threading
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, skipUnlessDBFeature
+from django.utils import timezone
+
+from events.models import Event
+from tickets.models import TicketHold, TicketOrder, TicketType
+from tickets.services.inventory import (
+    SoldOut, convert_holds, place_hold, release_expired_holds, release_holds, sell,
+)
+from tickets.views_webhook import handle_checkout_session_expired, handle_ticket_payment
+
+User = get_user_model()
+
+
+def create_event(user, **kwargs):
+    start = timezone.now() + timedelta(days=7)
+    return Event.objects.create(
+        name='Grand Final', sport='Basketball', start_datetime=start,
+        end_datetime=start + timedelta(hours=3), created_by=user, **kwargs
+    )
+
+
+class InventoryTest(TestCase):
+    """Test atomic ticket inventory and checkout holds"""
+
+    def setUp(self):
+        patcher = patch('events.signals.broadcaster')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.user = User.objects.create_user(email='fan@test.com', password='testpass123')
+        self.event = create_event(self.user)
+        self.ticket_type = TicketType.objects.create(
+            event_id=self.event.id, name='General', price_cents=2000, quantity_total=10
+        )
+
+    def _order(self, **kwargs):
+        return TicketOrder.objects.create(user=self.user, event_id=self.event.id, total_cents=2000, **kwargs)
+
+    def _counts(self):
+        self.ticket_type.refresh_from_db()
+        return self.ticket_type.quantity_sold, self.ticket_type.quantity_held
+
+    def test_sell_is_one_conditional_update(self):
+        with self.assertNumQueries(1):
+            sell([(self.ticket_type.id, 4)])
+        self.assertEqual(self._counts(), (4, 0))
+
+    def test_sold_out_is_one_query_too(self):
+        with self.assertNumQueries(1), self.assertRaises(SoldOut):
+            sell([(self.ticket_type.id, 11)])
+
+    def test_sell_all_or_nothing(self):
+        vip = TicketType.objects.create(event_id=self.event.id, name='VIP', price_cents=9000, quantity_total=2)
+        with self.assertRaises(SoldOut) as raised:
+            sell([(self.ticket_type.id, 3), (vip.id, 3)])
+
+        self.assertEqual((raised.exception.ticket_type_id, raised.exception.requested), (vip.id, 3))
+        self.assertEqual(self._counts(), (0, 0))
+        vip.refresh_from_db()
+        self.assertEqual(vip.quantity_sold, 0)
+
+    def test_holds_count_against_capacity(self):
+        place_hold(self.ticket_type.id, 8, order=self._order())
+        self.assertEqual(self._counts(), (0, 8))
+        self.assertEqual(self.ticket_type.available_quantity, 2)
+
+        with self.assertRaises(SoldOut):
+            sell([(self.ticket_type.id, 3)])
+        with self.assertRaises(SoldOut):
+            place_hold(self.ticket_type.id, 3)
+        self.assertEqual(TicketHold.objects.count(), 1)
+
+    def test_off_sale_ticket_type_rejected(self):
+        TicketType.objects.filter(id=self.ticket_type.id).update(on_sale=False)
+        with self.assertRaises(SoldOut):
+            sell([(self.ticket_type.id, 1)])
+
+    def test_convert_is_idempotent(self):
+        order = self._order()
+        place_hold(self.ticket_type.id, 3, order=order)
+
+        self.assertEqual(convert_holds(order), 1)
+        self.assertEqual(convert_holds(order), 0)
+        self.assertEqual(self._counts(), (3, 0))
+        self.assertEqual(order.holds.get().status, TicketHold.Status.CONVERTED)
+
+    def test_release_returns_seats(self):
+        order = self._order()
+        place_hold(self.ticket_type.id, 3, order=order)
+
+        self.assertEqual(release_holds(order), 1)
+        self.assertEqual(release_holds(order), 0)
+        self.assertEqual(self._counts(), (0, 0))
+        # A payment completing after the release sells the seats once
+        self.assertEqual(convert_holds(order), 1)
+        self.assertEqual(convert_holds(order), 0)
+        self.assertEqual(self._counts(), (3, 0))
+
+    def test_expired_holds_released(self):
+        now = timezone.now()
+        expired = place_hold(self.ticket_type.id, 4, order=self._order(), expires_at=now - timedelta(minutes=1))
+        live = place_hold(self.ticket_type.id, 2, order=self._order(), expires_at=now + timedelta(minutes=10))
+
+        self.assertEqual(release_expired_holds(now=now, batch_size=1), 1)
+        self.assertEqual(self._counts(), (0, 2))
+        expired.refresh_from_db()
+        live.refresh_from_db()
+        self.assertEqual(expired.status, TicketHold.Status.EXPIRED)
+        self.assertEqual(live.status, TicketHold.Status.ACTIVE)
+
+        call_command('release_expired_holds', stdout=open('/dev/null', 'w'))
+        self.assertEqual(self._counts(), (0, 2))
+
+    def test_payment_after_expiry_resells_if_available(self):
+        order = self._order()
+        place_hold(self.ticket_type.id, 2, order=order, expires_at=timezone.now() - timedelta(seconds=1))
+        release_expired_holds()
+
+        self.assertEqual(convert_holds(order), 1)
+        self.assertEqual(self._counts(), (2, 0))
+
+    def test_payment_after_expiry_never_oversells(self):
+        order = self._order()
+        place_hold(self.ticket_type.id, 2, order=order, expires_at=timezone.now() - timedelta(seconds=1))
+        release_expired_holds()
+        sell([(self.ticket_type.id, 9)])
+
+        with self.assertLogs('tickets.services.inventory', 'ERROR'):
+            self.assertEqual(convert_holds(order), 0)
+        self.assertEqual(self._counts(), (9, 0))
+
+
+class CheckoutWebhookInventoryTest(TestCase):
+    """Test Stripe webhook handling of held seats"""
+
+    def setUp(self):
+        patcher = patch('events.signals.broadcaster')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.user = User.objects.create_user(email='fan@test.com', password='testpass123')
+        self.event = create_event(self.user)
+        self.ticket_type = TicketType.objects.create(
+            event_id=self.event.id, name='General', price_cents=2000, quantity_total=5
+        )
+        self.order = TicketOrder.objects.create(
+            user=self.user, event_id=self.event.id, total_cents=4000, client_reference_id='order_abc'
+        )
+        place_hold(self.ticket_type.id, 2, order=self.order)
+
+    def test_completed_session_converts_hold_and_issues_typed_tickets(self):
+        session = {'id': 'cs_1', 'client_reference_id': 'order_abc', 'payment_intent': 'pi_1'}
+        handle_ticket_payment(session, {'quantity': '2'})
+        handle_ticket_payment(session, {'quantity': '2'})
+
+        self.ticket_type.refresh_from_db()
+        self.assertEqual((self.ticket_type.quantity_sold, self.ticket_type.quantity_held), (2, 0))
+        self.assertEqual(list(self.order.tickets.values_list('ticket_type_id', flat=True)), [self.ticket_type.id] * 2)
+
+    def test_payment_after_hold_lapsed_and_sold_out_issues_nothing(self):
+        self.order.holds.update(expires_at=timezone.now() - timedelta(seconds=1))
+        release_expired_holds()
+        sell([(self.ticket_type.id, 4)])
+
+        session = {'id': 'cs_1', 'client_reference_id': 'order_abc', 'payment_intent': 'pi_1'}
+        with self.assertLogs('tickets', 'ERROR'):
+            handle_ticket_payment(session, {'quantity': '2'})
+        handle_ticket_payment(session, {'quantity': '2'})
+
+        self.order.refresh_from_db()
+        self.ticket_type.refresh_from_db()
+        self.assertEqual(self.order.status, TicketOrder.Status.REFUND_REQUIRED)
+        self.assertEqual(self.order.provider_payment_intent_id, 'pi_1')
+        self.assertFalse(self.order.tickets.exists())
+        self.assertEqual((self.ticket_type.quantity_sold, self.ticket_type.quantity_held), (4, 0))
+        self.assertTrue(self.user.notifications.filter(title='Tickets Sold Out').exists())
+
+    def test_expired_session_releases_hold(self):
+        handle_checkout_session_expired({'id': 'cs_1', 'client_reference_id': 'order_abc'})
+
+        self.order.refresh_from_db()
+        self.ticket_type.refresh_from_db()
+        self.assertEqual(self.order.status, TicketOrder.Status.FAILED)
+        self.assertEqual(self.ticket_type.quantity_held, 0)
+        self.assertEqual(self.order.holds.get().status, TicketHold.Status.EXPIRED)
+
+
+class StaleReadOversellTest(TestCase):
+    """Checkouts that all saw seats available can't oversell"""
+
+    def setUp(self):
+        patcher = patch('events.signals.broadcaster')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        user = User.objects.create_user(email='fan@test.com', password='testpass123')
+        self.ticket_type = TicketType.objects.create(
+            event_id=create_event(user).id, name='General', price_cents=2000, quantity_total=10
+        )
+
+    def test_every_buyer_sees_stock_but_capacity_holds(self):
+        # 50 checkouts read the ticket type before any of them writes, as they do at an on-sale moment
+        snapshots = [TicketType.objects.get(id=self.ticket_type.id) for _ in range(50)]
+        self.assertTrue(all(snapshot.can_purchase(2) for snapshot in snapshots))
+
+        sold = 0
+        for n, snapshot in enumerate(snapshots):
+            try:
+                if n % 2:
+                    place_hold(snapshot.id, 2)
+                else:
+                    sell([(snapshot.id, 2)])
+                sold += 2
+            except SoldOut:
+                pass
+
+        self.ticket_type.refresh_from_db()
+        self.assertEqual(sold, 10)
+        self.assertEqual(self.ticket_type.quantity_sold + self.ticket_type.quantity_held, 10)
+
+
+@skipUnlessDBFeature('has_select_for_update')
+class InventoryConcurrencyTest(TransactionTestCase):
+    """Concurrent checkouts on a row-locking database never oversell"""
+
+    CAPACITY = 25
+    BUYERS = 16
+    ATTEMPTS = 6
+
+    def setUp(self):
+        patcher = patch('events.signals.broadcaster')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        user = User.objects.create_user(email='fan@test.com', password='testpass123')
+        self.ticket_type = TicketType.objects.create(
+            event_id=create_event(user).id, name='General', price_cents=2000, quantity_total=self.CAPACITY
+        )
+
+    def _run(self, attempt):
+        """Run BUYERS threads making ATTEMPTS purchases each; return the seats each claimed"""
+        claimed = []
+        barrier = threading.Barrier(self.BUYERS)
+
+        def buyer(n):
+            try:
+                barrier.wait()
+                for i in range(self.ATTEMPTS):
+                    quantity = 1 + (n + i) % 2
+                    try:
+                        attempt(quantity)
+                        claimed.append(quantity)
+                    except SoldOut:
+                        pass
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=buyer, args=(n,)) for n in range(self.BUYERS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return claimed
+
+    def test_concurrent_sales_never_oversell(self):
+        claimed = self._run(lambda quantity: sell([(self.ticket_type.id, quantity)]))
+
+        self.ticket_type.refresh_from_db()
+        self.assertEqual(self.ticket_type.quantity_sold, sum(claimed))
+        # Demand (16 buyers x 6 attempts) far exceeds capacity, so it sells out without overselling
+        self.assertIn(self.ticket_type.quantity_sold, (self.CAPACITY - 1, self.CAPACITY))
+
+    def test_concurrent_holds_never_oversell(self):
+        claimed = self._run(lambda quantity: place_hold(self.ticket_type.id, quantity))
+
+        self.ticket_type.refresh_from_db()
+        held = sum(TicketHold.objects.filter(ticket_type=self.ticket_type).values_list('quantity', flat=True))
+        self.assertEqual(self.ticket_type.quantity_held, sum(claimed))
+        self.assertEqual(held, sum(claimed))
+        self.assertLessEqual(held, self.CAPACITY)
+
+
+class AdminMarkPaidInventoryTest(TestCase):
+    """Test that the admin's mark-paid action sells seats through the counters"""
+
+    def setUp(self):
+        from django.contrib.admin.sites import site
+        from tickets.admin import TicketOrderAdmin
+
+        self.user = User.objects.create_user(email='fan@test.com', password='testpass123')
+        self.event = create_event(self.user)
+        self.admin = TicketOrderAdmin(TicketOrder, site)
+        self.ticket_type = TicketType.objects.create(
+            event_id=self.event.id, name='General Admission', price_cents=2000, quantity_total=1
+        )
+
+    def _mark_paid(self):
+        order = TicketOrder.objects.create(user=self.user, event_id=self.event.id, total_cents=2000)
+        with patch.object(self.admin, 'message_user') as message_user:
+            self.admin.mark_paid(None, TicketOrder.objects.filter(pk=order.pk))
+        order.refresh_from_db()
+        return order, message_user
+
+    def test_mark_paid_sells_the_seat_or_leaves_the_order(self):
+        order, _ = self._mark_paid()
+        self.assertEqual(order.status, TicketOrder.Status.PAID)
+        self.assertEqual(order.tickets.count(), 1)
+
+        order, message_user = self._mark_paid()
+        self.assertNotEqual(order.status, TicketOrder.Status.PAID)
+        self.assertFalse(order.tickets.exists())
+        self.assertIn('left unpaid', message_user.call_args_list[0][0][1])
+        self.ticket_type.refresh_from_db()
+        self.assertEqual(self.ticket_type.quantity_sold, 1)
@@ -0,0 +1,103 @@
+# tickets/tests/test_issuance.py
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from tickets.models import TicketType, TicketOrder, Ticket
+from tickets.services.issuance import issue_tickets
+from tickets.services.pricing import calculate_order_total, validate_inventory
+from tickets.services.qr import verify_qr_payload
+
+User = get_user_model()
+
+
+class BulkIssuanceTest(TestCase):
+    """Test bulk ticket issuance"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(email='buyer@test.com', password='testpass123')
+        self.order = TicketOrder.objects.create(user=self.user, event_id=7, total_cents=0)
+        self.general = TicketType.objects.create(
+            name='General', event_id=7, price_cents=1500, quantity_total=500
+        )
+        self.vip = TicketType.objects.create(
+            name='VIP', event_id=7, price_cents=5000, currency='AUD', quantity_total=20
+        )
+
+    def test_issue_tickets_signs_every_payload(self):
+        tickets = issue_tickets(self.order, [(self.general.id, 120), (self.vip.id, 3)])
+
+        self.assertEqual(len(tickets), 123)
+        self.assertEqual(Ticket.objects.filter(order=self.order).count(), 123)
+        self.assertEqual(Ticket.objects.filter(ticket_type=self.vip).count(), 3)
+        self.assertEqual(len({ticket.serial for ticket in tickets}), 123)
+
+        for ticket in Ticket.objects.filter(order=self.order):
+            verified = verify_qr_payload(ticket.qr_payload)
+            self.assertTrue(verified['valid'])
+            self.assertEqual(verified['ticket_id'], ticket.id)
+            self.assertEqual(verified['order_id'], self.order.id)
+            self.assertEqual(verified['serial'], ticket.serial)
+
+    def test_writes_are_batched(self):
+        with CaptureQueriesContext(connection) as queries:
+            issue_tickets(self.order, [(self.general.id, 300)])
+
+        # One insert (plus one payload update on backends without sequences),
+        # split only by the backend's parameter limit - never one write per ticket
+        self.assertLess(len(queries), 12)
+        self.assertEqual(Ticket.objects.filter(order=self.order).count(), 300)
+
+    def test_status_codes_and_untyped_tickets(self):
+        tickets = issue_tickets(self.order, [(None, 2)], status=Ticket.Status.VALID, with_codes=True)
+
+        self.assertEqual([ticket.code for ticket in tickets], [
+            f"TKT-7-{self.order.id}-1",
+            f"TKT-7-{self.order.id}-2",
+        ])
+        self.assertTrue(all(ticket.status == Ticket.Status.VALID for ticket in tickets))
+        self.assertIsNone(tickets[0].ticket_type_id)
+        self.assertEqual(issue_tickets(self.order, [(None, 0)]), [])
+
+    def test_broadcasts_once_per_group(self):
+        with patch('tickets.signals.safe_broadcast') as broadcast:
+            with self.captureOnCommitCallbacks(execute=True):
+                issue_tickets(self.order, [(self.general.id, 50)])
+
+        self.assertEqual(broadcast.call_count, 2)
+        groups = [call.args[0] for call in broadcast.call_args_list]
+        self.assertEqual(groups, [f"orders:user:{self.user.id}", "orders:event:7"])
+        self.assertEqual(broadcast.call_args.args[2]['count'], 50)
+
+
+class PricingLookupTest(TestCase):
+    """Test that pricing resolves ticket types in one query"""
+
+    def setUp(self):
+        self.types = [
+            TicketType.objects.create(name=f'Tier {i}', event_id=1, price_cents=100 * (i + 1), quantity_total=10)
+            for i in range(5)
+        ]
+
+    def test_calculate_order_total_single_query(self):
+        items = [{'ticket_type_id': ticket_type.id, 'qty': 2} for ticket_type in self.types]
+        with self.assertNumQueries(1):
+            total_cents, currency = calculate_order_total(items)
+
+        self.assertEqual(total_cents, 2 * (100 + 200 + 300 + 400 + 500))
+        self.assertEqual(currency, 'USD')
+
+    def test_calculate_order_total_missing_type(self):
+        with self.assertRaisesMessage(ValueError, 'Ticket type 9999 not found'):
+            calculate_order_total([{'ticket_type_id': self.types[0].id, 'qty': 1}, {'ticket_type_id': 9999, 'qty': 1}])
+
+    def test_validate_inventory_single_query(self):
+        items = [{'ticket_type_id': self.types[0].id, 'qty': 20}, {'ticket_type_id': 9999, 'qty': 1}]
+        with self.assertNumQueries(1):
+            result = validate_inventory(items)
+
+        self.assertFalse(result['valid'])
+        self.assertEqual(len(result['errors']), 2)
@@ -90,6 +90,9 @@ urlpatterns = [
     path('verify/', 
          views.checkin_ticket_qr, 
          name='verify-ticket'),
+    path('events/<int:event_id>/checkin/batch/', 
+         views.checkin_batch, 
+         name='checkin-batch'),
     path('checkin/', 
          views.checkin_ticket, 
          name='checkin-ticket'),
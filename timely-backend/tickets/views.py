@@ -6,6 +6,7 @@ from rest_framework.pagination import PageNumberPagination
 from django.shortcuts import get_object_or_404
 from django.db import transaction
 from django.contrib.auth import get_user_model
+from django.conf import settings
 
 from .models import TicketType, TicketOrder, Ticket, Refund
 from .serializers import (
@@ -21,7 +22,10 @@ from .permissions import (
 )
 from accounts.audit_mixin import AuditLogMixin
 from .services.pricing import calculate_order_total, validate_inventory
-from .services.qr import generate_qr_payload
+from .services.issuance import issue_tickets
+from .services.inventory import SoldOut, sell
+from .services.checkin import CheckinEngine
+from .services.qr import verify_qr_payload
 
 User = get_user_model()
 
@@ -132,26 +136,17 @@ def create_order(request):
                 currency=currency
             )
             
-            # Create tickets
-            for item in data['items']:
-                ticket_type_id = item['ticket_type_id']
-                quantity = item['qty']
-                
-                for _ in range(quantity):
-                    ticket = Ticket.objects.create(
-                        order=order,
-                        ticket_type_id=ticket_type_id
-                    )
-                    # Generate QR payload
-                    ticket.qr_payload = generate_qr_payload(
-                        ticket.id, order.id, ticket.serial
-                    )
-                    ticket.save()
+            # Claim the seats, then create tickets (serials and QR payloads computed up front, one insert)
+            items = [(item['ticket_type_id'], item['qty']) for item in data['items']]
+            sell(items)
+            issue_tickets(order, items)
             
             # Return order summary
             order_serializer = TicketOrderSerializer(order)
             return Response(order_serializer.data, status=status.HTTP_201_CREATED)
             
+    except SoldOut as e:
+        return Response({'error': str(e)}, status=status.HTTP_409_CONFLICT)
     except Exception as e:
         return Response(
             {'error': str(e)}, 
@@ -580,7 +575,7 @@ def checkin_ticket_qr(request):
     qr_payload = request.data.get('qr_payload')
     gate = request.data.get('gate', '')
     
-    if not qr_payload:
+    if not qr_payload or not isinstance(qr_payload, str):
         return Response(
             {'error': 'QR payload is required'}, 
             status=status.HTTP_400_BAD_REQUEST
@@ -593,61 +588,89 @@ def checkin_ticket_qr(request):
             status=status.HTTP_403_FORBIDDEN
         )
     
+    verified = verify_qr_payload(qr_payload)
+    if not verified['valid']:
+        return Response(
+            {'error': 'Invalid QR code', 'detail': verified['error']}, 
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    # Gate devices normally send their event; otherwise resolve it from the order
+    event_id = request.data.get('event_id') or TicketOrder.objects.filter(
+        id=verified['order_id']
+    ).values_list('event_id', flat=True).first()
     try:
-        # Parse QR payload
-        parts = qr_payload.split(':')
-        if len(parts) != 4 or parts[0] != 'TKT':
-            return Response(
-                {'error': 'Invalid QR code format'}, 
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        
-        ticket_id = int(parts[1])
-        order_id = int(parts[2])
-        serial = parts[3]
-        
-        # Get ticket
-        ticket = get_object_or_404(Ticket, id=ticket_id, serial=serial)
-        
-        # Check if already used
-        if ticket.status == Ticket.Status.USED:
-            return Response(
-                {'error': 'Ticket already used'}, 
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        
-        if ticket.status == Ticket.Status.VOID:
-            return Response(
-                {'error': 'Ticket is void'}, 
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        
-        # Use ticket
-        if ticket.use_ticket():
-            return Response({
-                'message': 'Ticket checked in successfully',
-                'ticket': {
-                    'id': ticket.id,
-                    'serial': ticket.serial,
-                    'ticket_type': ticket.ticket_type.name,
-                    'event_name': ticket.order.event.name,
-                    'used_at': ticket.used_at,
-                    'gate': gate
-                }
-            })
-        else:
-            return Response(
-                {'error': 'Failed to check in ticket'}, 
-                status=status.HTTP_400_BAD_REQUEST
-            )
-            
-    except (ValueError, Ticket.DoesNotExist):
+        event_id = int(event_id)
+    except (TypeError, ValueError):
+        event_id = None
+    if not event_id:
         return Response(
             {'error': 'Invalid ticket'}, 
             status=status.HTTP_400_BAD_REQUEST
         )
-    except Exception as e:
+    
+    result = CheckinEngine(event_id).scan(qr_payload, gate=gate)
+    if not result.admitted:
         return Response(
-            {'error': f'Check-in failed: {str(e)}'}, 
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR
-        )
\ No newline at end of file
+            {'error': result.error, 'status': result.status}, 
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    return Response({
+        'message': 'Ticket checked in successfully',
+        'ticket': {
+            'id': result.ticket_id,
+            'serial': result.serial,
+            'event_id': event_id,
+            'used_at': result.scanned_at,
+            'gate': gate
+        }
+    })
+
+
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+def checkin_batch(request, event_id):
+    """
+    Check-in a batch of scans uploaded by a gate device
+    Body: {scans: [{qr_payload: str, gate: str, scanned_at: ISO 8601}]}
+    """
+    from events.models import Event
+    
+    event = get_object_or_404(Event.objects.only('id', 'created_by_id'), id=event_id)
+    if not (request.user.is_staff or 
+            request.user.is_superuser or
+            event.created_by_id == request.user.id):
+        return Response(
+            {'error': 'Permission denied'}, 
+            status=status.HTTP_403_FORBIDDEN
+        )
+    
+    scans = request.data.get('scans')
+    max_batch = getattr(settings, 'TICKET_CHECKIN_MAX_BATCH', 500)
+    if not isinstance(scans, list) or not scans:
+        return Response(
+            {'error': 'scans must be a non-empty list'}, 
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    if len(scans) > max_batch:
+        return Response(
+            {'error': f'At most {max_batch} scans per batch'}, 
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    if not all(isinstance(scan, dict) for scan in scans):
+        return Response(
+            {'error': 'Each scan must be an object with a qr_payload'}, 
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    results = CheckinEngine(event.id).scan_batch(scans)
+    summary = {}
+    for result in results:
+        summary[result.status] = summary.get(result.status, 0) + 1
+    
+    return Response({
+        'event_id': event.id,
+        'summary': summary,
+        'results': [result.as_dict() for result in results]
+    })
@@ -16,6 +16,8 @@ from rest_framework.response import Response
 from events.models import Event
 from .models import TicketOrder, Ticket, TicketType
 from .permissions import CanPurchaseTickets
+from .services.issuance import issue_tickets
+from .services.inventory import SoldOut, default_ticket_type, place_hold, release_holds, sell, session_expires_at
 from notifications.models import Notification
 from accounts.models import User
 
@@ -60,6 +62,9 @@ def checkout(request):
     total_amount = unit_price * quantity
     currency = getattr(event, 'currency', 'usd').lower() or 'usd'
     
+    # Events with a ticket type have limited capacity; others sell untracked tickets
+    ticket_type = default_ticket_type(event_id)
+    
     # Handle free events (no Stripe needed)
     if total_amount == 0:
         try:
@@ -74,13 +79,14 @@ def checkout(request):
                     payment_provider=TicketOrder.Provider.OFFLINE
                 )
                 
-                # Create tickets in pending_approval status
-                for _ in range(quantity):
-                    Ticket.objects.create(
-                        order=order,
-                        ticket_type=None,  # No ticket type for simple flow
-                        status=Ticket.Status.PENDING_APPROVAL
-                    )
+                # Claim the seats, then create tickets in pending_approval status
+                if ticket_type:
+                    sell([(ticket_type.id, quantity)])
+                issue_tickets(
+                    order,
+                    [(ticket_type.id if ticket_type else None, quantity)],
+                    status=Ticket.Status.PENDING_APPROVAL
+                )
                 
                 # Notify user
                 Notification.objects.create(
@@ -112,6 +118,8 @@ def checkout(request):
                     'message': 'Free ticket submitted for approval'
                 }, status=status.HTTP_201_CREATED)
                 
+        except SoldOut as e:
+            return Response({'detail': str(e)}, status=status.HTTP_409_CONFLICT)
         except Exception as e:
             logger.error(f"Error creating free ticket order: {str(e)}")
             return Response({'detail': f'Failed to create order: {str(e)}'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -127,6 +135,7 @@ def checkout(request):
     # Update stripe.api_key to ensure we're using the latest from settings
     stripe.api_key = current_key
     
+    order = None
     try:
         # Use database transaction with row-level locking
         with transaction.atomic():
@@ -143,6 +152,11 @@ def checkout(request):
                 client_reference_id=client_ref_id
             )
             
+            # Hold the seats until the Stripe session expires (rolls back the order if sold out)
+            expires_at = session_expires_at()
+            if ticket_type:
+                place_hold(ticket_type.id, quantity, order=order)
+            
             logger.info(f"Created order {order.id} for user {request.user.id}, event {event_id}")
         
         # Create Stripe Checkout Session with idempotency key
@@ -172,6 +186,8 @@ def checkout(request):
             }],
             success_url=f'{base_frontend_url}/tickets/checkout/success?session_id={{CHECKOUT_SESSION_ID}}',
             cancel_url=f'{base_frontend_url}/events/{event_id}/checkout?canceled=1',
+            expires_at=int(expires_at.timestamp()),
+            payment_intent_data={'metadata': {'order_id': str(order.id)}},
             metadata={
                 'order_id': str(order.id),
                 'event_id': str(event_id),
@@ -195,13 +211,19 @@ def checkout(request):
             'order_id': order.id
         }, status=status.HTTP_200_OK)
         
+    except SoldOut as e:
+        return Response({'detail': str(e)}, status=status.HTTP_409_CONFLICT)
     except stripe.error.StripeError as e:
         logger.error(f"Stripe error creating checkout session: {str(e)}")
+        if order:
+            release_holds(order)
         return Response({
             'detail': f'Payment processing error: {str(e)}'
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     except Exception as e:
         logger.error(f"Error creating checkout session: {str(e)}")
+        if order:
+            release_holds(order)
         return Response({
             'detail': f'Failed to create checkout session: {str(e)}'
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -254,13 +276,10 @@ def free_ticket(request):
                     'on_sale': True
                 }
             )
+            sell([(ticket_type.id, 1)])
             
             # Create ticket in pending_approval status
-            ticket = Ticket.objects.create(
-                order=order,
-                ticket_type=ticket_type,
-                status=Ticket.Status.PENDING_APPROVAL
-            )
+            ticket, = issue_tickets(order, [(ticket_type.id, 1)], status=Ticket.Status.PENDING_APPROVAL)
             
             # Notify user
             try:
@@ -299,6 +318,8 @@ def free_ticket(request):
                 'message': 'Free ticket submitted for approval'
             }, status=status.HTTP_201_CREATED)
             
+    except SoldOut as e:
+        return Response({'detail': str(e)}, status=status.HTTP_409_CONFLICT)
     except Exception as e:
         logger.error(f"Error creating free ticket: {str(e)}")
         return Response({'detail': f'Failed to create ticket: {str(e)}'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
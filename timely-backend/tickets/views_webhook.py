@@ -2,6 +2,7 @@
 """
 Stripe webhook handler for ticket/registration payments
 """
+import json
 import logging
 import stripe
 from django.conf import settings
@@ -11,7 +12,10 @@ from django.views.decorators.http import require_http_methods
 from django.db import transaction
 from django.shortcuts import get_object_or_404
 
-from .models import TicketOrder, Ticket
+from payments.inbox import record_event
+from .models import TicketOrder, Ticket, TicketHold
+from .services.issuance import issue_tickets
+from .services.inventory import convert_holds, release_holds
 from registrations.models import Registration, RegistrationPaymentLog
 from notifications.models import Notification
 from accounts.models import User
@@ -26,53 +30,43 @@ stripe.api_key = settings.STRIPE_SECRET_KEY if hasattr(settings, 'STRIPE_SECRET_
 @require_http_methods(["POST"])
 def stripe_webhook(request):
     """
-    Handle Stripe webhook events
+    Receive Stripe webhook events
     POST /api/stripe/webhook/
-    No authentication required (signature verified instead)
+    No authentication required (signature verified instead). The event is
+    stored in the payments inbox and fulfilled in the background by the
+    handlers below (see payments.inbox), so Stripe is answered as soon as
+    the row is written; redeliveries of a stored event are acknowledged
+    without processing it again.
     """
     payload = request.body
-    sig_header = request.META.get('HTTP_STRIPE_SIGNATURE')
+    sig_header = request.META.get('HTTP_STRIPE_SIGNATURE', '')
     
     webhook_secret = getattr(settings, 'STRIPE_WEBHOOK_SECRET', '')
     
     if not webhook_secret:
         logger.warning("STRIPE_WEBHOOK_SECRET not configured - accepting all webhooks in development mode")
-        # In development without webhook secret, parse the event directly
-        try:
-            event = stripe.Event.construct_from(
-                stripe.util.convert_to_stripe_object(request.body, None, None),
-                stripe.api_key
-            )
-        except Exception as e:
-            logger.error(f"Error parsing webhook payload: {str(e)}")
-            return HttpResponse(status=400)
     else:
         # Verify webhook signature
         try:
-            event = stripe.Webhook.construct_event(
-                payload, sig_header, webhook_secret
+            stripe.WebhookSignature.verify_header(
+                payload.decode('utf-8'), sig_header, webhook_secret, stripe.Webhook.DEFAULT_TOLERANCE
             )
-        except ValueError as e:
-            logger.error(f"Invalid webhook payload: {str(e)}")
-            return HttpResponse(status=400)
-        except stripe.error.SignatureVerificationError as e:
+        except (UnicodeDecodeError, stripe.error.SignatureVerificationError) as e:
             logger.error(f"Invalid webhook signature: {str(e)}")
             return HttpResponse(status=400)
     
-    logger.info(f"Received Stripe webhook event: {event['type']}, ID: {event.get('id')}")
-    
-    # Handle the event
     try:
-        if event['type'] == 'checkout.session.completed':
-            handle_checkout_session_completed(event['data']['object'])
-        elif event['type'] == 'payment_intent.payment_failed':
-            handle_payment_failed(event['data']['object'])
-        else:
-            logger.info(f"Unhandled event type: {event['type']}")
+        event = json.loads(payload)
+        event_id = event['id']
+    except (ValueError, KeyError, TypeError) as e:
+        logger.error(f"Invalid webhook payload: {str(e)}")
+        return HttpResponse(status=400)
     
-    except Exception as e:
-        logger.error(f"Error processing webhook {event.get('id')}: {str(e)}", exc_info=True)
-        return HttpResponse(status=500)
+    webhook_event, created = record_event(event)
+    if created:
+        logger.info(f"Queued Stripe webhook event: {webhook_event.event_type}, ID: {event_id}")
+    else:
+        logger.info(f"Duplicate Stripe webhook event acknowledged: {event_id}")
     
     return HttpResponse(status=200)
 
@@ -114,19 +108,13 @@ def handle_ticket_payment(session, metadata):
                 return
             
             # Check if already processed
-            if order.status == TicketOrder.Status.PAID:
-                logger.info(f"Order {order.id} already marked as paid")
+            if order.status in (TicketOrder.Status.PAID, TicketOrder.Status.REFUND_REQUIRED):
+                logger.info(f"Order {order.id} already processed ({order.status})")
                 return
             
-            # Update order status
-            order.status = TicketOrder.Status.PAID
-            order.provider_payment_intent_id = session.get('payment_intent', '')
-            order.save(update_fields=['status', 'provider_payment_intent_id'])
-            
             # Get quantity from metadata
             quantity = int(metadata.get('quantity', 1))
             
-            # Create tickets in pending_approval status
             from events.models import Event
             try:
                 event = Event.objects.get(id=order.event_id)
@@ -134,12 +122,20 @@ def handle_ticket_payment(session, metadata):
             except Event.DoesNotExist:
                 event_name = f"Event #{order.event_id}"
             
-            for _ in range(quantity):
-                Ticket.objects.create(
-                    order=order,
-                    ticket_type=None,  # Simple flow without ticket types
-                    status=Ticket.Status.PENDING_APPROVAL
-                )
+            # Held seats become sold; orders without holds use the simple flow without ticket types
+            held = list(order.holds.values_list('ticket_type_id', 'quantity'))
+            if held and not convert_holds(order):
+                # The hold lapsed and its seats were sold meanwhile: refund rather than oversell
+                flag_order_for_refund(order, session.get('payment_intent', ''), event_name)
+                return
+            
+            # Update order status
+            order.status = TicketOrder.Status.PAID
+            order.provider_payment_intent_id = session.get('payment_intent', '')
+            order.save(update_fields=['status', 'provider_payment_intent_id'])
+            
+            # Create tickets in pending_approval status
+            issue_tickets(order, held or [(None, quantity)], status=Ticket.Status.PENDING_APPROVAL)
             
             logger.info(f"Created {quantity} tickets for order {order.id}")
             
@@ -172,6 +168,33 @@ def handle_ticket_payment(session, metadata):
         raise
 
 
+def flag_order_for_refund(order, payment_intent_id, event_name):
+    """Mark a paid order that could not get its seats for refund, and tell the buyer and admins"""
+    order.status = TicketOrder.Status.REFUND_REQUIRED
+    order.provider_payment_intent_id = payment_intent_id
+    order.save(update_fields=['status', 'provider_payment_intent_id'])
+    logger.error(f"Order {order.id} paid after its hold lapsed and the seats were sold; refund required")
+    
+    Notification.objects.create(
+        user=order.user,
+        kind='warning',
+        topic='payment',
+        title='Tickets Sold Out',
+        body=f'Your checkout for {event_name} expired before payment and the tickets sold out. Your payment will be refunded.',
+        link_url='/tickets/me'
+    )
+    admins = User.objects.filter(is_staff=True) | User.objects.filter(is_superuser=True)
+    for admin in admins.distinct():
+        Notification.objects.create(
+            user=admin,
+            kind='error',
+            topic='payment',
+            title='Refund Required',
+            body=f'Order {order.id} from {order.user.email} for {event_name} was paid after its seats sold out',
+            link_url=f'/admin/tickets/ticketorder/{order.id}/change/'
+        )
+
+
 def handle_registration_payment(session, metadata):
     """Handle successful registration payment"""
     try:
@@ -240,6 +263,34 @@ def handle_registration_payment(session, metadata):
         raise
 
 
+def handle_checkout_session_expired(session):
+    """Handle an abandoned checkout: fail the order and return its held seats to sale"""
+    try:
+        logger.info(f"Processing checkout.session.expired: {session['id']}")
+        
+        client_ref_id = session.get('client_reference_id')
+        if not client_ref_id:
+            return
+        
+        with transaction.atomic():
+            try:
+                order = TicketOrder.objects.select_for_update().get(client_reference_id=client_ref_id)
+            except TicketOrder.DoesNotExist:
+                logger.error(f"Order not found for client_reference_id: {client_ref_id}")
+                return
+            
+            if order.status == TicketOrder.Status.PAYMENT_PENDING:
+                order.status = TicketOrder.Status.FAILED
+                order.save(update_fields=['status'])
+            
+            released = release_holds(order, TicketHold.Status.EXPIRED)
+            logger.info(f"Order {order.id} checkout expired, released {released} holds")
+            
+    except Exception as e:
+        logger.error(f"Error in handle_checkout_session_expired: {str(e)}", exc_info=True)
+        raise
+
+
 def handle_payment_failed(payment_intent):
     """Handle failed payment"""
     try:
@@ -263,6 +314,8 @@ def handle_payment_failed(payment_intent):
             order.status = TicketOrder.Status.FAILED
             order.provider_payment_intent_id = payment_intent['id']
             order.save(update_fields=['status', 'provider_payment_intent_id'])
+            # Held seats stay held: the customer can retry in the same Checkout session,
+            # and checkout.session.expired releases them if they don't
             
             # Notify user
             Notification.objects.create(
@@ -11,6 +11,8 @@ from django.utils import timezone
 from .models import TicketOrder, Ticket
 from .services.stripe_service import stripe_service
 from .services.email_service import email_service
+from .services.issuance import issue_tickets
+from .services.inventory import SoldOut, sell
 
 logger = logging.getLogger(__name__)
 
@@ -110,7 +112,6 @@ def handle_registration_payment(session, metadata):
 def handle_checkout_session_completed(event):
     """Handle successful checkout session completion"""
     try:
-        import uuid
         from .models import TicketType
         
         session = event['data']['object']
@@ -132,11 +133,11 @@ def handle_checkout_session_completed(event):
             return HttpResponse("No order_id found", status=400)
         
         with transaction.atomic():
-            # Get the order
-            order = get_object_or_404(TicketOrder, id=order_id)
+            # Get the order, locked so a redelivery waits and then sees it processed
+            order = get_object_or_404(TicketOrder.objects.select_for_update(), id=order_id)
             
             # Check if already processed
-            if order.status == TicketOrder.Status.PAID:
+            if order.status in (TicketOrder.Status.PAID, TicketOrder.Status.REFUND_REQUIRED):
                 logger.info(f"Order {order_id} already processed")
                 return HttpResponse("Order already processed", status=200)
             
@@ -154,6 +155,17 @@ def handle_checkout_session_completed(event):
                 }
             )
             
+            # Sell the seats before issuing them; a sold-out event is refunded, not oversold
+            try:
+                sell([(ticket_type.id, quantity)])
+            except SoldOut as e:
+                logger.error(f"Order {order_id} paid but {e}; refund required")
+                order.status = TicketOrder.Status.REFUND_REQUIRED
+                order.provider_payment_intent_id = session.get('payment_intent', session_id)
+                order.provider_session_id = session_id
+                order.save()
+                return HttpResponse("Sold out; refund required", status=200)
+            
             # Mark order as paid
             order.status = TicketOrder.Status.PAID
             order.provider_payment_intent_id = session.get('payment_intent', session_id)
@@ -162,24 +174,16 @@ def handle_checkout_session_completed(event):
             order.save()
             
             # Create tickets with VALID status (payment received)
-            tickets_created = []
-            for i in range(quantity):
-                serial = f"TKT-{uuid.uuid4().hex[:12].upper()}"
-                code = f"TKT-{event_id}-{order.id}-{i+1}"
-                
-                ticket = Ticket.objects.create(
-                    order=order,
-                    ticket_type=ticket_type,
-                    serial=serial,
-                    code=code,
-                    qr_payload=f"event:{event_id},order:{order.id},user:{order.user.id},seq:{i+1}",
-                    status=Ticket.Status.VALID  # Payment received, ticket is valid
-                )
-                tickets_created.append({
-                    'id': ticket.id,
-                    'serial': ticket.serial,
-                    'status': 'valid'
-                })
+            tickets = issue_tickets(
+                order,
+                [(ticket_type.id, quantity)],
+                status=Ticket.Status.VALID,  # Payment received, ticket is valid
+                with_codes=True
+            )
+            tickets_created = [
+                {'id': ticket.id, 'serial': ticket.serial, 'status': 'valid'}
+                for ticket in tickets
+            ]
                 
             # Send realtime notification
             try:
@@ -267,26 +271,31 @@ def handle_payment_succeeded(event):
             return HttpResponse("No order_id found", status=400)
         
         with transaction.atomic():
-            # Get the order
-            order = get_object_or_404(TicketOrder, id=order_id)
+            # Get the order, locked so a redelivery waits and then sees it processed
+            order = get_object_or_404(TicketOrder.objects.select_for_update(), id=order_id)
             
             # Check if already processed
-            if order.status == TicketOrder.Status.PAID:
+            if order.status in (TicketOrder.Status.PAID, TicketOrder.Status.REFUND_REQUIRED):
                 logger.info(f"Order {order_id} already processed")
                 return HttpResponse("Order already processed", status=200)
             
+            # Update inventory: the order's seats are sold all or nothing
+            try:
+                sell((ticket_type_id, 1) for ticket_type_id in
+                     order.tickets.exclude(ticket_type=None).values_list('ticket_type_id', flat=True))
+            except SoldOut as e:
+                logger.error(f"Order {order_id} paid but {e}; refund required")
+                order.status = TicketOrder.Status.REFUND_REQUIRED
+                order.provider_payment_intent_id = payment_intent_id
+                order.save(update_fields=['status', 'provider_payment_intent_id'])
+                return HttpResponse("Sold out; refund required", status=200)
+            
             # Mark order as paid
             order.mark_paid(
                 session_id=payment_intent_id,
                 payment_intent=payment_intent_id
             )
             
-            # Update inventory
-            for ticket in order.tickets.all():
-                ticket_type = ticket.ticket_type
-                ticket_type.quantity_sold += 1
-                ticket_type.save()
-            
             # Send realtime notification
             try:
                 from channels.layers import get_channel_layer
@@ -32,6 +32,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
 
     # 3rd-party
     "rest_framework",
@@ -57,6 +58,11 @@ INSTALLED_APPS = [
     "ticketing.apps.TicketingConfig",
     "tickets.apps.TicketsConfig",
     "reports.apps.ReportsConfig",
+    "scheduler.apps.SchedulerConfig",
+    "mediahub.apps.MediahubConfig",
+    "privacy.apps.PrivacyConfig",
+    "settingshub.apps.SettingshubConfig",
+    "search.apps.SearchConfig",
 ]
 
 # NOTE: Payments (Stripe) and app-level notifications are intentionally disabled for stabilization.
@@ -69,6 +75,8 @@ MIDDLEWARE = [
     "whitenoise.middleware.WhiteNoiseMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
+    # Inside CORS so 429s still carry CORS headers
+    "api.middleware.RateLimitingMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
@@ -78,7 +86,6 @@ MIDDLEWARE = [
     # "common.middleware.PublicEndpointMiddleware",
     # "common.security.SecurityHeadersMiddleware",
     # "api.middleware.AuditLoggingMiddleware",
-    # "api.middleware.RateLimitingMiddleware",
 ]
 
 ROOT_URLCONF = "timely.urls"
@@ -152,6 +159,14 @@ MAX_IMAGE_SIZE = 10 * 1024 * 1024  # 10MB
 MAX_VIDEO_SIZE = 100 * 1024 * 1024  # 100MB
 MEDIA_THUMBNAIL_SIZE = (300, 300)
 MEDIA_THUMBNAIL_QUALITY = 85
+# Responsive renditions, built off the request on the "media" background queue
+MEDIA_RENDITIONS = {
+    'thumb': {'size': (320, 320), 'crop': True},
+    'medium': {'size': (1024, 1024)},
+    'large': {'size': (2048, 2048)},
+}
+MEDIA_RENDITION_FORMATS = ('webp', 'jpeg')
+MEDIA_RENDITION_QUALITY = 82
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
@@ -188,9 +203,6 @@ REST_FRAMEWORK = {
     "DEFAULT_THROTTLE_RATES": {
         "anon": "100/min",
         "user": "1000/min",
-        "public_checkout": "10/min",
-        # Temporarily higher for acceptance run
-        "login": "100/min",
     },
 }
 
@@ -200,9 +212,39 @@ if DEBUG:
     REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"] = {
         "user": "10000/min",
         "anon": "10000/min",
-        "login": "10000/min",
     }
 
+# Per-route rate limits (common.ratelimit, GCRA), applied by
+# api.middleware.RateLimitingMiddleware per client IP. Paths ending in '*'
+# are prefixes. State is shared through the cache when it is Redis.
+RATE_LIMIT_ENABLED = env.bool("RATE_LIMIT_ENABLED", default=not DEBUG)
+# Proxies in front of the app that append to X-Forwarded-For; 0 keys on
+# REMOTE_ADDR and ignores the header, which clients can set to anything
+RATE_LIMIT_TRUSTED_PROXIES = env.int("RATE_LIMIT_TRUSTED_PROXIES", default=0)
+RATE_LIMIT_POLICIES = {
+    "login": {
+        # Temporarily higher for acceptance run
+        "rate": "100/min",
+        "methods": ["POST"],
+        "paths": ["/api/auth/login/"],
+    },
+    "register": {
+        "rate": "20/hour",
+        "methods": ["POST"],
+        "paths": ["/api/auth/register/"],
+    },
+    "token_refresh": {
+        "rate": "60/min",
+        "methods": ["POST"],
+        "paths": ["/api/auth/refresh/"],
+    },
+    "public_checkout": {
+        "rate": "10/min",
+        "methods": ["POST"],
+        "paths": ["/api/tickets/checkout/", "/api/tickets/free/"],
+    },
+}
+
 SPECTACULAR_SETTINGS = {
     "TITLE": "Timely API",
     "DESCRIPTION": "Online Sports Events Management System API",
@@ -222,8 +264,15 @@ SIMPLE_JWT = {
     "AUTH_COOKIE_HTTP_ONLY": True,
     "AUTH_COOKIE_PATH": "/",
     "AUTH_COOKIE_SAMESITE": "Lax",
+    # Tokens carry User.token_version so logout can revoke them
+    "TOKEN_OBTAIN_SERIALIZER": "accounts.serializers.UserTokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "accounts.serializers.UserTokenRefreshSerializer",
 }
 
+# Authenticated requests resolve their user from a cache keyed by user id and
+# token version; entries are dropped on user changes and revocation
+AUTH_USER_CACHE_TIMEOUT = env.int("AUTH_USER_CACHE_TIMEOUT", default=60)  # seconds
+
 # Email verification settings
 EMAIL_VERIFICATION_REQUIRED = True
 EMAIL_VERIFICATION_TOKEN_EXPIRY = 24 * 60 * 60  # 24 hours in seconds
@@ -303,13 +352,94 @@ REALTIME_CONFIG = {
     'NOTIFICATION_INTERVAL': 5,  # seconds
     'MATCH_UPDATE_INTERVAL': 10,  # seconds
     'LEADERBOARD_UPDATE_INTERVAL': 30,  # seconds
+    'RESULTS_COALESCE_WINDOW': 1.0,  # seconds; result edits within a window share one broadcast
+    'SSE_REPLAY_BUFFER': 256,  # frames kept per event for Last-Event-ID resume
+    'SSE_CLIENT_QUEUE': 64,  # frames buffered per SSE client before it is dropped
+    'SSE_HEARTBEAT_INTERVAL': 15,  # seconds between SSE keep-alive comments
+    'SSE_IDLE_TIMEOUT': 60,  # seconds an event feed outlives its last SSE client
 }
 
+# Background work queues (common.background); eager mode runs tasks inline
+BACKGROUND_TASKS_EAGER = env.bool("BACKGROUND_TASKS_EAGER", default=False)
+BACKGROUND_QUEUE_WORKERS = {
+    'notifications': 4,
+    'metrics': 1,
+    'media': 2,
+    'exports': 2,
+    'webhooks': 4,
+    'delivery': 4,
+}
+NOTIFICATION_FANOUT_CHUNK_SIZE = 500
+
+# Event, news and venue search (search app): "postgres" ranks full-text matches
+# and catches typos with pg_trgm; "local" keeps an in-process inverted index
+# (tests, SQLite); "auto" picks by database. The local backend hands at most
+# max results to the database per search, and its trigram threshold is the
+# word similarity cut-off, matching PostgreSQL's pg_trgm default
+SEARCH_BACKEND = env('SEARCH_BACKEND', default='auto')
+SEARCH_MAX_RESULTS = 1000
+SEARCH_TRIGRAM_THRESHOLD = 0.6
+
+# GDPR exports (privacy.services.exporter): rows per cursor fetch, and archive
+# bytes kept in memory before spooling to disk
+PRIVACY_EXPORT_CHUNK_SIZE = 2000
+PRIVACY_EXPORT_SPOOL_BYTES = 8 * 1024 * 1024
+
+# Site settings and feature flags (settingshub.services.snapshot): compiled per
+# process; seconds between checks of the shared version bumped by admin edits,
+# and the age at which a snapshot is recompiled anyway (the version key is only
+# shared across workers on Redis)
+SETTINGS_SNAPSHOT_RECHECK_SECONDS = 1.0
+SETTINGS_SNAPSHOT_MAX_AGE_SECONDS = 30.0
+
+# Unread badge counts (NotificationUnread): cached per user, invalidated on change;
+# reconcile_unread_counts --loop repairs counters that drift from the notifications
+NOTIFICATION_UNREAD_CACHE_TTL = 300  # seconds
+NOTIFICATION_UNREAD_RECONCILE_INTERVAL = 15 * 60  # seconds
+
+# Fixture reminders (scheduler.tasks): run_reminders --loop sweeps every interval
+REMINDER_SCHEDULER_INTERVAL = 60  # seconds
+
+# API metrics (api.metrics): requests are aggregated in memory and flushed as rollups
+API_METRICS_FLUSH_INTERVAL = env.int("API_METRICS_FLUSH_INTERVAL", default=60)  # seconds
+API_METRICS_MAX_KEYS = 2000
+
+# Gate check-in (tickets.services.checkin)
+TICKET_CHECKIN_INDEX_TTL = 300  # seconds before an event's ticket index is rebuilt
+TICKET_CHECKIN_MAX_BATCH = 500  # scans per offline batch upload
+
+# Ticket inventory (tickets.services.inventory)
+TICKET_HOLD_TTL = 35 * 60  # seconds a Stripe checkout session (and its held seats) stays open
+TICKET_HOLD_GRACE = 5 * 60  # extra seconds before release, for payments completing as the session expires
+
 # Stripe Configuration
 STRIPE_SECRET_KEY = env('STRIPE_SECRET_KEY', default='')
 STRIPE_WEBHOOK_SECRET = env('STRIPE_WEBHOOK_SECRET', default='')
 VITE_STRIPE_PUBLISHABLE_KEY = env('VITE_STRIPE_PUBLISHABLE_KEY', default='')
 
+# Stripe webhook inbox (payments.inbox): events are stored and acknowledged, then
+# processed on the "webhooks" queue; failures retry with backoff (base doubling
+# up to max) and are parked as failed after max attempts. Events held by a
+# worker for longer than the lease are released by process_webhook_inbox
+STRIPE_WEBHOOK_MAX_ATTEMPTS = 8
+STRIPE_WEBHOOK_RETRY_BASE_SECONDS = 30
+STRIPE_WEBHOOK_RETRY_MAX_SECONDS = 3600
+STRIPE_WEBHOOK_LEASE_SECONDS = 300
+
+# Outbound email/SMS delivery (payments.delivery): messages are stored as
+# DeliveryLog rows and sent on the "delivery" queue in batches over one
+# connection. Failed messages retry with jittered backoff (base doubling up to
+# max) up to DELIVERY_MAX_RETRIES. An endpoint whose batches fail threshold
+# times in a row is skipped for the cooldown, then probed with one message.
+# Rows held by a worker for longer than the lease are released by deliver_pending
+DELIVERY_BATCH_SIZE = 100
+DELIVERY_MAX_RETRIES = 5
+DELIVERY_RETRY_BASE_SECONDS = 10
+DELIVERY_RETRY_MAX_SECONDS = 3600
+DELIVERY_BREAKER_THRESHOLD = 5
+DELIVERY_BREAKER_COOLDOWN = 60
+DELIVERY_LEASE_SECONDS = 300
+
 # Enhanced Email Configuration for Payment Confirmations
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'  # Console for development
 EMAIL_HOST = 'localhost'
@@ -322,16 +452,33 @@ EMAIL_USE_TLS = False
 SECURE_SSL_REDIRECT = False  # True in prod
 
 # Cache Configuration
-CACHES = {
-    'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-        'LOCATION': 'unique-snowflake',
-        'TIMEOUT': 300,  # 5 minutes default
-        'OPTIONS': {
-            'MAX_ENTRIES': 1000,
+# Shared cache when CACHE_REDIS_URL is set (every worker sees the same entries
+# and invalidations; needs the redis client, installed with channels-redis);
+# per-process locmem otherwise, e.g. for dev and tests
+if os.environ.get("CACHE_REDIS_URL"):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ.get('CACHE_REDIS_URL'),
+            'KEY_PREFIX': 'timely',
+            'TIMEOUT': 300,  # 5 minutes default
         }
     }
-}
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'unique-snowflake',
+            'TIMEOUT': 300,  # 5 minutes default
+            'OPTIONS': {
+                'MAX_ENTRIES': 1000,
+            }
+        }
+    }
+
+# Public pages are cached under versioned per-event keys that are bumped on
+# writes, so they can be kept for minutes without serving stale scores
+PUBLIC_CACHE_TIMEOUT = env.int("PUBLIC_CACHE_TIMEOUT", default=300)  # seconds
 
 # Logging Configuration
 LOGGING = {
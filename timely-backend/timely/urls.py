@@ -8,6 +8,9 @@ from timely.core.views import SiteIndexView
 
 urlpatterns = [
     path("admin/", admin.site.urls),
+    path("api/media/", include("mediahub.urls")),
+    path("api/privacy/", include("privacy.urls")),
+    path("api/settings/", include("settingshub.urls")),
     path("api/", include("api.urls")),
     path("", SiteIndexView, name="site-index"),
 ]